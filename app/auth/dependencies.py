@@ -1,38 +1,146 @@
 """
 인증 의존성 및 사용자 인증 관련 기능
+
+환경변수 설정 방법:
+   DEBUG_API_TOKEN=change_me      # /debug/* 진단 엔드포인트 접근 토큰 (X-Debug-Token 헤더, 미설정 시 비활성화)
 """
+import calendar
+import logging
+import os
+import secrets
+from datetime import datetime
 from typing import Optional
-from sqlalchemy.orm import Session
-from fastapi import Depends, HTTPException, status
+from dotenv import load_dotenv
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import make_transient_to_detached
+from fastapi import Depends, Header, HTTPException, status
 
-from app.models.database import get_db
-from app.models.models import User
+from app.models.database import AsyncSessionLocal, get_async_db
+from app.models.models import RevokedToken, User
 from app.models.schemas import TokenData
-from app.auth.jwt_handler import verify_token
-from app.auth.security import verify_password
+from app.auth.jwt_handler import decode_token, token_expires_at, verify_token
+from app.auth.token_cache import token_cache, token_hash
+from app.auth.security import PASSLIB_SALT, password_hasher
+from app.auth.user_cache import user_cache
+
+# 환경변수 로드
+load_dotenv()
+
+DEBUG_API_TOKEN = os.getenv("DEBUG_API_TOKEN", "")
 
+logger = logging.getLogger(__name__)
 
-def get_current_user(token_data: TokenData = Depends(verify_token), db: Session = Depends(get_db)) -> User:
-    """현재 인증된 사용자 정보 반환"""
-    user = db.query(User).filter(User.email == token_data.email).first()
+
+async def get_current_user(token_data: TokenData = Depends(verify_token), db: AsyncSession = Depends(get_async_db)) -> User:
+    """현재 인증된 사용자 정보 반환 (캐시에 있으면 DB 조회 없이 현재 세션에 연결)"""
+    cached = user_cache.get(token_data.email)
+    if cached is not None:
+        user = User(**cached)
+        make_transient_to_detached(user)
+        user = await db.merge(user, load=False)
+    else:
+        user = await get_user_by_email(db, token_data.email)
+        if user is not None:
+            user_cache.set(token_data.email, user)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="사용자를 찾을 수 없습니다.",
         )
+    if not await is_token_active(db, user, token_data):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="인증 정보를 확인할 수 없습니다.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    """사용자 인증"""
-    user = db.query(User).filter(User.email == email).first()
+async def is_token_active(db: AsyncSession, user: User, token_data: TokenData) -> bool:
+    """
+    사용자 기준 토큰 폐기 확인 (HTTP 요청/WebSocket 연결 공통)
+    - users.tokens_valid_after 이전에 발급된 토큰 거부 (가입/비밀번호 변경·재설정, DB에 저장되므로 재시작/다른 워커에도 적용)
+    - 폐기 목록이 다른 워커에 전달되지 않는 memory 백엔드이거나 메모리 상한을 넘어 제거한 폐기 항목이 있으면
+      로그아웃 토큰을 revoked_tokens 테이블에서 직접 확인
+    """
+    if user.tokens_valid_after is not None:
+        valid_after = calendar.timegm(user.tokens_valid_after.timetuple())
+        if token_data.issued_at is None or token_data.issued_at < valid_after:
+            return False
+    if (not token_cache.shared or token_cache.revoked_evictions) and token_data.token_hash:
+        revoked = await db.scalar(select(RevokedToken.token_hash).where(
+            RevokedToken.token_hash == token_data.token_hash,
+            RevokedToken.expires_at > datetime.utcnow()
+        ))
+        if revoked is not None:
+            return False
+    return True
+
+
+def revoke_user_tokens(user: User):
+    """
+    지금까지 발급된 사용자의 토큰 모두 폐기 (commit 전에 호출)
+    iat는 초 단위이므로 같은 초에 새로 발급한 토큰(비밀번호 변경 응답의 새 토큰)은 유지
+    """
+    user.tokens_valid_after = datetime.utcnow().replace(microsecond=0)
+
+
+async def revoke_access_token(db: AsyncSession, token: str):
+    """로그아웃한 토큰을 만료 시각까지 폐기 (revoked_tokens 테이블에 기록하고 모든 워커의 토큰 캐시에 반영)"""
+    expires_at = token_expires_at(decode_token(token))
+    await db.merge(RevokedToken(token_hash=token_hash(token), expires_at=datetime.utcfromtimestamp(expires_at)))
+    await db.commit()
+    token_cache.revoke_token(token, expires_at)
+
+
+async def load_revoked_tokens(session_factory: async_sessionmaker = AsyncSessionLocal):
+    """만료된 폐기 토큰을 테이블에서 정리하고 남은 목록을 토큰 캐시에 반영 (앱 시작/허브 재연결 시)"""
+    async with session_factory() as db:
+        await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow()))
+        await db.commit()
+        rows = (await db.execute(select(RevokedToken.token_hash, RevokedToken.expires_at))).all()
+    token_cache.load_revoked({
+        row.token_hash: float(calendar.timegm(row.expires_at.timetuple())) for row in rows
+    })
+    logger.info("폐기된 토큰 %d개 로드", len(rows))
+
+
+def require_debug_access(x_debug_token: Optional[str] = Header(None)):
+    """
+    /debug/* 진단 엔드포인트 접근 확인
+    스택 프레임, 라우트 이름, 연결/캐시 통계를 노출하므로 DEBUG_API_TOKEN과 같은 X-Debug-Token 헤더가 있어야 합니다.
+    토큰이 없거나 다르면 엔드포인트가 없는 것처럼 404를 반환합니다.
+    """
+    if not DEBUG_API_TOKEN or x_debug_token is None or not secrets.compare_digest(x_debug_token, DEBUG_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found",
+        )
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """사용자 인증 (기존 방식 해시는 로그인 성공 시 새 해시로 변환)"""
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.password_hash, user.salt):
+    valid, new_hash = await password_hasher.verify(password, user.password_hash, user.salt)
+    if not valid:
         return None
+    if new_hash is not None:
+        try:
+            user.password_hash = new_hash
+            user.salt = PASSLIB_SALT
+            await db.commit()
+            user_cache.invalidate(user.email)
+        except Exception as e:
+            # 변환에 실패해도 로그인은 진행 (다음 로그인 때 다시 시도)
+            await db.rollback()
+            logger.warning("비밀번호 해시 변환 실패: %s", e)
     return user
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """이메일로 사용자 조회"""
-    return db.query(User).filter(User.email == email).first()
\ No newline at end of file
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
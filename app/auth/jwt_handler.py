@@ -1,7 +1,12 @@
 """
 JWT 토큰 관련 기능
+
+환경변수 설정 방법:
+   ACCESS_TOKEN_EXPIRE_MINUTES=10080   # 액세스 토큰 유효 기간 (분, 기본 7일)
+                                       # 이전 버전에서 발급한 만료 기간이 긴 토큰도 발급(iat) 후 이 기간이 지나면 거부
 """
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -11,6 +16,7 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.models.schemas import TokenData
+from app.auth.token_cache import token_cache, token_hash
 
 # 환경변수 로드
 load_dotenv()
@@ -18,7 +24,7 @@ load_dotenv()
 # 환경변수에서 설정값 가져오기 (개발용 기본값, 배포시 환경변수 사용)
 SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production-minimum-32-characters")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "10080"))
 
 # HTTPBearer 스키마
 bearer_scheme = HTTPBearer()
@@ -30,14 +36,48 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
-        # 토큰을 매우 오래 유효하게 설정 (100년)
-        expire = datetime.utcnow() + timedelta(days=36500)
+        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    # iat: 비밀번호 변경 이전에 발급된 토큰을 구분하는 데 사용 (users.tokens_valid_after)
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def token_expires_at(claims: dict) -> float:
+    """
+    토큰이 거부되기 시작하는 시각 (epoch)
+    exp와 발급(iat) 후 ACCESS_TOKEN_EXPIRE_MINUTES 중 빠른 쪽 (iat가 없는 이전 버전 토큰은 이미 만료)
+    """
+    issued_at = claims.get("iat")
+    if issued_at is None:
+        return 0.0
+    expires_at = float(issued_at) + ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    if claims.get("exp") is not None:
+        expires_at = min(expires_at, float(claims["exp"]))
+    return expires_at
+
+
+def decode_token(token: str) -> dict:
+    """
+    JWT 토큰 디코딩 (검증된 클레임은 만료 시각까지 캐시)
+    만료되었거나 폐기된 토큰이면 JWTError 발생
+    """
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        if token_expires_at(payload) <= time.time():
+            raise JWTError("만료된 토큰입니다.")
+        token_cache.set(token, payload, token_expires_at(payload))
+    if token_cache.is_revoked(token):
+        raise JWTError("폐기된 토큰입니다.")
+    return payload
+
+
+def _token_data(token: str, payload: dict) -> TokenData:
+    return TokenData(email=payload.get("sub"), issued_at=payload.get("iat"), token_hash=token_hash(token))
+
+
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> TokenData:
     """JWT 토큰 검증 (HTTP 요청용)"""
     credentials_exception = HTTPException(
@@ -47,11 +87,10 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(bearer_sche
     )
     
     try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+        payload = decode_token(credentials.credentials)
+        if payload.get("sub") is None:
             raise credentials_exception
-        token_data = TokenData(email=email)
+        token_data = _token_data(credentials.credentials, payload)
     except JWTError:
         raise credentials_exception
     
@@ -61,10 +100,9 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(bearer_sche
 def verify_token_string(token: str) -> Optional[TokenData]:
     """JWT 토큰 검증 (WebSocket용 - 문자열 토큰)"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+        payload = decode_token(token)
+        if payload.get("sub") is None:
             return None
-        return TokenData(email=email)
+        return _token_data(token, payload)
     except JWTError:
         return None
\ No newline at end of file
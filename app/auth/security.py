@@ -1,8 +1,49 @@
 """
 비밀번호 해싱 및 보안 관련 기능
+
+새 비밀번호는 passlib의 PBKDF2-SHA256으로 해시합니다. 해시 계산은 CPU를 오래 사용하므로
+이벤트 루프가 아닌 코어 수 크기의 전용 스레드 풀에서 실행하고(hashlib이 GIL을 해제하므로 병렬 실행됨),
+대기 중인 작업이 한도를 넘으면 503으로 즉시 거절합니다.
+
+기존 SHA-256 + salt 해시도 그대로 검증되며, 로그인에 성공하면 새 해시로 자동 변환됩니다.
+
+환경변수 설정 방법:
+   PASSWORD_HASH_ROUNDS=100000      # PBKDF2 반복 횟수
+   PASSWORD_HASH_WORKERS=4          # 해시 스레드 수 (기본값: CPU 코어 수)
+   PASSWORD_HASH_QUEUE_LIMIT=64     # 스레드 풀이 모두 사용 중일 때 대기 가능한 작업 수
+
+벤치마크 (코어당 초당 로그인 수):
+   python -m app.auth.security --benchmark
 """
+import asyncio
 import hashlib
+import hmac
+import os
 import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+# 환경변수 로드
+load_dotenv()
+
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "100000"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "64"))
+
+# passlib 해시 설정 (반복 횟수가 바뀌면 needs_update로 감지되어 로그인 시 재해시)
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    pbkdf2_sha256__rounds=PASSWORD_HASH_ROUNDS,
+)
+
+# passlib 해시에는 salt가 포함되어 있으므로 salt 컬럼은 비워 둠
+PASSLIB_SALT = ""
 
 
 def generate_salt() -> str:
@@ -11,11 +52,116 @@ def generate_salt() -> str:
 
 
 def hash_password_with_salt(password: str, salt: str) -> str:
-    """비밀번호와 salt을 사용하여 SHA-256 해시 생성"""
+    """비밀번호와 salt을 사용하여 SHA-256 해시 생성 (기존 방식)"""
     salted_password = password + salt
     return hashlib.sha256(salted_password.encode()).hexdigest()
 
 
+def is_legacy_hash(hashed_password: str) -> bool:
+    """기존 SHA-256 + salt 방식의 해시인지 여부"""
+    return not hashed_password.startswith("$")
+
+
+def hash_password(password: str) -> str:
+    """비밀번호를 passlib 해시로 변환 (동기 함수, 이벤트 루프에서는 password_hasher 사용)"""
+    return pwd_context.hash(password)
+
+
 def verify_password(plain_password: str, hashed_password: str, salt: str) -> bool:
-    """비밀번호 검증"""
-    return hash_password_with_salt(plain_password, salt) == hashed_password
\ No newline at end of file
+    """비밀번호 검증 (기존 방식과 passlib 해시 모두 지원)"""
+    valid, _ = verify_and_update(plain_password, hashed_password, salt)
+    return valid
+
+
+def verify_and_update(plain_password: str, hashed_password: str, salt: str) -> Tuple[bool, Optional[str]]:
+    """
+    비밀번호 검증 후 새 해시가 필요하면 함께 반환
+    반환값: (검증 성공 여부, 새 해시 또는 None)
+    """
+    if is_legacy_hash(hashed_password):
+        if not hmac.compare_digest(hash_password_with_salt(plain_password, salt), hashed_password):
+            return False, None
+        return True, pwd_context.hash(plain_password)
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """비밀번호 해시 전용 스레드 풀 (대기 작업 수 제한)"""
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_limit: int = PASSWORD_HASH_QUEUE_LIMIT):
+        self.workers = max(workers, 1)
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    async def _run(self, func, *args):
+        if self.in_flight >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"},
+            )
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hasher")
+
+        self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        """새 비밀번호 해시"""
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str, salt: str) -> Tuple[bool, Optional[str]]:
+        """비밀번호 검증 (새 해시가 필요하면 함께 반환)"""
+        return await self._run(verify_and_update, plain_password, hashed_password, salt)
+
+    def snapshot(self):
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+# 전역 비밀번호 해시 스레드 풀
+password_hasher = PasswordHasher()
+
+
+def run_benchmark(duration: float = 3.0):
+    """스레드 수별 초당 로그인(비밀번호 검증) 수 측정"""
+    stored_hash = hash_password("benchmark-password")
+
+    async def measure(workers: int) -> float:
+        hasher = PasswordHasher(workers=workers, queue_limit=workers * 4)
+        done = 0
+        deadline = time.perf_counter() + duration
+
+        async def worker():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                await hasher.verify("benchmark-password", stored_hash, PASSLIB_SALT)
+                done += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(workers * 2)))
+        return done / (time.perf_counter() - started)
+
+    print(f"PBKDF2-SHA256 {PASSWORD_HASH_ROUNDS}회 반복, 측정 시간 {duration:.0f}초")
+    worker_counts = sorted({1, PASSWORD_HASH_WORKERS})
+    for workers in worker_counts:
+        rate = asyncio.run(measure(workers))
+        print(f"  스레드 {workers}개: 초당 {rate:.1f}회 로그인 (스레드당 {rate / workers:.1f}회)")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        run_benchmark()
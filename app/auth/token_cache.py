@@ -0,0 +1,174 @@
+"""
+디코딩된 JWT 클레임 캐시
+
+verify_token/verify_token_string이 요청(및 WebSocket 연결)마다 jwt.decode를 다시 실행하지 않도록
+토큰 해시별로 검증이 끝난 클레임을 토큰 만료 시각(exp)까지 보관합니다.
+대부분의 클라이언트는 같은 토큰을 오래 재사용하므로 재연결이 몰릴 때 서명 검증 비용이 크게 줄어듭니다.
+
+캐시 적중 여부와 관계없이 로그아웃한 토큰(revoke_token) 검사는 매번 실행됩니다.
+- 폐기 목록은 revoked_tokens 테이블이 원본이며, 이 캐시는 앱 시작/허브 재연결 시 테이블에서 다시 채웁니다.
+- 여러 워커로 실행하면 폐기 내용을 pub/sub 채널(TOKEN_REVOCATION_CHANNEL)로 다른 워커에 알립니다.
+  (토큰 원문 대신 토큰 해시를 전달, WS_PUBSUB_BACKEND=memory이면 다른 워커에 전달되지 않으므로
+   get_current_user가 revoked_tokens 테이블을 직접 확인합니다. shared 참고)
+- 클레임과 폐기 목록 모두 토큰 만료 시각(jwt_handler.token_expires_at)까지만 보관하고 최대 개수를 넘으면
+  만료가 가장 빠른 항목부터 메모리에서 제거합니다. (테이블에는 남아 있으므로 DB 확인으로 계속 거부)
+- 비밀번호 변경/재설정으로 사용자의 토큰을 모두 폐기하는 경우는 users.tokens_valid_after로 판단합니다.
+
+환경변수 설정 방법:
+   TOKEN_CACHE_MAX_SIZE=10000       # 최대 보관 토큰 수 (0이면 캐시 사용 안 함)
+   TOKEN_REVOKED_MAX_SIZE=100000    # 메모리에 보관할 최대 폐기 토큰 수
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.services.pubsub import WS_PUBSUB_BACKEND
+
+# 환경변수 로드
+load_dotenv()
+
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+TOKEN_REVOKED_MAX_SIZE = int(os.getenv("TOKEN_REVOKED_MAX_SIZE", "100000"))
+
+# 워커 사이 토큰 폐기 채널
+TOKEN_REVOCATION_CHANNEL = "token_revocation"
+
+# 다른 워커에 폐기를 알리는 함수 (channel, message)
+PublishHandler = Callable[[str, str], None]
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def token_hash(token: str) -> str:
+    """revoked_tokens 테이블에 저장하는 토큰 해시 (SHA-256 HEX)"""
+    return _token_key(token).hex()
+
+
+class TokenClaimCache:
+    """토큰 해시별 클레임 LRU 캐시 (토큰 만료 시각까지 유효)"""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_MAX_SIZE, revoked_max_size: int = TOKEN_REVOKED_MAX_SIZE):
+        self.max_size = max_size
+        self.revoked_max_size = revoked_max_size
+        # 폐기 내용이 모든 워커에 전달되는지 여부 (memory 백엔드이면 DB에서 직접 확인해야 함)
+        self.shared = WS_PUBSUB_BACKEND != "memory"
+        # {토큰 해시: (만료 시각(epoch), 클레임)}
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # 폐기된 토큰 {토큰 해시: 만료 시각(epoch)}
+        self._revoked: Dict[bytes, float] = {}
+        self.publish: Optional[PublishHandler] = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revoked_rejections = 0
+        self.revoked_evictions = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """캐시된 클레임 반환 (없거나 만료되면 None)"""
+        if self.max_size <= 0:
+            return None
+        key = _token_key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def set(self, token: str, claims: Dict[str, Any], expires_at: float):
+        """검증이 끝난 클레임을 expires_at(epoch)까지 저장"""
+        if self.max_size <= 0:
+            return
+        key = _token_key(token)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def revoke_token(self, token: str, expires_at: float):
+        """토큰 폐기 (캐시에서 제거하고 expires_at(epoch)까지 거부, 다른 워커에도 알림)"""
+        key = _token_key(token)
+        self._entries.pop(key, None)
+        self._revoke_key(key, expires_at)
+        self._publish({"token": key.hex(), "expires_at": expires_at})
+
+    def load_revoked(self, revoked: Dict[str, float]):
+        """revoked_tokens 테이블의 폐기 목록 반영 {토큰 해시 HEX: 만료 시각(epoch)} (앱 시작/허브 재연결 시)"""
+        for hex_key, expires_at in revoked.items():
+            key = bytes.fromhex(hex_key)
+            self._entries.pop(key, None)
+            self._revoked[key] = expires_at
+        self._purge_revoked()
+
+    def on_remote_revocation(self, message: str):
+        """다른 워커의 토큰 폐기 반영 (pub/sub 채널 수신)"""
+        data = json.loads(message)
+        if "token" not in data:
+            return
+        key = bytes.fromhex(data["token"])
+        self._entries.pop(key, None)
+        self._revoke_key(key, data["expires_at"])
+
+    def is_revoked(self, token: str) -> bool:
+        """폐기된 토큰인지 확인 (캐시 적중 시에도 매번 호출)"""
+        revoked = bool(self._revoked) and _token_key(token) in self._revoked
+        if revoked:
+            self.revoked_rejections += 1
+        return revoked
+
+    def _revoke_key(self, key: bytes, expires_at: float):
+        self._revoked[key] = expires_at
+        self._purge_revoked()
+
+    def _publish(self, data: Dict[str, Any]):
+        if self.publish:
+            self.publish(TOKEN_REVOCATION_CHANNEL, json.dumps(data))
+
+    def _purge_revoked(self):
+        """만료된 폐기 항목 제거, 최대 개수를 넘으면 만료가 가장 빠른 항목부터 제거"""
+        now = time.time()
+        for key in [key for key, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[key]
+        overflow = len(self._revoked) - self.revoked_max_size
+        if overflow > 0:
+            for key in sorted(self._revoked, key=self._revoked.get)[:overflow]:
+                del self._revoked[key]
+            self.revoked_evictions += overflow
+
+    def clear(self):
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.max_size > 0,
+            "max_size": self.max_size,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "shared": self.shared,
+            "revoked_tokens": len(self._revoked),
+            "revoked_max_size": self.revoked_max_size,
+            "revoked_evictions": self.revoked_evictions,
+            "revoked_rejections": self.revoked_rejections,
+        }
+
+
+# 전역 토큰 클레임 캐시
+token_cache = TokenClaimCache()
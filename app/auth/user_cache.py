@@ -0,0 +1,134 @@
+"""
+인증된 사용자 조회 캐시
+
+get_current_user가 요청마다 실행하던 users 조회를 줄이기 위해 토큰 subject(이메일)별로
+사용자 컬럼 값을 TTL/LRU로 보관합니다. 캐시에는 ORM 객체가 아닌 컬럼 값만 저장하고,
+요청마다 해당 요청의 세션에 붙인(merge) 객체를 돌려주므로 엔드포인트에서 수정/삭제해도 그대로 반영됩니다.
+
+비밀번호 변경/재설정, 계정 삭제, 개인정보 수정 시에는 invalidate()로 즉시 제거해야 합니다.
+- 워커 프로세스마다 별도 캐시이므로 invalidate()는 pub/sub 채널(USER_CACHE_CHANNEL)로 다른 워커에도 알립니다.
+- memory 백엔드는 다른 프로세스로 알리지 못하므로 USER_CACHE=auto(기본값)이면 WS_PUBSUB_BACKEND가
+  memory가 아닐 때만 캐시를 사용합니다. 워커 1개로 실행할 때만 USER_CACHE=on으로 켜세요.
+- pub/sub 허브에 다시 연결되면 끊긴 동안 놓친 무효화가 있을 수 있으므로 캐시를 모두 비웁니다.
+
+환경변수 설정 방법:
+   USER_CACHE=auto                  # auto(프로세스 간 pub/sub 백엔드일 때만 사용), on, off
+   USER_CACHE_TTL_SECONDS=60        # 캐시 유지 시간 (0이면 캐시 사용 안 함)
+   USER_CACHE_MAX_SIZE=10000        # 최대 보관 사용자 수 (초과 시 가장 오래 사용하지 않은 항목 제거)
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import inspect
+
+from app.services.pubsub import WS_PUBSUB_BACKEND
+
+# 환경변수 로드
+load_dotenv()
+
+USER_CACHE = os.getenv("USER_CACHE", "auto").lower()
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+# 워커 사이 사용자 캐시 무효화 채널 (메시지는 토큰 subject)
+USER_CACHE_CHANNEL = "user_cache"
+
+# 다른 워커에 무효화를 알리는 함수 (channel, message)
+PublishHandler = Callable[[str, str], None]
+
+
+class UserCache:
+    """토큰 subject별 사용자 컬럼 값 TTL/LRU 캐시"""
+
+    def __init__(self, ttl_seconds: float = USER_CACHE_TTL_SECONDS, max_size: int = USER_CACHE_MAX_SIZE,
+                 mode: str = USER_CACHE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.mode = mode
+        self.publish: Optional[PublishHandler] = None
+        # {subject: (만료 시각, 컬럼 값)}
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self.ttl_seconds <= 0 or self.max_size <= 0 or self.mode == "off":
+            return False
+        if self.mode == "auto":
+            # memory 백엔드는 다른 워커의 캐시를 무효화하지 못함
+            return WS_PUBSUB_BACKEND != "memory"
+        return True
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        """캐시된 컬럼 값 반환 (없거나 만료되면 None)"""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(subject)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[subject]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        return values
+
+    def set(self, subject: str, user):
+        """조회한 사용자의 컬럼 값 저장"""
+        if not self.enabled:
+            return
+        mapper = inspect(user).mapper
+        values = {attr.key: getattr(user, attr.key) for attr in mapper.column_attrs}
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, subject: str):
+        """사용자 정보가 바뀌었을 때 캐시에서 제거 (다른 워커에도 알림)"""
+        if self._entries.pop(subject, None) is not None:
+            self.invalidations += 1
+        if self.publish and self.enabled:
+            self.publish(USER_CACHE_CHANNEL, subject)
+
+    def on_remote_invalidation(self, message: str):
+        """다른 워커가 무효화한 사용자 제거 (pub/sub 채널 수신)"""
+        if self._entries.pop(message, None) is not None:
+            self.remote_invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "ttl_seconds": self.ttl_seconds,
+            "max_size": self.max_size,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "remote_invalidations": self.remote_invalidations,
+        }
+
+
+# 전역 사용자 캐시
+user_cache = UserCache()
@@ -0,0 +1,187 @@
+"""
+로깅 설정 모듈
+
+app.* 로거의 로그를 크기가 제한된 큐에 넣고 별도 스레드(QueueListener)가 stdout으로 출력합니다.
+요청 처리/이벤트 루프에서는 큐에 넣기만 하므로 stdout이 느려도 응답이 지연되지 않으며,
+큐가 가득 차면 로그를 버리고 버린 개수를 집계합니다.
+
+채팅 WebSocket 처리 로거(app.chat)의 DEBUG 로그는 메시지 형식별로 초당 LOG_HOT_PATH_RATE개까지만 남기고
+나머지는 건너뛴 개수(suppressed)만 다음 로그에 기록합니다.
+
+환경변수 설정 방법:
+   LOG_LEVEL=INFO                   # app.* 기본 로그 레벨
+   LOG_LEVELS=app.chat=DEBUG,app.services.email_service=WARNING   # 모듈별 로그 레벨 (쉼표로 구분)
+   LOG_FORMAT=json                  # json 또는 text
+   LOG_QUEUE_SIZE=10000             # 출력 대기 로그 수 (초과 시 버림)
+   LOG_HOT_PATH_RATE=10             # app.chat DEBUG 로그의 메시지 형식별 초당 최대 개수 (0이면 제한 없음)
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_HOT_PATH_RATE = float(os.getenv("LOG_HOT_PATH_RATE", "10"))
+
+# 애플리케이션 로거 최상위 이름과 채팅 처리 로거 이름
+APP_LOGGER = "app"
+CHAT_LOGGER = "app.chat"
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 JSON에 추가하기 위해 제외)
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄짜리 JSON 로그 (extra로 넘긴 필드 포함)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 로그를 버리는 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 출력 스레드로 넘기기 전에 메시지와 예외 내용을 문자열로 변환 (traceback은 exc_info 필드로 분리)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    DEBUG 로그를 메시지 형식(record.msg)별로 초당 rate개까지만 통과시키는 필터
+    건너뛴 개수는 같은 형식의 다음 로그에 suppressed 필드로 기록합니다.
+    """
+
+    def __init__(self, rate: float = LOG_HOT_PATH_RATE):
+        super().__init__()
+        self.rate = rate
+        self._lock = threading.Lock()
+        # {메시지 형식: (현재 구간 시작 시각, 구간 내 통과 개수, 건너뛴 개수)}
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno > logging.DEBUG:
+            return True
+
+        key = str(record.msg)
+        now = time.monotonic()
+        with self._lock:
+            started, passed, skipped = self._windows.get(key, (now, 0, 0))
+            if now - started >= 1.0:
+                started, passed = now, 0
+            if passed >= self.rate:
+                self._windows[key] = (started, passed, skipped + 1)
+                self.suppressed += 1
+                return False
+            self._windows[key] = (started, passed + 1, 0)
+        if skipped:
+            record.suppressed = skipped
+        return True
+
+
+class _LoggingState:
+    def __init__(self):
+        self.handler: Optional[NonBlockingQueueHandler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.rate_filter: Optional[RateLimitFilter] = None
+
+
+_state = _LoggingState()
+
+
+def _parse_levels(value: str) -> Dict[str, str]:
+    """'app.chat=DEBUG,app.services=WARNING' → {로거 이름: 레벨}"""
+    levels = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    """app.* 로거에 비동기 큐 핸들러 설정 (여러 번 호출해도 한 번만 적용)"""
+    if _state.listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _state.handler = NonBlockingQueueHandler(log_queue)
+    _state.listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _state.listener.start()
+    atexit.register(_state.listener.stop)
+
+    app_logger = logging.getLogger(APP_LOGGER)
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.addHandler(_state.handler)
+    # uvicorn 등이 root 로거에 설정한 핸들러로 중복 출력되지 않도록 함
+    app_logger.propagate = False
+
+    _state.rate_filter = RateLimitFilter()
+    logging.getLogger(CHAT_LOGGER).addFilter(_state.rate_filter)
+
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    """출력 대기 로그 수, 큐 초과로 버린 로그 수, 초당 제한으로 건너뛴 DEBUG 로그 수"""
+    handler = _state.handler
+    return {
+        "queued": handler.queue.qsize() if handler else 0,
+        "queue_size": LOG_QUEUE_SIZE,
+        "dropped": handler.dropped if handler else 0,
+        "suppressed_debug": _state.rate_filter.suppressed if _state.rate_filter else 0,
+        "hot_path_rate": LOG_HOT_PATH_RATE,
+    }
@@ -3,19 +3,25 @@
 """
 from fastapi import FastAPI, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.responses import Response
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func
+from sqlalchemy import func, select, update, delete, case
+import asyncio
 import json
+import logging
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Awaitable, Callable, List, Optional
 
 # 로컬 모듈 import
-from app.models.database import get_db, create_tables
+from app.models.database import get_db, get_async_db, get_async_session_factory, get_read_db, get_pool_stats, replica_router
+from app.models.migrations import check_pending_migrations
 from app.models.models import (
     User, EmailVerification, Subject, Timetable, TimetableSubject,
-    ChatRoom, ChatParticipant, ChatMessage, MessageReaction,
+    ChatRoom, ChatParticipant, ChatMessage,
     UserProfile, UserImage, Notification,
     Group, GroupMember, GroupPost, GroupPostComment, GroupGallery, GroupMeeting, GroupMeetingAttendee,
     MatchingRequest, FriendRelationship,
@@ -37,6 +43,7 @@ from app.models.schemas import (
     ChatParticipantResponse, WebSocketMessage, MessageReactionCreate, MessageReactionResponse,
     ChatRoomSettingsUpdate, ChatRoomSettingsResponse, ScheduledMessageCreate, ScheduledMessageResponse,
     UserOnlineStatusUpdate, UserOnlineStatusResponse, FileUploadResponse, MessageSearchResponse,
+    MessageSearchHit, RoomSearchResult, GlobalMessageSearchResponse,
     # 온보딩 관련 스키마
     UserProfileCreate, UserProfileUpdate, UserProfileResponse,
     OnboardingProgressResponse, ImageUploadResponse, UserImageResponse,
@@ -63,9 +70,28 @@ from app.models.schemas import (
 )
 from app.services.email_service import EmailService
 from app.services.image_service import ImageService
-from app.auth.security import generate_salt, hash_password_with_salt
-from app.auth.jwt_handler import create_access_token
-from app.auth.dependencies import authenticate_user, get_current_user
+from app.services.chat_service import ChatService
+from app.services.search_service import MessageSearchService
+from app.services.connection_manager import WS_REPLAY_DB_LIMIT, manager
+from app.services.message_writer import message_writer
+from app.services.message_cache import MESSAGE_CACHE_CHANNEL, message_cache
+from app.services.event_coalescer import event_coalescer
+from app.auth.security import PASSLIB_SALT, password_hasher
+from app.auth.jwt_handler import bearer_scheme, create_access_token
+from app.auth.dependencies import (
+    authenticate_user, get_current_user, load_revoked_tokens, require_debug_access, revoke_access_token, revoke_user_tokens,
+)
+from app.auth.user_cache import USER_CACHE_CHANNEL, user_cache
+from app.auth.token_cache import TOKEN_REVOCATION_CHANNEL, token_cache
+from app.monitoring.loop_monitor import LOOP_MONITOR_ENABLED, LoopBlockingMiddleware, loop_monitor
+from app.monitoring.query_stats import QUERY_STATS_ENABLED, QueryStatsMiddleware, query_budget
+from app.config.logging_config import CHAT_LOGGER, get_logging_stats, setup_logging
+
+# 로그는 큐에 넣고 별도 스레드에서 출력 (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT 환경변수로 설정)
+setup_logging()
+logger = logging.getLogger(__name__)
+# WebSocket 메시지 처리 로그 (DEBUG 로그는 초당 LOG_HOT_PATH_RATE개까지만 출력)
+chat_logger = logging.getLogger(CHAT_LOGGER)
 
 app = FastAPI(
     title="매칭 앱 API",
@@ -82,38 +108,161 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 이벤트 루프 블로킹 감지기 (LOOP_MONITOR_ENABLED=true일 때만 활성화)
+if LOOP_MONITOR_ENABLED:
+    app.add_middleware(LoopBlockingMiddleware)
+
+# 요청별 SQL 쿼리 수/DB 시간 집계 및 N+1 감지
+if QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
 # 정적 파일 서빙 (이미지 파일들)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# 앱 시작 시 테이블 생성
+# 앱 시작 시 스키마 버전 확인
+# 테이블 생성/변경은 배포 시 `python -m app.models.migrations`로 한 번만 실행합니다.
 @app.on_event("startup")
 async def startup_event():
+    if LOOP_MONITOR_ENABLED:
+        loop_monitor.install()
+    # 여러 워커 사이의 채팅방 브로드캐스트 중계 (WS_PUBSUB_BACKEND)
+    await manager.start()
+    # WebSocket 메시지 지연 저장 (WS_WRITE_BEHIND)
+    await message_writer.start(on_failed=report_failed_messages)
+    # 최근 메시지 캐시 변경을 다른 워커에 알리고 다른 워커의 변경은 캐시에서 제거 (MESSAGE_CACHE)
+    # 허브 재연결 시에는 끊긴 동안 놓친 무효화가 있을 수 있으므로 전체 캐시 제거
+    if message_cache.enabled:
+        message_cache.publish = manager.publish
+        manager.add_channel_handler(MESSAGE_CACHE_CHANNEL, message_cache.on_remote_change)
+        manager.add_reconnect_handler(message_cache.on_reconnect)
+    # 사용자 정보 변경 시 다른 워커의 인증 사용자 캐시도 제거 (USER_CACHE)
+    if user_cache.enabled:
+        user_cache.publish = manager.publish
+        manager.add_channel_handler(USER_CACHE_CHANNEL, user_cache.on_remote_invalidation)
+        manager.add_reconnect_handler(user_cache.clear)
+    # 로그아웃으로 폐기한 토큰을 다른 워커에 알리고 다른 워커의 폐기를 반영
+    # 허브 재연결 시에는 끊긴 동안 놓친 폐기가 있을 수 있으므로 revoked_tokens 테이블에서 다시 로드
+    token_cache.publish = manager.publish
+    manager.add_channel_handler(TOKEN_REVOCATION_CHANNEL, token_cache.on_remote_revocation)
+    manager.add_reconnect_handler(reload_revoked_tokens)
+    # typing 간격 제한과 입장/퇴장 요약 전송 (WS_TYPING_INTERVAL_MS, WS_PRESENCE_DIGEST_MS)
+    await event_coalescer.start()
+    try:
+        pending = await check_pending_migrations()
+        if pending:
+            logger.warning("적용되지 않은 마이그레이션이 있습니다: %s", pending)
+            logger.warning("배포 시 `python -m app.models.migrations`를 실행하세요.")
+    except Exception as e:
+        # DB 연결 실패 등은 앱 시작을 막지 않도록 경고만 출력
+        logger.warning("스키마 버전 확인 실패: %s", str(e)[:200])
+    await refresh_revoked_tokens()
+
+async def refresh_revoked_tokens():
+    """revoked_tokens 테이블의 폐기 목록을 토큰 캐시에 반영 (실패해도 앱 시작/재연결을 막지 않음)"""
     try:
-        create_tables()
-        # create_tables() 내부에서 이미 에러 처리를 하므로 여기서는 성공 메시지만 출력
+        await load_revoked_tokens()
     except Exception as e:
-        # create_tables()에서 처리하지 않은 에러만 여기서 처리
-        error_str = str(e)
-        if "FOREIGN KEY" not in error_str and "2003" not in error_str:
-            print(f"❌ 데이터베이스 초기화 에러: {e}")
-            import traceback
-            traceback.print_exc()
+        logger.warning("폐기된 토큰 로드 실패: %s", str(e)[:200])
+
+def reload_revoked_tokens():
+    """허브 재연결 후 폐기된 토큰 다시 로드 (pub/sub 재연결 handler)"""
+    asyncio.create_task(refresh_revoked_tokens())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await message_writer.close()
+    await event_coalescer.close()
+    await manager.close()
+
+async def report_failed_messages(messages: List[ChatMessage]):
+    """지연 저장에 실패한 메시지를 채팅방에 알림 (이미 브로드캐스트된 메시지를 클라이언트가 실패로 표시)"""
+    for message in messages:
+        message_cache.remove(message.room_id, message.message_id)
+        await manager.broadcast_to_room(json.dumps({
+            "type": "message_failed",
+            "room_id": message.room_id,
+            "message_id": message.message_id,
+            "sender_id": message.sender_id,
+            "message": "메시지 저장에 실패했습니다."
+        }), message.room_id)
 
 @app.get("/")
 async def root():
     """루트 엔드포인트"""
     return {"message": "매칭 앱 API에 오신 것을 환영합니다!"}
 
+# 진단 엔드포인트는 DEBUG_API_TOKEN을 설정하고 X-Debug-Token 헤더로 호출할 때만 응답합니다.
+@app.get("/debug/loop-blocking", dependencies=[Depends(require_debug_access)])
+async def get_loop_blocking_report(sort: str = "total_blocked_ms", limit: int = 50):
+    """라우트별 이벤트 루프 점유 리포트 (sort: total_blocked_ms, avg_blocked_ms, max_step_ms, stalls, requests)"""
+    if not LOOP_MONITOR_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이벤트 루프 블로킹 감지기가 비활성화되어 있습니다."
+        )
+    
+    report = loop_monitor.get_report(sort_by=sort, limit=limit)
+    
+    return {
+        "threshold_ms": loop_monitor.threshold_ms,
+        "sort": sort if sort in loop_monitor.SORT_KEYS else "total_blocked_ms",
+        "routes": report
+    }
+
+@app.post("/debug/loop-blocking/reset", dependencies=[Depends(require_debug_access)])
+async def reset_loop_blocking_report():
+    """라우트별 이벤트 루프 점유 통계 초기화"""
+    if not LOOP_MONITOR_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="이벤트 루프 블로킹 감지기가 비활성화되어 있습니다."
+        )
+    loop_monitor.reset()
+    return {"message": "이벤트 루프 점유 통계를 초기화했습니다."}
+
+@app.get("/debug/db-pool", dependencies=[Depends(require_debug_access)])
+async def get_db_pool_stats():
+    """커넥션 풀 상태 및 대여 대기 시간 통계"""
+    return {"pools": get_pool_stats(), "replica": replica_router.snapshot()}
+
+@app.get("/debug/websocket", dependencies=[Depends(require_debug_access)])
+async def get_websocket_stats():
+    """WebSocket 연결 수, 연결별 전송 큐 깊이, 수신자별 전달 지연, 메시지 지연 저장/일시적 이벤트 병합 통계"""
+    return {
+        **manager.snapshot(),
+        "write_behind": message_writer.snapshot(),
+        "ephemeral": event_coalescer.snapshot(),
+    }
+
+@app.get("/debug/logging", dependencies=[Depends(require_debug_access)])
+async def get_logging_queue_stats():
+    """로그 출력 큐 상태와 버리거나 건너뛴 로그 수"""
+    return get_logging_stats()
+
+@app.get("/debug/message-cache", dependencies=[Depends(require_debug_access)])
+async def get_message_cache_stats():
+    """채팅방 최근 메시지 캐시 적중률, 메모리 사용량, 제거/무효화 통계"""
+    return message_cache.snapshot()
+
+@app.get("/debug/auth-cache", dependencies=[Depends(require_debug_access)])
+async def get_auth_cache_stats():
+    """인증 사용자/토큰 캐시 적중률 및 비밀번호 해시 스레드 풀 통계"""
+    return {
+        "user_cache": user_cache.snapshot(),
+        "token_cache": token_cache.snapshot(),
+        "password_hasher": password_hasher.snapshot(),
+    }
+
 # =============================================================================
 # 이메일 인증 시스템
 # =============================================================================
 
 @app.post("/auth/request-email-verification")
-async def request_email_verification(request: EmailVerificationRequest, db: Session = Depends(get_db)):
+async def request_email_verification(request: EmailVerificationRequest, db: AsyncSession = Depends(get_async_db)):
     """회원가입을 위한 이메일 인증번호 발송"""
     try:
         # 이미 가입된 이메일인지 확인
-        existing_user = db.query(User).filter(User.email == request.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == request.email))
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -121,11 +270,11 @@ async def request_email_verification(request: EmailVerificationRequest, db: Sess
             )
         
         # 기존 미사용 인증번호가 있다면 삭제
-        db.query(EmailVerification).filter(
+        await db.execute(delete(EmailVerification).where(
             EmailVerification.email == request.email,
             EmailVerification.purpose == "email_verification",
             EmailVerification.is_used == False
-        ).delete()
+        ))
         
         # 새 인증번호 생성
         verification_code = EmailService.generate_verification_code()
@@ -139,7 +288,7 @@ async def request_email_verification(request: EmailVerificationRequest, db: Sess
             expires_at=expires_at
         )
         db.add(verification)
-        db.commit()
+        await db.commit()
         
         # 이메일 발송
         email_sent = await EmailService.send_verification_email(
@@ -162,26 +311,24 @@ async def request_email_verification(request: EmailVerificationRequest, db: Sess
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"이메일 인증번호 발송 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("이메일 인증번호 발송 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이메일 인증번호 발송 중 오류가 발생했습니다."
         )
 
 @app.post("/auth/verify-email")
-async def verify_email(request: EmailVerificationConfirm, db: Session = Depends(get_db)):
+async def verify_email(request: EmailVerificationConfirm, db: AsyncSession = Depends(get_async_db)):
     """이메일 인증번호 확인"""
     try:
         # 인증번호 조회
-        verification = db.query(EmailVerification).filter(
+        verification = await db.scalar(select(EmailVerification).where(
             EmailVerification.email == request.email,
             EmailVerification.verification_code == request.verification_code,
             EmailVerification.purpose == "email_verification",
             EmailVerification.is_used == False
-        ).first()
+        ))
         
         if not verification:
             raise HTTPException(
@@ -201,7 +348,7 @@ async def verify_email(request: EmailVerificationConfirm, db: Session = Depends(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"이메일 인증 확인 에러: {e}")
+        logger.error("이메일 인증 확인 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이메일 인증 확인 중 오류가 발생했습니다."
@@ -212,11 +359,11 @@ async def verify_email(request: EmailVerificationConfirm, db: Session = Depends(
 # =============================================================================
 
 @app.post("/auth/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user: UserCreateWithVerification, db: Session = Depends(get_db)):
+async def register(user: UserCreateWithVerification, db: AsyncSession = Depends(get_async_db)):
     """회원가입 (이메일 인증 필요)"""
     try:
         # 이메일 중복 검사
-        existing_user = db.query(User).filter(User.email == user.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == user.email))
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
@@ -224,12 +371,12 @@ async def register(user: UserCreateWithVerification, db: Session = Depends(get_d
             )
         
         # 이메일 인증번호 확인
-        verification = db.query(EmailVerification).filter(
+        verification = await db.scalar(select(EmailVerification).where(
             EmailVerification.email == user.email,
             EmailVerification.verification_code == user.verification_code,
             EmailVerification.purpose == "email_verification",
             EmailVerification.is_used == False
-        ).first()
+        ))
         
         if not verification:
             raise HTTPException(
@@ -244,15 +391,14 @@ async def register(user: UserCreateWithVerification, db: Session = Depends(get_d
                 detail="인증번호가 만료되었습니다. 이메일 인증을 다시 요청해주세요."
             )
         
-        # 비밀번호 해싱
-        salt = generate_salt()
-        hashed_password = hash_password_with_salt(user.password, salt)
+        # 비밀번호 해싱 (전용 스레드 풀에서 실행)
+        hashed_password = await password_hasher.hash(user.password)
         
         # 사용자 생성
         db_user = User(
             email=user.email,
             password_hash=hashed_password,
-            salt=salt,
+            salt=PASSLIB_SALT,
             name=user.name,
             birth_date=user.birth_date,
             gender=user.gender.value,
@@ -260,41 +406,41 @@ async def register(user: UserCreateWithVerification, db: Session = Depends(get_d
             phone_number=user.phone_number,
             terms_agreed=user.terms_agreed
         )
+        # 같은 이메일로 탈퇴 전에 발급된 토큰은 사용할 수 없도록 가입 시각 이전 토큰 거부
+        revoke_user_tokens(db_user)
         
         db.add(db_user)
         
         # 인증번호 사용 처리
         verification.is_used = True
         
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         
-        print(f"✅ 회원가입 성공: {user.email}")
+        logger.info("회원가입 성공: %s", user.email)
         return db_user
         
     except HTTPException:
         raise
     except IntegrityError as e:
-        db.rollback()
-        print(f"회원가입 DB 에러: {e}")
+        await db.rollback()
+        logger.error("회원가입 DB 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="이미 등록된 정보입니다."
         )
     except Exception as e:
-        db.rollback()
-        print(f"회원가입 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("회원가입 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"회원가입 중 오류가 발생했습니다: {e}"
         )
 
 @app.post("/auth/login", response_model=Token)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """로그인"""
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -306,11 +452,11 @@ async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     return {"access_token": access_token, "token_type": "bearer"}
 
 @app.get("/auth/me", response_model=UserMeResponse)
-async def read_users_me(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def read_users_me(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """현재 사용자 정보 조회 (확장됨)"""
     try:
         # 사용자 프로필 정보 조회
-        profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.user_id).first()
+        profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == current_user.user_id))
         
         # 응답 데이터 구성
         response_data = {
@@ -348,20 +494,22 @@ async def read_users_me(current_user: User = Depends(get_current_user), db: Sess
         return UserMeResponse(**response_data)
         
     except Exception as e:
-        print(f"사용자 정보 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("사용자 정보 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="사용자 정보 조회 중 오류가 발생했습니다."
         )
 
 @app.post("/auth/logout")
-async def logout(current_user: User = Depends(get_current_user)):
-    """로그아웃"""
+async def logout(
+    current_user: User = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """로그아웃 (사용한 토큰은 만료 시각까지 거부)"""
     try:
-        # JWT 토큰 기반에서는 클라이언트에서 토큰을 삭제하는 것이 일반적
-        # 서버에서는 로그아웃 성공 메시지만 반환
+        # 클라이언트에서 삭제하는 것만으로는 부족하므로 서버에서도 폐기 (revoked_tokens 테이블에 기록)
+        await revoke_access_token(db, credentials.credentials)
         return {
             "message": "성공적으로 로그아웃되었습니다.",
             "user_id": current_user.user_id,
@@ -369,16 +517,16 @@ async def logout(current_user: User = Depends(get_current_user)):
         }
         
     except Exception as e:
-        print(f"로그아웃 에러: {e}")
+        logger.error("로그아웃 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="로그아웃 중 오류가 발생했습니다."
         )
 
 @app.get("/users/{user_id}", response_model=UserResponse)
-async def read_user(user_id: int, db: Session = Depends(get_db)):
+async def read_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
     """특정 사용자 정보 조회"""
-    user = db.query(User).filter(User.user_id == user_id).first()
+    user = await db.scalar(select(User).where(User.user_id == user_id))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -391,15 +539,15 @@ async def read_user(user_id: int, db: Session = Depends(get_db)):
 # =============================================================================
 
 @app.post("/auth/find-user-id", response_model=FindUserIdResponse)
-async def find_user_id(request: FindUserIdRequest, db: Session = Depends(get_db)):
+async def find_user_id(request: FindUserIdRequest, db: AsyncSession = Depends(get_async_db)):
     """아이디(이메일) 찾기"""
     try:
         # 이름, 생년월일, 연락처로 사용자 조회
-        user = db.query(User).filter(
+        user = await db.scalar(select(User).where(
             User.name == request.name,
             User.birth_date == request.birth_date,
             User.phone_number == request.phone_number
-        ).first()
+        ))
         
         if not user:
             raise HTTPException(
@@ -416,7 +564,7 @@ async def find_user_id(request: FindUserIdRequest, db: Session = Depends(get_db)
     except HTTPException:
         raise
     except Exception as e:
-        print(f"아이디 찾기 에러: {e}")
+        logger.error("아이디 찾기 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="아이디 찾기 중 오류가 발생했습니다."
@@ -424,14 +572,14 @@ async def find_user_id(request: FindUserIdRequest, db: Session = Depends(get_db)
 
 # 비밀번호 찾기 관련 엔드포인트들
 @app.post("/auth/request-password-reset")
-async def request_password_reset(request: PasswordResetRequest, db: Session = Depends(get_db)):
+async def request_password_reset(request: PasswordResetRequest, db: AsyncSession = Depends(get_async_db)):
     """비밀번호 재설정 인증번호 발송"""
     try:
         # 사용자 존재 확인 (이메일과 이름 모두 일치해야 함)
-        user = db.query(User).filter(
+        user = await db.scalar(select(User).where(
             User.email == request.email,
             User.name == request.name
-        ).first()
+        ))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -439,11 +587,11 @@ async def request_password_reset(request: PasswordResetRequest, db: Session = De
             )
         
         # 기존 미사용 인증번호가 있다면 삭제
-        db.query(EmailVerification).filter(
+        await db.execute(delete(EmailVerification).where(
             EmailVerification.email == request.email,
             EmailVerification.purpose == "password_reset",
             EmailVerification.is_used == False
-        ).delete()
+        ))
         
         # 새 인증번호 생성
         verification_code = EmailService.generate_verification_code()
@@ -457,7 +605,7 @@ async def request_password_reset(request: PasswordResetRequest, db: Session = De
             expires_at=expires_at
         )
         db.add(verification)
-        db.commit()
+        await db.commit()
         
         # 이메일 발송
         email_sent = await EmailService.send_verification_email(
@@ -480,26 +628,24 @@ async def request_password_reset(request: PasswordResetRequest, db: Session = De
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"비밀번호 재설정 요청 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("비밀번호 재설정 요청 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="비밀번호 재설정 요청 중 오류가 발생했습니다."
         )
 
 @app.post("/auth/verify-reset-code")
-async def verify_reset_code(request: VerificationCodeRequest, db: Session = Depends(get_db)):
+async def verify_reset_code(request: VerificationCodeRequest, db: AsyncSession = Depends(get_async_db)):
     """비밀번호 재설정 인증번호 확인"""
     try:
         # 인증번호 조회
-        verification = db.query(EmailVerification).filter(
+        verification = await db.scalar(select(EmailVerification).where(
             EmailVerification.email == request.email,
             EmailVerification.verification_code == request.verification_code,
             EmailVerification.purpose == "password_reset",
             EmailVerification.is_used == False
-        ).first()
+        ))
         
         if not verification:
             raise HTTPException(
@@ -519,23 +665,23 @@ async def verify_reset_code(request: VerificationCodeRequest, db: Session = Depe
     except HTTPException:
         raise
     except Exception as e:
-        print(f"인증번호 확인 에러: {e}")
+        logger.error("인증번호 확인 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="인증번호 확인 중 오류가 발생했습니다."
         )
 
 @app.post("/auth/reset-password")
-async def reset_password(request: PasswordResetConfirm, db: Session = Depends(get_db)):
+async def reset_password(request: PasswordResetConfirm, db: AsyncSession = Depends(get_async_db)):
     """비밀번호 재설정"""
     try:
         # 인증번호 확인
-        verification = db.query(EmailVerification).filter(
+        verification = await db.scalar(select(EmailVerification).where(
             EmailVerification.email == request.email,
             EmailVerification.verification_code == request.verification_code,
             EmailVerification.purpose == "password_reset",
             EmailVerification.is_used == False
-        ).first()
+        ))
         
         if not verification:
             raise HTTPException(
@@ -551,7 +697,7 @@ async def reset_password(request: PasswordResetConfirm, db: Session = Depends(ge
             )
         
         # 사용자 조회
-        user = db.query(User).filter(User.email == request.email).first()
+        user = await db.scalar(select(User).where(User.email == request.email))
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -559,26 +705,25 @@ async def reset_password(request: PasswordResetConfirm, db: Session = Depends(ge
             )
         
         # 새 비밀번호로 업데이트
-        new_salt = generate_salt()
-        new_hashed_password = hash_password_with_salt(request.new_password, new_salt)
+        user.password_hash = await password_hasher.hash(request.new_password)
+        user.salt = PASSLIB_SALT
         
-        user.password_hash = new_hashed_password
-        user.salt = new_salt
+        # 비밀번호를 재설정하기 전에 발급된 토큰은 모두 폐기
+        revoke_user_tokens(user)
         
         # 인증번호 사용 처리
         verification.is_used = True
         
-        db.commit()
+        await db.commit()
+        user_cache.invalidate(user.email)
         
         return {"message": "비밀번호가 성공적으로 변경되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"비밀번호 재설정 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("비밀번호 재설정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="비밀번호 재설정 중 오류가 발생했습니다."
@@ -592,7 +737,7 @@ async def reset_password(request: PasswordResetConfirm, db: Session = Depends(ge
 async def create_subject(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새로운 과목을 생성합니다."""
     try:
@@ -602,8 +747,8 @@ async def create_subject(
         request_body = await request.body()
         request_data = json.loads(request_body.decode('utf-8'))
         
-        print(f"🔍 과목 생성 요청 데이터: {request_data}")
-        print(f"🔍 사용자 ID: {current_user.user_id}")
+        logger.debug("과목 생성 요청 데이터: %s", request_data)
+        logger.debug("사용자 ID: %s", current_user.user_id)
         
         # 수동으로 데이터 검증 및 처리
         subject_data = {
@@ -615,7 +760,7 @@ async def create_subject(
             'end_time': request_data.get('end_time', '')
         }
         
-        print(f"🔍 처리된 과목 데이터: {subject_data}")
+        logger.debug("처리된 과목 데이터: %s", subject_data)
         
         # 시간 형태 변환
         from datetime import time
@@ -627,14 +772,14 @@ async def create_subject(
         start_time = time.fromisoformat(start_time_str)
         end_time = time.fromisoformat(end_time_str)
         
-        print(f"🔍 변환된 시간: {start_time} - {end_time}")
+        logger.debug("변환된 시간: %s - %s", start_time, end_time)
         # 시간 겹침 검사
-        existing_subject = db.query(Subject).filter(
+        existing_subject = await db.scalar(select(Subject).where(
             Subject.user_id == current_user.user_id,
             Subject.day_of_week == subject_data['day_of_week'],
             Subject.start_time < end_time,
             Subject.end_time > start_time
-        ).first()
+        ))
         
         if existing_subject:
             raise HTTPException(
@@ -654,25 +799,23 @@ async def create_subject(
         )
         
         db.add(db_subject)
-        db.commit()
-        db.refresh(db_subject)
+        await db.commit()
+        await db.refresh(db_subject)
         
         return db_subject
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"과목 생성 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("과목 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="과목 생성 중 오류가 발생했습니다."
         )
 
 @app.get("/subjects/", response_model=list[SubjectResponse])
-async def get_subjects(
+def get_subjects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -681,16 +824,14 @@ async def get_subjects(
         subjects = db.query(Subject).filter(Subject.user_id == current_user.user_id).all()
         return subjects
     except Exception as e:
-        print(f"과목 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("과목 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="과목 조회 중 오류가 발생했습니다."
         )
 
 @app.get("/subjects/{subject_id}", response_model=SubjectResponse)
-async def get_subject(
+def get_subject(
     subject_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -712,16 +853,14 @@ async def get_subject(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"과목 상세 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("과목 상세 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="과목 조회 중 오류가 발생했습니다."
         )
 
 @app.put("/subjects/{subject_id}", response_model=SubjectResponse)
-async def update_subject(
+def update_subject(
     subject_id: int,
     subject_update: SubjectUpdate,
     current_user: User = Depends(get_current_user),
@@ -770,16 +909,14 @@ async def update_subject(
         raise
     except Exception as e:
         db.rollback()
-        print(f"과목 수정 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("과목 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="과목 수정 중 오류가 발생했습니다."
         )
 
 @app.delete("/subjects/{subject_id}")
-async def delete_subject(
+def delete_subject(
     subject_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -806,16 +943,14 @@ async def delete_subject(
         raise
     except Exception as e:
         db.rollback()
-        print(f"과목 삭제 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("과목 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="과목 삭제 중 오류가 발생했습니다."
         )
 
 @app.post("/timetables/", response_model=TimetableResponse, status_code=status.HTTP_201_CREATED)
-async def create_timetable(
+def create_timetable(
     timetable: TimetableCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -845,16 +980,14 @@ async def create_timetable(
         
     except Exception as e:
         db.rollback()
-        print(f"시간표 생성 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("시간표 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표 생성 중 오류가 발생했습니다."
         )
 
 @app.get("/timetables/", response_model=list[TimetableResponse])
-async def get_timetables(
+def get_timetables(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -865,16 +998,14 @@ async def get_timetables(
         ).order_by(Timetable.year.desc(), Timetable.semester.desc()).all()
         return timetables
     except Exception as e:
-        print(f"시간표 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("시간표 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표 조회 중 오류가 발생했습니다."
         )
 
 @app.get("/timetables/active", response_model=WeeklyTimetableResponse)
-async def get_active_timetable(
+def get_active_timetable(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -902,7 +1033,7 @@ async def get_active_timetable(
             db.refresh(default_timetable)
             
             timetable = default_timetable
-            print(f"✅ 사용자 {current_user.user_id}에게 기본 시간표 생성됨: ID={timetable.timetable_id}")
+            logger.info("사용자 %s에게 기본 시간표 생성됨: ID=%s", current_user.user_id, timetable.timetable_id)
         
         # 시간표에 연결된 과목들 조회
         timetable_subjects = db.query(TimetableSubject).filter(
@@ -948,16 +1079,14 @@ async def get_active_timetable(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"활성 시간표 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("활성 시간표 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표 조회 중 오류가 발생했습니다."
         )
 
 @app.post("/timetables/{timetable_id}/subjects/")
-async def add_subject_to_timetable(
+def add_subject_to_timetable(
     timetable_id: int,
     subject_data: TimetableSubjectCreate,
     current_user: User = Depends(get_current_user),
@@ -1016,16 +1145,14 @@ async def add_subject_to_timetable(
         raise
     except Exception as e:
         db.rollback()
-        print(f"시간표 과목 추가 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("시간표 과목 추가 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표에 과목 추가 중 오류가 발생했습니다."
         )
 
 @app.delete("/timetables/{timetable_id}/subjects/{subject_id}")
-async def remove_subject_from_timetable(
+def remove_subject_from_timetable(
     timetable_id: int,
     subject_id: int,
     current_user: User = Depends(get_current_user),
@@ -1066,9 +1193,7 @@ async def remove_subject_from_timetable(
         raise
     except Exception as e:
         db.rollback()
-        print(f"시간표 과목 제거 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("시간표 과목 제거 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표에서 과목 제거 중 오류가 발생했습니다."
@@ -1078,54 +1203,170 @@ async def remove_subject_from_timetable(
 # 채팅 시스템
 # =============================================================================
 
-# WebSocket 연결 관리자
-class ConnectionManager:
-    def __init__(self):
-        # 활성 연결: {room_id: {user_id: websocket}}
-        self.active_connections: Dict[int, Dict[int, WebSocket]] = {}
-    
-    async def connect(self, websocket: WebSocket, room_id: int, user_id: int):
-        await websocket.accept()
-        if room_id not in self.active_connections:
-            self.active_connections[room_id] = {}
-        self.active_connections[room_id][user_id] = websocket
-        print(f"🔗 사용자 {user_id}가 채팅방 {room_id}에 연결되었습니다.")
+# WebSocket message 이벤트 (실시간 전송과 재연결 시 재전송에서 공통 사용)
+def message_event(message: ChatMessage, sender_name: str, reply_to_message: Optional[dict]) -> dict:
+    return {
+        "type": "message",
+        "message_id": message.message_id,
+        "seq": message.seq,
+        "room_id": message.room_id,
+        "sender_id": message.sender_id,
+        "sender_name": sender_name,
+        "content": message.message_content,
+        "message_type": message.message_type,
+        "file_url": message.file_url,
+        "file_name": message.file_name,
+        "file_size": message.file_size,
+        "reply_to_message": reply_to_message,
+        "timestamp": message.created_at.isoformat()
+    }
+
+# 재연결 시 놓친 메시지 재전송
+async def replay_missed_messages(
+    session_factory: async_sessionmaker,
+    room_id: int,
+    last_seq: int,
+    send: Callable[[str], Awaitable[None]]
+):
+    """
+    last_seq 이후 메시지를 replay 이벤트 하나로 재전송합니다.
+    채팅방 재전송 버퍼에 그 구간이 모두 있으면 버퍼에서, 아니면 DB에서 순번 범위로 조회합니다.
+    DB 조회 중 도착한 실시간 메시지와 겹칠 수 있으므로 클라이언트는 seq로 중복을 제거해야 합니다.
+    has_more가 true이면 나머지는 메시지 조회 API로 가져와야 합니다.
+    """
+    buffered = manager.replay(room_id, last_seq)
+    if buffered is not None:
+        # 버퍼의 이벤트는 이미 JSON 문자열이므로 다시 변환하지 않고 이어 붙임
+        await send(
+            f'{{"type": "replay", "room_id": {room_id}, "source": "buffer", "has_more": false, '
+            f'"messages": [{", ".join(buffered)}]}}'
+        )
+        return
+
+    reply = aliased(ChatMessage)
+    reply_sender = aliased(User)
+    async with session_factory() as db:
+        rows = (await db.execute(
+            select(ChatMessage, User.name, reply.message_id, reply.message_content, reply_sender.name)
+            .outerjoin(User, User.user_id == ChatMessage.sender_id)
+            .outerjoin(reply, reply.message_id == ChatMessage.reply_to_message_id)
+            .outerjoin(reply_sender, reply_sender.user_id == reply.sender_id)
+            .where(
+                ChatMessage.room_id == room_id,
+                ChatMessage.seq > last_seq,
+                ChatMessage.is_deleted == False
+            )
+            .order_by(ChatMessage.seq)
+            .limit(WS_REPLAY_DB_LIMIT + 1)
+        )).all()
+
+    events = [
+        message_event(message, sender_name or "Unknown", {
+            "message_id": reply_id,
+            "content": (reply_content or "")[:100],
+            "sender_name": reply_sender_name or "Unknown"
+        } if reply_id else None)
+        for message, sender_name, reply_id, reply_content, reply_sender_name in rows[:WS_REPLAY_DB_LIMIT]
+    ]
+    await send(json.dumps({
+        "type": "replay",
+        "room_id": room_id,
+        "source": "db",
+        "has_more": len(rows) > WS_REPLAY_DB_LIMIT,
+        "messages": events
+    }))
+
+# 채팅방 이벤트 처리 (채팅방별 연결과 사용자별 연결에서 공통 사용)
+# WebSocket 연결은 오래 유지되므로 DB 세션은 작업 단위(메시지 저장, 답장 조회)마다 열고 바로 반환합니다.
+async def handle_chat_event(
+    session_factory: async_sessionmaker,
+    user: User,
+    room_id: int,
+    message_data: dict,
+    reply: Callable[[dict], Awaitable[None]]
+):
+    """message(저장 후 브로드캐스트)와 typing 이벤트를 처리합니다. reply는 보낸 사용자에게 응답하는 함수입니다."""
+    if message_data.get("type") == "message":
+        chat_logger.debug("메시지 처리 중: %s", message_data)
+        
+        # 메시지를 데이터베이스에 저장
+        try:
+            new_message = ChatMessage(
+                room_id=room_id,
+                sender_id=user.user_id,
+                message_content=message_data.get("content", ""),
+                message_type=message_data.get("message_type", "text"),
+                file_url=message_data.get("file_url"),
+                file_name=message_data.get("file_name"),
+                file_size=message_data.get("file_size"),
+                reply_to_message_id=message_data.get("reply_to_message_id")
+            )
+            if message_writer.enabled:
+                # 지연 저장: ID만 발급받아 바로 브로드캐스트하고 저장은 일괄 처리
+                await message_writer.submit(new_message)
+            else:
+                async with session_factory() as db:
+                    db.add(new_message)
+                    await ChatService.on_message_created(db, new_message)
+                    await db.commit()
+                    await db.refresh(new_message)
+            chat_logger.debug("메시지 저장 완료: %s", new_message.message_id)
+            event_coalescer.message_sent(room_id, user.user_id)
+        except Exception as db_error:
+            # 세션은 async with 종료 시 롤백 후 반환됨
+            chat_logger.error("데이터베이스 저장 에러: %s", db_error)
+            await reply({
+                "type": "error",
+                "room_id": room_id,
+                "message": "메시지 저장에 실패했습니다."
+            })
+            return
     
-    def disconnect(self, room_id: int, user_id: int):
-        if room_id in self.active_connections:
-            if user_id in self.active_connections[room_id]:
-                del self.active_connections[room_id][user_id]
-                print(f"❌ 사용자 {user_id}가 채팅방 {room_id}에서 연결 해제되었습니다.")
-                
-                # 방에 아무도 없으면 방 정보 삭제
-                if not self.active_connections[room_id]:
-                    del self.active_connections[room_id]
+        # 답장 메시지 정보 가져오기
+        reply_to_message = None
+        if new_message.reply_to_message_id:
+            async with session_factory() as db:
+                reply_msg = message_writer.get_pending(new_message.reply_to_message_id) or await db.scalar(select(ChatMessage).where(
+                    ChatMessage.message_id == new_message.reply_to_message_id
+                ))
+                if reply_msg:
+                    reply_sender = await db.scalar(select(User).where(User.user_id == reply_msg.sender_id))
+                    reply_to_message = {
+                        "message_id": reply_msg.message_id,
+                        "content": reply_msg.message_content[:100],
+                        "sender_name": reply_sender.name if reply_sender else "Unknown"
+                    }
     
-    async def send_personal_message(self, message: str, room_id: int, user_id: int):
-        if room_id in self.active_connections and user_id in self.active_connections[room_id]:
-            await self.active_connections[room_id][user_id].send_text(message)
+        # 최근 메시지 캐시 갱신 (브로드캐스트를 받은 클라이언트가 바로 첫 페이지를 조회해도 보이도록 먼저 반영)
+        if message_cache.enabled:
+            message_cache.add(ChatService.to_response(
+                new_message, user.name, reply_to_message["content"] if reply_to_message else None
+            ))
+        
+        # 실시간 브로드캐스트
+        try:
+            broadcast_message = message_event(new_message, user.name, reply_to_message)
+            await manager.broadcast_to_room(json.dumps(broadcast_message), room_id, seq=new_message.seq)
+            chat_logger.debug("메시지 브로드캐스트 완료")
+        except Exception as broadcast_error:
+            chat_logger.error("브로드캐스트 에러: %s", broadcast_error)
     
-    async def broadcast_to_room(self, message: str, room_id: int, exclude_user: int = None):
-        print(f"🔊 브로드캐스트 시작 - 방 {room_id}, 제외할 사용자: {exclude_user}")
-        print(f"📋 현재 활성 연결: {self.active_connections}")
-        
-        if room_id in self.active_connections:
-            print(f"📍 방 {room_id}의 연결된 사용자들: {list(self.active_connections[room_id].keys())}")
-            for user_id, websocket in self.active_connections[room_id].items():
-                if exclude_user is None or user_id != exclude_user:
-                    try:
-                        print(f"📤 사용자 {user_id}에게 메시지 전송 중...")
-                        await websocket.send_text(message)
-                        print(f"✅ 사용자 {user_id}에게 메시지 전송 완료")
-                    except Exception as e:
-                        print(f"❌ 메시지 전송 실패 (사용자 {user_id}): {e}")
-                else:
-                    print(f"⏭️ 사용자 {user_id} 제외됨")
-        else:
-            print(f"❌ 방 {room_id}이 활성 연결에 없음")
-
-# 전역 연결 관리자
-manager = ConnectionManager()
+    elif message_data.get("type") == "typing":
+        # 타이핑 상태 브로드캐스트 (사용자마다 WS_TYPING_INTERVAL_MS에 한 번)
+        if not event_coalescer.allow_typing(room_id, user.user_id):
+            return
+        try:
+            typing_message = {
+                "type": "typing",
+                "room_id": room_id,
+                "sender_id": user.user_id,
+                "sender_name": user.name,
+                "timestamp": datetime.now().isoformat()
+            }
+            await manager.broadcast_to_room(json.dumps(typing_message), room_id, user.user_id)
+            chat_logger.debug("타이핑 상태 브로드캐스트 완료")
+        except Exception as typing_error:
+            chat_logger.error("타이핑 브로드캐스트 에러: %s", typing_error)
 
 # WebSocket 엔드포인트
 @app.websocket("/ws/chat/{room_id}")
@@ -1133,191 +1374,278 @@ async def websocket_endpoint(
     websocket: WebSocket, 
     room_id: int,
     token: str,
-    db: Session = Depends(get_db)
+    session_factory: async_sessionmaker = Depends(get_async_session_factory),
+    last_seq: Optional[int] = None
 ):
+    """last_seq(마지막으로 받은 메시지 순번)를 지정하면 연결 직후 놓친 메시지를 replay 이벤트로 재전송합니다."""
     user = None  # user 변수 초기화
     try:
         # JWT 토큰으로 사용자 인증
         from app.auth.jwt_handler import verify_token_string
-        from app.auth.dependencies import get_user_by_email
+        from app.auth.dependencies import get_user_by_email, is_token_active
         
         token_data = verify_token_string(token)
         if not token_data or not token_data.email:
             await websocket.close(code=4001, reason="Invalid token")
             return
         
-        user = get_user_by_email(db, token_data.email)
+        # 인증/권한 확인이 끝나면 세션을 바로 반환 (연결 유지 중에는 DB 커넥션을 점유하지 않음)
+        async with session_factory() as db:
+            user = await get_user_by_email(db, token_data.email)
+            if user and not await is_token_active(db, user, token_data):
+                user = None
+            participant = None
+            if user:
+                # 채팅방 참여 권한 확인
+                participant = await db.scalar(select(ChatParticipant).where(
+                    ChatParticipant.room_id == room_id,
+                    ChatParticipant.user_id == user.user_id,
+                    ChatParticipant.is_active == True
+                ))
+        
         if not user:
             await websocket.close(code=4002, reason="User not found")
             return
         
-        # 채팅방 참여 권한 확인
-        participant = db.query(ChatParticipant).filter(
-            ChatParticipant.room_id == room_id,
-            ChatParticipant.user_id == user.user_id,
-            ChatParticipant.is_active == True
-        ).first()
-        
         if not participant:
             await websocket.close(code=4003, reason="Not authorized for this room")
             return
         
         # WebSocket 연결
         await manager.connect(websocket, room_id, user.user_id)
+
+        async def reply(payload: dict):
+            await manager.send_personal_message(json.dumps(payload), room_id, user.user_id)
         
-        # 입장 알림
-        join_message = {
-            "type": "join",
-            "room_id": room_id,
-            "sender_id": user.user_id,
-            "sender_name": user.name,
-            "content": f"{user.name}님이 입장하셨습니다.",
-            "timestamp": datetime.now().isoformat()
-        }
-        print(f"📢 입장 알림 전송 시도: {join_message}")
-        try:
-            await manager.broadcast_to_room(json.dumps(join_message), room_id, user.user_id)
-            print(f"✅ 입장 알림 전송 완료")
-        except Exception as broadcast_error:
-            print(f"❌ 입장 알림 전송 실패: {broadcast_error}")
+        # 재연결: 연결 등록 직후 재전송해야 버퍼 구간과 이후 실시간 메시지 사이에 빠지는 메시지가 없음
+        if last_seq is not None:
+            await replay_missed_messages(
+                session_factory, room_id, last_seq,
+                lambda message: manager.send_personal_message(message, room_id, user.user_id)
+            )
+        
+        # 입장 알림 (병합 사용 시 presence_digest로 모아서 전송)
+        if event_coalescer.presence_enabled:
+            event_coalescer.presence_changed(room_id, user.user_id, user.name, "online")
+        else:
+            join_message = {
+                "type": "join",
+                "room_id": room_id,
+                "sender_id": user.user_id,
+                "sender_name": user.name,
+                "content": f"{user.name}님이 입장하셨습니다.",
+                "timestamp": datetime.now().isoformat()
+            }
+            chat_logger.debug("입장 알림 전송 시도: %s", join_message)
+            try:
+                await manager.broadcast_to_room(json.dumps(join_message), room_id, user.user_id)
+                chat_logger.debug("입장 알림 전송 완료")
+            except Exception as broadcast_error:
+                chat_logger.error("입장 알림 전송 실패: %s", broadcast_error)
         
-        print(f"🔄 메시지 수신 루프 시작 - 사용자 {user.user_id}")
+        chat_logger.debug("메시지 수신 루프 시작 - 사용자 %s", user.user_id)
         while True:
             try:
                 # 메시지 수신 (타임아웃 없이 대기)
-                print(f"⏳ 메시지 대기 중... - 사용자 {user.user_id}")
+                chat_logger.debug("메시지 대기 중... - 사용자 %s", user.user_id)
                 data = await websocket.receive_text()
-                print(f"📨 받은 메시지: {data}")
+                chat_logger.debug("받은 메시지: %s", data)
                 
                 try:
                     message_data = json.loads(data)
                 except json.JSONDecodeError as e:
-                    print(f"❌ JSON 파싱 에러: {e}")
-                    await websocket.send_text(json.dumps({
+                    chat_logger.error("JSON 파싱 에러: %s", e)
+                    await manager.send_personal_message(json.dumps({
                         "type": "error",
                         "message": "잘못된 메시지 형식입니다."
-                    }))
+                    }), room_id, user.user_id)
                     continue
                 
                 if message_data.get("type") == "heartbeat":
                     # 하트비트 응답
-                    print(f"💓 하트비트 수신 - 사용자 {user.user_id}")
-                    await websocket.send_text(json.dumps({
+                    chat_logger.debug("하트비트 수신 - 사용자 %s", user.user_id)
+                    await manager.send_personal_message(json.dumps({
                         "type": "heartbeat_response",
                         "timestamp": datetime.now().isoformat()
-                    }))
+                    }), room_id, user.user_id)
                     continue
                 
-                elif message_data.get("type") == "message":
-                    print(f"💬 메시지 처리 중: {message_data}")
-                    
-                    # 메시지를 데이터베이스에 저장
-                    try:
-                        new_message = ChatMessage(
-                            room_id=room_id,
-                            sender_id=user.user_id,
-                            message_content=message_data.get("content", ""),
-                            message_type=message_data.get("message_type", "text"),
-                            file_url=message_data.get("file_url"),
-                            file_name=message_data.get("file_name"),
-                            file_size=message_data.get("file_size"),
-                            reply_to_message_id=message_data.get("reply_to_message_id")
-                        )
-                        db.add(new_message)
-                        db.commit()
-                        db.refresh(new_message)
-                        print(f"✅ 메시지 저장 완료: {new_message.message_id}")
-                    except Exception as db_error:
-                        print(f"❌ 데이터베이스 저장 에러: {db_error}")
-                        db.rollback()
-                        await websocket.send_text(json.dumps({
-                            "type": "error",
-                            "message": "메시지 저장에 실패했습니다."
-                        }))
-                        continue
-                
-                # 답장 메시지 정보 가져오기
-                reply_to_message = None
-                if new_message.reply_to_message_id:
-                    reply_msg = db.query(ChatMessage).filter(
-                        ChatMessage.message_id == new_message.reply_to_message_id
-                    ).first()
-                    if reply_msg:
-                        reply_sender = db.query(User).filter(User.user_id == reply_msg.sender_id).first()
-                        reply_to_message = {
-                            "message_id": reply_msg.message_id,
-                            "content": reply_msg.message_content[:100],
-                            "sender_name": reply_sender.name if reply_sender else "Unknown"
-                        }
-                
-                    # 실시간 브로드캐스트
-                    try:
-                        broadcast_message = {
-                            "type": "message",
-                            "message_id": new_message.message_id,
-                            "room_id": room_id,
-                            "sender_id": user.user_id,
-                            "sender_name": user.name,
-                            "content": new_message.message_content,
-                            "message_type": new_message.message_type,
-                            "file_url": new_message.file_url,
-                            "file_name": new_message.file_name,
-                            "file_size": new_message.file_size,
-                            "reply_to_message": reply_to_message,
-                            "timestamp": new_message.created_at.isoformat()
-                        }
-                        await manager.broadcast_to_room(json.dumps(broadcast_message), room_id)
-                        print(f"📢 메시지 브로드캐스트 완료")
-                    except Exception as broadcast_error:
-                        print(f"❌ 브로드캐스트 에러: {broadcast_error}")
-                
-                elif message_data.get("type") == "typing":
-                    # 타이핑 상태 브로드캐스트
-                    try:
-                        typing_message = {
-                            "type": "typing",
-                            "room_id": room_id,
-                            "sender_id": user.user_id,
-                            "sender_name": user.name,
-                            "timestamp": datetime.now().isoformat()
-                        }
-                        await manager.broadcast_to_room(json.dumps(typing_message), room_id, user.user_id)
-                        print(f"⌨️ 타이핑 상태 브로드캐스트 완료")
-                    except Exception as typing_error:
-                        print(f"❌ 타이핑 브로드캐스트 에러: {typing_error}")
+                elif message_data.get("type") in ("message", "typing"):
+                    await handle_chat_event(session_factory, user, room_id, message_data, reply)
                         
             except WebSocketDisconnect:
-                print("🔌 WebSocket 연결이 정상적으로 끊어졌습니다.")
-                break
+                # 연결 해제/퇴장 알림은 바깥에서 처리 (전송 태스크 정리)
+                chat_logger.info("WebSocket 연결이 정상적으로 끊어졌습니다.")
+                raise
             except Exception as message_error:
-                print(f"❌ 메시지 처리 에러: {message_error}")
-                import traceback
-                traceback.print_exc()
+                chat_logger.exception("메시지 처리 에러: %s", message_error)
                 # RuntimeError가 발생하면 연결이 끊어진 것이므로 루프 종료
                 if "Cannot call \"receive\" once a disconnect message has been received" in str(message_error):
-                    print("🔌 WebSocket 연결이 끊어져서 루프를 종료합니다.")
-                    break
+                    chat_logger.info("WebSocket 연결이 끊어져서 루프를 종료합니다.")
+                    raise WebSocketDisconnect()
                 # 다른 에러는 계속 진행
                 
     except WebSocketDisconnect:
         if user:  # user가 정의된 경우에만 실행
-            manager.disconnect(room_id, user.user_id)
-            # 퇴장 알림
-            leave_message = {
-                "type": "leave",
-                "room_id": room_id,
-                "sender_id": user.user_id,
-                "sender_name": user.name,
-                "content": f"{user.name}님이 퇴장하셨습니다.",
-                "timestamp": datetime.now().isoformat()
-            }
-            await manager.broadcast_to_room(json.dumps(leave_message), room_id)
+            manager.disconnect(room_id, user.user_id, websocket)
+            # 퇴장 알림 (병합 사용 시 presence_digest로 모아서 전송)
+            if event_coalescer.presence_enabled:
+                event_coalescer.presence_changed(room_id, user.user_id, user.name, "offline")
+            else:
+                leave_message = {
+                    "type": "leave",
+                    "room_id": room_id,
+                    "sender_id": user.user_id,
+                    "sender_name": user.name,
+                    "content": f"{user.name}님이 퇴장하셨습니다.",
+                    "timestamp": datetime.now().isoformat()
+                }
+                await manager.broadcast_to_room(json.dumps(leave_message), room_id)
     except Exception as e:
-        print(f"WebSocket 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        chat_logger.exception("WebSocket 에러: %s", e)
         if user:  # user가 정의된 경우에만 실행
-            manager.disconnect(room_id, user.user_id)
+            manager.disconnect(room_id, user.user_id, websocket)
+
+# 사용자별 WebSocket 엔드포인트 (참여 중인 모든 채팅방 + 알람)
+@app.websocket("/ws/user")
+async def user_websocket_endpoint(
+    websocket: WebSocket,
+    token: str,
+    session_factory: async_sessionmaker = Depends(get_async_session_factory)
+):
+    """
+    연결 하나로 참여 중인 모든 채팅방의 message/typing/presence/reaction 이벤트와 알람(notification)을 받습니다.
+    채팅방 이벤트에는 room_id가 포함되며, 보내는 메시지에도 room_id를 지정해야 합니다.
+    연결 후 참여한 채팅방은 {"type": "subscribe", "room_id": ...}로 추가합니다.
+    재연결 후 {"type": "resume", "room_id": ..., "last_seq": ...}를 보내면 놓친 메시지를 replay 이벤트로 재전송합니다.
+    """
+    user = None
+    try:
+        from app.auth.jwt_handler import verify_token_string
+        from app.auth.dependencies import get_user_by_email, is_token_active
+        
+        token_data = verify_token_string(token)
+        if not token_data or not token_data.email:
+            await websocket.close(code=4001, reason="Invalid token")
+            return
+        
+        async with session_factory() as db:
+            user = await get_user_by_email(db, token_data.email)
+            if user and not await is_token_active(db, user, token_data):
+                user = None
+            if user:
+                # 참여 중인 채팅방
+                room_ids = (await db.scalars(select(ChatParticipant.room_id).where(
+                    *ChatService.membership_filters(user.user_id)
+                ))).all()
+        
+        if not user:
+            await websocket.close(code=4002, reason="User not found")
+            return
+        
+        await manager.connect_user(websocket, user.user_id, room_ids)
+        
+        async def reply(payload: dict):
+            await manager.send_to_user(json.dumps(payload), user.user_id)
+        
+        await reply({
+            "type": "connected",
+            "room_ids": sorted(set(room_ids)),
+            "timestamp": datetime.now().isoformat()
+        })
+        await broadcast_presence(user, room_ids, "online")
+        
+        while True:
+            try:
+                data = await websocket.receive_text()
+                chat_logger.debug("사용자별 연결 메시지: %s", data)
+                
+                try:
+                    message_data = json.loads(data)
+                except json.JSONDecodeError as e:
+                    chat_logger.error("JSON 파싱 에러: %s", e)
+                    await reply({"type": "error", "message": "잘못된 메시지 형식입니다."})
+                    continue
+                
+                event_type = message_data.get("type")
+                if event_type == "heartbeat":
+                    await reply({"type": "heartbeat_response", "timestamp": datetime.now().isoformat()})
+                    continue
+                
+                room_id = message_data.get("room_id")
+                if not isinstance(room_id, int):
+                    await reply({"type": "error", "message": "room_id가 필요합니다."})
+                    continue
+                
+                if event_type == "subscribe":
+                    # 연결 후 새로 참여한 채팅방 구독 (연결 시 구독한 채팅방과 같은 참여 조건)
+                    async with session_factory() as db:
+                        participant = await db.scalar(select(ChatParticipant).where(
+                            ChatParticipant.room_id == room_id,
+                            *ChatService.membership_filters(user.user_id)
+                        ))
+                    if not participant:
+                        await reply({"type": "error", "room_id": room_id, "message": "채팅방에 참여하지 않았습니다."})
+                        continue
+                    manager.add_user_room(user.user_id, room_id)
+                    await reply({"type": "subscribed", "room_id": room_id})
+                
+                elif event_type == "resume":
+                    last_seq = message_data.get("last_seq")
+                    if not manager.is_user_subscribed(user.user_id, room_id) or not isinstance(last_seq, int):
+                        await reply({"type": "error", "room_id": room_id, "message": "재전송할 수 없는 채팅방입니다."})
+                        continue
+                    await replay_missed_messages(
+                        session_factory, room_id, last_seq,
+                        lambda message: manager.send_to_user(message, user.user_id)
+                    )
+                
+                elif event_type == "unsubscribe":
+                    manager.remove_user_room(user.user_id, room_id)
+                    await reply({"type": "unsubscribed", "room_id": room_id})
+                
+                elif event_type in ("message", "typing"):
+                    if not manager.is_user_subscribed(user.user_id, room_id):
+                        await reply({"type": "error", "room_id": room_id, "message": "구독하지 않은 채팅방입니다."})
+                        continue
+                    await handle_chat_event(session_factory, user, room_id, message_data, reply)
+            
+            except WebSocketDisconnect:
+                raise
+            except Exception as message_error:
+                chat_logger.exception("사용자별 연결 메시지 처리 에러: %s", message_error)
+                if "Cannot call \"receive\" once a disconnect message has been received" in str(message_error):
+                    raise WebSocketDisconnect()
+    
+    except WebSocketDisconnect:
+        if user:
+            room_ids = list(manager.user_rooms.get(user.user_id, ()))
+            manager.disconnect_user(user.user_id, websocket)
+            await broadcast_presence(user, room_ids, "offline")
+    except Exception as e:
+        chat_logger.exception("사용자별 WebSocket 에러: %s", e)
+        if user:
+            manager.disconnect_user(user.user_id, websocket)
+
+async def broadcast_presence(user: User, room_ids, status_value: str):
+    """
+    사용자별 연결의 접속/종료를 참여 중인 채팅방에 알림
+    병합을 사용하면 presence_digest로 모아서 보내고, 아니면 채팅방마다 presence 이벤트를 바로 보냅니다.
+    """
+    if event_coalescer.presence_enabled:
+        for room_id in room_ids:
+            event_coalescer.presence_changed(room_id, user.user_id, user.name, status_value)
+        return
+    timestamp = datetime.now().isoformat()
+    for room_id in room_ids:
+        await manager.broadcast_to_room(json.dumps({
+            "type": "presence",
+            "room_id": room_id,
+            "user_id": user.user_id,
+            "sender_name": user.name,
+            "status": status_value,
+            "timestamp": timestamp
+        }), room_id, user.user_id)
 
 # =============================================================================
 # 채팅 REST API 엔드포인트
@@ -1327,7 +1655,7 @@ async def websocket_endpoint(
 async def create_chat_room(
     room_data: ChatRoomCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새로운 채팅방을 생성합니다."""
     try:
@@ -1338,8 +1666,8 @@ async def create_chat_room(
             created_by=current_user.user_id
         )
         db.add(new_room)
-        db.commit()
-        db.refresh(new_room)
+        await db.commit()
+        await db.refresh(new_room)
         
         # 생성자를 참여자로 추가
         creator_participant = ChatParticipant(
@@ -1357,7 +1685,7 @@ async def create_chat_room(
                 )
                 db.add(participant)
         
-        db.commit()
+        await db.commit()
         
         return ChatRoomResponse(
             room_id=new_room.room_id,
@@ -1371,62 +1699,45 @@ async def create_chat_room(
         )
         
     except Exception as e:
-        db.rollback()
-        print(f"채팅방 생성 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("채팅방 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 생성 중 오류가 발생했습니다."
         )
 
 @app.get("/chat/rooms/", response_model=ChatRoomListResponse)
+@query_budget(2)
 async def get_chat_rooms(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자가 참여 중인 채팅방 목록을 조회합니다."""
     try:
-        # 사용자가 참여 중인 채팅방들 조회
-        user_rooms = db.query(ChatRoom).join(ChatParticipant).filter(
-            ChatParticipant.user_id == current_user.user_id,
-            ChatParticipant.is_active == True,
-            ChatRoom.is_active == True
-        ).order_by(ChatRoom.updated_at.desc()).all()
+        # 마지막 메시지와 읽지 않은 메시지 수는 chat_rooms/chat_participants에 저장된 값을 사용하고
+        # 참여자 수만 상관 서브쿼리로 함께 조회 (방마다 쿼리를 보내지 않도록 하나의 쿼리로 구성)
+        my_participant = aliased(ChatParticipant)
+        room_participant = aliased(ChatParticipant)
+        
+        participant_count = select(func.count()).select_from(room_participant).where(
+            room_participant.room_id == ChatRoom.room_id,
+            room_participant.is_active == True
+        ).scalar_subquery()
+        
+        rows = (await db.execute(
+            select(
+                ChatRoom,
+                participant_count.label("participant_count"),
+                my_participant.unread_count
+            ).join(my_participant, my_participant.room_id == ChatRoom.room_id).where(
+                my_participant.user_id == current_user.user_id,
+                my_participant.is_active == True,
+                ChatRoom.is_active == True
+            ).order_by(ChatRoom.updated_at.desc())
+        )).all()
         
         rooms_response = []
-        for room in user_rooms:
-            # 참여자 수 계산
-            participant_count = db.query(ChatParticipant).filter(
-                ChatParticipant.room_id == room.room_id,
-                ChatParticipant.is_active == True
-            ).count()
-            
-            # 마지막 메시지 조회
-            last_message = db.query(ChatMessage).filter(
-                ChatMessage.room_id == room.room_id,
-                ChatMessage.is_deleted == False
-            ).order_by(ChatMessage.created_at.desc()).first()
-            
-            # 읽지 않은 메시지 수 계산
-            user_participant = db.query(ChatParticipant).filter(
-                ChatParticipant.room_id == room.room_id,
-                ChatParticipant.user_id == current_user.user_id
-            ).first()
-            
-            unread_count = 0
-            if user_participant and user_participant.last_read_at:
-                unread_count = db.query(ChatMessage).filter(
-                    ChatMessage.room_id == room.room_id,
-                    ChatMessage.created_at > user_participant.last_read_at,
-                    ChatMessage.is_deleted == False
-                ).count()
-            else:
-                unread_count = db.query(ChatMessage).filter(
-                    ChatMessage.room_id == room.room_id,
-                    ChatMessage.is_deleted == False
-                ).count()
-            
+        for room, room_participant_count, room_unread_count in rows:
             room_response = ChatRoomResponse(
                 room_id=room.room_id,
                 room_name=room.room_name,
@@ -1435,9 +1746,9 @@ async def get_chat_rooms(
                 is_active=room.is_active,
                 created_at=room.created_at,
                 updated_at=room.updated_at,
-                participant_count=participant_count,
-                last_message=last_message.message_content if last_message else None,
-                unread_count=unread_count
+                participant_count=room_participant_count or 0,
+                last_message=room.last_message_preview,
+                unread_count=room_unread_count or 0
             )
             rooms_response.append(room_response)
         
@@ -1447,30 +1758,76 @@ async def get_chat_rooms(
         )
         
     except Exception as e:
-        print(f"채팅방 목록 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("채팅방 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 목록 조회 중 오류가 발생했습니다."
         )
 
+@app.get("/chat/unread-count/")
+@query_budget(2)
+async def get_total_unread_count(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """참여 중인 모든 채팅방의 읽지 않은 메시지 수 합계 (앱 배지용)"""
+    try:
+        total_unread, rooms_with_unread = (await db.execute(
+            select(
+                func.coalesce(func.sum(ChatParticipant.unread_count), 0),
+                func.count(case((ChatParticipant.unread_count > 0, 1)))
+            ).join(ChatRoom, ChatRoom.room_id == ChatParticipant.room_id).where(
+                ChatParticipant.user_id == current_user.user_id,
+                ChatParticipant.is_active == True,
+                ChatRoom.is_active == True
+            )
+        )).one()
+        
+        return {
+            "total_unread_count": int(total_unread),
+            "rooms_with_unread": rooms_with_unread
+        }
+        
+    except Exception as e:
+        logger.error("읽지 않은 메시지 수 조회 에러: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="읽지 않은 메시지 수 조회 중 오류가 발생했습니다."
+        )
+
 @app.get("/chat/rooms/{room_id}/messages/", response_model=ChatMessageListResponse)
+@query_budget(8)
 async def get_chat_messages(
     room_id: int,
     page: int = 1,
     size: int = 50,
+    before_message_id: Optional[int] = None,
+    after_message_id: Optional[int] = None,
+    include_total: Optional[bool] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_read_db)
 ):
-    """채팅방의 메시지 목록을 조회합니다."""
+    """
+    채팅방의 메시지 목록을 조회합니다.
+    before_message_id/after_message_id를 지정하면 해당 메시지 기준 커서 방식으로 조회합니다.
+    (include_total을 지정하지 않으면 커서 방식에서는 전체 개수를 세지 않습니다.)
+    커서 없는 첫 페이지(size가 MESSAGE_CACHE_SIZE 이하)는 최근 메시지 캐시에서 응답합니다.
+    """
     try:
+        if before_message_id is not None and after_message_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="before_message_id와 after_message_id는 함께 사용할 수 없습니다."
+            )
+        
+
         # 채팅방 참여 권한 확인
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == room_id,
             ChatParticipant.user_id == current_user.user_id,
             ChatParticipant.is_active == True
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -1478,83 +1835,66 @@ async def get_chat_messages(
                 detail="이 채팅방에 접근할 권한이 없습니다."
             )
         
-        # 메시지 조회 (페이지네이션)
-        offset = (page - 1) * size
-        messages_query = db.query(ChatMessage).filter(
+        # 메시지 조회 (페이지네이션, 읽기 전용 복제본 사용)
+        messages_filter = (
             ChatMessage.room_id == room_id,
             ChatMessage.is_deleted == False
-        ).order_by(ChatMessage.created_at.desc())
+        )
         
-        total_count = messages_query.count()
-        messages = messages_query.offset(offset).limit(size).all()
+        cursor_mode = before_message_id is not None or after_message_id is not None
+        if include_total is None:
+            include_total = not cursor_mode
         
-        # 메시지 응답 생성
-        messages_response = []
-        for message in reversed(messages):  # 시간 순으로 정렬
-            sender = db.query(User).filter(User.user_id == message.sender_id).first()
-            
-            # 답장 메시지 정보 가져오기
-            reply_to_message = None
-            if message.reply_to_message_id:
-                reply_msg = db.query(ChatMessage).filter(
-                    ChatMessage.message_id == message.reply_to_message_id
-                ).first()
-                reply_to_message = reply_msg.message_content[:100] if reply_msg else None
+        # 첫 페이지는 최근 메시지 캐시에서 응답 (읽음 처리는 캐시와 관계없이 실행)
+        use_cache = message_cache.cacheable(page, size, cursor_mode)
+        if use_cache:
+            cached_page = message_cache.get_page(room_id, size, include_total)
+            if cached_page is not None:
+                ChatService.mark_read(participant)
+                await db.commit()
+                return Response(content=cached_page, media_type="application/json")
+            # 캐시를 채울 때는 복제 지연으로 빠진 메시지가 캐시에 남지 않도록 primary에서 조회
+            read_db = db
+            cache_version = message_cache.begin_fill(room_id)
+        
+        try:
+            total_count = None
+            if include_total:
+                total_count = await read_db.scalar(select(func.count()).select_from(ChatMessage).where(*messages_filter))
             
-            # 반응 정보 가져오기
-            reactions = db.query(MessageReaction).filter(
-                MessageReaction.message_id == message.message_id
-            ).all()
+            messages, has_more = await ChatService.fetch_message_page(
+                read_db, messages_filter, message_cache.size if use_cache else size, page=page,
+                before_message_id=before_message_id, after_message_id=after_message_id
+            )
             
-            reactions_response = []
-            for reaction in reactions:
-                reaction_user = db.query(User).filter(User.user_id == reaction.user_id).first()
-                reactions_response.append(MessageReactionResponse(
-                    reaction_id=reaction.reaction_id,
-                    message_id=reaction.message_id,
-                    user_id=reaction.user_id,
-                    user_name=reaction_user.name if reaction_user else "Unknown",
-                    emoji=reaction.emoji,
-                    created_at=reaction.created_at
-                ))
+            # 메시지 응답 생성 (시간 순으로 정렬)
+            messages_response = await ChatService.serialize_messages(read_db, list(reversed(messages)))
             
-            message_response = ChatMessageResponse(
-                message_id=message.message_id,
-                room_id=message.room_id,
-                sender_id=message.sender_id,
-                sender_name=sender.name if sender else "Unknown",
-                message_content=message.message_content,
-                message_type=message.message_type,
-                file_url=message.file_url,
-                file_name=message.file_name,
-                file_size=message.file_size,
-                reply_to_message_id=message.reply_to_message_id,
-                reply_to_message=reply_to_message,
-                is_edited=message.is_edited,
-                is_deleted=message.is_deleted,
-                edited_at=message.edited_at,
-                reactions=reactions_response,
-                created_at=message.created_at,
-                updated_at=message.updated_at
-            )
-            messages_response.append(message_response)
+            if use_cache:
+                # 지연 저장 대기 중인 메시지는 DB에 없으므로 저장된 뒤에 채움
+                known_total = total_count if total_count is not None else (None if has_more else len(messages))
+                if known_total is not None and not message_writer.has_pending(room_id):
+                    message_cache.fill(room_id, cache_version, messages_response, known_total)
+                has_more = has_more or len(messages_response) > size
+                messages_response = messages_response[-size:] if size > 0 else []
+        finally:
+            if use_cache:
+                message_cache.end_fill(room_id)
         
         # 읽음 상태 업데이트
-        participant.last_read_at = datetime.now()
-        db.commit()
+        ChatService.mark_read(participant)
+        await db.commit()
         
         return ChatMessageListResponse(
             messages=messages_response,
             total_count=total_count,
-            has_more=total_count > page * size
+            has_more=has_more
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"채팅 메시지 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("채팅 메시지 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅 메시지 조회 중 오류가 발생했습니다."
@@ -1565,7 +1905,7 @@ async def get_chat_messages(
 # =============================================================================
 
 @app.get("/api/users/{user_id}/onboarding/progress", response_model=OnboardingProgressResponse)
-async def get_onboarding_progress(
+def get_onboarding_progress(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1600,16 +1940,14 @@ async def get_onboarding_progress(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"온보딩 진행상황 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("온보딩 진행상황 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 진행상황 조회 중 오류가 발생했습니다."
         )
 
 @app.put("/api/users/{user_id}/onboarding", response_model=UserProfileResponse)
-async def save_onboarding_data(
+def save_onboarding_data(
     user_id: int,
     profile_data: UserProfileCreate,
     current_user: User = Depends(get_current_user),
@@ -1693,9 +2031,7 @@ async def save_onboarding_data(
         raise
     except Exception as e:
         db.rollback()
-        print(f"온보딩 데이터 저장 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("온보딩 데이터 저장 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 데이터 저장 중 오류가 발생했습니다."
@@ -1706,7 +2042,7 @@ async def upload_profile_images(
     user_id: int,
     images: List[UploadFile] = File(...),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """프로필 이미지 업로드"""
     try:
@@ -1718,7 +2054,7 @@ async def upload_profile_images(
             )
         
         # 기존 이미지 개수 확인
-        existing_count = db.query(UserImage).filter(UserImage.user_id == user_id).count()
+        existing_count = await db.scalar(select(func.count()).select_from(UserImage).where(UserImage.user_id == user_id))
         
         if existing_count + len(images) > 6:
             raise HTTPException(
@@ -1746,11 +2082,11 @@ async def upload_profile_images(
             db.add(db_image)
             db_images.append(db_image)
         
-        db.commit()
+        await db.commit()
         
         # 응답 생성
         for db_image in db_images:
-            db.refresh(db_image)
+            await db.refresh(db_image)
         
         return ImageUploadResponse(
             message=f"{len(saved_images)}개의 이미지가 성공적으로 업로드되었습니다.",
@@ -1761,10 +2097,8 @@ async def upload_profile_images(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"이미지 업로드 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("이미지 업로드 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 업로드 중 오류가 발생했습니다."
@@ -1775,7 +2109,7 @@ async def delete_profile_image(
     user_id: int,
     image_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """프로필 이미지 삭제"""
     try:
@@ -1787,10 +2121,10 @@ async def delete_profile_image(
             )
         
         # 이미지 조회
-        image = db.query(UserImage).filter(
+        image = await db.scalar(select(UserImage).where(
             UserImage.image_id == image_id,
             UserImage.user_id == user_id
-        ).first()
+        ))
         
         if not image:
             raise HTTPException(
@@ -1802,36 +2136,34 @@ async def delete_profile_image(
         await ImageService.delete_image(image.image_url)
         
         # 데이터베이스에서 삭제
-        db.delete(image)
+        await db.delete(image)
         
         # 대표 이미지였다면 다른 이미지를 대표로 설정
         if image.is_primary:
-            next_image = db.query(UserImage).filter(
+            next_image = await db.scalar(select(UserImage).where(
                 UserImage.user_id == user_id,
                 UserImage.image_id != image_id
-            ).order_by(UserImage.upload_order).first()
+            ).order_by(UserImage.upload_order))
             
             if next_image:
                 next_image.is_primary = True
         
-        db.commit()
+        await db.commit()
         
         return {"message": "이미지가 성공적으로 삭제되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"이미지 삭제 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("이미지 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 삭제 중 오류가 발생했습니다."
         )
 
 @app.put("/api/users/{user_id}/images/{image_id}/primary")
-async def set_primary_image(
+def set_primary_image(
     user_id: int,
     image_id: int,
     current_user: User = Depends(get_current_user),
@@ -1898,16 +2230,14 @@ async def set_primary_image(
         raise
     except Exception as e:
         db.rollback()
-        print(f"대표 이미지 설정 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("대표 이미지 설정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="대표 이미지 설정 중 오류가 발생했습니다."
         )
 
 @app.post("/api/users/{user_id}/onboarding/complete", response_model=OnboardingCompleteResponse)
-async def complete_onboarding(
+def complete_onboarding(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -1973,16 +2303,14 @@ async def complete_onboarding(
         raise
     except Exception as e:
         db.rollback()
-        print(f"온보딩 완료 처리 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("온보딩 완료 처리 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 완료 처리 중 오류가 발생했습니다."
         )
 
 @app.get("/api/users/{user_id}/profile", response_model=UserProfileResponse)
-async def get_user_profile(
+def get_user_profile(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -2035,9 +2363,7 @@ async def get_user_profile(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"프로필 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("프로필 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="프로필 조회 중 오류가 발생했습니다."
@@ -2051,7 +2377,7 @@ async def get_user_profile(
 async def update_user_profile(
     profile_update: UserProfileUpdateRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자 개인정보 수정 (이름)"""
     try:
@@ -2063,11 +2389,14 @@ async def update_user_profile(
             )
         
         # 사용자 이름 업데이트
-        db.query(User).filter(User.user_id == current_user.user_id).update({"name": profile_update.name})
-        db.commit()
+        await db.execute(update(User).where(User.user_id == current_user.user_id).values(name=profile_update.name))
+        await db.commit()
+        user_cache.invalidate(current_user.email)
+        # 캐시된 메시지의 보낸 사람/반응한 사용자 이름이 바뀜
+        message_cache.clear()
         
         # 업데이트된 사용자 정보 조회
-        updated_user = db.query(User).filter(User.user_id == current_user.user_id).first()
+        updated_user = await db.scalar(select(User).where(User.user_id == current_user.user_id))
         
         return {
             "message": "이름이 성공적으로 수정되었습니다.",
@@ -2082,10 +2411,8 @@ async def update_user_profile(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"개인정보 수정 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("개인정보 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="개인정보 수정 중 오류가 발생했습니다."
@@ -2096,7 +2423,7 @@ async def update_user_profile(
 # =============================================================================
 
 @app.get("/api/users/onboarding/profile")
-async def get_onboarding_profile(
+def get_onboarding_profile(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -2131,16 +2458,14 @@ async def get_onboarding_profile(
         }
         
     except Exception as e:
-        print(f"온보딩 프로필 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("온보딩 프로필 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 프로필 조회 중 오류가 발생했습니다."
         )
 
 @app.get("/api/users/{user_id}/onboarding/profile")
-async def get_user_onboarding_profile(
+def get_user_onboarding_profile(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -2185,9 +2510,7 @@ async def get_user_onboarding_profile(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"온보딩 프로필 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("온보딩 프로필 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 프로필 조회 중 오류가 발생했습니다."
@@ -2197,7 +2520,7 @@ async def get_user_onboarding_profile(
 async def update_onboarding_profile(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """온보딩 프로필 정보 저장/수정"""
     try:
@@ -2207,8 +2530,8 @@ async def update_onboarding_profile(
         request_body = await request.body()
         request_data = json.loads(request_body.decode('utf-8'))
         
-        print(f"🔍 원시 요청 데이터: {request_data}")
-        print(f"🔍 사용자 ID: {current_user.user_id}")
+        logger.debug("원시 요청 데이터: %s", request_data)
+        logger.debug("사용자 ID: %s", current_user.user_id)
         
         # 수동으로 데이터 검증 및 처리
         profile_data = {
@@ -2224,10 +2547,10 @@ async def update_onboarding_profile(
             'friend_style_keywords': request_data.get('friend_style_keywords', [])
         }
         
-        print(f"🔍 처리된 프로필 데이터: {profile_data}")
+        logger.debug("처리된 프로필 데이터: %s", profile_data)
         
         # 기존 프로필 조회
-        existing_profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.user_id).first()
+        existing_profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == current_user.user_id))
         
         if existing_profile:
             # 기존 프로필 업데이트
@@ -2265,8 +2588,8 @@ async def update_onboarding_profile(
             )
             db.add(profile)
         
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
         
         return {
             "message": "온보딩 프로필이 성공적으로 저장되었습니다.",
@@ -2287,10 +2610,8 @@ async def update_onboarding_profile(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"프로필 수정 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("프로필 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="프로필 수정 중 오류가 발생했습니다."
@@ -2300,12 +2621,12 @@ async def update_onboarding_profile(
 async def update_onboarding_profile(
     profile_data: UserProfileCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """온보딩 프로필 정보 저장 (프론트엔드 요청에 맞춤)"""
     try:
         # 기존 프로필 조회
-        profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.user_id).first()
+        profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == current_user.user_id))
         
         if profile:
             # 기존 프로필 업데이트
@@ -2344,8 +2665,8 @@ async def update_onboarding_profile(
             )
             db.add(profile)
         
-        db.commit()
-        db.refresh(profile)
+        await db.commit()
+        await db.refresh(profile)
         
         return {
             "message": "온보딩 프로필 정보가 성공적으로 저장되었습니다.",
@@ -2365,10 +2686,8 @@ async def update_onboarding_profile(
         }
         
     except Exception as e:
-        db.rollback()
-        print(f"온보딩 프로필 저장 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("온보딩 프로필 저장 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온보딩 프로필 저장 중 오류가 발생했습니다."
@@ -2384,29 +2703,31 @@ async def get_notifications(
     size: int = 20,
     unread_only: bool = False,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자의 알람 목록을 조회합니다."""
     try:
         # 기본 쿼리
-        query = db.query(Notification).filter(Notification.user_id == current_user.user_id)
+        query = select(Notification).where(Notification.user_id == current_user.user_id)
         
         # 읽지 않은 알람만 조회
         if unread_only:
-            query = query.filter(Notification.is_read == False)
+            query = query.where(Notification.is_read == False)
         
         # 전체 개수 조회
-        total_count = query.count()
+        total_count = await db.scalar(select(func.count()).select_from(query.subquery()))
         
         # 읽지 않은 알람 개수 조회
-        unread_count = db.query(Notification).filter(
+        unread_count = await db.scalar(select(func.count()).select_from(Notification).where(
             Notification.user_id == current_user.user_id,
             Notification.is_read == False
-        ).count()
+        ))
         
         # 페이지네이션
         offset = (page - 1) * size
-        notifications = query.order_by(Notification.created_at.desc()).offset(offset).limit(size).all()
+        notifications = (await db.scalars(
+            query.order_by(Notification.created_at.desc()).offset(offset).limit(size)
+        )).all()
         
         return NotificationListResponse(
             notifications=notifications,
@@ -2415,9 +2736,7 @@ async def get_notifications(
         )
         
     except Exception as e:
-        print(f"알람 목록 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("알람 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="알람 목록 조회 중 오류가 발생했습니다."
@@ -2426,28 +2745,28 @@ async def get_notifications(
 @app.get("/notifications/stats", response_model=NotificationStatsResponse)
 async def get_notification_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자의 알람 통계를 조회합니다."""
     try:
         # 전체 알람 수
-        total_count = db.query(Notification).filter(
+        total_count = await db.scalar(select(func.count()).select_from(Notification).where(
             Notification.user_id == current_user.user_id
-        ).count()
+        ))
         
         # 읽지 않은 알람 수
-        unread_count = db.query(Notification).filter(
+        unread_count = await db.scalar(select(func.count()).select_from(Notification).where(
             Notification.user_id == current_user.user_id,
             Notification.is_read == False
-        ).count()
+        ))
         
         # 타입별 알람 수
         type_counts = {}
         for notification_type in NotificationTypeEnum:
-            count = db.query(Notification).filter(
+            count = await db.scalar(select(func.count()).select_from(Notification).where(
                 Notification.user_id == current_user.user_id,
                 Notification.notification_type == notification_type.value
-            ).count()
+            ))
             type_counts[notification_type.value] = count
         
         return NotificationStatsResponse(
@@ -2457,9 +2776,7 @@ async def get_notification_stats(
         )
         
     except Exception as e:
-        print(f"알람 통계 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("알람 통계 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="알람 통계 조회 중 오류가 발생했습니다."
@@ -2469,21 +2786,22 @@ async def get_notification_stats(
 async def mark_notifications_read(
     request: NotificationMarkReadRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """알람을 읽음 처리합니다."""
     try:
         # 사용자의 알람인지 확인하고 읽음 처리
-        updated_count = db.query(Notification).filter(
+        result = await db.execute(update(Notification).where(
             Notification.notification_id.in_(request.notification_ids),
             Notification.user_id == current_user.user_id,
             Notification.is_read == False
-        ).update({
+        ).values({
             Notification.is_read: True,
             Notification.read_at: datetime.now()
-        })
+        }))
+        updated_count = result.rowcount
         
-        db.commit()
+        await db.commit()
         
         return {
             "message": f"{updated_count}개의 알람이 읽음 처리되었습니다.",
@@ -2491,10 +2809,8 @@ async def mark_notifications_read(
         }
         
     except Exception as e:
-        db.rollback()
-        print(f"알람 읽음 처리 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("알람 읽음 처리 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="알람 읽음 처리 중 오류가 발생했습니다."
@@ -2503,20 +2819,21 @@ async def mark_notifications_read(
 @app.post("/notifications/mark-all-read")
 async def mark_all_notifications_read(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """모든 알람을 읽음 처리합니다."""
     try:
         # 사용자의 모든 읽지 않은 알람을 읽음 처리
-        updated_count = db.query(Notification).filter(
+        result = await db.execute(update(Notification).where(
             Notification.user_id == current_user.user_id,
             Notification.is_read == False
-        ).update({
+        ).values({
             Notification.is_read: True,
             Notification.read_at: datetime.now()
-        })
+        }))
+        updated_count = result.rowcount
         
-        db.commit()
+        await db.commit()
         
         return {
             "message": f"모든 알람({updated_count}개)이 읽음 처리되었습니다.",
@@ -2524,10 +2841,8 @@ async def mark_all_notifications_read(
         }
         
     except Exception as e:
-        db.rollback()
-        print(f"전체 알람 읽음 처리 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("전체 알람 읽음 처리 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="전체 알람 읽음 처리 중 오류가 발생했습니다."
@@ -2537,15 +2852,15 @@ async def mark_all_notifications_read(
 async def delete_notification(
     notification_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """특정 알람을 삭제합니다."""
     try:
         # 알람 조회 및 소유권 확인
-        notification = db.query(Notification).filter(
+        notification = await db.scalar(select(Notification).where(
             Notification.notification_id == notification_id,
             Notification.user_id == current_user.user_id
-        ).first()
+        ))
         
         if not notification:
             raise HTTPException(
@@ -2554,33 +2869,31 @@ async def delete_notification(
             )
         
         # 알람 삭제
-        db.delete(notification)
-        db.commit()
+        await db.delete(notification)
+        await db.commit()
         
         return {"message": "알람이 성공적으로 삭제되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"알람 삭제 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("알람 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="알람 삭제 중 오류가 발생했습니다."
         )
 
 # 내부 함수: 알람 생성 (다른 API에서 호출용)
-def create_notification(
-    db: Session,
+async def create_notification(
+    db: AsyncSession,
     user_id: int,
     title: str,
     message: str,
     notification_type: str,
     data: str = None
 ):
-    """내부 함수: 새 알람을 생성합니다."""
+    """내부 함수: 새 알람을 생성하고 사용자별 WebSocket 연결(/ws/user)로 전달합니다."""
     try:
         notification = Notification(
             user_id=user_id,
@@ -2591,15 +2904,19 @@ def create_notification(
         )
         
         db.add(notification)
-        db.commit()
-        db.refresh(notification)
-        
-        print(f"✅ 알람 생성: 사용자 {user_id}에게 '{title}' 알람 발송")
+        await db.commit()
+        await db.refresh(notification)
+        
+        logger.info("알람 생성: 사용자 %s에게 '%s' 알람 발송", user_id, title)
+        await manager.send_to_user(json.dumps({
+            "type": "notification",
+            "notification": NotificationResponse.model_validate(notification).model_dump(mode="json")
+        }), user_id)
         return notification
         
     except Exception as e:
-        db.rollback()
-        print(f"❌ 알람 생성 에러: {e}")
+        await db.rollback()
+        logger.error("알람 생성 에러: %s", e)
         return None
 
 # =============================================================================
@@ -2611,7 +2928,7 @@ async def upload_chat_file(
     room_id: int,
     file: UploadFile,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅방에 파일 업로드"""
     try:
@@ -2619,11 +2936,11 @@ async def upload_chat_file(
         from app.models.models import ChatParticipant
         
         # 채팅방 참여 권한 확인
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == room_id,
             ChatParticipant.user_id == current_user.user_id,
             ChatParticipant.is_active == True
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -2643,9 +2960,7 @@ async def upload_chat_file(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"파일 업로드 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("파일 업로드 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="파일 업로드 중 오류가 발생했습니다."
@@ -2656,17 +2971,17 @@ async def add_message_reaction(
     message_id: int,
     reaction_data: MessageReactionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메시지에 반응(이모지) 추가"""
     try:
         from app.models.models import ChatMessage, MessageReaction, ChatParticipant
         
         # 메시지 존재 확인
-        message = db.query(ChatMessage).filter(
+        message = await db.scalar(select(ChatMessage).where(
             ChatMessage.message_id == message_id,
             ChatMessage.is_deleted == False
-        ).first()
+        ))
         
         if not message:
             raise HTTPException(
@@ -2675,11 +2990,11 @@ async def add_message_reaction(
             )
         
         # 채팅방 참여 권한 확인
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == message.room_id,
             ChatParticipant.user_id == current_user.user_id,
             ChatParticipant.is_active == True
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -2688,16 +3003,17 @@ async def add_message_reaction(
             )
         
         # 기존 반응이 있는지 확인 (같은 사용자, 같은 이모지)
-        existing_reaction = db.query(MessageReaction).filter(
+        existing_reaction = await db.scalar(select(MessageReaction).where(
             MessageReaction.message_id == message_id,
             MessageReaction.user_id == current_user.user_id,
             MessageReaction.emoji == reaction_data.emoji
-        ).first()
+        ))
         
         if existing_reaction:
             # 이미 반응이 있으면 제거
-            db.delete(existing_reaction)
-            db.commit()
+            await db.delete(existing_reaction)
+            await db.commit()
+            message_cache.remove_reaction(message.room_id, message_id, current_user.user_id, reaction_data.emoji)
             raise HTTPException(
                 status_code=status.HTTP_200_OK,
                 detail="반응이 제거되었습니다."
@@ -2711,12 +3027,13 @@ async def add_message_reaction(
         )
         
         db.add(new_reaction)
-        db.commit()
-        db.refresh(new_reaction)
+        await db.commit()
+        await db.refresh(new_reaction)
         
         # WebSocket으로 실시간 알림
         reaction_message = {
             "type": "reaction",
+            "room_id": message.room_id,
             "message_id": message_id,
             "user_id": current_user.user_id,
             "user_name": current_user.name,
@@ -2726,7 +3043,7 @@ async def add_message_reaction(
         }
         await manager.broadcast_to_room(json.dumps(reaction_message), message.room_id)
         
-        return MessageReactionResponse(
+        reaction_response = MessageReactionResponse(
             reaction_id=new_reaction.reaction_id,
             message_id=new_reaction.message_id,
             user_id=new_reaction.user_id,
@@ -2734,13 +3051,13 @@ async def add_message_reaction(
             emoji=new_reaction.emoji,
             created_at=new_reaction.created_at
         )
+        message_cache.add_reaction(message.room_id, reaction_response)
+        return reaction_response
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"메시지 반응 추가 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("메시지 반응 추가 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 반응 추가 중 오류가 발생했습니다."
@@ -2751,17 +3068,17 @@ async def remove_message_reaction(
     message_id: int,
     emoji: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메시지 반응 제거"""
     try:
         from app.models.models import ChatMessage, MessageReaction, ChatParticipant
         
         # 메시지 존재 확인
-        message = db.query(ChatMessage).filter(
+        message = await db.scalar(select(ChatMessage).where(
             ChatMessage.message_id == message_id,
             ChatMessage.is_deleted == False
-        ).first()
+        ))
         
         if not message:
             raise HTTPException(
@@ -2770,11 +3087,11 @@ async def remove_message_reaction(
             )
         
         # 반응 찾기
-        reaction = db.query(MessageReaction).filter(
+        reaction = await db.scalar(select(MessageReaction).where(
             MessageReaction.message_id == message_id,
             MessageReaction.user_id == current_user.user_id,
             MessageReaction.emoji == emoji
-        ).first()
+        ))
         
         if not reaction:
             raise HTTPException(
@@ -2783,12 +3100,14 @@ async def remove_message_reaction(
             )
         
         # 반응 제거
-        db.delete(reaction)
-        db.commit()
+        await db.delete(reaction)
+        await db.commit()
+        message_cache.remove_reaction(message.room_id, message_id, current_user.user_id, emoji)
         
         # WebSocket으로 실시간 알림
         reaction_message = {
             "type": "reaction",
+            "room_id": message.room_id,
             "message_id": message_id,
             "user_id": current_user.user_id,
             "user_name": current_user.name,
@@ -2803,14 +3122,14 @@ async def remove_message_reaction(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"메시지 반응 제거 에러: {e}")
+        logger.error("메시지 반응 제거 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 반응 제거 중 오류가 발생했습니다."
         )
 
 @app.get("/chat/messages/{message_id}/reactions/", response_model=List[MessageReactionResponse])
-async def get_message_reactions(
+def get_message_reactions(
     message_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -2866,31 +3185,70 @@ async def get_message_reactions(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"메시지 반응 조회 에러: {e}")
+        logger.error("메시지 반응 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 반응 조회 중 오류가 발생했습니다."
         )
 
 @app.get("/chat/rooms/{room_id}/search/", response_model=MessageSearchResponse)
+@query_budget(8)
 async def search_messages(
     room_id: int,
     q: str,
     page: int = 1,
     size: int = 20,
+    before_message_id: Optional[int] = None,
+    after_message_id: Optional[int] = None,
+    include_total: bool = False,
+    sort: str = "recent",
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """채팅방 내 메시지 검색"""
+    """
+    채팅방 내 메시지 검색 (n-gram 색인 사용, app/services/search_service.py 참고)
+    - sort=recent (기본): 최신순. before_message_id/after_message_id를 지정하면 해당 메시지 기준 커서 방식으로 조회
+    - sort=relevance: 관련도순 (최신 일치 메시지 1000개 안에서 정렬). 응답의 next_cursor를 cursor로 전달하면 다음 페이지 조회
+    - include_total=true: 검색 결과 수(total_count)를 색인으로 최대 1000개까지 세어 함께 반환
+    """
     try:
-        from app.models.models import ChatMessage, ChatParticipant
+        from app.models.models import ChatParticipant
+        
+        if before_message_id is not None and after_message_id is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="before_message_id와 after_message_id는 함께 사용할 수 없습니다."
+            )
+        
+        if sort not in ("recent", "relevance"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="sort는 recent 또는 relevance만 사용할 수 있습니다."
+            )
+        
+        # 한 글자 검색어는 색인이 없으므로 관련도 점수 없이 최신순으로 검색
+        by_relevance = sort == "relevance" and bool(MessageSearchService.query_terms(q))
+        if by_relevance and (before_message_id is not None or after_message_id is not None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="관련도순 검색은 cursor 파라미터로 페이지를 조회합니다."
+            )
+        if by_relevance and cursor:
+            try:
+                MessageSearchService.decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="잘못된 cursor 형식입니다."
+                )
         
         # 채팅방 참여 권한 확인
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == room_id,
             ChatParticipant.user_id == current_user.user_id,
             ChatParticipant.is_active == True
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -2898,90 +3256,115 @@ async def search_messages(
                 detail="이 채팅방에 접근할 권한이 없습니다."
             )
         
-        # 메시지 검색
-        search_query = f"%{q}%"
-        offset = (page - 1) * size
+        # 메시지 검색 (드문 bigram이 있으면 색인으로 후보를 좁힌 뒤 나머지 bigram과 한 글자 단어로 확인)
+        rare_term = await MessageSearchService.find_rare_term(db, room_id, q)
         
-        messages_query = db.query(ChatMessage).filter(
-            ChatMessage.room_id == room_id,
-            ChatMessage.is_deleted == False,
-            ChatMessage.message_content.like(search_query)
-        ).order_by(ChatMessage.created_at.desc())
+        # 결과 수는 요청한 경우에만 색인으로 상한까지 셈 (페이지마다 전체를 세지 않음)
+        total_count, total_count_capped = None, False
+        if include_total:
+            total_count, total_count_capped = await MessageSearchService.count_matches(db, room_id, q, rare_term)
         
-        total_count = messages_query.count()
-        messages = messages_query.offset(offset).limit(size).all()
+        next_cursor = None
+        if by_relevance:
+            messages, has_more, next_cursor = await MessageSearchService.search_by_relevance(
+                db, room_id, q, size, page=page, cursor=cursor, rare_term=rare_term
+            )
+        else:
+            messages, has_more = await ChatService.fetch_message_page(
+                db, MessageSearchService.build_filters(room_id, q, rare_term), size, page=page,
+                before_message_id=before_message_id, after_message_id=after_message_id
+            )
         
         # 메시지 응답 생성
-        messages_response = []
-        for message in messages:
-            sender = db.query(User).filter(User.user_id == message.sender_id).first()
-            
-            # 답장 메시지 정보 가져오기
-            reply_to_message = None
-            if message.reply_to_message_id:
-                reply_msg = db.query(ChatMessage).filter(
-                    ChatMessage.message_id == message.reply_to_message_id
-                ).first()
-                reply_to_message = reply_msg.message_content[:100] if reply_msg else None
-            
-            # 반응 정보 가져오기
-            reactions = db.query(MessageReaction).filter(
-                MessageReaction.message_id == message.message_id
-            ).all()
-            
-            reactions_response = []
-            for reaction in reactions:
-                reaction_user = db.query(User).filter(User.user_id == reaction.user_id).first()
-                reactions_response.append(MessageReactionResponse(
-                    reaction_id=reaction.reaction_id,
-                    message_id=reaction.message_id,
-                    user_id=reaction.user_id,
-                    user_name=reaction_user.name if reaction_user else "Unknown",
-                    emoji=reaction.emoji,
-                    created_at=reaction.created_at
-                ))
-            
-            message_response = ChatMessageResponse(
-                message_id=message.message_id,
-                room_id=message.room_id,
-                sender_id=message.sender_id,
-                sender_name=sender.name if sender else "Unknown",
-                message_content=message.message_content,
-                message_type=message.message_type,
-                file_url=message.file_url,
-                file_name=message.file_name,
-                file_size=message.file_size,
-                reply_to_message_id=message.reply_to_message_id,
-                reply_to_message=reply_to_message,
-                is_edited=message.is_edited,
-                is_deleted=message.is_deleted,
-                edited_at=message.edited_at,
-                reactions=reactions_response,
-                created_at=message.created_at,
-                updated_at=message.updated_at
-            )
-            messages_response.append(message_response)
+        messages_response = await ChatService.serialize_messages(db, messages)
         
         return MessageSearchResponse(
             messages=messages_response,
             total_count=total_count,
+            total_count_capped=total_count_capped,
             page=page,
-            has_more=total_count > page * size
+            has_more=has_more,
+            next_cursor=next_cursor
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.exception("메시지 검색 에러: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="메시지 검색 중 오류가 발생했습니다."
+        )
+
+@app.get("/chat/search/", response_model=GlobalMessageSearchResponse)
+@query_budget(4)
+async def search_all_messages(
+    q: str,
+    per_room: int = 3,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    참여 중인 모든 채팅방의 메시지 검색 (채팅방별로 묶어서 최신순)
+    나간 채팅방(is_active=False 또는 left_at이 있는 채팅방)은 검색하지 않습니다.
+    """
+    try:
+        if not q.strip():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="검색어를 입력해주세요."
+            )
+        per_room = max(1, min(per_room, 20))
+        
+        results = await MessageSearchService.search_user_rooms(db, current_user.user_id, q, per_room)
+        if not results:
+            return GlobalMessageSearchResponse()
+        
+        # 채팅방 이름과 보낸 사람 이름을 한 번씩 조회
+        room_ids = [room_id for room_id, _, _ in results]
+        rooms = {
+            room.room_id: room
+            for room in (await db.scalars(select(ChatRoom).where(ChatRoom.room_id.in_(room_ids)))).all()
+        }
+        sender_ids = {message.sender_id for _, _, messages in results for message in messages}
+        user_names = dict((await db.execute(
+            select(User.user_id, User.name).where(User.user_id.in_(sender_ids))
+        )).all())
+        
+        return GlobalMessageSearchResponse(
+            rooms=[
+                RoomSearchResult(
+                    room_id=room_id,
+                    room_name=rooms[room_id].room_name,
+                    room_type=rooms[room_id].room_type,
+                    hit_count=hit_count,
+                    messages=[
+                        MessageSearchHit(
+                            message_id=message.message_id,
+                            sender_id=message.sender_id,
+                            sender_name=user_names.get(message.sender_id, "Unknown"),
+                            snippet=MessageSearchService.make_snippet(message.message_content, q),
+                            created_at=message.created_at
+                        )
+                        for message in messages
+                    ]
+                )
+                for room_id, hit_count, messages in results
+            ],
+            total_count=sum(hit_count for _, hit_count, _ in results)
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"메시지 검색 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("전체 메시지 검색 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 검색 중 오류가 발생했습니다."
         )
 
 @app.get("/chat/rooms/{room_id}/settings/", response_model=ChatRoomSettingsResponse)
-async def get_chat_room_settings(
+def get_chat_room_settings(
     room_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -3036,14 +3419,14 @@ async def get_chat_room_settings(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"채팅방 설정 조회 에러: {e}")
+        logger.error("채팅방 설정 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 설정 조회 중 오류가 발생했습니다."
         )
 
 @app.put("/chat/rooms/{room_id}/settings/", response_model=ChatRoomSettingsResponse)
-async def update_chat_room_settings(
+def update_chat_room_settings(
     room_id: int,
     settings_data: ChatRoomSettingsUpdate,
     current_user: User = Depends(get_current_user),
@@ -3104,14 +3487,14 @@ async def update_chat_room_settings(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"채팅방 설정 업데이트 에러: {e}")
+        logger.error("채팅방 설정 업데이트 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 설정 업데이트 중 오류가 발생했습니다."
         )
 
 @app.post("/chat/rooms/{room_id}/scheduled-messages/", response_model=ScheduledMessageResponse)
-async def create_scheduled_message(
+def create_scheduled_message(
     room_id: int,
     message_data: ScheduledMessageCreate,
     current_user: User = Depends(get_current_user),
@@ -3171,14 +3554,14 @@ async def create_scheduled_message(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"예약 메시지 생성 에러: {e}")
+        logger.error("예약 메시지 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="예약 메시지 생성 중 오류가 발생했습니다."
         )
 
 @app.get("/chat/rooms/{room_id}/online-status/", response_model=List[UserOnlineStatusResponse])
-async def get_room_participants_status(
+def get_room_participants_status(
     room_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -3230,7 +3613,7 @@ async def get_room_participants_status(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"온라인 상태 조회 에러: {e}")
+        logger.error("온라인 상태 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="온라인 상태 조회 중 오류가 발생했습니다."
@@ -3245,7 +3628,7 @@ async def upload_user_images(
     images: List[UploadFile] = File(...),
     primary_image_index: int = Form(0),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """사용자 프로필 이미지 업로드"""
     try:
@@ -3262,9 +3645,9 @@ async def upload_user_images(
             )
         
         # 기존 이미지들 삭제 (새로 업로드하는 경우)
-        existing_images = db.query(UserImage).filter(UserImage.user_id == current_user.user_id).all()
+        existing_images = (await db.scalars(select(UserImage).where(UserImage.user_id == current_user.user_id))).all()
         for img in existing_images:
-            db.delete(img)
+            await db.delete(img)
         
         uploaded_images = []
         primary_image_id = None
@@ -3311,7 +3694,7 @@ async def upload_user_images(
             )
             
             db.add(user_image)
-            db.flush()  # ID 생성
+            await db.flush()  # ID 생성
             
             if is_primary:
                 primary_image_id = user_image.image_id
@@ -3326,12 +3709,12 @@ async def upload_user_images(
             })
         
         # 온보딩 프로필이 있다면 이미지 업로드 완료로 표시
-        profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.user_id).first()
+        profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == current_user.user_id))
         if profile:
             profile.onboarding_completed = True
             profile.onboarding_completed_at = datetime.now()
         
-        db.commit()
+        await db.commit()
         
         return {
             "message": "프로필 이미지가 성공적으로 업로드되었습니다.",
@@ -3343,17 +3726,15 @@ async def upload_user_images(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"이미지 업로드 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("이미지 업로드 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 업로드 중 오류가 발생했습니다."
         )
 
 @app.get("/api/users/{user_id}/profile/images")
-async def get_user_profile_images(
+def get_user_profile_images(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -3395,14 +3776,14 @@ async def get_user_profile_images(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"이미지 목록 조회 에러: {e}")
+        logger.error("이미지 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 목록 조회 중 오류가 발생했습니다."
         )
 
 @app.delete("/api/users/{user_id}/profile/images/{image_id}")
-async def delete_user_profile_image(
+def delete_user_profile_image(
     user_id: int,
     image_id: int,
     current_user: User = Depends(get_current_user),
@@ -3454,14 +3835,14 @@ async def delete_user_profile_image(
         raise
     except Exception as e:
         db.rollback()
-        print(f"이미지 삭제 에러: {e}")
+        logger.error("이미지 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 삭제 중 오류가 발생했습니다."
         )
 
 @app.put("/api/users/{user_id}/profile/images/{image_id}/primary")
-async def set_primary_image(
+def set_primary_image(
     user_id: int,
     image_id: int,
     current_user: User = Depends(get_current_user),
@@ -3512,7 +3893,7 @@ async def set_primary_image(
         raise
     except Exception as e:
         db.rollback()
-        print(f"대표 이미지 설정 에러: {e}")
+        logger.error("대표 이미지 설정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="대표 이미지 설정 중 오류가 발생했습니다."
@@ -3523,7 +3904,7 @@ async def set_primary_image(
 # =============================================================================
 
 @app.put("/timetables/{timetable_id}", response_model=TimetableResponse)
-async def update_timetable(
+def update_timetable(
     timetable_id: int,
     timetable_data: TimetableUpdate,
     current_user: User = Depends(get_current_user),
@@ -3566,14 +3947,14 @@ async def update_timetable(
         raise
     except Exception as e:
         db.rollback()
-        print(f"시간표 수정 에러: {e}")
+        logger.error("시간표 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표 수정 중 오류가 발생했습니다."
         )
 
 @app.delete("/timetables/{timetable_id}")
-async def delete_timetable(
+def delete_timetable(
     timetable_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -3606,14 +3987,14 @@ async def delete_timetable(
         raise
     except Exception as e:
         db.rollback()
-        print(f"시간표 삭제 에러: {e}")
+        logger.error("시간표 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표 삭제 중 오류가 발생했습니다."
         )
 
 @app.get("/timetables/{timetable_id}/subjects/", response_model=list[SubjectResponse])
-async def get_timetable_subjects(
+def get_timetable_subjects(
     timetable_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -3658,7 +4039,7 @@ async def get_timetable_subjects(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"시간표 과목 조회 에러: {e}")
+        logger.error("시간표 과목 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="시간표 과목 조회 중 오류가 발생했습니다."
@@ -3674,16 +4055,16 @@ async def create_chat_message(
     message_data: ChatMessageCreate,
     reply_to_message_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """REST API로 채팅 메시지를 전송합니다."""
     try:
         # 채팅방 존재 및 참여 여부 확인
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == room_id,
             ChatParticipant.user_id == current_user.user_id,
             ChatParticipant.is_active == True
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -3694,10 +4075,10 @@ async def create_chat_message(
         # 답장 메시지 확인
         reply_to = None
         if reply_to_message_id:
-            reply_to = db.query(ChatMessage).filter(
+            reply_to = await db.scalar(select(ChatMessage).where(
                 ChatMessage.message_id == reply_to_message_id,
                 ChatMessage.room_id == room_id
-            ).first()
+            ))
             if not reply_to:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -3712,37 +4093,28 @@ async def create_chat_message(
             message_type=message_data.message_type.value,
             reply_to_message_id=reply_to_message_id if reply_to else None
         )
+        if message_writer.enabled:
+            # 지연 저장 중에는 WebSocket 메시지와 같은 발급기로 ID/순번을 받아야 겹치지 않음
+            message.message_id = await message_writer.allocate_id()
+            message.seq = await message_writer.allocate_seq(room_id)
         
         db.add(message)
-        db.commit()
-        db.refresh(message)
+        await ChatService.on_message_created(db, message)
+        await db.commit()
+        await db.refresh(message)
         
-        # 응답 생성
-        return ChatMessageResponse(
-            message_id=message.message_id,
-            room_id=message.room_id,
-            sender_id=message.sender_id,
-            sender_name=current_user.name,
-            message_content=message.message_content,
-            message_type=message.message_type,
-            file_url=message.file_url,
-            file_name=message.file_name,
-            file_size=message.file_size,
-            reply_to_message_id=message.reply_to_message_id,
-            reply_to_message=reply_to.message_content if reply_to else None,
-            is_edited=message.is_edited,
-            is_deleted=message.is_deleted,
-            edited_at=message.edited_at,
-            reactions=[],
-            created_at=message.created_at,
-            updated_at=message.updated_at
+        # 응답 생성 (답장 원본 미리보기는 메시지 조회 API와 같은 길이로 자름)
+        message_response = ChatService.to_response(
+            message, current_user.name, ChatService.make_preview(reply_to) if reply_to else None
         )
+        message_cache.add(message_response)
+        return message_response
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"메시지 전송 에러: {e}")
+        await db.rollback()
+        logger.error("메시지 전송 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 전송 중 오류가 발생했습니다."
@@ -3753,15 +4125,15 @@ async def update_chat_message(
     message_id: int,
     message_data: ChatMessageCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅 메시지를 수정합니다."""
     try:
-        message = db.query(ChatMessage).filter(
+        message = await db.scalar(select(ChatMessage).where(
             ChatMessage.message_id == message_id,
             ChatMessage.sender_id == current_user.user_id,
             ChatMessage.is_deleted == False
-        ).first()
+        ))
         
         if not message:
             raise HTTPException(
@@ -3773,53 +4145,21 @@ async def update_chat_message(
         message.message_content = message_data.message_content
         message.is_edited = True
         message.edited_at = datetime.now()
+        await ChatService.on_message_edited(db, message)
         
-        db.commit()
-        db.refresh(message)
+        await db.commit()
+        await db.refresh(message)
         
         # 응답 생성
-        sender = db.query(User).filter(User.user_id == message.sender_id).first()
-        reactions = db.query(MessageReaction).filter(
-            MessageReaction.message_id == message_id
-        ).all()
-        
-        reaction_responses = []
-        for reaction in reactions:
-            user = db.query(User).filter(User.user_id == reaction.user_id).first()
-            reaction_responses.append(MessageReactionResponse(
-                reaction_id=reaction.reaction_id,
-                message_id=reaction.message_id,
-                user_id=reaction.user_id,
-                user_name=user.name if user else "알 수 없음",
-                emoji=reaction.emoji,
-                created_at=reaction.created_at
-            ))
-        
-        return ChatMessageResponse(
-            message_id=message.message_id,
-            room_id=message.room_id,
-            sender_id=message.sender_id,
-            sender_name=sender.name if sender else "알 수 없음",
-            message_content=message.message_content,
-            message_type=message.message_type,
-            file_url=message.file_url,
-            file_name=message.file_name,
-            file_size=message.file_size,
-            reply_to_message_id=message.reply_to_message_id,
-            reply_to_message=None,
-            is_edited=message.is_edited,
-            is_deleted=message.is_deleted,
-            edited_at=message.edited_at,
-            reactions=reaction_responses,
-            created_at=message.created_at,
-            updated_at=message.updated_at
-        )
+        [message_response] = await ChatService.serialize_messages(db, [message])
+        message_cache.replace(message_response)
+        return message_response
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"메시지 수정 에러: {e}")
+        await db.rollback()
+        logger.error("메시지 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 수정 중 오류가 발생했습니다."
@@ -3829,14 +4169,14 @@ async def update_chat_message(
 async def delete_chat_message(
     message_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅 메시지를 삭제합니다."""
     try:
-        message = db.query(ChatMessage).filter(
+        message = await db.scalar(select(ChatMessage).where(
             ChatMessage.message_id == message_id,
             ChatMessage.sender_id == current_user.user_id
-        ).first()
+        ))
         
         if not message:
             raise HTTPException(
@@ -3844,19 +4184,25 @@ async def delete_chat_message(
                 detail="메시지를 찾을 수 없거나 삭제 권한이 없습니다."
             )
         
+        # 이미 삭제된 메시지는 카운터를 다시 줄이지 않음
+        if message.is_deleted:
+            return {"message": "메시지가 삭제되었습니다."}
+        
         # 소프트 삭제
         message.is_deleted = True
         message.message_content = "(삭제된 메시지입니다)"
+        await ChatService.on_message_deleted(db, message)
         
-        db.commit()
+        await db.commit()
+        message_cache.remove(message.room_id, message.message_id, message.message_content)
         
         return {"message": "메시지가 삭제되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"메시지 삭제 에러: {e}")
+        await db.rollback()
+        logger.error("메시지 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="메시지 삭제 중 오류가 발생했습니다."
@@ -3867,7 +4213,7 @@ async def delete_chat_message(
 # =============================================================================
 
 @app.put("/chat/rooms/{room_id}/", response_model=ChatRoomResponse)
-async def update_chat_room(
+def update_chat_room(
     room_id: int,
     room_data: ChatRoomCreate,
     current_user: User = Depends(get_current_user),
@@ -3925,7 +4271,7 @@ async def update_chat_room(
         raise
     except Exception as e:
         db.rollback()
-        print(f"채팅방 수정 에러: {e}")
+        logger.error("채팅방 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 수정 중 오류가 발생했습니다."
@@ -3935,15 +4281,15 @@ async def update_chat_room(
 async def leave_chat_room(
     room_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅방을 나갑니다."""
     try:
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == room_id,
             ChatParticipant.user_id == current_user.user_id,
             ChatParticipant.is_active == True
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -3955,15 +4301,18 @@ async def leave_chat_room(
         participant.is_active = False
         participant.left_at = datetime.now()
         
-        db.commit()
+        await db.commit()
+        
+        # 사용자별 WebSocket 연결의 채팅방 구독 해제
+        manager.remove_user_room(current_user.user_id, room_id)
         
         return {"message": "채팅방을 나갔습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"채팅방 나가기 에러: {e}")
+        await db.rollback()
+        logger.error("채팅방 나가기 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 나가기 중 오류가 발생했습니다."
@@ -3973,11 +4322,11 @@ async def leave_chat_room(
 async def delete_chat_room(
     room_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅방을 삭제합니다."""
     try:
-        room = db.query(ChatRoom).filter(ChatRoom.room_id == room_id).first()
+        room = await db.scalar(select(ChatRoom).where(ChatRoom.room_id == room_id))
         
         if not room:
             raise HTTPException(
@@ -3995,22 +4344,23 @@ async def delete_chat_room(
         # 소프트 삭제
         room.is_active = False
         
-        db.commit()
+        await db.commit()
+        message_cache.invalidate(room_id)
         
         return {"message": "채팅방이 삭제되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"채팅방 삭제 에러: {e}")
+        await db.rollback()
+        logger.error("채팅방 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="채팅방 삭제 중 오류가 발생했습니다."
         )
 
 @app.post("/chat/rooms/{room_id}/participants/")
-async def add_chat_participant(
+def add_chat_participant(
     room_id: int,
     user_id: int = Form(...),
     current_user: User = Depends(get_current_user),
@@ -4058,6 +4408,8 @@ async def add_chat_participant(
                 existing.is_active = True
                 existing.left_at = None
                 existing.joined_at = datetime.now()
+                # 참여 이전 메시지는 읽지 않은 수에 포함하지 않음 (ChatService와 같은 기준)
+                existing.unread_count = 0
         else:
             # 새 참여자 추가
             participant = ChatParticipant(
@@ -4075,7 +4427,7 @@ async def add_chat_participant(
         raise
     except Exception as e:
         db.rollback()
-        print(f"참여자 추가 에러: {e}")
+        logger.error("참여자 추가 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="참여자 추가 중 오류가 발생했습니다."
@@ -4086,11 +4438,11 @@ async def remove_chat_participant(
     room_id: int,
     user_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """채팅방에서 참여자를 제거합니다."""
     try:
-        room = db.query(ChatRoom).filter(ChatRoom.room_id == room_id).first()
+        room = await db.scalar(select(ChatRoom).where(ChatRoom.room_id == room_id))
         
         if not room:
             raise HTTPException(
@@ -4105,10 +4457,10 @@ async def remove_chat_participant(
                 detail="참여자 제거 권한이 없습니다."
             )
         
-        participant = db.query(ChatParticipant).filter(
+        participant = await db.scalar(select(ChatParticipant).where(
             ChatParticipant.room_id == room_id,
             ChatParticipant.user_id == user_id
-        ).first()
+        ))
         
         if not participant:
             raise HTTPException(
@@ -4120,15 +4472,18 @@ async def remove_chat_participant(
         participant.is_active = False
         participant.left_at = datetime.now()
         
-        db.commit()
+        await db.commit()
+        
+        # 사용자별 WebSocket 연결의 채팅방 구독 해제
+        manager.remove_user_room(user_id, room_id)
         
         return {"message": "참여자가 제거되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"참여자 제거 에러: {e}")
+        await db.rollback()
+        logger.error("참여자 제거 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="참여자 제거 중 오류가 발생했습니다."
@@ -4139,7 +4494,7 @@ async def remove_chat_participant(
 # =============================================================================
 
 @app.get("/api/users/search/", response_model=UserSearchListResponse)
-async def search_users(
+def search_users(
     query: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
@@ -4186,7 +4541,7 @@ async def search_users(
         )
         
     except Exception as e:
-        print(f"사용자 검색 에러: {e}")
+        logger.error("사용자 검색 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="사용자 검색 중 오류가 발생했습니다."
@@ -4196,35 +4551,38 @@ async def search_users(
 async def change_password(
     password_data: PasswordChangeRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """비밀번호를 변경합니다."""
     try:
         # 현재 비밀번호 확인
-        from app.auth.security import verify_password
-        if not verify_password(password_data.current_password, current_user.password_hash, current_user.salt):
+        valid, _ = await password_hasher.verify(password_data.current_password, current_user.password_hash, current_user.salt)
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="현재 비밀번호가 올바르지 않습니다."
             )
         
         # 새 비밀번호 해시
-        new_salt = generate_salt()
-        new_password_hash = hash_password_with_salt(password_data.new_password, new_salt)
+        new_password_hash = await password_hasher.hash(password_data.new_password)
         
         # 비밀번호 업데이트
         current_user.password_hash = new_password_hash
-        current_user.salt = new_salt
+        current_user.salt = PASSLIB_SALT
+        # 기존 토큰(다른 기기 포함)은 모두 폐기하고 이 기기에서 계속 사용할 새 토큰 발급
+        revoke_user_tokens(current_user)
         
-        db.commit()
+        await db.commit()
+        user_cache.invalidate(current_user.email)
+        access_token = create_access_token(data={"sub": current_user.email})
         
-        return {"message": "비밀번호가 변경되었습니다."}
+        return {"message": "비밀번호가 변경되었습니다.", "access_token": access_token, "token_type": "bearer"}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"비밀번호 변경 에러: {e}")
+        await db.rollback()
+        logger.error("비밀번호 변경 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="비밀번호 변경 중 오류가 발생했습니다."
@@ -4233,7 +4591,7 @@ async def change_password(
 @app.delete("/auth/account/")
 async def delete_account(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """계정을 탈퇴합니다."""
     try:
@@ -4243,21 +4601,24 @@ async def delete_account(
         # 사용자 관련 데이터 삭제 (선택적)
         # 실제 운영에서는 소프트 삭제를 권장
         
-        db.delete(current_user)
-        db.commit()
+        # 사용자 행이 삭제되므로 기존 토큰은 get_current_user에서 거부됨 (같은 이메일로 재가입해도 가입 시각 이전 토큰은 거부)
+        await db.delete(current_user)
+        await db.commit()
+        user_cache.invalidate(current_user.email)
+        message_cache.clear()
         
         return {"message": "계정이 삭제되었습니다."}
         
     except Exception as e:
-        db.rollback()
-        print(f"계정 탈퇴 에러: {e}")
+        await db.rollback()
+        logger.error("계정 탈퇴 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="계정 탈퇴 중 오류가 발생했습니다."
         )
 
 @app.post("/api/users/{user_id}/block/")
-async def block_user(
+def block_user(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4304,14 +4665,14 @@ async def block_user(
         raise
     except Exception as e:
         db.rollback()
-        print(f"사용자 차단 에러: {e}")
+        logger.error("사용자 차단 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="사용자 차단 중 오류가 발생했습니다."
         )
 
 @app.delete("/api/users/{user_id}/block/")
-async def unblock_user(
+def unblock_user(
     user_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4338,14 +4699,14 @@ async def unblock_user(
         raise
     except Exception as e:
         db.rollback()
-        print(f"차단 해제 에러: {e}")
+        logger.error("차단 해제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="차단 해제 중 오류가 발생했습니다."
         )
 
 @app.get("/api/users/blocked/", response_model=UserBlockListResponse)
-async def get_blocked_users(
+def get_blocked_users(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -4372,7 +4733,7 @@ async def get_blocked_users(
         )
         
     except Exception as e:
-        print(f"차단 목록 조회 에러: {e}")
+        logger.error("차단 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="차단 목록 조회 중 오류가 발생했습니다."
@@ -4383,7 +4744,7 @@ async def get_blocked_users(
 # =============================================================================
 
 @app.get("/api/users/notification-settings/", response_model=UserNotificationSettingsResponse)
-async def get_notification_settings(
+def get_notification_settings(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -4405,14 +4766,14 @@ async def get_notification_settings(
         return settings
         
     except Exception as e:
-        print(f"알림 설정 조회 에러: {e}")
+        logger.error("알림 설정 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="알림 설정 조회 중 오류가 발생했습니다."
         )
 
 @app.put("/api/users/notification-settings/", response_model=UserNotificationSettingsResponse)
-async def update_notification_settings(
+def update_notification_settings(
     settings_data: UserNotificationSettingsUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4448,7 +4809,7 @@ async def update_notification_settings(
         
     except Exception as e:
         db.rollback()
-        print(f"알림 설정 업데이트 에러: {e}")
+        logger.error("알림 설정 업데이트 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="알림 설정 업데이트 중 오류가 발생했습니다."
@@ -4462,7 +4823,7 @@ async def update_notification_settings(
 async def create_group(
     group_data: GroupCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹을 생성합니다."""
     try:
@@ -4475,8 +4836,8 @@ async def create_group(
             max_members=group_data.max_members
         )
         db.add(group)
-        db.commit()
-        db.refresh(group)
+        await db.commit()
+        await db.refresh(group)
         
         # 생성자를 owner로 추가
         member = GroupMember(
@@ -4486,9 +4847,9 @@ async def create_group(
             status='approved'
         )
         db.add(member)
-        db.commit()
+        await db.commit()
         
-        creator = db.query(User).filter(User.user_id == group.created_by).first()
+        creator = await db.scalar(select(User).where(User.user_id == group.created_by))
         return GroupResponse(
             group_id=group.group_id,
             group_name=group.group_name,
@@ -4505,8 +4866,8 @@ async def create_group(
         )
         
     except Exception as e:
-        db.rollback()
-        print(f"그룹 생성 에러: {e}")
+        await db.rollback()
+        logger.error("그룹 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 생성 중 오류가 발생했습니다."
@@ -4515,24 +4876,27 @@ async def create_group(
 @app.get("/groups/", response_model=GroupListResponse)
 async def get_groups(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     page: int = 1,
     size: int = 20
 ):
     """그룹 목록을 조회합니다."""
     try:
         # 사용자가 참여한 그룹 또는 공개 그룹
-        groups = db.query(Group).filter(
-            (Group.is_public == True) | (Group.created_by == current_user.user_id)
-        ).filter(Group.is_active == True).offset((page - 1) * size).limit(size).all()
+        groups = (await db.scalars(
+            select(Group).where(
+                (Group.is_public == True) | (Group.created_by == current_user.user_id),
+                Group.is_active == True
+            ).offset((page - 1) * size).limit(size)
+        )).all()
         
         results = []
         for group in groups:
-            creator = db.query(User).filter(User.user_id == group.created_by).first()
-            member_count = db.query(GroupMember).filter(
+            creator = await db.scalar(select(User).where(User.user_id == group.created_by))
+            member_count = await db.scalar(select(func.count()).select_from(GroupMember).where(
                 GroupMember.group_id == group.group_id,
                 GroupMember.is_active == True
-            ).count()
+            ))
             
             results.append(GroupResponse(
                 group_id=group.group_id,
@@ -4552,7 +4916,7 @@ async def get_groups(
         return GroupListResponse(groups=results, total_count=len(results))
         
     except Exception as e:
-        print(f"그룹 목록 조회 에러: {e}")
+        logger.error("그룹 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 목록 조회 중 오류가 발생했습니다."
@@ -4562,11 +4926,11 @@ async def get_groups(
 async def get_group(
     group_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 상세 정보를 조회합니다."""
     try:
-        group = db.query(Group).filter(Group.group_id == group_id).first()
+        group = await db.scalar(select(Group).where(Group.group_id == group_id))
         
         if not group:
             raise HTTPException(
@@ -4574,11 +4938,11 @@ async def get_group(
                 detail="그룹을 찾을 수 없습니다."
             )
         
-        creator = db.query(User).filter(User.user_id == group.created_by).first()
-        member_count = db.query(GroupMember).filter(
+        creator = await db.scalar(select(User).where(User.user_id == group.created_by))
+        member_count = await db.scalar(select(func.count()).select_from(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.is_active == True
-        ).count()
+        ))
         
         return GroupResponse(
             group_id=group.group_id,
@@ -4598,14 +4962,14 @@ async def get_group(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"그룹 조회 에러: {e}")
+        logger.error("그룹 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 조회 중 오류가 발생했습니다."
         )
 
 @app.put("/groups/{group_id}", response_model=GroupResponse)
-async def update_group(
+def update_group(
     group_id: int,
     group_data: GroupUpdate,
     current_user: User = Depends(get_current_user),
@@ -4675,14 +5039,14 @@ async def update_group(
         raise
     except Exception as e:
         db.rollback()
-        print(f"그룹 수정 에러: {e}")
+        logger.error("그룹 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 수정 중 오류가 발생했습니다."
         )
 
 @app.delete("/groups/{group_id}")
-async def delete_group(
+def delete_group(
     group_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -4714,7 +5078,7 @@ async def delete_group(
         raise
     except Exception as e:
         db.rollback()
-        print(f"그룹 삭제 에러: {e}")
+        logger.error("그룹 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 삭제 중 오류가 발생했습니다."
@@ -4724,11 +5088,11 @@ async def delete_group(
 async def join_group(
     group_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹에 가입합니다."""
     try:
-        group = db.query(Group).filter(Group.group_id == group_id).first()
+        group = await db.scalar(select(Group).where(Group.group_id == group_id))
         
         if not group:
             raise HTTPException(
@@ -4737,10 +5101,10 @@ async def join_group(
             )
         
         # 이미 가입했는지 확인
-        existing = db.query(GroupMember).filter(
+        existing = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id
-        ).first()
+        ))
         
         if existing:
             if existing.is_active:
@@ -4763,7 +5127,7 @@ async def join_group(
             )
             db.add(member)
         
-        db.commit()
+        await db.commit()
         
         status_msg = "가입 신청이 완료되었습니다." if group.requires_approval else "가입이 완료되었습니다."
         return {"message": status_msg}
@@ -4771,8 +5135,8 @@ async def join_group(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"그룹 가입 에러: {e}")
+        await db.rollback()
+        logger.error("그룹 가입 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 가입 중 오류가 발생했습니다."
@@ -4782,15 +5146,15 @@ async def join_group(
 async def leave_group(
     group_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹을 탈퇴합니다."""
     try:
-        member = db.query(GroupMember).filter(
+        member = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id,
             GroupMember.is_active == True
-        ).first()
+        ))
         
         if not member:
             raise HTTPException(
@@ -4808,15 +5172,15 @@ async def leave_group(
         member.is_active = False
         member.left_at = datetime.now()
         
-        db.commit()
+        await db.commit()
         
         return {"message": "그룹을 탈퇴했습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"그룹 탈퇴 에러: {e}")
+        await db.rollback()
+        logger.error("그룹 탈퇴 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="그룹 탈퇴 중 오류가 발생했습니다."
@@ -4826,26 +5190,26 @@ async def leave_group(
 async def get_group_members(
     group_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 멤버 목록을 조회합니다."""
     try:
         # 그룹 접근 권한 확인
-        group = db.query(Group).filter(Group.group_id == group_id).first()
+        group = await db.scalar(select(Group).where(Group.group_id == group_id))
         if not group:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="그룹을 찾을 수 없습니다."
             )
         
-        members = db.query(GroupMember).filter(
+        members = (await db.scalars(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.is_active == True
-        ).all()
+        ))).all()
         
         results = []
         for member in members:
-            user = db.query(User).filter(User.user_id == member.user_id).first()
+            user = await db.scalar(select(User).where(User.user_id == member.user_id))
             if user:
                 results.append(GroupMemberResponse(
                     member_id=member.member_id,
@@ -4862,7 +5226,7 @@ async def get_group_members(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"멤버 목록 조회 에러: {e}")
+        logger.error("멤버 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="멤버 목록 조회 중 오류가 발생했습니다."
@@ -4875,32 +5239,32 @@ async def get_group_members(
 @app.get("/matching/recommendations/", response_model=MatchingRecommendationListResponse)
 async def get_matching_recommendations(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     page: int = 1,
     size: int = 20
 ):
     """매칭 추천 목록을 조회합니다."""
     try:
         # 현재 사용자 프로필
-        current_profile = db.query(UserProfile).filter(
+        current_profile = await db.scalar(select(UserProfile).where(
             UserProfile.user_id == current_user.user_id
-        ).first()
+        ))
         
         if not current_profile:
             return MatchingRecommendationListResponse(recommendations=[], total_count=0)
         
         # 차단된 사용자 제외
-        blocked_ids = [b.blocked_id for b in db.query(UserBlock).filter(
+        blocked_ids = [b.blocked_id for b in (await db.scalars(select(UserBlock).where(
             UserBlock.blocker_id == current_user.user_id
-        ).all()]
+        ))).all()]
         
         # 이미 친구인 사용자 제외
         friend_ids = set()
-        friendships = db.query(FriendRelationship).filter(
+        friendships = (await db.scalars(select(FriendRelationship).where(
             (FriendRelationship.user1_id == current_user.user_id) |
             (FriendRelationship.user2_id == current_user.user_id),
             FriendRelationship.is_active == True
-        ).all()
+        ))).all()
         for f in friendships:
             if f.user1_id == current_user.user_id:
                 friend_ids.add(f.user2_id)
@@ -4908,15 +5272,17 @@ async def get_matching_recommendations(
                 friend_ids.add(f.user1_id)
         
         # 추천 사용자 조회 (간단한 구현 - 실제로는 더 복잡한 알고리즘 필요)
-        users = db.query(User).filter(
-            User.user_id != current_user.user_id,
-            User.user_id.notin_(blocked_ids),
-            User.user_id.notin_(friend_ids)
-        ).offset((page - 1) * size).limit(size).all()
+        users = (await db.scalars(
+            select(User).where(
+                User.user_id != current_user.user_id,
+                User.user_id.notin_(blocked_ids),
+                User.user_id.notin_(friend_ids)
+            ).offset((page - 1) * size).limit(size)
+        )).all()
         
         results = []
         for user in users:
-            profile = db.query(UserProfile).filter(UserProfile.user_id == user.user_id).first()
+            profile = await db.scalar(select(UserProfile).where(UserProfile.user_id == user.user_id))
             if not profile:
                 continue
             
@@ -4926,9 +5292,11 @@ async def get_matching_recommendations(
             common = list(set(current_interests) & set(user_interests))
             
             # 프로필 이미지
-            images = db.query(UserImage).filter(
-                UserImage.user_id == user.user_id
-            ).order_by(UserImage.upload_order).all()
+            images = (await db.scalars(
+                select(UserImage).where(
+                    UserImage.user_id == user.user_id
+                ).order_by(UserImage.upload_order)
+            )).all()
             
             image_responses = []
             for img in images:
@@ -4957,9 +5325,7 @@ async def get_matching_recommendations(
         )
         
     except Exception as e:
-        print(f"매칭 추천 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("매칭 추천 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="매칭 추천 조회 중 오류가 발생했습니다."
@@ -4969,7 +5335,7 @@ async def get_matching_recommendations(
 async def create_matching_request(
     request_data: MatchingRequestCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """매칭 요청을 생성합니다."""
     try:
@@ -4980,7 +5346,7 @@ async def create_matching_request(
             )
         
         # 사용자 존재 확인
-        requested_user = db.query(User).filter(User.user_id == request_data.requested_id).first()
+        requested_user = await db.scalar(select(User).where(User.user_id == request_data.requested_id))
         if not requested_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -4988,10 +5354,10 @@ async def create_matching_request(
             )
         
         # 이미 요청했는지 확인
-        existing = db.query(MatchingRequest).filter(
+        existing = await db.scalar(select(MatchingRequest).where(
             MatchingRequest.requester_id == current_user.user_id,
             MatchingRequest.requested_id == request_data.requested_id
-        ).first()
+        ))
         
         if existing:
             raise HTTPException(
@@ -5006,11 +5372,11 @@ async def create_matching_request(
             status='pending'
         )
         db.add(request)
-        db.commit()
-        db.refresh(request)
+        await db.commit()
+        await db.refresh(request)
         
-        requester = db.query(User).filter(User.user_id == request.requester_id).first()
-        requested = db.query(User).filter(User.user_id == request.requested_id).first()
+        requester = await db.scalar(select(User).where(User.user_id == request.requester_id))
+        requested = await db.scalar(select(User).where(User.user_id == request.requested_id))
         
         return MatchingRequestResponse(
             request_id=request.request_id,
@@ -5026,8 +5392,8 @@ async def create_matching_request(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"매칭 요청 생성 에러: {e}")
+        await db.rollback()
+        logger.error("매칭 요청 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="매칭 요청 생성 중 오류가 발생했습니다."
@@ -5037,15 +5403,15 @@ async def create_matching_request(
 async def accept_matching_request(
     request_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """매칭 요청을 수락하고 자동으로 채팅방을 생성합니다."""
     try:
-        matching_request = db.query(MatchingRequest).filter(
+        matching_request = await db.scalar(select(MatchingRequest).where(
             MatchingRequest.request_id == request_id,
             MatchingRequest.requested_id == current_user.user_id,
             MatchingRequest.status == 'pending'
-        ).first()
+        ))
         
         if not matching_request:
             raise HTTPException(
@@ -5065,29 +5431,29 @@ async def accept_matching_request(
         db.add(friend)
         
         # 채팅방 자동 생성 (이미 존재하는지 확인)
-        existing_room = db.query(ChatRoom).join(ChatParticipant).filter(
-            ChatRoom.is_group == False,
-            ChatRoom.is_deleted == False
-        ).filter(
+        existing_room = await db.scalar(select(ChatRoom).join(ChatParticipant).where(
+            ChatRoom.room_type == 'direct',
+            ChatRoom.is_active == True
+        ).where(
             ChatParticipant.user_id.in_([matching_request.requester_id, matching_request.requested_id])
         ).group_by(ChatRoom.room_id).having(
             func.count(ChatParticipant.user_id) == 2
-        ).first()
+        ))
         
         chat_room = None
         if not existing_room:
             # 사용자 정보 조회
-            requester = db.query(User).filter(User.user_id == matching_request.requester_id).first()
-            requested = db.query(User).filter(User.user_id == matching_request.requested_id).first()
+            requester = await db.scalar(select(User).where(User.user_id == matching_request.requester_id))
+            requested = await db.scalar(select(User).where(User.user_id == matching_request.requested_id))
             
             # 1:1 채팅방 생성
             chat_room = ChatRoom(
-                name=f"{requester.name}, {requested.name}",
-                is_group=False,
+                room_name=f"{requester.name}, {requested.name}",
+                room_type='direct',
                 created_by=matching_request.requester_id
             )
             db.add(chat_room)
-            db.flush()  # room_id 생성
+            await db.flush()  # room_id 생성
             
             # 참여자 추가
             participant1 = ChatParticipant(
@@ -5105,22 +5471,20 @@ async def accept_matching_request(
         else:
             chat_room = existing_room
         
-        db.commit()
-        db.refresh(chat_room)
+        await db.commit()
+        await db.refresh(chat_room)
         
         return {
             "message": "매칭 요청이 수락되었습니다.",
             "chat_room_id": chat_room.room_id,
-            "chat_room_name": chat_room.name
+            "chat_room_name": chat_room.room_name
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"매칭 요청 수락 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("매칭 요청 수락 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="매칭 요청 수락 중 오류가 발생했습니다."
@@ -5130,15 +5494,15 @@ async def accept_matching_request(
 async def reject_matching_request(
     request_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """매칭 요청을 거절합니다."""
     try:
-        matching_request = db.query(MatchingRequest).filter(
+        matching_request = await db.scalar(select(MatchingRequest).where(
             MatchingRequest.request_id == request_id,
             MatchingRequest.requested_id == current_user.user_id,
             MatchingRequest.status == 'pending'
-        ).first()
+        ))
         
         if not matching_request:
             raise HTTPException(
@@ -5147,15 +5511,15 @@ async def reject_matching_request(
             )
         
         matching_request.status = 'rejected'
-        db.commit()
+        await db.commit()
         
         return {"message": "매칭 요청이 거절되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"매칭 요청 거절 에러: {e}")
+        await db.rollback()
+        logger.error("매칭 요청 거절 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="매칭 요청 거절 중 오류가 발생했습니다."
@@ -5164,25 +5528,25 @@ async def reject_matching_request(
 @app.get("/matching/requests/", response_model=MatchingRequestListResponse)
 async def get_matching_requests(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     type: str = "received"  # received, sent
 ):
     """매칭 요청 목록을 조회합니다."""
     try:
         if type == "received":
-            requests = db.query(MatchingRequest).filter(
+            requests = (await db.scalars(select(MatchingRequest).where(
                 MatchingRequest.requested_id == current_user.user_id,
                 MatchingRequest.status == 'pending'
-            ).all()
+            ))).all()
         else:
-            requests = db.query(MatchingRequest).filter(
+            requests = (await db.scalars(select(MatchingRequest).where(
                 MatchingRequest.requester_id == current_user.user_id
-            ).all()
+            ))).all()
         
         results = []
         for req in requests:
-            requester = db.query(User).filter(User.user_id == req.requester_id).first()
-            requested = db.query(User).filter(User.user_id == req.requested_id).first()
+            requester = await db.scalar(select(User).where(User.user_id == req.requester_id))
+            requested = await db.scalar(select(User).where(User.user_id == req.requested_id))
             
             results.append(MatchingRequestResponse(
                 request_id=req.request_id,
@@ -5198,7 +5562,7 @@ async def get_matching_requests(
         return MatchingRequestListResponse(requests=results, total_count=len(results))
         
     except Exception as e:
-        print(f"매칭 요청 목록 조회 에러: {e}")
+        logger.error("매칭 요청 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="매칭 요청 목록 조회 중 오류가 발생했습니다."
@@ -5207,20 +5571,20 @@ async def get_matching_requests(
 @app.get("/matching/friends/", response_model=FriendListResponse)
 async def get_friends(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """친구 목록을 조회합니다."""
     try:
-        friendships = db.query(FriendRelationship).filter(
+        friendships = (await db.scalars(select(FriendRelationship).where(
             ((FriendRelationship.user1_id == current_user.user_id) |
              (FriendRelationship.user2_id == current_user.user_id)),
             FriendRelationship.is_active == True
-        ).all()
+        ))).all()
         
         results = []
         for friendship in friendships:
             friend_id = friendship.user2_id if friendship.user1_id == current_user.user_id else friendship.user1_id
-            friend = db.query(User).filter(User.user_id == friend_id).first()
+            friend = await db.scalar(select(User).where(User.user_id == friend_id))
             
             if friend:
                 results.append(FriendResponse(
@@ -5233,14 +5597,14 @@ async def get_friends(
         return FriendListResponse(friends=results, total_count=len(results))
         
     except Exception as e:
-        print(f"친구 목록 조회 에러: {e}")
+        logger.error("친구 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="친구 목록 조회 중 오류가 발생했습니다."
         )
 
 @app.delete("/matching/friends/{friend_id}/")
-async def remove_friend(
+def remove_friend(
     friend_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -5268,7 +5632,7 @@ async def remove_friend(
         raise
     except Exception as e:
         db.rollback()
-        print(f"친구 관계 해제 에러: {e}")
+        logger.error("친구 관계 해제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="친구 관계 해제 중 오류가 발생했습니다."
@@ -5283,17 +5647,17 @@ async def create_group_post(
     group_id: int,
     post_data: GroupPostCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글을 생성합니다."""
     try:
         # 그룹 멤버 확인
-        member = db.query(GroupMember).filter(
+        member = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id,
             GroupMember.is_active == True,
             GroupMember.status == 'approved'
-        ).first()
+        ))
         
         if not member:
             raise HTTPException(
@@ -5308,14 +5672,14 @@ async def create_group_post(
             content=post_data.content
         )
         db.add(post)
-        db.commit()
-        db.refresh(post)
+        await db.commit()
+        await db.refresh(post)
         
-        author = db.query(User).filter(User.user_id == post.author_id).first()
-        comment_count = db.query(GroupPostComment).filter(
+        author = await db.scalar(select(User).where(User.user_id == post.author_id))
+        comment_count = await db.scalar(select(func.count()).select_from(GroupPostComment).where(
             GroupPostComment.post_id == post.post_id,
             GroupPostComment.is_deleted == False
-        ).count()
+        ))
         
         return GroupPostResponse(
             post_id=post.post_id,
@@ -5333,8 +5697,8 @@ async def create_group_post(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"게시글 생성 에러: {e}")
+        await db.rollback()
+        logger.error("게시글 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="게시글 생성 중 오류가 발생했습니다."
@@ -5344,24 +5708,26 @@ async def create_group_post(
 async def get_group_posts(
     group_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     page: int = 1,
     size: int = 20
 ):
     """그룹 게시글 목록을 조회합니다."""
     try:
-        posts = db.query(GroupPost).filter(
-            GroupPost.group_id == group_id,
-            GroupPost.is_deleted == False
-        ).order_by(GroupPost.is_pinned.desc(), GroupPost.created_at.desc()).offset((page - 1) * size).limit(size).all()
+        posts = (await db.scalars(
+            select(GroupPost).where(
+                GroupPost.group_id == group_id,
+                GroupPost.is_deleted == False
+            ).order_by(GroupPost.is_pinned.desc(), GroupPost.created_at.desc()).offset((page - 1) * size).limit(size)
+        )).all()
         
         results = []
         for post in posts:
-            author = db.query(User).filter(User.user_id == post.author_id).first()
-            comment_count = db.query(GroupPostComment).filter(
+            author = await db.scalar(select(User).where(User.user_id == post.author_id))
+            comment_count = await db.scalar(select(func.count()).select_from(GroupPostComment).where(
                 GroupPostComment.post_id == post.post_id,
                 GroupPostComment.is_deleted == False
-            ).count()
+            ))
             
             results.append(GroupPostResponse(
                 post_id=post.post_id,
@@ -5379,7 +5745,7 @@ async def get_group_posts(
         return GroupPostListResponse(posts=results, total_count=len(results))
         
     except Exception as e:
-        print(f"게시글 목록 조회 에러: {e}")
+        logger.error("게시글 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="게시글 목록 조회 중 오류가 발생했습니다."
@@ -5390,15 +5756,15 @@ async def get_group_post(
     group_id: int,
     post_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글 상세를 조회합니다."""
     try:
-        post = db.query(GroupPost).filter(
+        post = await db.scalar(select(GroupPost).where(
             GroupPost.post_id == post_id,
             GroupPost.group_id == group_id,
             GroupPost.is_deleted == False
-        ).first()
+        ))
         
         if not post:
             raise HTTPException(
@@ -5406,11 +5772,11 @@ async def get_group_post(
                 detail="게시글을 찾을 수 없습니다."
             )
         
-        author = db.query(User).filter(User.user_id == post.author_id).first()
-        comment_count = db.query(GroupPostComment).filter(
+        author = await db.scalar(select(User).where(User.user_id == post.author_id))
+        comment_count = await db.scalar(select(func.count()).select_from(GroupPostComment).where(
             GroupPostComment.post_id == post.post_id,
             GroupPostComment.is_deleted == False
-        ).count()
+        ))
         
         return GroupPostResponse(
             post_id=post.post_id,
@@ -5428,7 +5794,7 @@ async def get_group_post(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"게시글 조회 에러: {e}")
+        logger.error("게시글 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="게시글 조회 중 오류가 발생했습니다."
@@ -5440,16 +5806,16 @@ async def update_group_post(
     post_id: int,
     post_data: GroupPostUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글을 수정합니다."""
     try:
-        post = db.query(GroupPost).filter(
+        post = await db.scalar(select(GroupPost).where(
             GroupPost.post_id == post_id,
             GroupPost.group_id == group_id,
             GroupPost.author_id == current_user.user_id,
             GroupPost.is_deleted == False
-        ).first()
+        ))
         
         if not post:
             raise HTTPException(
@@ -5462,14 +5828,14 @@ async def update_group_post(
         if post_data.content is not None:
             post.content = post_data.content
         
-        db.commit()
-        db.refresh(post)
+        await db.commit()
+        await db.refresh(post)
         
-        author = db.query(User).filter(User.user_id == post.author_id).first()
-        comment_count = db.query(GroupPostComment).filter(
+        author = await db.scalar(select(User).where(User.user_id == post.author_id))
+        comment_count = await db.scalar(select(func.count()).select_from(GroupPostComment).where(
             GroupPostComment.post_id == post.post_id,
             GroupPostComment.is_deleted == False
-        ).count()
+        ))
         
         return GroupPostResponse(
             post_id=post.post_id,
@@ -5487,8 +5853,8 @@ async def update_group_post(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"게시글 수정 에러: {e}")
+        await db.rollback()
+        logger.error("게시글 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="게시글 수정 중 오류가 발생했습니다."
@@ -5499,15 +5865,15 @@ async def delete_group_post(
     group_id: int,
     post_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글을 삭제합니다."""
     try:
-        post = db.query(GroupPost).filter(
+        post = await db.scalar(select(GroupPost).where(
             GroupPost.post_id == post_id,
             GroupPost.group_id == group_id,
             GroupPost.is_deleted == False
-        ).first()
+        ))
         
         if not post:
             raise HTTPException(
@@ -5516,12 +5882,12 @@ async def delete_group_post(
             )
         
         # 작성자 또는 관리자만 삭제 가능
-        member = db.query(GroupMember).filter(
+        member = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id,
             GroupMember.role.in_(['owner', 'admin']),
             GroupMember.is_active == True
-        ).first()
+        ))
         
         if post.author_id != current_user.user_id and not member:
             raise HTTPException(
@@ -5531,15 +5897,15 @@ async def delete_group_post(
         
         # 소프트 삭제
         post.is_deleted = True
-        db.commit()
+        await db.commit()
         
         return {"message": "게시글이 삭제되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"게시글 삭제 에러: {e}")
+        await db.rollback()
+        logger.error("게시글 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="게시글 삭제 중 오류가 발생했습니다."
@@ -5551,17 +5917,17 @@ async def create_group_post_comment(
     post_id: int,
     comment_data: GroupPostCommentCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글에 댓글을 작성합니다."""
     try:
         # 그룹 멤버 확인
-        member = db.query(GroupMember).filter(
+        member = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id,
             GroupMember.is_active == True,
             GroupMember.status == 'approved'
-        ).first()
+        ))
         
         if not member:
             raise HTTPException(
@@ -5576,10 +5942,10 @@ async def create_group_post_comment(
             parent_comment_id=comment_data.parent_comment_id
         )
         db.add(comment)
-        db.commit()
-        db.refresh(comment)
+        await db.commit()
+        await db.refresh(comment)
         
-        author = db.query(User).filter(User.user_id == comment.author_id).first()
+        author = await db.scalar(select(User).where(User.user_id == comment.author_id))
         
         return GroupPostCommentResponse(
             comment_id=comment.comment_id,
@@ -5595,8 +5961,8 @@ async def create_group_post_comment(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"댓글 생성 에러: {e}")
+        await db.rollback()
+        logger.error("댓글 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="댓글 생성 중 오류가 발생했습니다."
@@ -5607,18 +5973,18 @@ async def get_group_post_comments(
     group_id: int,
     post_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글 댓글 목록을 조회합니다."""
     try:
-        comments = db.query(GroupPostComment).filter(
+        comments = (await db.scalars(select(GroupPostComment).where(
             GroupPostComment.post_id == post_id,
             GroupPostComment.is_deleted == False
-        ).order_by(GroupPostComment.created_at.asc()).all()
+        ).order_by(GroupPostComment.created_at.asc()))).all()
         
         results = []
         for comment in comments:
-            author = db.query(User).filter(User.user_id == comment.author_id).first()
+            author = await db.scalar(select(User).where(User.user_id == comment.author_id))
             results.append(GroupPostCommentResponse(
                 comment_id=comment.comment_id,
                 post_id=comment.post_id,
@@ -5633,7 +5999,7 @@ async def get_group_post_comments(
         return GroupPostCommentListResponse(comments=results, total_count=len(results))
         
     except Exception as e:
-        print(f"댓글 목록 조회 에러: {e}")
+        logger.error("댓글 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="댓글 목록 조회 중 오류가 발생했습니다."
@@ -5646,16 +6012,16 @@ async def update_group_post_comment(
     comment_id: int,
     comment_data: GroupPostCommentUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글 댓글을 수정합니다."""
     try:
-        comment = db.query(GroupPostComment).filter(
+        comment = await db.scalar(select(GroupPostComment).where(
             GroupPostComment.comment_id == comment_id,
             GroupPostComment.post_id == post_id,
             GroupPostComment.author_id == current_user.user_id,
             GroupPostComment.is_deleted == False
-        ).first()
+        ))
         
         if not comment:
             raise HTTPException(
@@ -5666,10 +6032,10 @@ async def update_group_post_comment(
         if comment_data.content is not None:
             comment.content = comment_data.content
         
-        db.commit()
-        db.refresh(comment)
+        await db.commit()
+        await db.refresh(comment)
         
-        author = db.query(User).filter(User.user_id == comment.author_id).first()
+        author = await db.scalar(select(User).where(User.user_id == comment.author_id))
         
         return GroupPostCommentResponse(
             comment_id=comment.comment_id,
@@ -5685,8 +6051,8 @@ async def update_group_post_comment(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"댓글 수정 에러: {e}")
+        await db.rollback()
+        logger.error("댓글 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="댓글 수정 중 오류가 발생했습니다."
@@ -5698,15 +6064,15 @@ async def delete_group_post_comment(
     post_id: int,
     comment_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 게시글 댓글을 삭제합니다."""
     try:
-        comment = db.query(GroupPostComment).filter(
+        comment = await db.scalar(select(GroupPostComment).where(
             GroupPostComment.comment_id == comment_id,
             GroupPostComment.post_id == post_id,
             GroupPostComment.is_deleted == False
-        ).first()
+        ))
         
         if not comment:
             raise HTTPException(
@@ -5715,12 +6081,12 @@ async def delete_group_post_comment(
             )
         
         # 작성자 또는 관리자만 삭제 가능
-        member = db.query(GroupMember).filter(
+        member = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id,
             GroupMember.role.in_(['owner', 'admin']),
             GroupMember.is_active == True
-        ).first()
+        ))
         
         if comment.author_id != current_user.user_id and not member:
             raise HTTPException(
@@ -5730,15 +6096,15 @@ async def delete_group_post_comment(
         
         # 소프트 삭제
         comment.is_deleted = True
-        db.commit()
+        await db.commit()
         
         return {"message": "댓글이 삭제되었습니다."}
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"댓글 삭제 에러: {e}")
+        await db.rollback()
+        logger.error("댓글 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="댓글 삭제 중 오류가 발생했습니다."
@@ -5754,15 +6120,15 @@ async def upload_group_gallery_image(
     image: UploadFile = File(...),
     description: Optional[str] = Form(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """그룹 갤러리에 이미지를 업로드합니다."""
     try:
         # 그룹 존재 확인
-        group = db.query(Group).filter(
+        group = await db.scalar(select(Group).where(
             Group.group_id == group_id,
             Group.is_active == True
-        ).first()
+        ))
         
         if not group:
             raise HTTPException(
@@ -5771,11 +6137,11 @@ async def upload_group_gallery_image(
             )
         
         # 그룹 멤버 확인
-        member = db.query(GroupMember).filter(
+        member = await db.scalar(select(GroupMember).where(
             GroupMember.group_id == group_id,
             GroupMember.user_id == current_user.user_id,
             GroupMember.is_active == True
-        ).first()
+        ))
         
         if not member:
             raise HTTPException(
@@ -5827,8 +6193,8 @@ async def upload_group_gallery_image(
         )
         
         db.add(gallery_image)
-        db.commit()
-        db.refresh(gallery_image)
+        await db.commit()
+        await db.refresh(gallery_image)
         
         return GroupGalleryResponse(
             image_id=gallery_image.image_id,
@@ -5845,10 +6211,8 @@ async def upload_group_gallery_image(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        print(f"갤러리 이미지 업로드 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        await db.rollback()
+        logger.exception("갤러리 이미지 업로드 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 업로드 중 오류가 발생했습니다."
@@ -5860,15 +6224,15 @@ async def get_group_gallery_images(
     skip: int = 0,
     limit: int = 50,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """그룹 갤러리 이미지 목록을 조회합니다."""
     try:
         # 그룹 존재 확인
-        group = db.query(Group).filter(
+        group = await db.scalar(select(Group).where(
             Group.group_id == group_id,
             Group.is_active == True
-        ).first()
+        ))
         
         if not group:
             raise HTTPException(
@@ -5878,11 +6242,11 @@ async def get_group_gallery_images(
         
         # 비공개 그룹인 경우 멤버 확인
         if not group.is_public:
-            member = db.query(GroupMember).filter(
+            member = await db.scalar(select(GroupMember).where(
                 GroupMember.group_id == group_id,
                 GroupMember.user_id == current_user.user_id,
                 GroupMember.is_active == True
-            ).first()
+            ))
             
             if not member:
                 raise HTTPException(
@@ -5891,18 +6255,21 @@ async def get_group_gallery_images(
                 )
         
         # 갤러리 이미지 조회
-        images_query = db.query(GroupGallery).filter(
+        images_filter = (
             GroupGallery.group_id == group_id,
             GroupGallery.is_deleted == False
-        ).order_by(GroupGallery.created_at.desc())
+        )
         
-        total_count = images_query.count()
-        images = images_query.offset(skip).limit(limit).all()
+        total_count = await db.scalar(select(func.count()).select_from(GroupGallery).where(*images_filter))
+        images = (await db.scalars(
+            select(GroupGallery).where(*images_filter)
+            .order_by(GroupGallery.created_at.desc()).offset(skip).limit(limit)
+        )).all()
         
         # 업로더 정보 포함
         image_responses = []
         for img in images:
-            uploader = db.query(User).filter(User.user_id == img.uploaded_by).first()
+            uploader = await db.scalar(select(User).where(User.user_id == img.uploaded_by))
             image_responses.append(
                 GroupGalleryResponse(
                     image_id=img.image_id,
@@ -5925,16 +6292,14 @@ async def get_group_gallery_images(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"갤러리 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("갤러리 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="갤러리 조회 중 오류가 발생했습니다."
         )
 
 @app.delete("/groups/{group_id}/gallery/{image_id}")
-async def delete_group_gallery_image(
+def delete_group_gallery_image(
     group_id: int,
     image_id: int,
     current_user: User = Depends(get_current_user),
@@ -5979,7 +6344,7 @@ async def delete_group_gallery_image(
             if os.path.exists(image.image_url.lstrip('/')):
                 os.remove(image.image_url.lstrip('/'))
         except Exception as e:
-            print(f"파일 삭제 에러: {e}")
+            logger.error("파일 삭제 에러: %s", e)
         
         return {"message": "이미지가 삭제되었습니다."}
         
@@ -5987,9 +6352,7 @@ async def delete_group_gallery_image(
         raise
     except Exception as e:
         db.rollback()
-        print(f"이미지 삭제 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("이미지 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="이미지 삭제 중 오류가 발생했습니다."
@@ -6000,7 +6363,7 @@ async def delete_group_gallery_image(
 # =============================================================================
 
 @app.put("/groups/{group_id}/members/{user_id}/role/", response_model=GroupMemberResponse)
-async def update_group_member_role(
+def update_group_member_role(
     group_id: int,
     user_id: int,
     role_update: GroupMemberRoleUpdate,
@@ -6091,9 +6454,7 @@ async def update_group_member_role(
         raise
     except Exception as e:
         db.rollback()
-        print(f"멤버 역할 변경 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("멤버 역할 변경 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="멤버 역할 변경 중 오류가 발생했습니다."
@@ -6104,7 +6465,7 @@ async def update_group_member_role(
 # =============================================================================
 
 @app.post("/groups/{group_id}/meetings/", response_model=GroupMeetingResponse, status_code=status.HTTP_201_CREATED)
-async def create_group_meeting(
+def create_group_meeting(
     group_id: int,
     meeting_data: GroupMeetingCreate,
     current_user: User = Depends(get_current_user),
@@ -6172,16 +6533,14 @@ async def create_group_meeting(
         raise
     except Exception as e:
         db.rollback()
-        print(f"정기모임 생성 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("정기모임 생성 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="정기모임 생성 중 오류가 발생했습니다."
         )
 
 @app.get("/groups/{group_id}/meetings/", response_model=GroupMeetingListResponse)
-async def get_group_meetings(
+def get_group_meetings(
     group_id: int,
     skip: int = 0,
     limit: int = 50,
@@ -6259,16 +6618,14 @@ async def get_group_meetings(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"정기모임 목록 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("정기모임 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="정기모임 목록 조회 중 오류가 발생했습니다."
         )
 
 @app.get("/groups/{group_id}/meetings/{meeting_id}", response_model=GroupMeetingResponse)
-async def get_group_meeting(
+def get_group_meeting(
     group_id: int,
     meeting_id: int,
     current_user: User = Depends(get_current_user),
@@ -6333,16 +6690,14 @@ async def get_group_meeting(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"정기모임 상세 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("정기모임 상세 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="정기모임 상세 조회 중 오류가 발생했습니다."
         )
 
 @app.put("/groups/{group_id}/meetings/{meeting_id}", response_model=GroupMeetingResponse)
-async def update_group_meeting(
+def update_group_meeting(
     group_id: int,
     meeting_id: int,
     meeting_data: GroupMeetingUpdate,
@@ -6421,16 +6776,14 @@ async def update_group_meeting(
         raise
     except Exception as e:
         db.rollback()
-        print(f"정기모임 수정 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("정기모임 수정 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="정기모임 수정 중 오류가 발생했습니다."
         )
 
 @app.delete("/groups/{group_id}/meetings/{meeting_id}")
-async def delete_group_meeting(
+def delete_group_meeting(
     group_id: int,
     meeting_id: int,
     current_user: User = Depends(get_current_user),
@@ -6475,16 +6828,14 @@ async def delete_group_meeting(
         raise
     except Exception as e:
         db.rollback()
-        print(f"정기모임 삭제 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("정기모임 삭제 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="정기모임 삭제 중 오류가 발생했습니다."
         )
 
 @app.post("/groups/{group_id}/meetings/{meeting_id}/attend")
-async def attend_group_meeting(
+def attend_group_meeting(
     group_id: int,
     meeting_id: int,
     current_user: User = Depends(get_current_user),
@@ -6557,16 +6908,14 @@ async def attend_group_meeting(
         raise
     except Exception as e:
         db.rollback()
-        print(f"참석 신청 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("참석 신청 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="참석 신청 중 오류가 발생했습니다."
         )
 
 @app.delete("/groups/{group_id}/meetings/{meeting_id}/attend")
-async def cancel_attend_group_meeting(
+def cancel_attend_group_meeting(
     group_id: int,
     meeting_id: int,
     current_user: User = Depends(get_current_user),
@@ -6596,16 +6945,14 @@ async def cancel_attend_group_meeting(
         raise
     except Exception as e:
         db.rollback()
-        print(f"참석 취소 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("참석 취소 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="참석 취소 중 오류가 발생했습니다."
         )
 
 @app.get("/groups/{group_id}/meetings/{meeting_id}/attendees")
-async def get_meeting_attendees(
+def get_meeting_attendees(
     group_id: int,
     meeting_id: int,
     current_user: User = Depends(get_current_user),
@@ -6670,9 +7017,7 @@ async def get_meeting_attendees(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"참석자 목록 조회 에러: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("참석자 목록 조회 에러: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="참석자 목록 조회 중 오류가 발생했습니다."
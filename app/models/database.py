@@ -1,9 +1,16 @@
 import os
-from sqlalchemy import create_engine
+import asyncio
+import logging
+import time
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
 
+from app.monitoring.pool_stats import PoolStats, InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
+from app.monitoring import query_stats
+
 # 환경변수 로드
 load_dotenv()
 
@@ -13,28 +20,109 @@ DB_PORT = os.getenv("DB_PORT", "3306")
 DB_USER = os.getenv("DB_USER", "pjh") 
 DB_PASSWORD = os.getenv("DB_PASSWORD", "qkrwngh2350@")
 DB_NAME = os.getenv("DB_NAME", "syncup")
+# 비동기 드라이버 (asyncmy 또는 aiomysql)
+DB_ASYNC_DRIVER = os.getenv("DB_ASYNC_DRIVER", "asyncmy")
+
+# 커넥션 풀 설정 (워커당 값, 엔진마다 별도 풀)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))            # 유지할 커넥션 수
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))     # pool_size 초과 시 추가로 허용할 커넥션 수
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))   # 커넥션 대여 대기 최대 시간 (초)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))   # 커넥션 재생성 주기 (초)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # 대여 시 연결 유효성 검사
+
+# 읽기 전용 복제본(replica) 설정 (DB_REPLICA_HOST가 없으면 primary만 사용)
+DB_REPLICA_HOST = os.getenv("DB_REPLICA_HOST")
+DB_REPLICA_PORT = os.getenv("DB_REPLICA_PORT", DB_PORT)
+DB_REPLICA_USER = os.getenv("DB_REPLICA_USER", DB_USER)
+DB_REPLICA_PASSWORD = os.getenv("DB_REPLICA_PASSWORD", DB_PASSWORD)
+DB_REPLICA_NAME = os.getenv("DB_REPLICA_NAME", DB_NAME)
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))        # 허용 복제 지연
+DB_REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_LAG_CHECK_INTERVAL", "10"))  # 지연 확인 주기 (초)
+
+logger = logging.getLogger(__name__)
 
 # 데이터베이스 URL 구성 (PyMySQL 사용)
 # 비밀번호에 특수문자가 있을 경우 URL 인코딩
 import urllib.parse
 encoded_password = urllib.parse.quote_plus(DB_PASSWORD)
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+ASYNC_DATABASE_URL = f"mysql+{DB_ASYNC_DRIVER}://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
+REPLICA_ASYNC_DATABASE_URL = None
+if DB_REPLICA_HOST:
+    encoded_replica_password = urllib.parse.quote_plus(DB_REPLICA_PASSWORD)
+    REPLICA_ASYNC_DATABASE_URL = (
+        f"mysql+{DB_ASYNC_DRIVER}://{DB_REPLICA_USER}:{encoded_replica_password}"
+        f"@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_REPLICA_NAME}?charset=utf8mb4"
+    )
 
 # SQLAlchemy 엔진 생성
 engine = create_engine(
     DATABASE_URL,
     echo=False,  # 개발 시 True로 설정하면 SQL 쿼리 로그 출력
-    pool_pre_ping=True,  # 연결 유효성 검사
-    pool_recycle=3600,   # 1시간마다 연결 재생성
+    poolclass=InstrumentedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=DB_POOL_PRE_PING,  # 연결 유효성 검사
+    pool_recycle=DB_POOL_RECYCLE,    # 주기적으로 연결 재생성
+)
+
+# 비동기 SQLAlchemy 엔진 생성 (이벤트 루프를 막지 않는 DB I/O)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_pre_ping=DB_POOL_PRE_PING,
+    pool_recycle=DB_POOL_RECYCLE,
 )
 
+# 읽기 전용 복제본 엔진 (설정된 경우에만)
+replica_async_engine = None
+if REPLICA_ASYNC_DATABASE_URL:
+    replica_async_engine = create_async_engine(
+        REPLICA_ASYNC_DATABASE_URL,
+        echo=False,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+
+# 커넥션 풀 통계
+pool_stats = {
+    "primary": PoolStats("primary").attach(engine),
+    "primary_async": PoolStats("primary_async").attach(async_engine.sync_engine),
+}
+if replica_async_engine is not None:
+    pool_stats["replica_async"] = PoolStats("replica_async").attach(replica_async_engine.sync_engine)
+
+# 요청별 쿼리 수/DB 시간 집계
+if query_stats.QUERY_STATS_ENABLED:
+    query_stats.attach(engine)
+    query_stats.attach(async_engine.sync_engine)
+    if replica_async_engine is not None:
+        query_stats.attach(replica_async_engine.sync_engine)
+
 # 세션 로컬 클래스
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 세션 클래스
+# expire_on_commit=False: 커밋 후에도 속성 접근 시 추가 쿼리(지연 로딩)가 발생하지 않도록 함
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+ReplicaAsyncSessionLocal = None
+if replica_async_engine is not None:
+    ReplicaAsyncSessionLocal = async_sessionmaker(bind=replica_async_engine, autoflush=False, expire_on_commit=False)
+
 # Base 클래스
 Base = declarative_base()
 
 # 데이터베이스 세션 의존성
+# 동기 세션이므로 이 의존성을 쓰는 엔드포인트는 async def가 아닌 def로 선언 (스레드풀에서 실행되어 이벤트 루프를 막지 않음)
 def get_db():
     db = SessionLocal()
     try:
@@ -42,106 +130,99 @@ def get_db():
     finally:
         db.close()
 
-# 데이터베이스 테이블 생성
-def create_tables():
+# 비동기 데이터베이스 세션 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# 비동기 세션 팩토리 의존성 (WebSocket처럼 오래 유지되는 연결에서 작업 단위마다 짧은 세션을 열 때 사용)
+def get_async_session_factory() -> async_sessionmaker:
+    return AsyncSessionLocal
+
+class ReplicaRouter:
     """
-    FOREIGN KEY 제약조건 없이 테이블 생성
-    (데이터베이스 사용자에게 REFERENCES 권한이 없는 경우)
-    
-    참고: ForeignKey 제약조건이 없어도 SQLAlchemy의 relationship은 정상 작동합니다.
-    애플리케이션 레벨에서 참조 무결성을 관리해야 합니다.
+    읽기 요청을 복제본으로 보낼지 결정
+    복제 지연(Seconds_Behind_Master)을 주기적으로 확인하여 허용치를 넘거나
+    확인에 실패하면 primary로 되돌립니다.
     """
-    from sqlalchemy import event, inspect
-    from sqlalchemy.schema import DDL
-    import re
-    
-    # SQL 실행 전에 FOREIGN KEY 제거하는 이벤트 리스너
-    @event.listens_for(engine, "before_cursor_execute", retval=True)
-    def remove_foreign_keys(conn, cursor, statement, parameters, context, executemany):
-        # statement가 문자열인 경우에만 처리
-        if isinstance(statement, str):
-            original = statement
-            upper_stmt = statement.upper()
-            
-            # CREATE TABLE 문인지 확인
-            if "CREATE TABLE" in upper_stmt:
-                # 1. 테이블 레벨 FOREIGN KEY 제약조건 제거 (FOREIGN KEY(...) REFERENCES ... 전체)
-                statement = re.sub(
-                    r',\s*FOREIGN\s+KEY\s*\([^)]+\)\s*REFERENCES\s+[`"]?(\w+)[`"]?\.?[`"]?(\w+)[`"]?\s*\([^)]+\)',
-                    '',
-                    statement,
-                    flags=re.IGNORECASE | re.MULTILINE
-                )
-                # 2. 컬럼 정의 내부의 REFERENCES 제거 (컬럼 타입 뒤의 REFERENCES ...)
-                statement = re.sub(
-                    r'\s+REFERENCES\s+[`"]?(\w+)[`"]?\.?[`"]?(\w+)[`"]?\s*\([^)]+\)',
-                    '',
-                    statement,
-                    flags=re.IGNORECASE
-                )
-                # 3. FOREIGN KEY(컬럼) 만 남은 경우 제거 (REFERENCES가 이미 제거되어 FOREIGN KEY만 남은 경우)
-                # 마지막에 오는 경우: , FOREIGN KEY(...) )
-                statement = re.sub(
-                    r',\s*FOREIGN\s+KEY\s*\([^)]+\)\s*\)',
-                    ')',
-                    statement,
-                    flags=re.IGNORECASE
-                )
-                # 중간에 오는 경우: , FOREIGN KEY(...) ,
-                statement = re.sub(
-                    r',\s*FOREIGN\s+KEY\s*\([^)]+\)\s*,',
-                    ',',
-                    statement,
-                    flags=re.IGNORECASE
-                )
-                # 줄 끝에 오는 경우
-                statement = re.sub(
-                    r',\s*FOREIGN\s+KEY\s*\([^)]+\)\s*$',
-                    '',
-                    statement,
-                    flags=re.IGNORECASE | re.MULTILINE
-                )
-                
-                if statement != original:
-                    return statement, parameters
-        
-        return statement, parameters
-    
-    try:
-        # 테이블 생성 시도
-        Base.metadata.create_all(bind=engine, checkfirst=True)
-        print("✅ 데이터베이스 테이블 생성/확인 완료")
-    except Exception as e:
-        error_str = str(e)
-        
-        # 데이터베이스 연결 오류인 경우
-        if "2003" in error_str or "Connection refused" in error_str or "Can't connect" in error_str:
-            print("❌ 데이터베이스 연결 실패")
-            print(f"   호스트: {DB_HOST}:{DB_PORT}")
-            print(f"   데이터베이스: {DB_NAME}")
-            print("   가능한 원인:")
-            print("   1. 데이터베이스 서버가 실행 중이 아닙니다")
-            print("   2. 네트워크 연결 문제 (인터넷/VPN 확인)")
-            print("   3. 호스트/포트 정보가 잘못되었습니다")
-            print("   4. 방화벽이 포트를 차단하고 있습니다")
-            print(f"   에러 상세: {error_str[:200]}")
-            # 연결 오류는 앱 시작을 막지 않도록 경고만 출력
-            print("⚠️  데이터베이스 연결 실패로 앱이 시작되었지만, DB 기능은 사용할 수 없습니다.")
-            return
-        
-        # FOREIGN KEY 권한 오류인 경우
-        elif "REFERENCES" in error_str or "1142" in error_str:
-            print("⚠️  FOREIGN KEY 권한 오류 발생")
-            print("   이벤트 리스너로 FOREIGN KEY를 제거하려고 시도했지만 실패했습니다.")
-            print("   해결 방법:")
-            print("   1. 데이터베이스 관리자에게 REFERENCES 권한 요청")
-            print("   2. 또는 FOREIGN KEY 없이 테이블을 수동으로 생성")
-            print(f"   에러: {error_str[:300]}")
-            # 에러를 다시 발생시켜서 사용자가 알 수 있도록 함
-            raise Exception(f"FOREIGN KEY 권한 오류: {error_str[:200]}")
+
+    def __init__(self, max_lag_seconds: float, check_interval: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.healthy = replica_async_engine is not None
+        self.last_lag = None
+        self.last_checked = 0.0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._lock = asyncio.Lock()
+
+    async def use_replica(self) -> bool:
+        """이번 요청에서 복제본을 사용할지 여부"""
+        if replica_async_engine is None:
+            return False
+        if time.monotonic() - self.last_checked >= self.check_interval:
+            async with self._lock:
+                if time.monotonic() - self.last_checked >= self.check_interval:
+                    await self.check_lag()
+        return self.healthy
+
+    def record_read(self, used_replica: bool):
+        """실제로 조회를 실행한 요청만 집계 (세션을 받고 다른 세션으로 조회한 요청은 제외)"""
+        if used_replica:
+            self.replica_reads += 1
         else:
-            # 다른 오류는 그대로 발생시킴
-            print(f"❌ 데이터베이스 초기화 에러: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
+            self.primary_fallbacks += 1
+
+    async def check_lag(self):
+        """복제 지연 확인 (복제 설정이 없는 단독 DB는 지연 0으로 간주)"""
+        self.last_checked = time.monotonic()
+        try:
+            async with replica_async_engine.connect() as conn:
+                result = await conn.execute(text("SHOW SLAVE STATUS"))
+                row = result.mappings().first()
+            if row is None:
+                lag = 0.0
+            else:
+                seconds_behind = row.get("Seconds_Behind_Master")
+                # NULL이면 복제가 중단된 상태
+                lag = float(seconds_behind) if seconds_behind is not None else float("inf")
+            self.last_lag = lag
+            healthy = lag <= self.max_lag_seconds
+        except Exception as e:
+            self.last_lag = None
+            healthy = False
+            logger.warning("복제본 상태 확인 실패, primary로 전환: %s", e)
+        if healthy != self.healthy:
+            logger.warning("복제본 %s (지연: %s초)", "사용 재개" if healthy else "사용 중단", self.last_lag)
+        self.healthy = healthy
+
+    def snapshot(self):
+        return {
+            "configured": replica_async_engine is not None,
+            "healthy": self.healthy,
+            "last_lag_seconds": self.last_lag,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+replica_router = ReplicaRouter(DB_REPLICA_MAX_LAG_SECONDS, DB_REPLICA_LAG_CHECK_INTERVAL)
+
+# 읽기 전용 데이터베이스 세션 의존성
+# 복제본이 설정되어 있고 지연이 허용치 이내이면 복제본, 아니면 primary 세션을 반환합니다.
+# 이 세션으로는 쓰기 작업을 하지 마세요.
+async def get_read_db():
+    use_replica = await replica_router.use_replica()
+    session_factory = ReplicaAsyncSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as db:
+        try:
+            yield db
+        finally:
+            # 첫 쿼리에서 트랜잭션이 시작되므로, 트랜잭션이 없으면 이 세션으로 조회하지 않은 요청
+            if replica_async_engine is not None and db.in_transaction():
+                replica_router.record_read(use_replica)
+
+# 커넥션 풀 통계 조회
+def get_pool_stats():
+    return [stats.snapshot() for stats in pool_stats.values()]
@@ -0,0 +1,391 @@
+"""
+데이터베이스 스키마 부트스트랩 / 마이그레이션
+
+배포 시 한 번만 실행하는 명령입니다. 앱 시작(startup) 시에는 스키마를 건드리지 않고
+미적용 마이그레이션이 있는지만 확인합니다.
+
+실행 방법:
+   python -m app.models.migrations            # 미적용 마이그레이션 모두 적용
+   python -m app.models.migrations --status   # 적용 현황만 출력
+   python -m app.models.migrations --explain  # 주요 조회 쿼리의 EXPLAIN 확인 (풀 스캔이 있으면 종료 코드 1)
+
+적용된 버전은 schema_migrations 테이블에 기록됩니다.
+
+참고: 데이터베이스 사용자에게 REFERENCES 권한이 없는 경우를 위해 FOREIGN KEY 제약조건 없이
+테이블을 생성합니다. ForeignKey 제약조건이 없어도 SQLAlchemy의 relationship은 정상 작동하며,
+참조 무결성은 애플리케이션 레벨에서 관리합니다.
+"""
+import sys
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from sqlalchemy import bindparam, func, insert, inspect, or_, select, text, update
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.models.database import Base, engine, async_engine, DB_HOST, DB_PORT, DB_NAME
+from app.models.models import (
+    ChatMessage, ChatParticipant, ChatRoom, EmailVerification, FriendRelationship, GroupMeetingAttendee,
+    GroupMember, MatchingRequest, MessageSearchTerm, Notification,
+)
+from app.services.search_service import MessageSearchService
+
+MIGRATIONS_TABLE = "schema_migrations"
+
+
+def create_missing_tables(conn):
+    """FOREIGN KEY 제약조건 없이 누락된 테이블과 인덱스 생성"""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+
+    for table in Base.metadata.sorted_tables:
+        if table.name in existing_tables:
+            continue
+        conn.execute(CreateTable(table, include_foreign_key_constraints=[]))
+        for index in table.indexes:
+            conn.execute(CreateIndex(index))
+        print(f"   + 테이블 생성: {table.name}")
+
+
+def create_missing_indexes(conn, table_names: List[str]):
+    """기존 테이블에 모델에 선언된 인덱스 중 누락된 것만 생성"""
+    inspector = inspect(conn)
+    for table_name in table_names:
+        table = Base.metadata.tables[table_name]
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table_name)}
+        for index in table.indexes:
+            if index.name in existing_indexes:
+                continue
+            conn.execute(CreateIndex(index))
+            print(f"   + 인덱스 생성: {table_name}.{index.name}")
+
+
+def add_missing_columns(conn, table_name: str, column_names: List[str]):
+    """기존 테이블에 모델에 선언된 컬럼 중 누락된 것만 추가"""
+    inspector = inspect(conn)
+    existing_columns = {column["name"] for column in inspector.get_columns(table_name)}
+    table = Base.metadata.tables[table_name]
+    ddl_compiler = conn.dialect.ddl_compiler(conn.dialect, None)
+    for column_name in column_names:
+        if column_name in existing_columns:
+            continue
+        column_spec = ddl_compiler.get_column_specification(table.c[column_name])
+        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_spec}"))
+        print(f"   + 컬럼 추가: {table_name}.{column_name}")
+
+
+def add_hot_path_indexes(conn):
+    """자주 사용되는 조회 조건용 복합 인덱스 추가"""
+    create_missing_indexes(conn, [
+        "chat_messages",
+        "chat_participants",
+        "friend_relationships",
+        "group_members",
+        "notifications",
+        "email_verifications",
+        "matching_requests",
+        "group_meeting_attendees",
+    ])
+
+
+def widen_password_hash(conn):
+    """passlib 해시를 저장할 수 있도록 users.password_hash 길이 확장"""
+    # SQLite 등은 VARCHAR 길이를 강제하지 않으므로 MariaDB/MySQL에서만 변경
+    if conn.dialect.name in ("mysql", "mariadb"):
+        conn.execute(text("ALTER TABLE users MODIFY password_hash VARCHAR(255) NOT NULL"))
+        print("   + 컬럼 변경: users.password_hash VARCHAR(255)")
+
+
+def add_chat_counters(conn):
+    """채팅방 마지막 메시지 정보와 참여자별 읽지 않은 메시지 수 컬럼 추가 및 기존 데이터로 채우기"""
+    add_missing_columns(conn, "chat_rooms", ["last_message_id", "last_message_at", "last_message_preview"])
+    add_missing_columns(conn, "chat_participants", ["unread_count"])
+
+    messages = ChatMessage.__table__
+    rooms = ChatRoom.__table__
+
+    last_message_id = select(func.max(messages.c.message_id)).where(
+        messages.c.room_id == rooms.c.room_id,
+        messages.c.is_deleted == False
+    ).scalar_subquery()
+    conn.execute(update(rooms).values(last_message_id=last_message_id, updated_at=rooms.c.updated_at))
+
+    last_message = messages.alias("last_message")
+    conn.execute(update(rooms).where(rooms.c.last_message_id.isnot(None)).values(
+        last_message_at=select(last_message.c.created_at).where(
+            last_message.c.message_id == rooms.c.last_message_id
+        ).scalar_subquery(),
+        last_message_preview=select(func.substr(last_message.c.message_content, 1, 100)).where(
+            last_message.c.message_id == rooms.c.last_message_id
+        ).scalar_subquery(),
+        updated_at=rooms.c.updated_at
+    ))
+
+    recompute_unread_counts(conn)
+    print("   + 기존 채팅 데이터로 마지막 메시지/읽지 않은 수 계산 완료")
+
+
+def recompute_unread_counts(conn):
+    """
+    참여자별 읽지 않은 메시지 수를 메시지 테이블에서 다시 계산
+    ChatService와 같은 기준: 다른 사람이 참여(joined_at) 이후에 보냈고 마지막으로 읽은 시각(last_read_at) 이후인 삭제되지 않은 메시지
+    """
+    messages = ChatMessage.__table__
+    participants = ChatParticipant.__table__
+    conn.execute(update(participants).values(
+        unread_count=select(func.count()).select_from(messages).where(
+            messages.c.room_id == participants.c.room_id,
+            messages.c.sender_id != participants.c.user_id,
+            messages.c.is_deleted == False,
+            or_(participants.c.joined_at.is_(None), messages.c.created_at >= participants.c.joined_at),
+            or_(participants.c.last_read_at.is_(None), messages.c.created_at > participants.c.last_read_at)
+        ).scalar_subquery()
+    ))
+
+
+def add_message_cursor_index(conn):
+    """커서 기반 메시지 페이지네이션용 (room_id, is_deleted, message_id) 인덱스 추가"""
+    create_missing_indexes(conn, ["chat_messages"])
+
+
+def add_message_search_index(conn, batch_size: int = 1000):
+    """메시지 검색 n-gram 색인 테이블 생성 및 기존 메시지 색인"""
+    create_missing_tables(conn)
+
+    messages = ChatMessage.__table__
+    last_message_id = 0
+    indexed = 0
+    while True:
+        rows = conn.execute(
+            select(messages.c.message_id, messages.c.room_id, messages.c.message_content).where(
+                messages.c.message_id > last_message_id,
+                messages.c.is_deleted == False
+            ).order_by(messages.c.message_id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        terms = [
+            {"room_id": room_id, "term": term, "message_id": message_id, "term_count": count}
+            for message_id, room_id, content in rows
+            for term, count in MessageSearchService.tokenize(content).items()
+        ]
+        if terms:
+            conn.execute(insert(MessageSearchTerm.__table__), terms)
+        last_message_id = rows[-1].message_id
+        indexed += len(rows)
+    print(f"   + 기존 메시지 {indexed}개 검색 색인 완료")
+
+
+def add_message_seq(conn, batch_size: int = 1000):
+    """채팅방별 메시지 순번(chat_messages.seq, chat_rooms.last_seq) 추가 및 기존 메시지에 message_id 순서로 발급"""
+    add_missing_columns(conn, "chat_rooms", ["last_seq"])
+    add_missing_columns(conn, "chat_messages", ["seq"])
+    create_missing_indexes(conn, ["chat_messages"])
+
+    messages = ChatMessage.__table__
+    rooms = ChatRoom.__table__
+    # 같은 테이블을 참조하는 UPDATE 서브쿼리는 MariaDB에서 사용할 수 없으므로 채팅방별로 나눠서 발급
+    room_ids = conn.execute(select(messages.c.room_id).distinct()).scalars().all()
+    for room_id in room_ids:
+        seq = 0
+        last_message_id = 0
+        while True:
+            message_ids = conn.execute(
+                select(messages.c.message_id).where(
+                    messages.c.room_id == room_id,
+                    messages.c.message_id > last_message_id
+                ).order_by(messages.c.message_id).limit(batch_size)
+            ).scalars().all()
+            if not message_ids:
+                break
+            conn.execute(
+                update(messages).where(messages.c.message_id == bindparam("target_id")).values(seq=bindparam("new_seq")),
+                [{"target_id": message_id, "new_seq": seq + i + 1} for i, message_id in enumerate(message_ids)]
+            )
+            seq += len(message_ids)
+            last_message_id = message_ids[-1]
+        conn.execute(update(rooms).where(rooms.c.room_id == room_id).values(last_seq=seq, updated_at=rooms.c.updated_at))
+    print(f"   + 채팅방 {len(room_ids)}개의 기존 메시지 순번 발급 완료")
+
+
+# (버전, 설명, 적용 함수) - 새 마이그레이션은 항상 목록 끝에 추가
+def add_token_revocation(conn):
+    """비밀번호 변경/재설정 시 토큰 폐기 기준 시각(users.tokens_valid_after)과 로그아웃 토큰 테이블(revoked_tokens) 추가"""
+    add_missing_columns(conn, "users", ["tokens_valid_after"])
+    create_missing_tables(conn)
+
+
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "초기 스키마 (FOREIGN KEY 제외)", create_missing_tables),
+    (2, "주요 조회 경로 인덱스 추가", add_hot_path_indexes),
+    (3, "비밀번호 해시 컬럼 길이 확장", widen_password_hash),
+    (4, "채팅방 마지막 메시지/읽지 않은 메시지 수 컬럼 추가", add_chat_counters),
+    (5, "메시지 커서 페이지네이션 인덱스 추가", add_message_cursor_index),
+    (6, "메시지 검색 n-gram 색인 추가", add_message_search_index),
+    (7, "메시지 ID 블록 할당 테이블 추가", create_missing_tables),
+    (8, "채팅방별 메시지 순번 추가", add_message_seq),
+    (9, "토큰 폐기 기준 시각/로그아웃 토큰 테이블 추가", add_token_revocation),
+    (10, "읽지 않은 메시지 수 재계산 (참여 이전 메시지 제외)", recompute_unread_counts),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def _ensure_migrations_table(conn):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {MIGRATIONS_TABLE} ("
+        "version INTEGER NOT NULL PRIMARY KEY, "
+        "description VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+
+
+def _applied_versions(conn) -> Set[int]:
+    return {row[0] for row in conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))}
+
+
+def run_migrations(bind=engine) -> int:
+    """미적용 마이그레이션을 순서대로 적용하고 적용한 개수 반환"""
+    with bind.begin() as conn:
+        _ensure_migrations_table(conn)
+        applied = _applied_versions(conn)
+
+    count = 0
+    for version, description, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        print(f"🛠️  마이그레이션 {version} 적용 중: {description}")
+        # 마이그레이션마다 별도 트랜잭션 (MariaDB DDL은 자동 커밋되므로 실패 시 재실행 가능하도록 작성)
+        with bind.begin() as conn:
+            migrate(conn)
+            conn.execute(
+                text(f"INSERT INTO {MIGRATIONS_TABLE} (version, description) VALUES (:version, :description)"),
+                {"version": version, "description": description},
+            )
+        count += 1
+    return count
+
+
+def print_status(bind=engine):
+    """마이그레이션 적용 현황 출력"""
+    with bind.begin() as conn:
+        _ensure_migrations_table(conn)
+        applied = _applied_versions(conn)
+    for version, description, _ in MIGRATIONS:
+        mark = "✅" if version in applied else "⏳"
+        print(f"{mark} {version}: {description}")
+
+
+async def check_pending_migrations() -> List[int]:
+    """
+    미적용 마이그레이션 버전 목록 (앱 시작 시 확인용)
+    schema_migrations 테이블이 없으면 모든 버전을 반환합니다.
+    """
+    async with async_engine.connect() as conn:
+        has_table = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(MIGRATIONS_TABLE))
+        applied = set()
+        if has_table:
+            result = await conn.execute(text(f"SELECT version FROM {MIGRATIONS_TABLE}"))
+            applied = {row[0] for row in result}
+    return [version for version, _, _ in MIGRATIONS if version not in applied]
+
+
+# EXPLAIN으로 확인할 주요 조회 쿼리 (app/main.py의 조회 조건과 동일)
+HOT_QUERIES = {
+    "채팅방 메시지 목록": select(ChatMessage).where(
+        ChatMessage.room_id == 1, ChatMessage.is_deleted == False, ChatMessage.message_id < 1000000
+    ).order_by(ChatMessage.message_id.desc()).limit(51),
+    "메시지 검색 후보": select(ChatMessage).where(
+        *MessageSearchService.build_filters(1, "기말고사", rare_term="기말")
+    ).order_by(ChatMessage.message_id.desc()).limit(21),
+    "메시지 관련도 검색": MessageSearchService.relevance_query(1, "안녕하세요")[0].limit(21),
+    "참여 중인 채팅방 검색 색인": select(MessageSearchTerm.message_id).where(
+        MessageSearchTerm.room_id.in_(MessageSearchService.active_rooms(1)), MessageSearchTerm.term == "안녕"
+    ),
+    "재연결 시 놓친 메시지": select(ChatMessage).where(
+        ChatMessage.room_id == 1, ChatMessage.seq > 1000, ChatMessage.is_deleted == False
+    ).order_by(ChatMessage.seq).limit(501),
+    "참여 중인 채팅방": select(ChatParticipant).where(
+        ChatParticipant.user_id == 1, ChatParticipant.is_active == True
+    ),
+    "친구 목록": select(FriendRelationship).where(
+        or_(FriendRelationship.user1_id == 1, FriendRelationship.user2_id == 1),
+        FriendRelationship.is_active == True,
+    ),
+    "가입한 그룹": select(GroupMember).where(
+        GroupMember.user_id == 1, GroupMember.is_active == True
+    ),
+    "유형별 알림 개수": select(Notification.notification_id).where(
+        Notification.user_id == 1, Notification.notification_type == "chat"
+    ),
+    "이메일 인증번호 확인": select(EmailVerification).where(
+        EmailVerification.email == "user@example.com",
+        EmailVerification.purpose == "email_verification",
+        EmailVerification.is_used == False,
+    ),
+    "받은 매칭 요청": select(MatchingRequest).where(
+        MatchingRequest.requested_id == 1, MatchingRequest.status == "pending"
+    ),
+    "모임 참석자": select(GroupMeetingAttendee).where(
+        GroupMeetingAttendee.meeting_id == 1, GroupMeetingAttendee.status == "attending"
+    ),
+}
+
+
+def explain_hot_queries(bind=engine) -> List[Dict[str, Any]]:
+    """
+    HOT_QUERIES를 EXPLAIN하여 테이블 풀 스캔(type=ALL) 여부 확인
+    (데이터가 거의 없는 테이블은 옵티마이저가 풀 스캔을 선택할 수 있으므로 실제 데이터가 있는 DB에서 실행)
+    """
+    report = []
+    with bind.connect() as conn:
+        for name, statement in HOT_QUERIES.items():
+            sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+            rows = [dict(row) for row in conn.execute(text(f"EXPLAIN {sql}")).mappings()]
+            full_scans = [row.get("table") for row in rows if row.get("type") == "ALL"]
+            report.append({
+                "query": name,
+                "keys": [row.get("key") for row in rows],
+                "full_scans": full_scans,
+            })
+    return report
+
+
+def main(argv: List[str]) -> int:
+    try:
+        if "--status" in argv:
+            print_status()
+            return 0
+        if "--explain" in argv:
+            report = explain_hot_queries()
+            for item in report:
+                mark = "❌" if item["full_scans"] else "✅"
+                print(f"{mark} {item['query']}: 인덱스 {item['keys']}, 풀 스캔 {item['full_scans']}")
+            return 1 if any(item["full_scans"] for item in report) else 0
+        count = run_migrations()
+    except Exception as e:
+        error_str = str(e)
+
+        # 데이터베이스 연결 오류인 경우
+        if "2003" in error_str or "Connection refused" in error_str or "Can't connect" in error_str:
+            print("❌ 데이터베이스 연결 실패")
+            print(f"   호스트: {DB_HOST}:{DB_PORT}")
+            print(f"   데이터베이스: {DB_NAME}")
+            print(f"   에러 상세: {error_str[:200]}")
+        # 권한 오류인 경우
+        elif "1142" in error_str:
+            print("❌ 권한 오류: 데이터베이스 사용자에게 CREATE/INDEX 권한이 필요합니다.")
+            print(f"   에러: {error_str[:300]}")
+        else:
+            print(f"❌ 마이그레이션 실패: {e}")
+            import traceback
+            traceback.print_exc()
+        return 1
+
+    if count:
+        print(f"✅ 마이그레이션 {count}개 적용 완료 (현재 버전: {LATEST_VERSION})")
+    else:
+        print(f"✅ 스키마가 최신 상태입니다 (현재 버전: {LATEST_VERSION})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
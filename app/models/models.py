@@ -1,6 +1,7 @@
 from sqlalchemy import Column, Integer, String, Date, Enum, Boolean, TIMESTAMP, DateTime, Time, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.mysql import VARCHAR
 from app.models.database import Base
 
 class User(Base):
@@ -8,8 +9,8 @@ class User(Base):
     
     user_id = Column(Integer, primary_key=True, autoincrement=True)
     email = Column(String(255), nullable=False, unique=True)
-    password_hash = Column(String(64), nullable=False)  # SHA-256 해시 (HEX 64자)
-    salt = Column(String(32), nullable=False)           # Salt (16바이트를 HEX로 표현)
+    password_hash = Column(String(255), nullable=False)  # passlib 해시 (기존 계정은 SHA-256 HEX 64자)
+    salt = Column(String(32), nullable=False)            # 기존 SHA-256 방식의 Salt (passlib 해시는 빈 문자열)
     name = Column(String(100), nullable=False)
     birth_date = Column(Date, nullable=False)
     gender = Column(Enum('M', 'F'), nullable=False)
@@ -17,6 +18,7 @@ class User(Base):
     phone_number = Column(String(20), nullable=True)  # 연락처 필드 추가
     terms_agreed = Column(Boolean, nullable=False, default=False)
     created_at = Column(TIMESTAMP, default=func.current_timestamp())
+    tokens_valid_after = Column(DateTime, nullable=True)  # 이 시각(UTC) 이전에 발급된 토큰 거부 (가입/비밀번호 변경·재설정)
     
     # 관계 설정
     subjects = relationship("Subject", back_populates="user")
@@ -41,6 +43,11 @@ class EmailVerification(Base):
     expires_at = Column(DateTime, nullable=False)
     created_at = Column(TIMESTAMP, default=func.current_timestamp())
     
+    # 인덱스 (인증번호 확인 시 이메일/용도/사용여부로 조회)
+    __table_args__ = (
+        Index('idx_email_purpose_used', 'email', 'purpose', 'is_used'),
+    )
+    
     def __repr__(self):
         return f"<EmailVerification(email='{self.email}', code='{self.verification_code}', purpose='{self.purpose}')>"
 
@@ -109,6 +116,11 @@ class ChatRoom(Base):
     is_active = Column(Boolean, nullable=False, default=True)  # 활성 상태
     created_at = Column(TIMESTAMP, default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, default=func.current_timestamp(), onupdate=func.current_timestamp())
+    # 마지막 메시지 정보 (메시지 저장/삭제 시 ChatService가 함께 갱신)
+    last_message_id = Column(Integer, nullable=True)
+    last_message_at = Column(TIMESTAMP, nullable=True)
+    last_message_preview = Column(String(100), nullable=True)
+    last_seq = Column(Integer, nullable=False, default=0, server_default="0")  # 마지막으로 발급한 메시지 순번 (ChatMessage.seq)
     
     # 관계 설정
     creator = relationship("User", foreign_keys=[created_by])
@@ -130,6 +142,7 @@ class ChatParticipant(Base):
     last_read_at = Column(TIMESTAMP, nullable=True)  # 마지막 읽은 시간
     is_active = Column(Boolean, nullable=False, default=True)  # 참여 상태
     notification_enabled = Column(Boolean, nullable=False, default=True)  # 알림 설정
+    unread_count = Column(Integer, nullable=False, default=0, server_default="0")  # 읽지 않은 메시지 수 (ChatService가 갱신)
     
     # 관계 설정
     chat_room = relationship("ChatRoom", back_populates="participants")
@@ -138,6 +151,7 @@ class ChatParticipant(Base):
     # 복합 유니크 키 (같은 방에 같은 사용자 중복 방지)
     __table_args__ = (
         Index('idx_room_user', 'room_id', 'user_id'),
+        Index('idx_participant_user_active', 'user_id', 'is_active'),
     )
     
     def __repr__(self):
@@ -161,6 +175,7 @@ class ChatMessage(Base):
     edited_at = Column(TIMESTAMP, nullable=True)  # 수정 시간
     created_at = Column(TIMESTAMP, default=func.current_timestamp())
     updated_at = Column(TIMESTAMP, default=func.current_timestamp(), onupdate=func.current_timestamp())
+    seq = Column(Integer, nullable=True)  # 채팅방 안에서 1씩 증가하는 순번 (WebSocket 재연결 시 놓친 메시지 재전송)
     
     # 관계 설정
     chat_room = relationship("ChatRoom", back_populates="messages")
@@ -168,6 +183,13 @@ class ChatMessage(Base):
     reply_to = relationship("ChatMessage", remote_side=[message_id])
     reactions = relationship("MessageReaction", back_populates="message")
     
+    # 인덱스 (채팅방별 메시지 목록/최근 메시지 조회)
+    __table_args__ = (
+        Index('idx_room_deleted_created', 'room_id', 'is_deleted', 'created_at'),
+        Index('idx_room_deleted_message', 'room_id', 'is_deleted', 'message_id'),  # 커서 페이지네이션
+        Index('idx_room_seq', 'room_id', 'seq'),  # 재연결 시 순번 범위 조회
+    )
+    
     def __repr__(self):
         return f"<ChatMessage(message_id={self.message_id}, room_id={self.room_id}, sender_id={self.sender_id})>"
 
@@ -193,6 +215,48 @@ class MessageReaction(Base):
     def __repr__(self):
         return f"<MessageReaction(message_id={self.message_id}, user_id={self.user_id}, emoji='{self.emoji}')>"
 
+class MessageSearchTerm(Base):
+    """메시지 검색 색인 테이블 (메시지 내용의 2글자 단위 n-gram, app/services/search_service.py 참고)"""
+    __tablename__ = "message_search_terms"
+    
+    room_id = Column(Integer, ForeignKey('chat_rooms.room_id'), primary_key=True)
+    # 대소문자/악센트를 구분해야 서로 다른 n-gram이 같은 키로 충돌하지 않음
+    term = Column(String(8).with_variant(VARCHAR(8, collation='utf8mb4_bin'), 'mysql', 'mariadb'), primary_key=True)
+    message_id = Column(Integer, ForeignKey('chat_messages.message_id'), primary_key=True)
+    term_count = Column(Integer, nullable=False, default=1)  # 메시지 안에서 n-gram 출현 횟수 (관련도 점수)
+    
+    # 메시지 수정/삭제 시 색인 제거용
+    __table_args__ = (
+        Index('idx_search_term_message', 'message_id'),
+    )
+    
+    def __repr__(self):
+        return f"<MessageSearchTerm(room_id={self.room_id}, term='{self.term}', message_id={self.message_id})>"
+
+class IdBlock(Base):
+    """ID 블록 할당 테이블 (저장 전에 ID를 발급하는 메시지 지연 저장용, app/services/message_writer.py 참고)"""
+    __tablename__ = "id_blocks"
+    
+    name = Column(String(50), primary_key=True)  # 대상 테이블 이름 (예: chat_messages)
+    next_id = Column(Integer, nullable=False)  # 다음 블록의 시작 ID
+    
+    def __repr__(self):
+        return f"<IdBlock(name='{self.name}', next_id={self.next_id})>"
+
+class RevokedToken(Base):
+    """로그아웃으로 폐기한 토큰 (만료 시각까지 보관, app/auth/token_cache.py 참고)"""
+    __tablename__ = "revoked_tokens"
+    
+    token_hash = Column(String(64), primary_key=True)  # 토큰 SHA-256 HEX
+    expires_at = Column(DateTime, nullable=False)  # 이 시각(UTC) 이후에는 토큰 자체가 만료되므로 삭제 가능
+    
+    __table_args__ = (
+        Index('idx_revoked_token_expires', 'expires_at'),
+    )
+    
+    def __repr__(self):
+        return f"<RevokedToken(token_hash='{self.token_hash[:8]}', expires_at={self.expires_at})>"
+
 class ChatRoomSettings(Base):
     """채팅방 개인 설정 테이블"""
     __tablename__ = "chat_room_settings"
@@ -345,6 +409,7 @@ class Notification(Base):
     __table_args__ = (
         Index('idx_user_notifications', 'user_id', 'created_at'),
         Index('idx_user_unread', 'user_id', 'is_read'),
+        Index('idx_user_notification_type', 'user_id', 'notification_type'),
     )
     
     def __repr__(self):
@@ -399,6 +464,7 @@ class GroupMember(Base):
     # 복합 유니크 키
     __table_args__ = (
         Index('idx_group_user', 'group_id', 'user_id', unique=True),
+        Index('idx_member_user_active', 'user_id', 'is_active'),
     )
     
     def __repr__(self):
@@ -524,6 +590,7 @@ class GroupMeetingAttendee(Base):
     # 복합 유니크 키
     __table_args__ = (
         Index('idx_meeting_user', 'meeting_id', 'user_id', unique=True),
+        Index('idx_meeting_status', 'meeting_id', 'status'),
     )
     
     def __repr__(self):
@@ -551,6 +618,7 @@ class MatchingRequest(Base):
     # 복합 유니크 키 (같은 사람에게 중복 요청 방지)
     __table_args__ = (
         Index('idx_requester_requested', 'requester_id', 'requested_id', unique=True),
+        Index('idx_requested_status', 'requested_id', 'status'),
     )
     
     def __repr__(self):
@@ -573,6 +641,7 @@ class FriendRelationship(Base):
     # 복합 유니크 키
     __table_args__ = (
         Index('idx_user1_user2', 'user1_id', 'user2_id', unique=True),
+        Index('idx_user2', 'user2_id'),
     )
     
     def __repr__(self):
@@ -91,6 +91,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    issued_at: Optional[int] = None  # iat (users.tokens_valid_after 이전 발급 토큰 거부)
+    token_hash: Optional[str] = None  # 로그아웃 폐기 확인용 (revoked_tokens.token_hash)
 
 # 아이디 찾기 관련 스키마
 class FindUserIdRequest(BaseModel):
@@ -295,6 +297,7 @@ class ChatMessageCreate(ChatMessageBase):
 class ChatMessageResponse(ChatMessageBase):
     message_id: int
     room_id: int
+    seq: Optional[int] = Field(None, description="채팅방 메시지 순번")
     sender_id: int
     sender_name: str = Field(..., description="발신자 이름")
     file_url: Optional[str] = Field(None, description="파일/이미지 URL")
@@ -328,8 +331,8 @@ class ChatRoomListResponse(BaseModel):
 # 채팅 메시지 목록 조회용 스키마
 class ChatMessageListResponse(BaseModel):
     messages: List[ChatMessageResponse] = Field([], description="메시지 목록")
-    total_count: int = Field(0, description="전체 메시지 수")
-    has_more: bool = Field(False, description="더 많은 메시지 존재 여부")
+    total_count: Optional[int] = Field(None, description="전체 메시지 수 (include_total=false이면 생략)")
+    has_more: bool = Field(False, description="조회 방향으로 더 많은 메시지 존재 여부")
 
 # 메시지 반응 관련 스키마
 class MessageReactionCreate(BaseModel):
@@ -417,9 +420,29 @@ class FileUploadResponse(BaseModel):
 # 메시지 검색 관련 스키마
 class MessageSearchResponse(BaseModel):
     messages: List[ChatMessageResponse] = Field([], description="검색된 메시지 목록")
-    total_count: int = Field(0, description="검색된 메시지 총 개수")
+    total_count: Optional[int] = Field(None, description="검색된 메시지 총 개수 (include_total=true일 때만, 최대 1000개까지 셈)")
+    total_count_capped: bool = Field(False, description="검색 결과가 total_count보다 많아 세기를 멈췄는지 여부")
     page: int = Field(1, description="현재 페이지")
     has_more: bool = Field(False, description="더 많은 결과 존재 여부")
+    next_cursor: Optional[str] = Field(None, description="관련도순 검색의 다음 페이지 커서 (cursor 파라미터로 전달)")
+
+class MessageSearchHit(BaseModel):
+    message_id: int
+    sender_id: int
+    sender_name: str = Field(..., description="발신자 이름")
+    snippet: str = Field(..., description="검색어 주변 메시지 내용")
+    created_at: datetime
+
+class RoomSearchResult(BaseModel):
+    room_id: int
+    room_name: str = Field(..., description="채팅방 이름")
+    room_type: str = Field(..., description="채팅방 유형")
+    hit_count: int = Field(..., description="채팅방에서 검색된 메시지 수")
+    messages: List[MessageSearchHit] = Field([], description="최신순 검색 결과 (채팅방별 최대 per_room개)")
+
+class GlobalMessageSearchResponse(BaseModel):
+    rooms: List[RoomSearchResult] = Field([], description="최근 검색 결과가 있는 채팅방 순서")
+    total_count: int = Field(0, description="검색된 메시지 총 개수")
 
 # =============================================================================
 # 온보딩 관련 스키마
@@ -0,0 +1,263 @@
+"""
+이벤트 루프 블로킹 감지기
+
+요청 처리 중 이벤트 루프를 양보(await)하지 않고 붙잡고 있는 시간을 측정하여
+라우트별로 집계합니다. 임계값을 넘는 정체(stall)가 발생하면 감시 스레드가
+이벤트 루프 스레드의 스택을 샘플링해서 원인이 된 동기 호출
+(예: upload_group_gallery_image의 open().write(), ImageService.save_image의 Image.verify())
+을 찾아 기록합니다.
+
+환경변수 설정 방법:
+   LOOP_MONITOR_ENABLED=true        # 감지기 활성화 (기본값: false)
+   LOOP_STALL_THRESHOLD_MS=100      # 정체로 판단할 임계값 (밀리초)
+   LOOP_STALL_LOG=true              # 임계값 초과 시 로그 출력 여부
+
+참고: asyncio의 Handle을 계측하므로 uvloop 대신 기본 이벤트 루프에서 실행해야 합니다.
+   uvicorn app.main:app --loop asyncio
+"""
+import asyncio
+import contextvars
+import linecache
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "false").lower() == "true"
+LOOP_STALL_THRESHOLD_MS = float(os.getenv("LOOP_STALL_THRESHOLD_MS", "100"))
+LOOP_STALL_LOG = os.getenv("LOOP_STALL_LOG", "true").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+# 애플리케이션 코드 위치 (원인 호출을 찾을 때 기준이 되는 경로)
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+
+# 현재 실행 중인 요청 정보 (Task 컨텍스트를 통해 각 스텝에 전달됨)
+_current_request: contextvars.ContextVar[Optional["RequestBlockingInfo"]] = contextvars.ContextVar(
+    "loop_monitor_request", default=None
+)
+
+
+class RequestBlockingInfo:
+    """요청 하나가 이벤트 루프를 점유한 시간 정보"""
+
+    def __init__(self, scope: Dict[str, Any]):
+        self.scope = scope
+        self.blocked_ms = 0.0
+        self.max_step_ms = 0.0
+        self.stalls = 0
+
+    @property
+    def route(self) -> str:
+        """라우트 템플릿 기준 이름 (예: GET /chat/rooms/{room_id}/messages/)"""
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        if self.scope.get("type") == "websocket":
+            return f"WS {path}"
+        return f"{self.scope.get('method', '')} {path}"
+
+
+class RouteBlockingStats:
+    """라우트별 이벤트 루프 점유 통계"""
+
+    def __init__(self):
+        self.requests = 0
+        self.total_blocked_ms = 0.0
+        self.max_step_ms = 0.0
+        self.stalls = 0
+        # 원인 호출별 {culprit: [횟수, 누적 시간]}
+        self.culprits: Dict[str, List[float]] = {}
+
+    def to_dict(self, route: str) -> Dict[str, Any]:
+        top_culprits = sorted(self.culprits.items(), key=lambda item: item[1][1], reverse=True)[:5]
+        return {
+            "route": route,
+            "requests": self.requests,
+            "total_blocked_ms": round(self.total_blocked_ms, 2),
+            "avg_blocked_ms": round(self.total_blocked_ms / self.requests, 2) if self.requests else 0.0,
+            "max_step_ms": round(self.max_step_ms, 2),
+            "stalls": self.stalls,
+            "culprits": [
+                {"call": call, "count": int(count), "total_ms": round(total, 2)}
+                for call, (count, total) in top_culprits
+            ],
+        }
+
+
+class LoopBlockingMonitor:
+    """이벤트 루프 스텝 계측 및 감시 스레드"""
+
+    SORT_KEYS = ("total_blocked_ms", "avg_blocked_ms", "max_step_ms", "stalls", "requests")
+
+    def __init__(self, threshold_ms: float = LOOP_STALL_THRESHOLD_MS, log_stalls: bool = LOOP_STALL_LOG):
+        self.threshold_ms = threshold_ms
+        self.log_stalls = log_stalls
+        self.routes: Dict[str, RouteBlockingStats] = {}
+        self._lock = threading.Lock()
+        self._installed = False
+        self._original_run = None
+        self._loop_thread_id: Optional[int] = None
+        # 현재 실행 중인 스텝 정보 (감시 스레드와 공유)
+        self._step_started: Optional[float] = None
+        self._step_culprit: Optional[str] = None
+
+    # -------------------------------------------------------------------------
+    # 설치 / 해제
+    # -------------------------------------------------------------------------
+
+    def install(self):
+        """asyncio Handle 계측 및 감시 스레드 시작 (이벤트 루프 스레드에서 호출)"""
+        if self._installed:
+            return
+        self._installed = True
+        self._loop_thread_id = threading.get_ident()
+
+        monitor = self
+        self._original_run = original_run = asyncio.events.Handle._run
+
+        def _run(handle):
+            monitor._step_culprit = None
+            monitor._step_started = time.perf_counter()
+            try:
+                original_run(handle)
+            finally:
+                started = monitor._step_started
+                monitor._step_started = None
+                if started is not None:
+                    monitor._end_step(handle, (time.perf_counter() - started) * 1000)
+
+        asyncio.events.Handle._run = _run
+
+        watchdog = threading.Thread(target=self._watchdog, name="loop-blocking-watchdog", daemon=True)
+        watchdog.start()
+        logger.info("이벤트 루프 블로킹 감지기 활성화 (임계값 %.0fms)", self.threshold_ms)
+
+    def uninstall(self):
+        """계측 해제"""
+        if self._installed and self._original_run is not None:
+            asyncio.events.Handle._run = self._original_run
+        self._installed = False
+
+    # -------------------------------------------------------------------------
+    # 측정
+    # -------------------------------------------------------------------------
+
+    def _end_step(self, handle, elapsed_ms: float):
+        """스텝 하나가 끝났을 때 해당 요청에 점유 시간 누적"""
+        context = getattr(handle, "_context", None)
+        info = context.get(_current_request) if context is not None else None
+        if info is None:
+            return
+
+        info.blocked_ms += elapsed_ms
+        if elapsed_ms > info.max_step_ms:
+            info.max_step_ms = elapsed_ms
+
+        if elapsed_ms >= self.threshold_ms:
+            info.stalls += 1
+            culprit = self._step_culprit or "알 수 없음 (샘플링 전에 종료됨)"
+            route = info.route
+            with self._lock:
+                stats = self.routes.setdefault(route, RouteBlockingStats())
+                entry = stats.culprits.setdefault(culprit, [0, 0.0])
+                entry[0] += 1
+                entry[1] += elapsed_ms
+            if self.log_stalls:
+                logger.warning("이벤트 루프 정체 %.1fms - %s - %s", elapsed_ms, route, culprit)
+
+    def finish_request(self, info: RequestBlockingInfo):
+        """요청 종료 시 라우트 통계에 반영"""
+        with self._lock:
+            stats = self.routes.setdefault(info.route, RouteBlockingStats())
+            stats.requests += 1
+            stats.total_blocked_ms += info.blocked_ms
+            stats.stalls += info.stalls
+            if info.max_step_ms > stats.max_step_ms:
+                stats.max_step_ms = info.max_step_ms
+
+    def _watchdog(self):
+        """스텝이 임계값을 넘기면 이벤트 루프 스레드의 스택을 샘플링"""
+        interval = max(self.threshold_ms / 2000, 0.005)
+        while self._installed:
+            time.sleep(interval)
+            started = self._step_started
+            if started is None or self._step_culprit is not None:
+                continue
+            if (time.perf_counter() - started) * 1000 < self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None and self._step_started == started:
+                self._step_culprit = self._describe_culprit(frame)
+
+    @staticmethod
+    def _describe_culprit(frame) -> str:
+        """
+        샘플링된 스택에서 원인 호출 설명 생성
+        가장 안쪽의 애플리케이션 프레임과, 그 프레임이 호출 중인 함수를 함께 표시합니다.
+        (C 함수 호출처럼 안쪽 프레임이 없으면 해당 소스 줄을 표시)
+        """
+        callee = None
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if filename.startswith(APP_DIR) and not filename.endswith("loop_monitor.py"):
+                relative = os.path.relpath(filename, os.path.dirname(APP_DIR))
+                location = f"{relative}:{frame.f_lineno} {frame.f_code.co_name}"
+                if callee is not None:
+                    call = getattr(callee.f_code, "co_qualname", callee.f_code.co_name)
+                else:
+                    call = linecache.getline(filename, frame.f_lineno).strip()
+                return f"{location} → {call}"
+            callee = frame
+            frame = frame.f_back
+        return "애플리케이션 외부 코드"
+
+    # -------------------------------------------------------------------------
+    # 리포트
+    # -------------------------------------------------------------------------
+
+    def get_report(self, sort_by: str = "total_blocked_ms", limit: int = 50) -> List[Dict[str, Any]]:
+        """라우트별 리포트 (sort_by 기준 내림차순)"""
+        if sort_by not in self.SORT_KEYS:
+            sort_by = "total_blocked_ms"
+        with self._lock:
+            rows = [stats.to_dict(route) for route, stats in self.routes.items()]
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit]
+
+    def reset(self):
+        """집계 초기화"""
+        with self._lock:
+            self.routes.clear()
+
+
+class LoopBlockingMiddleware:
+    """요청마다 RequestBlockingInfo를 컨텍스트에 설정하는 ASGI 미들웨어"""
+
+    def __init__(self, app, monitor: Optional[LoopBlockingMonitor] = None):
+        self.app = app
+        self.monitor = monitor or loop_monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        info = RequestBlockingInfo(scope)
+        token = _current_request.set(info)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_request.reset(token)
+            self.monitor.finish_request(info)
+
+
+# 전역 감지기
+loop_monitor = LoopBlockingMonitor()
@@ -0,0 +1,142 @@
+"""
+데이터베이스 커넥션 풀 통계
+
+커넥션 풀 이벤트를 구독하여 다음 지표를 수집합니다.
+- 현재 대여 중인 커넥션 수 / 사용 중인 overflow 커넥션 수
+- 커넥션 대여(checkout) 대기 시간 히스토그램
+- 새로 생성/재생성(recycle)/무효화된 커넥션 수, 대여 타임아웃 횟수
+
+워커당 풀 크기(DB_POOL_SIZE, DB_MAX_OVERFLOW)를 실측 데이터로 정하기 위해 사용합니다.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy import exc as sa_exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class PoolStats:
+    """엔진 하나의 커넥션 풀 통계"""
+
+    # 대기 시간 히스토그램 버킷 상한 (밀리초)
+    WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connections_created = 0
+        self.connections_recycled = 0
+        self.connections_invalidated = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.wait_histogram = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+
+    def attach(self, engine):
+        """엔진(또는 AsyncEngine.sync_engine)의 풀에 이벤트 리스너 등록"""
+        self.pool = engine.pool
+        if isinstance(engine.pool, _InstrumentedPoolMixin):
+            engine.pool.pool_stats = self
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                # 같은 풀 슬롯에서 다시 연결된 경우 = pool_recycle/무효화로 인한 재생성
+                if connection_record.record_info.get("pool_stats_connected"):
+                    self.connections_recycled += 1
+                else:
+                    connection_record.record_info["pool_stats_connected"] = True
+                    self.connections_created += 1
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            with self._lock:
+                self.connections_invalidated += 1
+
+        return self
+
+    def record_checkout(self, wait_ms: float, timed_out: bool = False):
+        """커넥션 대여 대기 시간 기록"""
+        index = len(self.WAIT_BUCKETS_MS)
+        for i, bound in enumerate(self.WAIT_BUCKETS_MS):
+            if wait_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+            self.wait_histogram[index] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """현재 풀 상태와 누적 통계"""
+        pool = self.pool
+        data: Dict[str, Any] = {"name": self.name, "pool_class": type(pool).__name__ if pool else None}
+
+        if isinstance(pool, QueuePool):
+            data.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "timeout": pool.timeout(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow_in_use": max(pool.overflow(), 0),
+            })
+
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in self.WAIT_BUCKETS_MS] + [f">{self.WAIT_BUCKETS_MS[-1]}ms"]
+            total = self.checkouts + self.checkout_timeouts
+            data.update({
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "avg_wait_ms": round(self.total_wait_ms / total, 3) if total else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "wait_histogram": dict(zip(labels, self.wait_histogram)),
+                "connections_created": self.connections_created,
+                "connections_recycled": self.connections_recycled,
+                "connections_invalidated": self.connections_invalidated,
+            })
+        return data
+
+
+class _InstrumentedPoolMixin:
+    """connect() 호출부터 커넥션을 받기까지의 대기 시간을 측정하는 풀 믹스인"""
+
+    pool_stats: Optional[PoolStats] = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except sa_exc.TimeoutError:
+            if self.pool_stats is not None:
+                self.pool_stats.record_checkout((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        if self.pool_stats is not None:
+            self.pool_stats.record_checkout((time.perf_counter() - started) * 1000)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() 후 새로 만들어진 풀에도 통계 연결 유지
+        pool = super().recreate()
+        pool.pool_stats = self.pool_stats
+        if self.pool_stats is not None:
+            self.pool_stats.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """대기 시간 측정 QueuePool (동기 엔진용)"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """대기 시간 측정 AsyncAdaptedQueuePool (비동기 엔진용)"""
@@ -0,0 +1,205 @@
+"""
+요청별 SQL 쿼리 예산 및 N+1 감지기
+
+엔진의 before/after_cursor_execute 이벤트를 구독하여 요청마다 실행된
+SQL 문 개수와 DB 시간을 집계합니다.
+- 응답 헤더: X-DB-Query-Count, X-DB-Time-Ms (예산이 선언된 경우 X-DB-Query-Budget)
+- 같은 SQL 문이 파라미터만 바뀌어 반복 실행되면 N+1 의심으로 로그 출력
+- @query_budget(n)으로 엔드포인트의 쿼리 예산을 선언하면 초과 시 경고
+
+SQLAlchemy는 파라미터를 바인딩 변수로 분리하므로, 같은 SQL 문자열이
+여러 번 실행되었다는 것은 파라미터만 다른 반복 실행을 의미합니다.
+
+환경변수 설정 방법:
+   QUERY_STATS_ENABLED=true         # 집계 및 응답 헤더 활성화 (기본값: true)
+   QUERY_STATS_LOG=false            # 요청마다 쿼리 수/시간 로그 출력 여부
+   QUERY_REPEAT_THRESHOLD=5         # 같은 SQL 문이 이 횟수 이상 반복되면 N+1로 판단
+"""
+import contextvars
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+
+# 환경변수 로드
+load_dotenv()
+
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "true").lower() == "true"
+QUERY_STATS_LOG = os.getenv("QUERY_STATS_LOG", "false").lower() == "true"
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "5"))
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+QUERY_BUDGET_HEADER = "X-DB-Query-Budget"
+
+# 현재 요청의 쿼리 통계 (AsyncSession도 greenlet에 컨텍스트를 전달하므로 그대로 보임)
+_current_stats: contextvars.ContextVar[Optional["RequestQueryStats"]] = contextvars.ContextVar(
+    "query_stats_request", default=None
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """선언된 쿼리 예산을 초과함"""
+
+
+class RequestQueryStats:
+    """요청 하나에서 실행된 SQL 문 통계"""
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget
+        self.count = 0
+        self.db_time_ms = 0.0
+        # SQL 문별 실행 횟수
+        self.statements: Dict[str, int] = {}
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.db_time_ms += elapsed_ms
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def repeated_statements(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> List[Dict[str, Any]]:
+        """threshold 이상 반복 실행된 SQL 문 (N+1 의심) 목록"""
+        repeated = [
+            {"statement": statement, "count": count}
+            for statement, count in self.statements.items()
+            if count >= threshold
+        ]
+        repeated.sort(key=lambda item: item["count"], reverse=True)
+        return repeated
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_stats_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    started_stack = conn.info.get("query_stats_started")
+    if not started_stack:
+        return
+    started = started_stack.pop()
+    stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def attach(engine):
+    """엔진(또는 AsyncEngine.sync_engine)에 쿼리 집계 리스너 등록"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+def query_budget(max_queries: int):
+    """
+    엔드포인트의 쿼리 예산 선언 (라우트 데코레이터 아래에 위치해야 함)
+
+        @app.get("/chat/rooms/")
+        @query_budget(5)
+        async def get_chat_rooms(...):
+    """
+    def decorator(func):
+        func.query_budget = max_queries
+        return func
+    return decorator
+
+
+@contextmanager
+def count_queries(budget: Optional[int] = None):
+    """
+    블록 안에서 실행된 SQL 문 집계 (같은 스레드/태스크에서 실행되는 코드용)
+    budget을 넘으면 QueryBudgetExceeded를 발생시킵니다.
+    """
+    stats = RequestQueryStats(budget)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+    if stats.over_budget:
+        raise QueryBudgetExceeded(
+            f"쿼리 예산 초과: {stats.count}개 실행 (예산 {stats.budget}개)\n"
+            + "\n".join(f"  {item['count']}회: {item['statement']}" for item in stats.repeated_statements(2))
+        )
+
+
+def assert_query_budget(response, max_queries: Optional[int] = None):
+    """
+    응답 헤더의 쿼리 수가 예산 이내인지 확인 (TestClient 응답용)
+    max_queries를 생략하면 엔드포인트에 선언된 예산(X-DB-Query-Budget)을 사용합니다.
+    """
+    count = response.headers.get(QUERY_COUNT_HEADER)
+    if count is None:
+        raise QueryBudgetExceeded(f"{QUERY_COUNT_HEADER} 헤더가 없습니다. (QUERY_STATS_ENABLED 확인)")
+    if max_queries is None:
+        declared = response.headers.get(QUERY_BUDGET_HEADER)
+        if declared is None:
+            raise QueryBudgetExceeded("엔드포인트에 선언된 쿼리 예산이 없습니다.")
+        max_queries = int(declared)
+    if int(count) > max_queries:
+        raise QueryBudgetExceeded(f"쿼리 예산 초과: {count}개 실행 (예산 {max_queries}개)")
+
+
+class QueryStatsMiddleware:
+    """요청마다 쿼리 수/DB 시간을 집계해 응답 헤더와 로그로 남기는 ASGI 미들웨어"""
+
+    def __init__(self, app, log_requests: bool = QUERY_STATS_LOG, repeat_threshold: int = QUERY_REPEAT_THRESHOLD):
+        self.app = app
+        self.log_requests = log_requests
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                stats.budget = self._declared_budget(scope)
+                headers = list(message.get("headers", []))
+                headers.append((QUERY_COUNT_HEADER.lower().encode(), str(stats.count).encode()))
+                headers.append((QUERY_TIME_HEADER.lower().encode(), f"{stats.db_time_ms:.2f}".encode()))
+                if stats.budget is not None:
+                    headers.append((QUERY_BUDGET_HEADER.lower().encode(), str(stats.budget).encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats)
+
+    @staticmethod
+    def _declared_budget(scope) -> Optional[int]:
+        route = scope.get("route")
+        endpoint = getattr(route, "endpoint", None)
+        return getattr(endpoint, "query_budget", None)
+
+    def _report(self, scope, stats: RequestQueryStats):
+        if stats.budget is None:
+            stats.budget = self._declared_budget(scope)
+        route = scope.get("route")
+        name = f"{scope.get('method', '')} {getattr(route, 'path', None) or scope.get('path', '')}"
+
+        if self.log_requests:
+            logger.info("%s - 쿼리 %d개, DB %.1fms", name, stats.count, stats.db_time_ms)
+        if stats.over_budget:
+            logger.warning("쿼리 예산 초과: %s - %d개 실행 (예산 %d개)", name, stats.count, stats.budget)
+        for item in stats.repeated_statements(self.repeat_threshold):
+            statement = " ".join(item["statement"].split())
+            logger.warning("N+1 의심: %s - 같은 SQL %d회 실행: %s", name, item["count"], statement[:200])
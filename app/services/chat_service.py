@@ -0,0 +1,301 @@
+"""
+채팅 메시지 관련 공통 처리 서비스
+
+채팅방의 마지막 메시지 정보(chat_rooms.last_message_*)와 참여자별 읽지 않은 메시지 수
+(chat_participants.unread_count), 메시지 검색 색인(message_search_terms)을
+메시지 저장/수정/삭제/읽음 처리와 같은 트랜잭션 안에서 갱신합니다.
+모든 메서드는 커밋하지 않으므로 호출한 쪽에서 메시지 변경과 함께 커밋해야 합니다.
+"""
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, MessageReaction, User
+from app.models.schemas import ChatMessageResponse, MessageReactionResponse
+from app.services.search_service import MessageSearchService
+
+
+class ChatService:
+    # 채팅방 목록에 표시할 마지막 메시지 미리보기 길이
+    PREVIEW_LENGTH = 100
+
+    # 카운터 UPDATE는 세션에 로드된 객체와 동기화하지 않음 (MariaDB에서 동기화용 SELECT가 추가로 실행되는 것 방지)
+    NO_SYNC = {"synchronize_session": False}
+
+    @classmethod
+    def make_preview(cls, message: ChatMessage) -> str:
+        """마지막 메시지 미리보기 문자열"""
+        return (message.message_content or "")[:cls.PREVIEW_LENGTH]
+
+    @classmethod
+    async def on_message_created(cls, db: AsyncSession, message: ChatMessage):
+        """
+        새 메시지 저장 시 호출 (db.add(message) 이후, 커밋 이전)
+        채팅방 순번을 발급하고 마지막 메시지 정보를 갱신하며, 보낸 사람을 제외한 참여자의 unread_count를 1 증가시킨 뒤
+        검색 색인에 추가합니다.
+        """
+        if message.seq is None:
+            message.seq = await cls.next_seq(db, message.room_id)
+        else:
+            # 메시지 지연 저장 중에는 MessageWriter가 순번을 미리 발급
+            await cls.advance_seq(db, {message.room_id: message.seq})
+        await db.flush()
+        await cls.on_messages_created(db, [message])
+
+    @classmethod
+    async def next_seq(cls, db: AsyncSession, room_id: int) -> int:
+        """채팅방 메시지 순번 발급 (채팅방 행 잠금으로 같은 채팅방의 저장 트랜잭션끼리 순서가 정해짐)"""
+        await db.execute(
+            update(ChatRoom).where(ChatRoom.room_id == room_id).values(
+                last_seq=ChatRoom.last_seq + 1,
+                updated_at=ChatRoom.updated_at
+            ),
+            execution_options=cls.NO_SYNC
+        )
+        return await db.scalar(select(ChatRoom.last_seq).where(ChatRoom.room_id == room_id))
+
+    @classmethod
+    async def advance_seq(cls, db: AsyncSession, last_seqs: Dict[int, int]):
+        """미리 발급한 순번까지 chat_rooms.last_seq를 올림 ({room_id: 마지막 순번}, 더 작은 값으로는 되돌리지 않음)"""
+        for room_id, seq in last_seqs.items():
+            await db.execute(
+                update(ChatRoom).where(ChatRoom.room_id == room_id, ChatRoom.last_seq < seq).values(
+                    last_seq=seq,
+                    updated_at=ChatRoom.updated_at
+                ),
+                execution_options=cls.NO_SYNC
+            )
+
+    @classmethod
+    async def on_messages_created(cls, db: AsyncSession, messages: Sequence[ChatMessage]):
+        """
+        메시지 여러 개를 한 번에 저장한 뒤 호출 (INSERT 이후, 커밋 이전 - 메시지 지연 저장의 일괄 INSERT)
+        채팅방별 마지막 메시지와 (채팅방, 보낸 사람)별 unread_count 증가를 묶어서 갱신하고 검색 색인을 한 번에 추가합니다.
+        """
+        await MessageSearchService.index_messages(db, messages)
+
+        last_messages: Dict[int, ChatMessage] = {}
+        sent_counts: Counter = Counter()
+        for message in messages:
+            last = last_messages.get(message.room_id)
+            if last is None or message.message_id > last.message_id:
+                last_messages[message.room_id] = message
+            sent_counts[(message.room_id, message.sender_id)] += 1
+
+        # 동시에 저장된 메시지가 있어도 message_id가 더 큰 경우에만 갱신
+        for message in last_messages.values():
+            await db.execute(
+                update(ChatRoom).where(
+                    ChatRoom.room_id == message.room_id,
+                    or_(ChatRoom.last_message_id.is_(None), ChatRoom.last_message_id < message.message_id)
+                ).values(
+                    last_message_id=message.message_id,
+                    last_message_at=func.current_timestamp(),
+                    last_message_preview=cls.make_preview(message),
+                    updated_at=ChatRoom.updated_at  # 목록 정렬 기준(updated_at)은 바꾸지 않음
+                ),
+                execution_options=cls.NO_SYNC
+            )
+        for (room_id, sender_id), count in sent_counts.items():
+            await db.execute(
+                update(ChatParticipant).where(
+                    ChatParticipant.room_id == room_id,
+                    ChatParticipant.user_id != sender_id,
+                    ChatParticipant.is_active == True
+                ).values(unread_count=ChatParticipant.unread_count + count),
+                execution_options=cls.NO_SYNC
+            )
+
+    @classmethod
+    async def on_message_edited(cls, db: AsyncSession, message: ChatMessage):
+        """메시지 수정 시 호출 - 검색 색인을 교체하고 마지막 메시지였다면 미리보기 갱신"""
+        await MessageSearchService.reindex_message(db, message)
+        await db.execute(
+            update(ChatRoom).where(
+                ChatRoom.room_id == message.room_id,
+                ChatRoom.last_message_id == message.message_id
+            ).values(
+                last_message_preview=cls.make_preview(message),
+                updated_at=ChatRoom.updated_at
+            ),
+            execution_options=cls.NO_SYNC
+        )
+
+    @classmethod
+    async def on_message_deleted(cls, db: AsyncSession, message: ChatMessage):
+        """
+        메시지 삭제 시 호출 (is_deleted 변경 이후, 커밋 이전)
+        검색 색인을 삭제하고 아직 읽지 않은 참여자의 unread_count를 줄이며, 마지막 메시지였다면 직전 메시지로 되돌립니다.
+        """
+        await db.flush()
+        await MessageSearchService.remove_message(db, message.message_id)
+
+        # 메시지를 저장할 때 unread_count를 늘린 참여자(on_messages_created와 같은 조건)만 줄임
+        await db.execute(
+            update(ChatParticipant).where(
+                ChatParticipant.room_id == message.room_id,
+                ChatParticipant.user_id != message.sender_id,
+                ChatParticipant.is_active == True,
+                or_(ChatParticipant.joined_at.is_(None), ChatParticipant.joined_at <= message.created_at),
+                ChatParticipant.unread_count > 0,
+                or_(ChatParticipant.last_read_at.is_(None), ChatParticipant.last_read_at < message.created_at)
+            ).values(unread_count=ChatParticipant.unread_count - 1),
+            execution_options=cls.NO_SYNC
+        )
+
+        last_message_id = await db.scalar(select(ChatRoom.last_message_id).where(ChatRoom.room_id == message.room_id))
+        if last_message_id != message.message_id:
+            return
+
+        previous = await db.scalar(
+            select(ChatMessage).where(
+                ChatMessage.room_id == message.room_id,
+                ChatMessage.is_deleted == False
+            ).order_by(ChatMessage.created_at.desc(), ChatMessage.message_id.desc()).limit(1)
+        )
+        await db.execute(
+            update(ChatRoom).where(ChatRoom.room_id == message.room_id).values(
+                last_message_id=previous.message_id if previous else None,
+                last_message_at=previous.created_at if previous else None,
+                last_message_preview=cls.make_preview(previous) if previous else None,
+                updated_at=ChatRoom.updated_at
+            ),
+            execution_options=cls.NO_SYNC
+        )
+
+    @staticmethod
+    async def fetch_message_page(
+        db: AsyncSession,
+        filters: tuple,
+        limit: int,
+        page: int = 1,
+        before_message_id: Optional[int] = None,
+        after_message_id: Optional[int] = None
+    ) -> Tuple[List[ChatMessage], bool]:
+        """
+        메시지 한 페이지 조회 (최신 메시지가 앞에 오도록 반환)
+        - before_message_id: 해당 메시지보다 이전 메시지 (과거 방향으로 스크롤)
+        - after_message_id: 해당 메시지보다 이후 메시지 (재접속 후 따라잡기)
+        - 둘 다 없으면 page 기준 OFFSET 조회 (기존 방식)
+        limit + 1개를 조회해서 조회 방향으로 더 있는지(has_more) 판단합니다.
+        """
+        query = select(ChatMessage).where(*filters)
+        if after_message_id is not None:
+            query = query.where(ChatMessage.message_id > after_message_id).order_by(ChatMessage.message_id.asc())
+        else:
+            if before_message_id is not None:
+                query = query.where(ChatMessage.message_id < before_message_id)
+            query = query.order_by(ChatMessage.message_id.desc())
+            if before_message_id is None and page > 1:
+                query = query.offset((page - 1) * limit)
+
+        messages = list((await db.scalars(query.limit(limit + 1))).all())
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if after_message_id is not None:
+            messages.reverse()
+        return messages, has_more
+
+    @classmethod
+    async def serialize_messages(
+        cls, db: AsyncSession, messages: Sequence[ChatMessage]
+    ) -> List[ChatMessageResponse]:
+        """
+        메시지 목록을 응답 형식으로 변환 (전달된 순서 유지)
+        보낸 사람, 답장 원본 미리보기, 반응과 반응한 사용자를 메시지 수와 관계없이
+        최대 3번의 IN 쿼리(반응 → 답장 원본 → 사용자)로 한꺼번에 불러옵니다.
+        """
+        if not messages:
+            return []
+
+        message_ids = [message.message_id for message in messages]
+        reactions = (await db.scalars(
+            select(MessageReaction).where(MessageReaction.message_id.in_(message_ids))
+            .order_by(MessageReaction.reaction_id)
+        )).all()
+        reactions_by_message: Dict[int, List[MessageReaction]] = {}
+        for reaction in reactions:
+            reactions_by_message.setdefault(reaction.message_id, []).append(reaction)
+
+        reply_ids = {message.reply_to_message_id for message in messages if message.reply_to_message_id}
+        reply_previews: Dict[int, Optional[str]] = {}
+        if reply_ids:
+            rows = await db.execute(
+                select(ChatMessage.message_id, ChatMessage.message_content)
+                .where(ChatMessage.message_id.in_(reply_ids))
+            )
+            reply_previews = {message_id: (content or "")[:cls.PREVIEW_LENGTH] for message_id, content in rows}
+
+        user_ids = {message.sender_id for message in messages} | {reaction.user_id for reaction in reactions}
+        rows = await db.execute(select(User.user_id, User.name).where(User.user_id.in_(user_ids)))
+        user_names: Dict[int, str] = dict(rows.all())
+
+        return [
+            cls.to_response(
+                message,
+                user_names.get(message.sender_id, "Unknown"),
+                reply_previews.get(message.reply_to_message_id),
+                [
+                    MessageReactionResponse(
+                        reaction_id=reaction.reaction_id,
+                        message_id=reaction.message_id,
+                        user_id=reaction.user_id,
+                        user_name=user_names.get(reaction.user_id, "Unknown"),
+                        emoji=reaction.emoji,
+                        created_at=reaction.created_at
+                    )
+                    for reaction in reactions_by_message.get(message.message_id, [])
+                ]
+            )
+            for message in messages
+        ]
+
+    @staticmethod
+    def to_response(
+        message: ChatMessage,
+        sender_name: str,
+        reply_preview: Optional[str] = None,
+        reactions: Sequence[MessageReactionResponse] = ()
+    ) -> ChatMessageResponse:
+        """
+        메시지 하나를 응답 형식으로 변환 (보낸 사람 이름, 답장 원본 미리보기, 반응을 이미 알고 있을 때)
+        답장 원본 미리보기는 make_preview()로 자른 값이어야 메시지 조회 API 응답과 같아집니다.
+        """
+        return ChatMessageResponse(
+            message_id=message.message_id,
+            room_id=message.room_id,
+            seq=message.seq,
+            sender_id=message.sender_id,
+            sender_name=sender_name,
+            message_content=message.message_content,
+            message_type=message.message_type,
+            file_url=message.file_url,
+            file_name=message.file_name,
+            file_size=message.file_size,
+            reply_to_message_id=message.reply_to_message_id,
+            reply_to_message=reply_preview,
+            is_edited=message.is_edited,
+            is_deleted=message.is_deleted,
+            edited_at=message.edited_at,
+            reactions=list(reactions),
+            created_at=message.created_at,
+            updated_at=message.updated_at
+        )
+
+    @staticmethod
+    def membership_filters(user_id: int) -> tuple:
+        """현재 참여 중인 채팅방 조건 (나간 채팅방 제외, /ws/user 구독 범위)"""
+        return (
+            ChatParticipant.user_id == user_id,
+            ChatParticipant.is_active == True,
+            ChatParticipant.left_at.is_(None)
+        )
+
+    @staticmethod
+    def mark_read(participant: ChatParticipant):
+        """참여자의 읽음 상태 갱신"""
+        participant.last_read_at = datetime.now()
+        participant.unread_count = 0
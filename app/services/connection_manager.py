@@ -0,0 +1,435 @@
+"""
+채팅 WebSocket 연결 관리자
+
+연결마다 크기가 제한된 전송 큐와 전용 전송(writer) 태스크를 두어, 브로드캐스트는 큐에 넣기만 하고
+네트워크 전송을 기다리지 않습니다. 느린 모바일 클라이언트가 있어도 같은 채팅방의 다른 사용자에게는
+지연 없이 전달됩니다.
+
+큐가 가득 찬 연결(느린 소비자)은 더 이상 따라잡을 수 없다고 보고 SLOW_CONSUMER_CLOSE_CODE로 연결을 끊습니다.
+클라이언트는 재연결할 때 마지막으로 받은 순번(last_seq)을 보내 놓친 메시지를 재전송받습니다.
+
+여러 워커로 실행할 때는 pub/sub 백엔드(app/services/pubsub.py)가 다른 워커에 연결된 참여자에게 전달합니다.
+워커는 로컬 연결이 있는 채팅방만 구독하고, 마지막 연결이 끊어지면 구독을 해제합니다.
+채팅방/사용자가 아닌 워커 공통 채널(add_channel_handler)은 최근 메시지 캐시 무효화 등에 사용합니다.
+
+사용자별 연결(/ws/user)은 연결 하나로 참여 중인 모든 채팅방의 이벤트와 알람을 받습니다.
+채팅방 이벤트는 room_id가 포함된 그대로 전달되고, 알람은 사용자 채널("user:{user_id}")로 전달됩니다.
+
+구독 중인 채팅방마다 순번(seq)이 있는 최근 메시지 이벤트를 WS_REPLAY_BUFFER_SIZE개까지 보관합니다.
+재연결한 클라이언트가 마지막으로 받은 순번을 알려 주면 그 이후 이벤트를 버퍼에서 바로 재전송하며,
+버퍼가 그 구간을 모두 가지고 있지 않으면 None을 돌려주어 호출한 쪽이 DB에서 조회하도록 합니다.
+
+환경변수 설정 방법:
+   WS_SEND_QUEUE_SIZE=256           # 연결당 전송 대기 메시지 수 (초과 시 연결 종료)
+   WS_SEND_TIMEOUT_SECONDS=10       # 메시지 하나의 전송 제한 시간 (초과 시 연결 종료)
+   WS_REPLAY_BUFFER_SIZE=256        # 채팅방별 재전송용 최근 메시지 이벤트 수
+   WS_REPLAY_DB_LIMIT=500           # 버퍼에 없는 구간을 DB에서 조회해 한 번에 재전송할 최대 메시지 수
+"""
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+from fastapi import WebSocket
+
+from app.services.pubsub import Channel, PubSubBackend, create_backend
+
+# 환경변수 로드
+load_dotenv()
+
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+WS_SEND_TIMEOUT_SECONDS = float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+WS_REPLAY_BUFFER_SIZE = int(os.getenv("WS_REPLAY_BUFFER_SIZE", "256"))
+WS_REPLAY_DB_LIMIT = int(os.getenv("WS_REPLAY_DB_LIMIT", "500"))
+
+logger = logging.getLogger(__name__)
+
+# 느린 소비자 연결 종료 코드 (4001~4003은 인증/권한 오류에 사용 중)
+SLOW_CONSUMER_CLOSE_CODE = 4008
+
+# 사용자 채널 이름 접두사 (pub/sub 채널 "user:{user_id}")
+USER_CHANNEL_PREFIX = "user:"
+
+
+def user_channel(user_id: int) -> str:
+    return f"{USER_CHANNEL_PREFIX}{user_id}"
+
+
+class DeliveryStats:
+    """WebSocket 전송 큐 깊이와 수신자별 전달 지연 통계"""
+
+    # 전달 지연(큐에 넣은 시점 ~ 전송 완료) 히스토그램 버킷 상한 (밀리초)
+    LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.slow_consumer_disconnects = 0
+        self.max_queue_depth = 0
+        self.total_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.latency_histogram = [0] * (len(self.LATENCY_BUCKETS_MS) + 1)
+
+    def record_enqueue(self, depth: int):
+        with self._lock:
+            self.enqueued += 1
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def record_delivery(self, latency_ms: float):
+        index = len(self.LATENCY_BUCKETS_MS)
+        for i, bound in enumerate(self.LATENCY_BUCKETS_MS):
+            if latency_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self.delivered += 1
+            self.total_latency_ms += latency_ms
+            if latency_ms > self.max_latency_ms:
+                self.max_latency_ms = latency_ms
+            self.latency_histogram[index] += 1
+
+    def record_failure(self):
+        with self._lock:
+            self.failed += 1
+
+    def record_slow_consumer(self):
+        with self._lock:
+            self.slow_consumer_disconnects += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            labels = [f"<={bound}ms" for bound in self.LATENCY_BUCKETS_MS] + [f">{self.LATENCY_BUCKETS_MS[-1]}ms"]
+            return {
+                "enqueued": self.enqueued,
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "slow_consumer_disconnects": self.slow_consumer_disconnects,
+                "max_queue_depth": self.max_queue_depth,
+                "avg_latency_ms": round(self.total_latency_ms / self.delivered, 3) if self.delivered else 0.0,
+                "max_latency_ms": round(self.max_latency_ms, 3),
+                "latency_histogram": dict(zip(labels, self.latency_histogram)),
+            }
+
+
+class ConnectionSender:
+    """연결 하나의 전송 큐와 전송 태스크"""
+
+    def __init__(self, websocket: WebSocket, stats: DeliveryStats, queue_size: int = WS_SEND_QUEUE_SIZE):
+        self.websocket = websocket
+        self.stats = stats
+        # (큐에 넣은 시각, 메시지)
+        self.queue: "asyncio.Queue[Tuple[float, str]]" = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, message: str) -> bool:
+        """전송 큐에 추가 (큐가 가득 찼으면 False)"""
+        if self.closed:
+            return True
+        try:
+            self.queue.put_nowait((time.perf_counter(), message))
+        except asyncio.QueueFull:
+            return False
+        self.stats.record_enqueue(self.queue.qsize())
+        return True
+
+    async def _run(self):
+        while True:
+            enqueued_at, message = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(message), WS_SEND_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                self.stats.record_failure()
+                self.stats.record_slow_consumer()
+                self.close(SLOW_CONSUMER_CLOSE_CODE, "Slow consumer")
+                return
+            except Exception:
+                # 연결이 이미 끊어진 경우 - 수신 루프에서 disconnect 처리
+                self.stats.record_failure()
+                self.closed = True
+                return
+            self.stats.record_delivery((time.perf_counter() - enqueued_at) * 1000)
+
+    def close(self, code: Optional[int] = None, reason: str = ""):
+        """전송 태스크 종료 (code를 지정하면 WebSocket도 해당 코드로 닫음)"""
+        if self.closed and code is None:
+            return
+        self.closed = True
+        if self._task is not asyncio.current_task():
+            self._task.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_websocket(code, reason))
+
+    async def _close_websocket(self, code: int, reason: str):
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+
+class ReplayBuffer:
+    """채팅방 하나의 최근 메시지 이벤트 (순번 순서로 정렬, 가장 오래된 것부터 버림)"""
+
+    def __init__(self, size: int = WS_REPLAY_BUFFER_SIZE):
+        self.size = size
+        self.seqs: List[int] = []
+        self.messages: List[str] = []
+
+    def add(self, seq: int, message: str):
+        # 다른 워커에서 온 이벤트는 순서가 바뀌어 도착할 수 있으므로 정렬 위치에 삽입
+        index = bisect.bisect_left(self.seqs, seq)
+        if index < len(self.seqs) and self.seqs[index] == seq:
+            return
+        self.seqs.insert(index, seq)
+        self.messages.insert(index, message)
+        if len(self.seqs) > self.size:
+            del self.seqs[0]
+            del self.messages[0]
+
+    def since(self, last_seq: int) -> Optional[List[str]]:
+        """
+        last_seq 이후 이벤트 (버퍼가 last_seq 다음부터 빠짐없이 가지고 있을 때만, 아니면 None)
+        마지막 이벤트가 last_seq이면 놓친 이벤트가 없으므로 빈 목록을 돌려줍니다.
+        """
+        if not self.seqs or last_seq > self.seqs[-1]:
+            return None
+        index = bisect.bisect_right(self.seqs, last_seq)
+        expected = last_seq + 1
+        for seq in self.seqs[index:]:
+            if seq != expected:
+                return None
+            expected += 1
+        return self.messages[index:]
+
+
+class ConnectionManager:
+    def __init__(self, queue_size: int = WS_SEND_QUEUE_SIZE, pubsub: Optional[PubSubBackend] = None,
+                 replay_size: int = WS_REPLAY_BUFFER_SIZE):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        # 구독 중인 채팅방별 재전송 버퍼: {room_id: ReplayBuffer}
+        self.replay_buffers: Dict[int, ReplayBuffer] = {}
+        # 활성 연결: {room_id: {user_id: ConnectionSender}}
+        self.active_connections: Dict[int, Dict[int, ConnectionSender]] = {}
+        # 사용자별 연결: {user_id: ConnectionSender}
+        self.user_connections: Dict[int, ConnectionSender] = {}
+        # 사용자별 연결이 구독 중인 채팅방: {user_id: {room_id}} / {room_id: {user_id}}
+        self.user_rooms: Dict[int, Set[int]] = {}
+        self.room_users: Dict[int, Set[int]] = {}
+        # 채팅방/사용자가 아닌 워커 공통 채널: {channel: handler(message)}
+        self.channel_handlers: Dict[str, Callable[[str], None]] = {}
+        self.stats = DeliveryStats()
+        self.pubsub = pubsub or create_backend()
+
+    async def start(self):
+        """pub/sub 백엔드 연결 (앱 시작 시 호출)"""
+        await self.pubsub.start(self._deliver_local)
+
+    async def close(self):
+        await self.pubsub.close()
+
+    def add_channel_handler(self, channel: str, handler: Callable[[str], None]):
+        """워커 공통 채널 구독 (다른 워커가 이 채널로 publish한 메시지를 handler로 전달, 예: 캐시 무효화)"""
+        self.channel_handlers[channel] = handler
+        self.pubsub.subscribe(channel)
+
+    def add_reconnect_handler(self, handler: Callable[[], None]):
+        """pub/sub 허브 재연결 후 호출할 handler 등록 (끊긴 동안 놓친 워커 공통 채널 메시지 보정)"""
+        self.pubsub.add_reconnect_handler(handler)
+
+    def publish(self, channel: str, message: str):
+        """워커 공통 채널로 다른 워커에 알림 (이 워커의 handler는 호출하지 않음)"""
+        self.pubsub.publish(channel, message)
+
+    def _room_in_use(self, room_id: int) -> bool:
+        return room_id in self.active_connections or room_id in self.room_users
+
+    def _subscribe_room(self, room_id: int):
+        """채팅방을 처음 사용할 때 구독 (구독 중에만 이벤트를 빠짐없이 받으므로 재전송 버퍼도 이때 생성)"""
+        if not self._room_in_use(room_id):
+            self.pubsub.subscribe(room_id)
+            self.replay_buffers[room_id] = ReplayBuffer(self.replay_size)
+
+    def _unsubscribe_room(self, room_id: int):
+        if not self._room_in_use(room_id):
+            self.pubsub.unsubscribe(room_id)
+            self.replay_buffers.pop(room_id, None)
+
+    async def connect(self, websocket: WebSocket, room_id: int, user_id: int):
+        await websocket.accept()
+        self._subscribe_room(room_id)
+        room = self.active_connections.setdefault(room_id, {})
+        previous = room.get(user_id)
+        if previous:
+            previous.close()
+        room[user_id] = ConnectionSender(websocket, self.stats, self.queue_size)
+        logger.info("사용자 %s가 채팅방 %s에 연결되었습니다.", user_id, room_id)
+
+    def disconnect(self, room_id: int, user_id: int, websocket: Optional[WebSocket] = None):
+        """
+        연결 해제 (websocket을 지정하면 같은 연결일 때만 해제)
+        같은 사용자가 다시 연결한 뒤 이전 연결의 종료 처리가 늦게 실행되어도 새 연결은 유지됩니다.
+        """
+        room = self.active_connections.get(room_id)
+        if not room or user_id not in room:
+            return
+        sender = room[user_id]
+        if websocket is not None and sender.websocket is not websocket:
+            return
+        sender.close()
+        del room[user_id]
+        logger.info("사용자 %s가 채팅방 %s에서 연결 해제되었습니다.", user_id, room_id)
+
+        # 방에 아무도 없으면 방 정보 삭제 및 구독 해제
+        if not room:
+            del self.active_connections[room_id]
+            self._unsubscribe_room(room_id)
+
+    async def connect_user(self, websocket: WebSocket, user_id: int, room_ids: Iterable[int]):
+        """사용자별 연결 등록 (같은 사용자의 이전 사용자별 연결은 대체)"""
+        await websocket.accept()
+        previous = self.user_connections.get(user_id)
+        if previous:
+            self.disconnect_user(user_id)
+        self.user_connections[user_id] = ConnectionSender(websocket, self.stats, self.queue_size)
+        self.pubsub.subscribe(user_channel(user_id))
+        for room_id in room_ids:
+            self.add_user_room(user_id, room_id)
+        logger.info("사용자 %s가 사용자별 연결로 채팅방 %s개에 연결되었습니다.", user_id, len(self.user_rooms.get(user_id, ())))
+
+    def disconnect_user(self, user_id: int, websocket: Optional[WebSocket] = None):
+        """사용자별 연결 해제 (websocket을 지정하면 같은 연결일 때만 해제)"""
+        sender = self.user_connections.get(user_id)
+        if sender is None or (websocket is not None and sender.websocket is not websocket):
+            return
+        sender.close()
+        del self.user_connections[user_id]
+        self.pubsub.unsubscribe(user_channel(user_id))
+        for room_id in list(self.user_rooms.get(user_id, ())):
+            self.remove_user_room(user_id, room_id)
+        self.user_rooms.pop(user_id, None)
+        logger.info("사용자 %s의 사용자별 연결이 해제되었습니다.", user_id)
+
+    def add_user_room(self, user_id: int, room_id: int):
+        """사용자별 연결에 채팅방 구독 추가"""
+        if user_id not in self.user_connections:
+            return
+        self._subscribe_room(room_id)
+        self.user_rooms.setdefault(user_id, set()).add(room_id)
+        self.room_users.setdefault(room_id, set()).add(user_id)
+
+    def remove_user_room(self, user_id: int, room_id: int):
+        """사용자별 연결에서 채팅방 구독 제거 (채팅방을 나가거나 제거된 경우)"""
+        self.user_rooms.get(user_id, set()).discard(room_id)
+        users = self.room_users.get(room_id)
+        if not users or user_id not in users:
+            return
+        users.discard(user_id)
+        if not users:
+            del self.room_users[room_id]
+            self._unsubscribe_room(room_id)
+
+    def is_user_subscribed(self, user_id: int, room_id: int) -> bool:
+        return room_id in self.user_rooms.get(user_id, ())
+
+    def _enqueue(self, room_id: int, user_id: int, sender: ConnectionSender, message: str):
+        if sender.enqueue(message):
+            return
+        # 큐가 가득 찬 느린 소비자는 연결을 끊음
+        logger.warning("전송 큐 초과로 연결 종료 - 사용자 %s, 채팅방 %s", user_id, room_id)
+        self.stats.record_slow_consumer()
+        self.disconnect(room_id, user_id)
+        sender.close(SLOW_CONSUMER_CLOSE_CODE, "Slow consumer")
+
+    def _enqueue_user(self, user_id: int, sender: ConnectionSender, message: str):
+        if sender.enqueue(message):
+            return
+        logger.warning("전송 큐 초과로 사용자별 연결 종료 - 사용자 %s", user_id)
+        self.stats.record_slow_consumer()
+        self.disconnect_user(user_id)
+        sender.close(SLOW_CONSUMER_CLOSE_CODE, "Slow consumer")
+
+    async def send_personal_message(self, message: str, room_id: int, user_id: int):
+        sender = self.active_connections.get(room_id, {}).get(user_id)
+        if sender:
+            self._enqueue(room_id, user_id, sender, message)
+
+    async def send_to_user(self, message: str, user_id: int):
+        """
+        사용자별 연결(/ws/user)로 전달 (알람 등)
+        다른 워커에 연결된 경우에도 pub/sub 사용자 채널로 전달됩니다.
+        """
+        channel = user_channel(user_id)
+        self._deliver_local(channel, message)
+        self.pubsub.publish(channel, message)
+
+    async def broadcast_to_room(self, message: str, room_id: int, exclude_user: int = None, seq: Optional[int] = None):
+        """
+        채팅방 참여자의 전송 큐에 메시지 추가 (네트워크 전송은 기다리지 않음)
+        로컬 연결에 바로 전달하고, 다른 워커의 연결에는 pub/sub 백엔드로 전달합니다.
+        seq(메시지 순번)를 지정하면 재연결한 클라이언트에게 재전송할 수 있도록 버퍼에 보관합니다.
+        """
+        self._deliver_local(room_id, message, exclude_user, seq)
+        self.pubsub.publish(room_id, message, exclude_user, seq)
+
+    def replay(self, room_id: int, last_seq: int) -> Optional[List[str]]:
+        """last_seq 이후 메시지 이벤트 (버퍼에 빠짐없이 있을 때만, 아니면 None - DB에서 조회해야 함)"""
+        buffer = self.replay_buffers.get(room_id)
+        return buffer.since(last_seq) if buffer else None
+
+    def _deliver_local(self, channel: Channel, message: str, exclude_user: Optional[int] = None,
+                       seq: Optional[int] = None):
+        """이 워커에 연결된 채팅방 참여자(채팅방별 연결과 사용자별 연결) 또는 사용자에게 전달"""
+        if isinstance(channel, str):
+            handler = self.channel_handlers.get(channel)
+            if handler:
+                handler(message)
+                return
+            user_id = int(channel[len(USER_CHANNEL_PREFIX):])
+            sender = self.user_connections.get(user_id)
+            if sender:
+                self._enqueue_user(user_id, sender, message)
+            return
+
+        room_id = channel
+        buffer = self.replay_buffers.get(room_id)
+        if buffer is not None and seq is not None:
+            buffer.add(seq, message)
+        for user_id, sender in list(self.active_connections.get(room_id, {}).items()):
+            if exclude_user is None or user_id != exclude_user:
+                self._enqueue(room_id, user_id, sender, message)
+        for user_id in list(self.room_users.get(room_id, ())):
+            sender = self.user_connections.get(user_id)
+            if sender and (exclude_user is None or user_id != exclude_user):
+                self._enqueue_user(user_id, sender, message)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """연결 수, 현재 전송 큐 깊이, 누적 전달 통계"""
+        depths = [
+            sender.queue.qsize()
+            for room in self.active_connections.values()
+            for sender in room.values()
+        ] + [sender.queue.qsize() for sender in self.user_connections.values()]
+        return {
+            "rooms": len(self.active_connections.keys() | self.room_users.keys()),
+            "connections": len(depths),
+            "user_connections": len(self.user_connections),
+            "replay_buffered_messages": sum(len(buffer.seqs) for buffer in self.replay_buffers.values()),
+            "queue_size": self.queue_size,
+            "queued_messages": sum(depths),
+            "current_max_queue_depth": max(depths, default=0),
+            **self.stats.snapshot(),
+            "pubsub": self.pubsub.snapshot(),
+        }
+
+
+# 전역 연결 관리자
+manager = ConnectionManager()
@@ -1,3 +1,4 @@
+import logging
 import os
 import random
 import string
@@ -16,6 +17,8 @@ SMTP_PORT = email_settings["smtp_port"]
 SMTP_USER = email_settings["smtp_user"]
 SMTP_PASSWORD = email_settings["smtp_password"]
 
+logger = logging.getLogger(__name__)
+
 class EmailService:
     
     @staticmethod
@@ -109,28 +112,18 @@ class EmailService:
         test_mode = email_settings["test_mode"]
         
         if test_mode:
-            print(f"\n{'='*50}")
-            print(f"📧 실제 메일 발송 시뮬레이션")
-            print(f"받는 사람: {recipient_email}")
-            print(f"발송자: {SMTP_USER}")
-            print(f"SMTP 서버: {SMTP_SERVER}:{SMTP_PORT}")
-            print(f"목적: {purpose}")
-            print(f"🔑 인증번호: {verification_code}")
-            print(f"유효시간: 10분")
-            print(f"")
-            print(f"📬 {recipient_email}로 다음 내용의 메일이 발송됩니다:")
-            print(f"제목: 경복대학교 매칭앱 - 인증번호")
-            print(f"내용: 비밀번호 재설정을 위한 인증번호는 {verification_code}입니다.")
-            print(f"{'='*50}\n")
+            # 테스트 모드에서는 인증번호를 로그로 확인
+            logger.info(
+                "메일 발송 시뮬레이션: 받는 사람 %s, 목적 %s, 인증번호 %s (유효시간 10분)",
+                recipient_email, purpose, verification_code,
+                extra={"smtp_server": f"{SMTP_SERVER}:{SMTP_PORT}", "sender": SMTP_USER}
+            )
             return True
         
         # 실제 이메일 발송 (프로덕션 모드)
         try:
-            print(f"📧 실제 메일 발송 시도:")
-            print(f"  SMTP 서버: {SMTP_SERVER}:{SMTP_PORT}")
-            print(f"  발송자: {SMTP_USER}")
-            print(f"  받는사람: {recipient_email}")
-            print(f"  인증번호: {verification_code}")
+            logger.info("메일 발송 시도: 받는 사람 %s", recipient_email,
+                        extra={"smtp_server": f"{SMTP_SERVER}:{SMTP_PORT}", "sender": SMTP_USER})
             
             message = EmailService.create_verification_email(recipient_email, verification_code, purpose)
             
@@ -140,23 +133,20 @@ class EmailService:
             context.verify_mode = ssl.CERT_NONE
             
             # SMTP 연결 및 이메일 발송 (포트 465 SSL 직접 연결)
-            print("  SMTP 서버 연결 중...")
+            logger.debug("SMTP 서버 연결 중")
             server = aiosmtplib.SMTP(hostname=SMTP_SERVER, port=SMTP_PORT, use_tls=True, tls_context=context)
             await server.connect()
-            print("  Gmail 로그인 중...")
+            logger.debug("Gmail 로그인 중")
             await server.login(SMTP_USER, SMTP_PASSWORD)
-            print("  메일 전송 중...")
+            logger.debug("메일 전송 중")
             await server.send_message(message)
             await server.quit()
             
-            print(f"✅ 인증 이메일 발송 성공: {recipient_email}")
+            logger.info("인증 이메일 발송 성공: %s", recipient_email)
             return True
             
         except Exception as e:
-            print(f"❌ 이메일 발송 실패: {e}")
-            print(f"   에러 타입: {type(e).__name__}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("이메일 발송 실패: %s (%s)", e, type(e).__name__)
             return False
     
     @staticmethod
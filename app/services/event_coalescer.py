@@ -0,0 +1,189 @@
+"""
+일시적인 WebSocket 이벤트(typing, 입장/퇴장, presence) 병합
+
+큰 그룹 채팅방에서는 typing 프레임과 연결/해제마다 보내는 입장/퇴장 알림이 전송 프레임의 대부분을 차지합니다.
+저장하지 않고 최신 상태만 의미가 있는 이벤트이므로 서버에서 줄여서 보냅니다.
+
+- typing: 채팅방별 사용자마다 WS_TYPING_INTERVAL_MS에 한 번만 브로드캐스트합니다. (첫 프레임은 바로 전송)
+  메시지를 보내면 다시 바로 전송할 수 있습니다. 클라이언트는 typing 표시를 이 간격보다 길게 유지해야 합니다.
+- 입장/퇴장(presence): 채팅방별로 모아 WS_PRESENCE_DIGEST_MS마다 presence_digest 이벤트 하나로 보냅니다.
+  같은 사용자의 변경은 마지막 상태만 보내고, 간격 안에서 상태가 원래대로 돌아오면(재연결 등) 보내지 않습니다.
+  채팅방 전체에 보내므로 자기 자신의 변경도 포함될 수 있습니다. (클라이언트에서 무시)
+   {"type": "presence_digest", "room_id": 1, "online": [{"user_id": 3, "sender_name": "..."}], "offline": [...]}
+- 각각 0으로 설정하면 병합하지 않고 기존처럼 이벤트마다 바로 전송합니다. (typing, join/leave, presence 이벤트)
+- 줄인 이벤트 수는 GET /debug/websocket 의 ephemeral 항목에서 확인합니다.
+
+환경변수 설정 방법:
+   WS_TYPING_INTERVAL_MS=2000       # 채팅방별 사용자당 typing 브로드캐스트 최소 간격 (0이면 모두 전송)
+   WS_PRESENCE_DIGEST_MS=1000       # 입장/퇴장을 모아서 보내는 주기 (0이면 이벤트마다 바로 전송)
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from app.services.connection_manager import ConnectionManager, manager
+
+# 환경변수 로드
+load_dotenv()
+
+WS_TYPING_INTERVAL_MS = float(os.getenv("WS_TYPING_INTERVAL_MS", "2000"))
+WS_PRESENCE_DIGEST_MS = float(os.getenv("WS_PRESENCE_DIGEST_MS", "1000"))
+
+logger = logging.getLogger(__name__)
+
+ONLINE = "online"
+OFFLINE = "offline"
+
+
+class EphemeralEventCoalescer:
+    """typing 간격 제한과 채팅방별 presence 요약 전송"""
+
+    def __init__(
+        self,
+        connection_manager: ConnectionManager = manager,
+        typing_interval_ms: float = WS_TYPING_INTERVAL_MS,
+        presence_digest_ms: float = WS_PRESENCE_DIGEST_MS,
+    ):
+        self.manager = connection_manager
+        self.typing_interval = typing_interval_ms / 1000
+        self.presence_interval = presence_digest_ms / 1000
+        # 마지막으로 typing을 브로드캐스트한 시각: {(room_id, user_id): monotonic}
+        self.typing_sent_at: Dict[Tuple[int, int], float] = {}
+        # 다음 요약에 보낼 변경: {room_id: {user_id: [처음 상태, 마지막 상태, 이름]}}
+        self.pending: Dict[int, Dict[int, List[Any]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        # 통계
+        self.typing_received = 0
+        self.typing_suppressed = 0
+        self.presence_received = 0
+        self.presence_suppressed = 0
+        self.presence_digests = 0
+
+    @property
+    def typing_enabled(self) -> bool:
+        return self.typing_interval > 0
+
+    @property
+    def presence_enabled(self) -> bool:
+        return self.presence_interval > 0
+
+    async def start(self):
+        """요약 전송 태스크 시작 (앱 시작 시 호출, 병합을 사용하지 않으면 아무것도 하지 않음)"""
+        if (self.typing_enabled or self.presence_enabled) and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """남은 요약을 보내고 종료"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    # -------------------------------------------------------------------------
+    # typing
+    # -------------------------------------------------------------------------
+
+    def allow_typing(self, room_id: int, user_id: int) -> bool:
+        """typing 이벤트를 브로드캐스트해야 하는지 (간격 안에 이미 보냈으면 False)"""
+        self.typing_received += 1
+        if not self.typing_enabled:
+            return True
+        now = time.monotonic()
+        key = (room_id, user_id)
+        sent_at = self.typing_sent_at.get(key)
+        if sent_at is not None and now - sent_at < self.typing_interval:
+            self.typing_suppressed += 1
+            return False
+        self.typing_sent_at[key] = now
+        return True
+
+    def message_sent(self, room_id: int, user_id: int):
+        """메시지를 보내면 입력이 끝난 것이므로 다음 typing은 바로 전송"""
+        self.typing_sent_at.pop((room_id, user_id), None)
+
+    # -------------------------------------------------------------------------
+    # presence
+    # -------------------------------------------------------------------------
+
+    def presence_changed(self, room_id: int, user_id: int, sender_name: str, status: str):
+        """입장(online)/퇴장(offline)을 다음 요약에 추가 (presence_enabled일 때만 호출)"""
+        self.presence_received += 1
+        changes = self.pending.setdefault(room_id, {})
+        change = changes.get(user_id)
+        if change is None:
+            changes[user_id] = [status, status, sender_name]
+        else:
+            # 같은 사용자의 이전 변경은 이 변경으로 대체
+            self.presence_suppressed += 1
+            change[1] = status
+            change[2] = sender_name
+
+    async def flush(self):
+        """모아 둔 입장/퇴장을 채팅방별 presence_digest 이벤트로 전송"""
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, {}
+        timestamp = datetime.now().isoformat()
+        for room_id, changes in pending.items():
+            digest: Dict[str, List[Dict[str, Any]]] = {ONLINE: [], OFFLINE: []}
+            for user_id, (first_status, last_status, sender_name) in changes.items():
+                if first_status != last_status:
+                    # 간격 안에서 원래 상태로 돌아옴 (퇴장 후 재입장 등)
+                    self.presence_suppressed += 1
+                    continue
+                digest[last_status].append({"user_id": user_id, "sender_name": sender_name})
+            if not digest[ONLINE] and not digest[OFFLINE]:
+                continue
+            self.presence_digests += 1
+            await self.manager.broadcast_to_room(json.dumps({
+                "type": "presence_digest",
+                "room_id": room_id,
+                ONLINE: digest[ONLINE],
+                OFFLINE: digest[OFFLINE],
+                "timestamp": timestamp
+            }), room_id)
+
+    async def _run(self):
+        interval = self.presence_interval if self.presence_enabled else self.typing_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+                self._prune_typing()
+            except Exception as e:
+                logger.exception("presence 요약 전송 에러: %s", e)
+
+    def _prune_typing(self):
+        # 간격이 지난 기록은 다시 바로 전송할 수 있으므로 제거
+        if not self.typing_sent_at:
+            return
+        expired_before = time.monotonic() - self.typing_interval
+        for key in [key for key, sent_at in self.typing_sent_at.items() if sent_at <= expired_before]:
+            del self.typing_sent_at[key]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "typing_interval_ms": self.typing_interval * 1000,
+            "presence_digest_ms": self.presence_interval * 1000,
+            "typing_received": self.typing_received,
+            "typing_suppressed": self.typing_suppressed,
+            "presence_received": self.presence_received,
+            "presence_suppressed": self.presence_suppressed,
+            "presence_digests": self.presence_digests,
+            "pending_presence_rooms": len(self.pending),
+        }
+
+
+# 전역 일시적 이벤트 병합기
+event_coalescer = EphemeralEventCoalescer()
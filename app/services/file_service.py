@@ -1,6 +1,7 @@
 """
 채팅용 파일 업로드 및 처리 서비스
 """
+import logging
 import os
 import uuid
 import shutil
@@ -10,6 +11,8 @@ from fastapi import UploadFile, HTTPException, status
 from PIL import Image
 import aiofiles
 
+logger = logging.getLogger(__name__)
+
 class FileService:
     # 허용되는 파일 형식
     ALLOWED_IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
@@ -189,7 +192,7 @@ class FileService:
             return False
             
         except Exception as e:
-            print(f"파일 삭제 오류: {e}")
+            logger.warning("파일 삭제 오류: %s", e)
             return False
     
     @classmethod
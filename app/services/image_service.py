@@ -1,6 +1,7 @@
 """
 이미지 업로드 및 처리 서비스
 """
+import logging
 import os
 import uuid
 import shutil
@@ -10,6 +11,8 @@ from fastapi import UploadFile, HTTPException, status
 from PIL import Image
 import aiofiles
 
+logger = logging.getLogger(__name__)
+
 class ImageService:
     # 허용되는 이미지 형식
     ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
@@ -168,7 +171,7 @@ class ImageService:
             return False
             
         except Exception as e:
-            print(f"이미지 삭제 오류: {e}")
+            logger.warning("이미지 삭제 오류: %s", e)
             return False
     
     @classmethod
@@ -0,0 +1,369 @@
+"""
+채팅방 최근 메시지 캐시
+
+채팅방에 들어갈 때마다 조회하는 메시지 목록 첫 페이지(GET /chat/rooms/{room_id}/messages/, 커서 없이 page=1)를
+DB 조회 없이 돌려주기 위해 채팅방별로 최신 메시지 MESSAGE_CACHE_SIZE개를 응답 JSON으로 직렬화해 보관합니다.
+(권한 확인과 읽음 처리는 캐시와 관계없이 매번 DB에서 실행)
+
+- 메시지 저장(WebSocket/REST/지연 저장), 수정, 삭제, 반응 추가/제거 시 캐시된 채팅방이면 해당 메시지만 갱신합니다.
+  수정/삭제된 메시지를 답장 원본으로 가진 메시지의 미리보기도 함께 갱신합니다.
+- 캐시 전체의 직렬화된 크기가 MESSAGE_CACHE_MAX_BYTES를 넘으면 가장 오래 조회하지 않은 채팅방부터 제거합니다.
+- 여러 워커로 실행하면 변경한 워커는 pub/sub 채널(MESSAGE_CACHE_CHANNEL)로 채팅방 ID를 알리고,
+  다른 워커는 해당 채팅방 캐시를 버립니다. (다음 조회 때 DB에서 다시 채움)
+  memory 백엔드는 다른 프로세스로 알리지 못하므로 MESSAGE_CACHE=auto(기본값)이면 WS_PUBSUB_BACKEND가
+  memory가 아닐 때만 캐시를 사용합니다. 워커 1개로 실행할 때만 MESSAGE_CACHE=on으로 켜세요.
+- pub/sub 허브 연결이 끊어졌다 다시 연결되면 끊긴 동안 주고받지 못한 무효화가 있을 수 있으므로
+  이 워커의 캐시를 모두 버리고 다른 워커에도 전체 무효화를 알립니다.
+- 무효화가 누락되어도 오래된 응답이 계속 나가지 않도록 DB에서 채운 지 MESSAGE_CACHE_TTL_SECONDS가 지난
+  채팅방 캐시는 다시 DB에서 채웁니다.
+- DB에서 채우는 동안 같은 채팅방이 변경되면 조회 결과가 이미 오래된 것일 수 있으므로 캐시에 넣지 않습니다.
+- 적중률 등 통계는 GET /debug/message-cache 에서 확인합니다.
+
+환경변수 설정 방법:
+   MESSAGE_CACHE=auto                   # auto(프로세스 간 pub/sub 백엔드일 때만 사용), on, off
+   MESSAGE_CACHE_SIZE=50                # 채팅방별 보관할 최신 메시지 수 (0이면 캐시 사용 안 함, 이보다 큰 size 요청은 DB 조회)
+   MESSAGE_CACHE_TTL_SECONDS=30         # DB에서 채운 채팅방 캐시의 유효 시간 (0이면 만료 없음)
+   MESSAGE_CACHE_MAX_BYTES=67108864     # 캐시 전체의 최대 직렬화 크기 (초과 시 가장 오래 조회하지 않은 채팅방 제거)
+"""
+import bisect
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+
+from app.models.schemas import ChatMessageResponse, MessageReactionResponse
+from app.services.chat_service import ChatService
+from app.services.pubsub import WS_PUBSUB_BACKEND
+
+# 환경변수 로드
+load_dotenv()
+
+MESSAGE_CACHE = os.getenv("MESSAGE_CACHE", "auto").lower()
+MESSAGE_CACHE_SIZE = int(os.getenv("MESSAGE_CACHE_SIZE", "50"))
+MESSAGE_CACHE_TTL_SECONDS = float(os.getenv("MESSAGE_CACHE_TTL_SECONDS", "30"))
+MESSAGE_CACHE_MAX_BYTES = int(os.getenv("MESSAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# 워커 사이 캐시 무효화 채널 (메시지는 채팅방 ID, "*"이면 전체)
+MESSAGE_CACHE_CHANNEL = "message_cache"
+ALL_ROOMS = "*"
+
+# 다른 워커에 변경을 알리는 함수 (channel, message)
+PublishHandler = Callable[[str, str], None]
+
+
+class CachedRoom:
+    """채팅방 하나의 최신 메시지 (message_id 오름차순, 메시지별 응답 JSON)"""
+
+    __slots__ = ("message_ids", "encoded", "total_count", "complete", "bytes", "expires_at")
+
+    def __init__(self, total_count: int, complete: bool, expires_at: Optional[float] = None):
+        self.message_ids: List[int] = []
+        self.encoded: List[str] = []
+        # 삭제되지 않은 메시지 수 (total_count 응답 값)
+        self.total_count = total_count
+        # 채팅방의 삭제되지 않은 메시지를 모두 가지고 있는지 (보관 개수보다 적은 요청이 아니어도 응답 가능)
+        self.complete = complete
+        self.bytes = 0
+        # 만료 시각 (time.monotonic 기준, None이면 만료 없음)
+        self.expires_at = expires_at
+
+    def index(self, message_id: int) -> Optional[int]:
+        index = bisect.bisect_left(self.message_ids, message_id)
+        if index < len(self.message_ids) and self.message_ids[index] == message_id:
+            return index
+        return None
+
+    def insert(self, message_id: int, encoded: str):
+        index = bisect.bisect_left(self.message_ids, message_id)
+        self.message_ids.insert(index, message_id)
+        self.encoded.insert(index, encoded)
+        self.bytes += len(encoded)
+
+    def set(self, index: int, encoded: str):
+        self.bytes += len(encoded) - len(self.encoded[index])
+        self.encoded[index] = encoded
+
+    def pop(self, index: int):
+        del self.message_ids[index]
+        self.bytes -= len(self.encoded.pop(index))
+
+
+class RecentMessageCache:
+    """채팅방별 최신 메시지 응답 캐시 (채팅방 단위 LRU, 전체 크기 제한)"""
+
+    def __init__(self, size: int = MESSAGE_CACHE_SIZE, max_bytes: int = MESSAGE_CACHE_MAX_BYTES,
+                 ttl_seconds: float = MESSAGE_CACHE_TTL_SECONDS, mode: str = MESSAGE_CACHE):
+        self.size = size
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.mode = mode
+        self._rooms: "OrderedDict[int, CachedRoom]" = OrderedDict()
+        self._bytes = 0
+        # DB에서 채우는 중인 채팅방: {room_id: [진행 중인 조회 수, 변경 횟수]}
+        self._fills: Dict[int, List[int]] = {}
+        self.publish: Optional[PublishHandler] = None
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.fills = 0
+        self.stale_fills = 0
+        self.evictions = 0
+        self.expired = 0
+        self.resyncs = 0
+        self.updates = 0
+        self.invalidations = 0
+        self.remote_invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        if self.size <= 0 or self.max_bytes <= 0 or self.mode == "off":
+            return False
+        if self.mode == "auto":
+            # memory 백엔드는 다른 워커의 캐시를 무효화하지 못함
+            return WS_PUBSUB_BACKEND != "memory"
+        return True
+
+    def cacheable(self, page: int, size: int, cursor_mode: bool) -> bool:
+        """캐시로 응답할 수 있는 요청인지 (커서 없는 첫 페이지이고 보관 개수 이하)"""
+        if not self.enabled:
+            return False
+        if cursor_mode or page != 1 or size > self.size:
+            self.bypassed += 1
+            return False
+        return True
+
+    # -------------------------------------------------------------------------
+    # 조회
+    # -------------------------------------------------------------------------
+
+    def get_page(self, room_id: int, size: int, include_total: bool) -> Optional[str]:
+        """최신 메시지 size개를 ChatMessageListResponse JSON으로 반환 (캐시에 없거나 개수가 모자라면 None)"""
+        room = self._rooms.get(room_id)
+        if room is not None and room.expires_at is not None and time.monotonic() >= room.expires_at:
+            self._drop(room_id)
+            self.expired += 1
+            room = None
+        if room is None or (len(room.message_ids) < size and not room.complete):
+            self.misses += 1
+            return None
+        self._rooms.move_to_end(room_id)
+        self.hits += 1
+        messages = room.encoded[-size:] if size > 0 else []
+        total_count = str(room.total_count) if include_total else "null"
+        has_more = "true" if room.total_count > len(messages) else "false"
+        return f'{{"messages":[{",".join(messages)}],"total_count":{total_count},"has_more":{has_more}}}'
+
+    def begin_fill(self, room_id: int) -> int:
+        """DB 조회 전에 호출 (반환값을 fill()에 전달, 조회가 끝나면 성공 여부와 관계없이 end_fill() 호출)"""
+        entry = self._fills.setdefault(room_id, [0, 0])
+        entry[0] += 1
+        return entry[1]
+
+    def end_fill(self, room_id: int):
+        entry = self._fills.get(room_id)
+        if entry is None:
+            return
+        entry[0] -= 1
+        if entry[0] <= 0:
+            del self._fills[room_id]
+
+    def fill(self, room_id: int, version: int, messages: Sequence[ChatMessageResponse], total_count: int):
+        """
+        DB에서 조회한 최신 메시지(시간 순서, 최대 size개)로 채팅방 캐시 생성
+        조회를 시작한 뒤 같은 채팅방이 변경되었으면 결과가 오래되었을 수 있으므로 버립니다.
+        """
+        entry = self._fills.get(room_id)
+        if entry is None or entry[1] != version:
+            self.stale_fills += 1
+            return
+        self._drop(room_id)
+        messages = list(messages)[-self.size:]
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else None
+        room = CachedRoom(total_count, complete=total_count <= len(messages), expires_at=expires_at)
+        for message in messages:
+            room.insert(message.message_id, message.model_dump_json())
+        self._rooms[room_id] = room
+        self._bytes += room.bytes
+        self.fills += 1
+        self._evict()
+
+    # -------------------------------------------------------------------------
+    # 변경 반영 (DB 커밋 이후 호출)
+    # -------------------------------------------------------------------------
+
+    def add(self, message: ChatMessageResponse):
+        """새 메시지 추가 (보관 개수를 넘으면 가장 오래된 메시지 제거)"""
+        room = self._changed(message.room_id)
+        if room is None or room.index(message.message_id) is not None:
+            return
+        self._resize(room, room.insert, message.message_id, message.model_dump_json())
+        room.total_count += 1
+        while len(room.message_ids) > self.size:
+            self._resize(room, room.pop, 0)
+            room.complete = False
+        self.updates += 1
+        self._evict()
+
+    def replace(self, message: ChatMessageResponse):
+        """수정된 메시지 교체 (이 메시지에 답장한 메시지의 미리보기도 갱신)"""
+        room = self._changed(message.room_id)
+        if room is None:
+            return
+        index = room.index(message.message_id)
+        if index is not None:
+            self._resize(room, room.set, index, message.model_dump_json())
+        self._update_replies(room, message.message_id, message.message_content)
+        self.updates += 1
+
+    def remove(self, room_id: int, message_id: int, content: Optional[str] = None):
+        """
+        삭제된(또는 저장에 실패한) 메시지 제거
+        content를 지정하면 이 메시지에 답장한 메시지의 미리보기를 삭제 후 내용으로 갱신합니다.
+        """
+        room = self._changed(room_id)
+        if room is None:
+            return
+        index = room.index(message_id)
+        if index is not None:
+            self._resize(room, room.pop, index)
+            room.total_count -= 1
+        elif not room.complete and (not room.message_ids or message_id < room.message_ids[0]):
+            # 캐시에 보관하지 않은 오래된 메시지 (캐시 범위 안인데 없는 메시지는 이미 제거된 것)
+            room.total_count -= 1
+        if content is not None:
+            self._update_replies(room, message_id, content)
+        self.updates += 1
+
+    def add_reaction(self, room_id: int, reaction: MessageReactionResponse):
+        self._edit(room_id, reaction.message_id, lambda message: message.reactions.append(reaction))
+
+    def remove_reaction(self, room_id: int, message_id: int, user_id: int, emoji: str):
+        def remove(message: ChatMessageResponse):
+            message.reactions = [
+                reaction for reaction in message.reactions
+                if not (reaction.user_id == user_id and reaction.emoji == emoji)
+            ]
+        self._edit(room_id, message_id, remove)
+
+    def invalidate(self, room_id: int):
+        """채팅방 캐시 제거 (채팅방 삭제 등 개별 갱신이 어려운 변경)"""
+        self._changed(room_id)
+        if self._drop(room_id):
+            self.invalidations += 1
+
+    def clear(self):
+        """전체 캐시 제거 (사용자 이름 변경 등 여러 채팅방의 응답이 바뀌는 변경)"""
+        for entry in self._fills.values():
+            entry[1] += 1
+        self._publish(ALL_ROOMS)
+        self.invalidations += len(self._rooms)
+        self._rooms.clear()
+        self._bytes = 0
+
+    def on_reconnect(self):
+        """pub/sub 허브 재연결 후 호출 (끊긴 동안 누락된 무효화가 있을 수 있으므로 모든 워커의 캐시 제거)"""
+        self.resyncs += 1
+        self.clear()
+
+    def on_remote_change(self, message: str):
+        """다른 워커가 변경한 채팅방 캐시 제거 (pub/sub 채널 수신)"""
+        self.remote_invalidations += 1
+        if message == ALL_ROOMS:
+            for entry in self._fills.values():
+                entry[1] += 1
+            self._rooms.clear()
+            self._bytes = 0
+            return
+        room_id = int(message)
+        entry = self._fills.get(room_id)
+        if entry is not None:
+            entry[1] += 1
+        self._drop(room_id)
+
+    # -------------------------------------------------------------------------
+    # 내부 처리
+    # -------------------------------------------------------------------------
+
+    def _changed(self, room_id: int) -> Optional[CachedRoom]:
+        """변경 기록 (진행 중인 DB 조회 무효화, 다른 워커에 알림) 후 캐시된 채팅방 반환"""
+        entry = self._fills.get(room_id)
+        if entry is not None:
+            entry[1] += 1
+        self._publish(str(room_id))
+        return self._rooms.get(room_id)
+
+    def _publish(self, message: str):
+        if self.publish and self.enabled:
+            self.publish(MESSAGE_CACHE_CHANNEL, message)
+
+    def _edit(self, room_id: int, message_id: int, change: Callable[[ChatMessageResponse], None]):
+        room = self._changed(room_id)
+        if room is None:
+            return
+        index = room.index(message_id)
+        if index is None:
+            return
+        message = ChatMessageResponse.model_validate_json(room.encoded[index])
+        change(message)
+        self._resize(room, room.set, index, message.model_dump_json())
+        self.updates += 1
+
+    def _update_replies(self, room: CachedRoom, message_id: int, content: Optional[str]):
+        preview = (content or "")[:ChatService.PREVIEW_LENGTH]
+        marker = f'"reply_to_message_id":{message_id},'
+        for index, encoded in enumerate(room.encoded):
+            if marker not in encoded:
+                continue
+            message = ChatMessageResponse.model_validate_json(encoded)
+            message.reply_to_message = preview
+            self._resize(room, room.set, index, message.model_dump_json())
+
+    def _resize(self, room: CachedRoom, change: Callable, *args):
+        before = room.bytes
+        change(*args)
+        self._bytes += room.bytes - before
+
+    def _drop(self, room_id: int) -> bool:
+        room = self._rooms.pop(room_id, None)
+        if room is None:
+            return False
+        self._bytes -= room.bytes
+        return True
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._rooms:
+            room_id, room = self._rooms.popitem(last=False)
+            self._bytes -= room.bytes
+            self.evictions += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "mode": self.mode,
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "bytes": self._bytes,
+            "rooms": len(self._rooms),
+            "messages": sum(len(room.message_ids) for room in self._rooms.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self.bypassed,
+            "fills": self.fills,
+            "stale_fills": self.stale_fills,
+            "updates": self.updates,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "resyncs": self.resyncs,
+            "invalidations": self.invalidations,
+            "remote_invalidations": self.remote_invalidations,
+        }
+
+
+# 전역 최근 메시지 캐시
+message_cache = RecentMessageCache()
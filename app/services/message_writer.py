@@ -0,0 +1,286 @@
+"""
+채팅 메시지 지연 저장 (write-behind)
+
+WS_WRITE_BEHIND=true이면 WebSocket으로 받은 메시지에 ID를 먼저 발급해 바로 브로드캐스트하고,
+WS_WRITE_BEHIND_INTERVAL_MS마다 또는 WS_WRITE_BEHIND_BATCH_SIZE개가 모이면 다중 행 INSERT 한 번으로 저장합니다.
+채팅 전달 지연이 DB 커밋 지연에 묶이지 않고, 커밋 횟수가 메시지 수가 아닌 배치 수로 줄어듭니다.
+
+- 메시지 ID는 id_blocks 테이블에서 WS_MESSAGE_ID_BLOCK_SIZE개씩 예약한 블록 안에서 발급합니다.
+  (워커마다 다른 블록을 받으며, 블록은 chat_messages의 최대 ID 이후부터 시작)
+  지연 저장을 사용하는 동안에는 REST API 메시지 저장도 같은 발급기를 사용해야 ID가 겹치지 않습니다.
+- 채팅방 순번(seq)도 워커 메모리에서 발급합니다. (채팅방별로 처음 한 번만 chat_rooms.last_seq를 읽음)
+  여러 워커가 같은 채팅방 순번을 따로 발급하게 되므로 지연 저장은 워커 1개로만 실행할 수 있습니다.
+  (순번은 재연결 replay의 기준이라 ID처럼 블록으로 나눠 발급하면 워커 사이 순서가 어긋나므로,
+   여러 워커용 설정인 WS_PUBSUB_BACKEND가 memory가 아니면 start()에서 RuntimeError를 발생시켜 앱 시작을 막음)
+- 배치 저장이 실패하면 메시지를 하나씩 다시 저장하고, 그래도 실패한 메시지는 on_failed로 알립니다.
+  (main.py에서 채팅방에 message_failed 이벤트 전송)
+- 저장되기 전(최대 WS_WRITE_BEHIND_INTERVAL_MS)에는 메시지 수정/삭제 API와 DB에서 조회하는 메시지 목록에서 보이지 않습니다.
+  (최근 메시지 캐시에는 바로 추가되므로 캐시에서 응답하는 첫 페이지에는 보이며, 저장에 실패하면 캐시에서 제거)
+- 워커가 비정상 종료되면 아직 저장하지 않은 메시지는 유실됩니다. (정상 종료 시에는 남은 메시지를 저장)
+
+환경변수 설정 방법:
+   WS_WRITE_BEHIND=false                # true이면 지연 저장 사용
+   WS_WRITE_BEHIND_INTERVAL_MS=50       # 저장 주기 (밀리초)
+   WS_WRITE_BEHIND_BATCH_SIZE=200       # 이 개수가 모이면 주기를 기다리지 않고 저장
+   WS_MESSAGE_ID_BLOCK_SIZE=1000        # 한 번에 예약할 메시지 ID 수
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.database import AsyncSessionLocal
+from app.models.models import ChatMessage, ChatRoom, IdBlock
+from app.services.chat_service import ChatService
+from app.services.pubsub import WS_PUBSUB_BACKEND
+
+# 환경변수 로드
+load_dotenv()
+
+WS_WRITE_BEHIND = os.getenv("WS_WRITE_BEHIND", "false").lower() == "true"
+WS_WRITE_BEHIND_INTERVAL_MS = float(os.getenv("WS_WRITE_BEHIND_INTERVAL_MS", "50"))
+WS_WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WS_WRITE_BEHIND_BATCH_SIZE", "200"))
+WS_MESSAGE_ID_BLOCK_SIZE = int(os.getenv("WS_MESSAGE_ID_BLOCK_SIZE", "1000"))
+
+logger = logging.getLogger(__name__)
+
+# 저장에 실패한 메시지를 알리는 함수
+FailedHandler = Callable[[List[ChatMessage]], Awaitable[None]]
+
+
+class MessageIdAllocator:
+    """id_blocks 테이블에서 ID 블록을 예약하고 블록 안에서는 DB 없이 ID를 발급"""
+
+    def __init__(self, session_factory: async_sessionmaker, block_size: int = WS_MESSAGE_ID_BLOCK_SIZE,
+                 name: str = "chat_messages"):
+        self.session_factory = session_factory
+        self.block_size = block_size
+        self.name = name
+        self._next = 0
+        self._end = 0
+        self._lock = asyncio.Lock()
+        self.blocks_reserved = 0
+
+    async def allocate(self) -> int:
+        if self._next >= self._end:
+            async with self._lock:
+                if self._next >= self._end:
+                    self._next, self._end = await self._reserve_block()
+        message_id = self._next
+        self._next += 1
+        return message_id
+
+    async def _reserve_block(self):
+        while True:
+            async with self.session_factory() as db:
+                block = await db.scalar(select(IdBlock).where(IdBlock.name == self.name).with_for_update())
+                # 지연 저장을 사용하지 않는 동안 AUTO_INCREMENT로 저장된 메시지 이후부터 예약
+                max_id = await db.scalar(select(func.max(ChatMessage.message_id))) or 0
+                start = max(block.next_id if block else 0, max_id + 1)
+                if block is None:
+                    db.add(IdBlock(name=self.name, next_id=start + self.block_size))
+                else:
+                    block.next_id = start + self.block_size
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # 다른 워커가 먼저 행을 만든 경우 다시 예약
+                    await db.rollback()
+                    continue
+            self.blocks_reserved += 1
+            return start, start + self.block_size
+
+
+class MessageWriter:
+    """WebSocket 메시지를 모아서 일괄 저장하는 지연 저장기"""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker = AsyncSessionLocal,
+        enabled: bool = WS_WRITE_BEHIND,
+        interval_ms: float = WS_WRITE_BEHIND_INTERVAL_MS,
+        batch_size: int = WS_WRITE_BEHIND_BATCH_SIZE,
+        id_block_size: int = WS_MESSAGE_ID_BLOCK_SIZE,
+        pubsub_backend: str = WS_PUBSUB_BACKEND,
+    ):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.pubsub_backend = pubsub_backend
+        self.interval = interval_ms / 1000
+        self.batch_size = batch_size
+        self.ids = MessageIdAllocator(session_factory, id_block_size)
+        # 채팅방별 마지막으로 발급한 순번
+        self.seqs: Dict[int, int] = {}
+        self._seq_lock = asyncio.Lock()
+        self.on_failed: Optional[FailedHandler] = None
+        # 저장 대기 메시지 (답장 대상 조회용으로 ID별로도 보관)
+        self.pending: List[ChatMessage] = []
+        self.pending_by_id: Dict[int, ChatMessage] = {}
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self._task: Optional[asyncio.Task] = None
+        # 통계
+        self.batches = 0
+        self.written = 0
+        self.failed = 0
+        self.retried_batches = 0
+        self.max_batch = 0
+        self.total_flush_ms = 0.0
+
+    async def start(self, on_failed: Optional[FailedHandler] = None):
+        """
+        저장 태스크 시작 (앱 시작 시 호출, 비활성화 상태면 아무것도 하지 않음)
+        여러 워커 설정(WS_PUBSUB_BACKEND != memory)에서는 채팅방 순번이 겹치므로 RuntimeError 발생
+        """
+        if self.enabled and self.pubsub_backend != "memory":
+            raise RuntimeError(
+                "WS_WRITE_BEHIND=true는 채팅방 순번을 워커 메모리에서 발급하므로 워커 1개로만 실행할 수 있습니다. "
+                f"(WS_PUBSUB_BACKEND={self.pubsub_backend}, 여러 워커로 실행하려면 WS_WRITE_BEHIND=false로 설정)"
+            )
+        self.on_failed = on_failed
+        if self.enabled and self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """남은 메시지를 저장하고 저장 태스크 종료"""
+        if self._task is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def allocate_id(self) -> int:
+        return await self.ids.allocate()
+
+    async def allocate_seq(self, room_id: int) -> int:
+        """채팅방 메시지 순번 발급 (처음 발급하는 채팅방은 DB의 마지막 순번부터 이어서 발급)"""
+        if room_id not in self.seqs:
+            async with self._seq_lock:
+                if room_id not in self.seqs:
+                    async with self.session_factory() as db:
+                        last_seq = await db.scalar(select(ChatRoom.last_seq).where(ChatRoom.room_id == room_id))
+                    self.seqs[room_id] = last_seq or 0
+        self.seqs[room_id] += 1
+        return self.seqs[room_id]
+
+    async def submit(self, message: ChatMessage) -> ChatMessage:
+        """ID와 생성 시각을 채워 저장 대기열에 추가 (저장을 기다리지 않음)"""
+        message.message_id = await self.ids.allocate()
+        message.seq = await self.allocate_seq(message.room_id)
+        message.created_at = datetime.now().replace(microsecond=0)
+        message.updated_at = message.created_at
+        message.is_edited = False
+        message.is_deleted = False
+        self.pending.append(message)
+        self.pending_by_id[message.message_id] = message
+        if len(self.pending) >= self.batch_size:
+            self._wakeup.set()
+        return message
+
+    def get_pending(self, message_id: int) -> Optional[ChatMessage]:
+        return self.pending_by_id.get(message_id)
+
+    def has_pending(self, room_id: int) -> bool:
+        """채팅방에 아직 저장하지 않은(저장 중인 배치 포함) 메시지가 있는지"""
+        return any(message.room_id == room_id for message in self.pending_by_id.values())
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception("메시지 지연 저장 에러: %s", e)
+            if self._closing and not self.pending:
+                return
+
+    async def flush(self):
+        """저장 대기 메시지를 한 번의 다중 행 INSERT로 저장 (실패하면 하나씩 다시 저장)"""
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        started = time.perf_counter()
+        failed: List[ChatMessage] = []
+        try:
+            await self._write(batch)
+        except Exception as e:
+            logger.warning("메시지 일괄 저장 실패 (%s개), 하나씩 다시 저장합니다: %s", len(batch), e)
+            self.retried_batches += 1
+            for message in batch:
+                try:
+                    await self._write([message])
+                except Exception as message_error:
+                    logger.error("메시지 저장 실패 - 메시지 %s: %s", message.message_id, message_error)
+                    failed.append(message)
+
+        for message in batch:
+            self.pending_by_id.pop(message.message_id, None)
+        self.batches += 1
+        self.written += len(batch) - len(failed)
+        self.failed += len(failed)
+        self.max_batch = max(self.max_batch, len(batch))
+        self.total_flush_ms += (time.perf_counter() - started) * 1000
+
+        if failed and self.on_failed:
+            await self.on_failed(failed)
+
+    async def _write(self, messages: List[ChatMessage]):
+        async with self.session_factory() as db:
+            await db.execute(insert(ChatMessage).values([self._row(message) for message in messages]))
+            await ChatService.on_messages_created(db, messages)
+            last_seqs: Dict[int, int] = {}
+            for message in messages:
+                last_seqs[message.room_id] = max(last_seqs.get(message.room_id, 0), message.seq)
+            await ChatService.advance_seq(db, last_seqs)
+            await db.commit()
+
+    @staticmethod
+    def _row(message: ChatMessage) -> Dict[str, Any]:
+        return {
+            "message_id": message.message_id,
+            "room_id": message.room_id,
+            "sender_id": message.sender_id,
+            "message_content": message.message_content,
+            "message_type": message.message_type or "text",
+            "file_url": message.file_url,
+            "file_name": message.file_name,
+            "file_size": message.file_size,
+            "reply_to_message_id": message.reply_to_message_id,
+            "is_edited": message.is_edited,
+            "is_deleted": message.is_deleted,
+            "created_at": message.created_at,
+            "updated_at": message.updated_at,
+            "seq": message.seq,
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "interval_ms": self.interval * 1000,
+            "batch_size": self.batch_size,
+            "pending": len(self.pending),
+            "batches": self.batches,
+            "written": self.written,
+            "failed": self.failed,
+            "retried_batches": self.retried_batches,
+            "max_batch": self.max_batch,
+            "avg_flush_ms": round(self.total_flush_ms / self.batches, 3) if self.batches else 0.0,
+            "id_blocks_reserved": self.ids.blocks_reserved,
+        }
+
+
+# 전역 메시지 지연 저장기
+message_writer = MessageWriter()
@@ -0,0 +1,276 @@
+"""
+채팅방 브로드캐스트 pub/sub 백엔드
+
+uvicorn을 여러 워커로 실행하면 워커마다 ConnectionManager가 따로 있으므로, 한 워커에서 보낸 메시지를
+다른 워커에 연결된 참여자에게 전달하려면 워커 사이의 중계가 필요합니다.
+
+- memory: 프로세스 안에서만 전달 (워커 1개, 기본값)
+- unix: Unix 소켓 허브를 통해 워커 사이에 전달. 각 워커는 자신이 연결을 가지고 있는 채널만 구독하며,
+  허브는 메시지를 보낸 워커를 제외한 구독 워커에게만 전달합니다. (보낸 워커는 로컬 연결에 바로 전달)
+
+채널은 채팅방(room_id 정수)과 사용자별 채널("user:{user_id}", /ws/user 연결의 알람 등),
+모든 워커가 구독하는 워커 공통 채널("message_cache" 등 캐시 무효화)입니다.
+
+허브 실행 방법 (워커보다 먼저 실행):
+   python -m app.services.pubsub --hub /tmp/matching_app_ws.sock
+
+환경변수 설정 방법:
+   WS_PUBSUB_BACKEND=unix                       # memory 또는 unix
+   WS_PUBSUB_SOCKET=/tmp/matching_app_ws.sock   # unix 백엔드 허브 소켓 경로
+   WS_PUBSUB_HUB_BUFFER_BYTES=16777216          # 허브의 워커 연결별 전송 대기 바이트 (초과 시 연결 종료)
+
+허브는 워커에게 보낼 프레임을 소켓 버퍼에 쌓기만 하므로, 멈춘 워커의 대기량이 WS_PUBSUB_HUB_BUFFER_BYTES를
+넘으면 (WebSocket의 느린 클라이언트처럼) 그 워커 연결을 끊습니다. 워커는 재연결 후 구독을 복구하며,
+끊긴 동안의 프레임은 전달되지 않으므로 재연결 handler(add_reconnect_handler)에서 캐시 등을 다시 맞춥니다.
+
+허브 프로토콜: 줄 단위 JSON
+   {"op": "sub", "channel": 1} / {"op": "unsub", "channel": "user:7"}
+   {"op": "pub", "channel": 1, "message": "...", "exclude_user": 3, "seq": 42}
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Set, Union
+
+from dotenv import load_dotenv
+
+# 환경변수 로드
+load_dotenv()
+
+WS_PUBSUB_BACKEND = os.getenv("WS_PUBSUB_BACKEND", "memory").lower()
+WS_PUBSUB_SOCKET = os.getenv("WS_PUBSUB_SOCKET", "/tmp/matching_app_ws.sock")
+WS_PUBSUB_HUB_BUFFER_BYTES = int(os.getenv("WS_PUBSUB_HUB_BUFFER_BYTES", str(16 * 1024 * 1024)))
+
+logger = logging.getLogger(__name__)
+
+# 프레임 한 줄의 최대 크기 (asyncio 기본값 64KB보다 긴 메시지도 전달)
+FRAME_LIMIT = 1024 * 1024
+
+# 채팅방 채널은 room_id, 사용자 채널은 "user:{user_id}"
+Channel = Union[int, str]
+
+# 다른 워커에서 받은 메시지를 로컬 연결에 전달하는 함수 (channel, message, exclude_user, seq)
+DeliverHandler = Callable[[Channel, str, Optional[int], Optional[int]], None]
+
+# 허브에 다시 연결된 뒤 호출할 함수 (끊긴 동안 주고받지 못한 프레임이 있을 수 있음)
+ReconnectHandler = Callable[[], None]
+
+
+class PubSubBackend:
+    """메모리 백엔드 (다른 프로세스로 전달하지 않음)"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.handler: Optional[DeliverHandler] = None
+        self.subscriptions: Set[Channel] = set()
+        self.reconnect_handlers: List[ReconnectHandler] = []
+        self.published = 0
+        self.received = 0
+        self.reconnects = 0
+
+    async def start(self, handler: DeliverHandler):
+        self.handler = handler
+
+    async def close(self):
+        pass
+
+    def add_reconnect_handler(self, handler: ReconnectHandler):
+        """허브 재연결 후 호출할 handler 등록 (memory 백엔드는 끊어지지 않으므로 호출하지 않음)"""
+        self.reconnect_handlers.append(handler)
+
+    def subscribe(self, channel: Channel):
+        self.subscriptions.add(channel)
+
+    def unsubscribe(self, channel: Channel):
+        self.subscriptions.discard(channel)
+
+    def publish(self, channel: Channel, message: str, exclude_user: Optional[int] = None, seq: Optional[int] = None):
+        """다른 워커의 구독자에게 전달 (로컬 연결에는 호출한 쪽에서 직접 전달, seq는 채팅방 메시지 순번)"""
+        self.published += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "backend": self.name,
+            "subscribed_channels": len(self.subscriptions),
+            "published": self.published,
+            "received": self.received,
+            "reconnects": self.reconnects,
+        }
+
+
+class UnixSocketBackend(PubSubBackend):
+    """Unix 소켓 허브 백엔드 (허브 연결이 끊어지면 재연결 후 구독 복구)"""
+
+    name = "unix"
+
+    # 재연결 대기 시간 (초)
+    RECONNECT_DELAY = 1.0
+
+    def __init__(self, path: str = WS_PUBSUB_SOCKET):
+        super().__init__()
+        self.path = path
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.connected = asyncio.Event()
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, handler: DeliverHandler):
+        await super().start(handler)
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self.connected.wait(), self.RECONNECT_DELAY)
+        except asyncio.TimeoutError:
+            logger.warning("pub/sub 허브에 연결하지 못했습니다: %s (재시도 중)", self.path)
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        if self.writer:
+            self.writer.close()
+
+    async def _run(self):
+        connected_before = False
+        while True:
+            try:
+                reader, self.writer = await asyncio.open_unix_connection(self.path, limit=FRAME_LIMIT)
+                # 재연결 시 현재 연결이 있는 채널 다시 구독
+                for channel in self.subscriptions:
+                    self._send({"op": "sub", "channel": channel})
+                self.connected.set()
+                logger.info("pub/sub 허브 연결: %s", self.path)
+                if connected_before:
+                    self.reconnects += 1
+                    for handler in self.reconnect_handlers:
+                        handler()
+                connected_before = True
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    frame = json.loads(line)
+                    self.received += 1
+                    if self.handler and frame["channel"] in self.subscriptions:
+                        self.handler(frame["channel"], frame["message"], frame.get("exclude_user"), frame.get("seq"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("pub/sub 허브 연결 에러: %s", e)
+            self.connected.clear()
+            self.writer = None
+            await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def _send(self, frame: Dict[str, object]):
+        # StreamWriter.write는 버퍼에 넣기만 하므로 브로드캐스트가 허브 전송을 기다리지 않음
+        if self.writer is None or self.writer.is_closing():
+            self.dropped += 1
+            return
+        self.writer.write(json.dumps(frame, ensure_ascii=False).encode() + b"\n")
+
+    def subscribe(self, channel: Channel):
+        if channel not in self.subscriptions:
+            super().subscribe(channel)
+            self._send({"op": "sub", "channel": channel})
+
+    def unsubscribe(self, channel: Channel):
+        if channel in self.subscriptions:
+            super().unsubscribe(channel)
+            self._send({"op": "unsub", "channel": channel})
+
+    def publish(self, channel: Channel, message: str, exclude_user: Optional[int] = None, seq: Optional[int] = None):
+        super().publish(channel, message, exclude_user, seq)
+        self._send({"op": "pub", "channel": channel, "message": message, "exclude_user": exclude_user, "seq": seq})
+
+    def snapshot(self) -> Dict[str, object]:
+        data = super().snapshot()
+        data.update({"socket": self.path, "connected": self.connected.is_set(), "dropped": self.dropped})
+        return data
+
+
+def create_backend(name: str = WS_PUBSUB_BACKEND) -> PubSubBackend:
+    if name == "unix":
+        return UnixSocketBackend()
+    return PubSubBackend()
+
+
+# -----------------------------------------------------------------------------
+# Unix 소켓 허브
+# -----------------------------------------------------------------------------
+
+class PubSubHub:
+    """워커 연결별 구독 채널을 관리하고 pub 프레임을 구독 워커에게 중계"""
+
+    def __init__(self, max_buffer_bytes: int = WS_PUBSUB_HUB_BUFFER_BYTES):
+        # {channel: {구독 워커 연결}}
+        self.channels: Dict[Channel, Set[asyncio.StreamWriter]] = {}
+        self.max_buffer_bytes = max_buffer_bytes
+        self.slow_disconnects = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        subscribed: Set[Channel] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                frame = json.loads(line)
+                channel = frame["channel"]
+                if frame["op"] == "sub":
+                    self.channels.setdefault(channel, set()).add(writer)
+                    subscribed.add(channel)
+                elif frame["op"] == "unsub":
+                    self._remove(channel, writer)
+                    subscribed.discard(channel)
+                elif frame["op"] == "pub":
+                    for subscriber in list(self.channels.get(channel, ())):
+                        if subscriber is not writer:
+                            self._write(subscriber, line)
+        except Exception as e:
+            logger.warning("pub/sub 허브 워커 연결 에러: %s", e)
+        finally:
+            for channel in subscribed:
+                self._remove(channel, writer)
+            writer.close()
+
+    def _write(self, subscriber: asyncio.StreamWriter, line: bytes):
+        if subscriber.is_closing():
+            return
+        # 전송 대기량이 한도를 넘은 워커는 연결 종료 (버퍼를 버리고 즉시 끊음, 구독 정리는 handle의 finally)
+        if subscriber.transport.get_write_buffer_size() + len(line) > self.max_buffer_bytes:
+            self.slow_disconnects += 1
+            logger.warning("pub/sub 허브: 느린 워커 연결 종료 (전송 대기 %d바이트)",
+                           subscriber.transport.get_write_buffer_size())
+            subscriber.transport.abort()
+            return
+        subscriber.write(line)
+
+    def _remove(self, channel: Channel, writer: asyncio.StreamWriter):
+        subscribers = self.channels.get(channel)
+        if subscribers:
+            subscribers.discard(writer)
+            if not subscribers:
+                del self.channels[channel]
+
+
+async def serve_hub(path: str):
+    if os.path.exists(path):
+        os.unlink(path)
+    hub = PubSubHub()
+    server = await asyncio.start_unix_server(hub.handle, path=path, limit=FRAME_LIMIT)
+    logger.info("pub/sub 허브 실행 중: %s", path)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    from app.config.logging_config import setup_logging
+
+    parser = argparse.ArgumentParser(description="채팅방 브로드캐스트 pub/sub 허브")
+    parser.add_argument("--hub", default=WS_PUBSUB_SOCKET, help="허브 Unix 소켓 경로")
+    args = parser.parse_args()
+    setup_logging()
+    # python -m 으로 실행하면 __name__이 "__main__"이므로 app.* 로거로 다시 지정
+    logger = logging.getLogger("app.services.pubsub")
+    asyncio.run(serve_hub(args.hub))
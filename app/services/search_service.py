@@ -0,0 +1,369 @@
+"""
+채팅 메시지 검색 서비스 (n-gram 색인)
+
+MariaDB의 FULLTEXT는 한국어 조사가 붙은 어절을 나누지 못하고 ngram 파서는 MySQL에만 있으므로,
+메시지 내용을 2글자 단위(bigram)로 잘라 message_search_terms 테이블에 (채팅방, 검색어, 메시지) 색인으로 저장합니다.
+색인은 ChatService가 메시지 저장/수정/삭제와 같은 트랜잭션 안에서 갱신하므로 여러 워커에서도 항상 일치합니다.
+
+최신순 검색:
+1. 검색어 bigram마다 색인 항목 수를 RARE_TERM_LIMIT개까지만 세어 드물게 나오는 bigram을 찾음
+2. 드문 bigram이 있으면 그 bigram이 들어 있는 메시지만 후보로 삼고, 나머지 bigram도 색인에 있는지 기본키로 확인
+3. 모든 bigram이 흔하면 최신 메시지부터 색인 기본키로 확인 (일치하는 메시지가 많아 한 페이지를 금방 채우고 멈춤)
+
+관련도순 검색:
+일치하는 최신 메시지를 RELEVANCE_CANDIDATE_LIMIT개까지 찾고, 그 안에서 검색어 bigram 출현 횟수 합계로 정렬합니다.
+(흔한 검색어도 색인 전체를 집계하지 않음)
+
+관련도순 후보와 검색 결과 수(TOTAL_COUNT_LIMIT개까지)는 메시지 테이블 없이 색인만으로 찾습니다.
+드문 bigram(없으면 첫 bigram)의 색인 항목을 최신순으로 읽으며 나머지 bigram이 있는지 기본키로 확인합니다.
+
+전체 채팅방 검색:
+색인 기본키가 room_id로 시작하므로 사용자가 참여 중인 채팅방의 색인 범위만 읽어 채팅방별로 묶어 반환합니다.
+
+최종 일치 여부는 색인(정규화된 내용의 bigram)으로 판단하므로 전각/호환 문자로 쓴 메시지도 검색됩니다.
+(세 글자 이상 단어는 bigram이 모두 같은 단어 안에 있으면 일치로 보므로, 드물게 글자 순서가 다른 단어도 검색될 수 있음)
+bigram이 없는 한 글자 단어는 LIKE로 확인하며, %와 _는 일반 문자로 검색합니다.
+"""
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.models import ChatMessage, ChatParticipant, MessageSearchTerm
+
+_WORD_RE = re.compile(r"\w+")
+
+
+class MessageSearchService:
+    # 검색 단위 글자 수
+    GRAM_SIZE = 2
+
+    # 색인 항목이 이보다 적은 bigram만 최신순 검색의 후보 범위로 사용
+    RARE_TERM_LIMIT = 1000
+
+    # 관련도순 검색에서 점수를 계산할 최신 일치 메시지 수
+    RELEVANCE_CANDIDATE_LIMIT = 1000
+
+    # 검색 결과 수를 셀 때의 상한 (넘으면 상한값과 함께 capped=True 반환)
+    TOTAL_COUNT_LIMIT = 1000
+
+    # 검색 결과 미리보기에서 검색어 앞뒤로 보여줄 글자 수
+    SNIPPET_CONTEXT = 30
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        """전각/반각 등 표기 차이를 맞추고 소문자로 변환"""
+        return unicodedata.normalize("NFKC", text or "").lower()
+
+    @classmethod
+    def split_words(cls, text: Optional[str]) -> List[str]:
+        """공백/문장부호 기준으로 단어 분리"""
+        return _WORD_RE.findall(cls.normalize(text))
+
+    @classmethod
+    def word_terms(cls, word: str) -> List[str]:
+        """단어를 bigram 목록으로 변환 (한 글자 단어는 빈 목록)"""
+        return [word[i:i + cls.GRAM_SIZE] for i in range(len(word) - cls.GRAM_SIZE + 1)]
+
+    @classmethod
+    def tokenize(cls, text: Optional[str]) -> Counter:
+        """메시지 내용 → {bigram: 출현 횟수}"""
+        terms = Counter()
+        for word in cls.split_words(text):
+            terms.update(cls.word_terms(word))
+        return terms
+
+    @classmethod
+    def query_terms(cls, q: str) -> List[str]:
+        """검색어 → 중복 없는 bigram 목록"""
+        return sorted({term for word in cls.split_words(q) for term in cls.word_terms(word)})
+
+    # -------------------------------------------------------------------------
+    # 색인 갱신 (커밋은 호출한 쪽에서)
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    async def index_message(cls, db: AsyncSession, message: ChatMessage):
+        """메시지 색인 추가 (message_id가 발급된 이후 호출)"""
+        await cls.index_messages(db, [message])
+
+    @classmethod
+    async def index_messages(cls, db: AsyncSession, messages: Sequence[ChatMessage]):
+        """여러 메시지 색인을 한 번의 INSERT로 추가"""
+        rows = [
+            {"room_id": message.room_id, "term": term, "message_id": message.message_id, "term_count": count}
+            for message in messages
+            for term, count in cls.tokenize(message.message_content).items()
+        ]
+        if rows:
+            await db.execute(insert(MessageSearchTerm), rows)
+
+    @staticmethod
+    async def remove_message(db: AsyncSession, message_id: int):
+        """메시지 색인 삭제"""
+        await db.execute(delete(MessageSearchTerm).where(MessageSearchTerm.message_id == message_id))
+
+    @classmethod
+    async def reindex_message(cls, db: AsyncSession, message: ChatMessage):
+        """수정된 메시지 색인 교체"""
+        await cls.remove_message(db, message.message_id)
+        await cls.index_message(db, message)
+
+    # -------------------------------------------------------------------------
+    # 검색
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    async def find_rare_term(cls, db: AsyncSession, room_id: int, q: str) -> Optional[str]:
+        """
+        검색어 bigram 중 채팅방 안에서 색인 항목이 가장 적은 bigram (RARE_TERM_LIMIT개 이상이면 None)
+        bigram마다 최대 RARE_TERM_LIMIT개까지만 세므로 흔한 bigram이 있어도 한 번의 짧은 쿼리로 끝납니다.
+        """
+        terms = cls.query_terms(q)
+        if not terms:
+            return None
+        counts = [
+            select(func.count()).select_from(
+                cls.term_postings(room_id, term).limit(cls.RARE_TERM_LIMIT).subquery()
+            ).scalar_subquery()
+            for term in terms
+        ]
+        row = (await db.execute(select(*counts))).one()
+        count, term = min(zip(row, terms))
+        return term if count < cls.RARE_TERM_LIMIT else None
+
+    @staticmethod
+    def escape_like(text: str) -> str:
+        """LIKE 패턴의 특수 문자(%, _)를 일반 문자로 검색하도록 변환 (escape="\\"와 함께 사용)"""
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @classmethod
+    def like_filters(cls, q: str) -> List:
+        """bigram이 없는 단어(한 글자 단어, 단어가 없는 검색어)의 LIKE 조건"""
+        words = cls.split_words(q)
+        if words:
+            words = [word for word in words if not cls.word_terms(word)]
+        else:
+            words = [q]
+        return [ChatMessage.message_content.like(f"%{cls.escape_like(word)}%", escape="\\") for word in words]
+
+    @classmethod
+    def term_filters(cls, q: str) -> List:
+        """검색어 bigram이 모두 메시지 색인에 있는지 (메시지마다 색인 기본키 조회)"""
+        return [
+            select(MessageSearchTerm.message_id).where(
+                MessageSearchTerm.room_id == ChatMessage.room_id,
+                MessageSearchTerm.term == term,
+                MessageSearchTerm.message_id == ChatMessage.message_id
+            ).exists()
+            for term in cls.query_terms(q)
+        ]
+
+    @classmethod
+    def build_filters(cls, room_id: int, q: str, rare_term: Optional[str] = None) -> tuple:
+        """
+        채팅방 내 검색 조건 (ChatService.fetch_message_page에 그대로 전달 가능)
+        rare_term(find_rare_term 결과)이 있으면 색인으로 후보를 좁히고, 나머지 bigram과 한 글자 단어로 최종 확인합니다.
+        """
+        filters = [ChatMessage.room_id == room_id, ChatMessage.is_deleted == False]
+        filters.extend(cls.term_filters(q))
+        filters.extend(cls.like_filters(q))
+        if rare_term:
+            filters.append(ChatMessage.message_id.in_(cls.term_postings(room_id, rare_term)))
+        return tuple(filters)
+
+    @staticmethod
+    def term_postings(room_id: int, term: str):
+        """bigram이 들어 있는 메시지 ID (기본키 범위 조회)"""
+        return select(MessageSearchTerm.message_id).where(
+            MessageSearchTerm.room_id == room_id,
+            MessageSearchTerm.term == term
+        )
+
+    @classmethod
+    def matching_postings(cls, room_id: int, q: str, rare_term: Optional[str] = None):
+        """
+        모든 bigram이 들어 있는 메시지 ID (색인만 사용, 한 글자 단어가 있어 LIKE 확인이 필요하면 None)
+        드문 bigram(없으면 첫 bigram)의 색인 항목에서 나머지 bigram을 기본키로 확인합니다.
+        삭제된 메시지는 색인에서 제거되므로 메시지 테이블을 확인하지 않아도 됩니다.
+        """
+        terms = cls.query_terms(q)
+        if not terms or cls.like_filters(q):
+            return None
+        driver = rare_term or terms[0]
+        other = aliased(MessageSearchTerm)
+        return cls.term_postings(room_id, driver).where(*[
+            select(other.message_id).where(
+                other.room_id == room_id,
+                other.term == term,
+                other.message_id == MessageSearchTerm.message_id
+            ).exists()
+            for term in terms if term != driver
+        ])
+
+    @classmethod
+    async def count_matches(
+        cls, db: AsyncSession, room_id: int, q: str, rare_term: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """
+        채팅방 내 검색 결과 수 (TOTAL_COUNT_LIMIT개까지만 셈)
+        반환값: (결과 수, 상한을 넘었는지 여부)
+        한 글자 단어가 없으면 메시지 테이블 없이 색인만으로 셉니다. (matching_postings)
+        """
+        matches = cls.matching_postings(room_id, q, rare_term)
+        if matches is None:
+            matches = select(ChatMessage.message_id).where(*cls.build_filters(room_id, q, rare_term))
+        count = await db.scalar(
+            select(func.count()).select_from(matches.limit(cls.TOTAL_COUNT_LIMIT + 1).subquery())
+        )
+        return min(count, cls.TOTAL_COUNT_LIMIT), count > cls.TOTAL_COUNT_LIMIT
+
+    @classmethod
+    def relevance_query(cls, room_id: int, q: str, rare_term: Optional[str] = None):
+        """
+        관련도순 검색 쿼리와 점수 서브쿼리 (쿼리 결과는 (ChatMessage, score))
+        최신 일치 메시지 RELEVANCE_CANDIDATE_LIMIT개의 색인 항목만 집계합니다.
+        (MariaDB는 LIMIT이 있는 IN 서브쿼리를 지원하지 않으므로 파생 테이블로 조인)
+        """
+        candidates = cls.matching_postings(room_id, q, rare_term)
+        if candidates is None:
+            candidates = select(ChatMessage.message_id).where(*cls.build_filters(room_id, q, rare_term))
+        candidates = candidates.order_by(
+            candidates.selected_columns.message_id.desc()
+        ).limit(cls.RELEVANCE_CANDIDATE_LIMIT).subquery()
+        scores = select(
+            MessageSearchTerm.message_id,
+            func.sum(MessageSearchTerm.term_count).label("score")
+        ).join(
+            candidates, candidates.c.message_id == MessageSearchTerm.message_id
+        ).where(
+            MessageSearchTerm.room_id == room_id,
+            MessageSearchTerm.term.in_(cls.query_terms(q))
+        ).group_by(MessageSearchTerm.message_id).subquery()
+        return select(ChatMessage, scores.c.score).join(
+            scores, scores.c.message_id == ChatMessage.message_id
+        ).order_by(scores.c.score.desc(), ChatMessage.message_id.desc()), scores
+
+    @staticmethod
+    def encode_cursor(score: int, message_id: int) -> str:
+        return f"{score}:{message_id}"
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[int, int]:
+        """관련도순 커서 해석 (형식이 잘못되면 ValueError)"""
+        score, message_id = cursor.split(":")
+        return int(score), int(message_id)
+
+    @classmethod
+    async def search_by_relevance(
+        cls,
+        db: AsyncSession,
+        room_id: int,
+        q: str,
+        limit: int,
+        page: int = 1,
+        cursor: Optional[str] = None,
+        rare_term: Optional[str] = None
+    ) -> Tuple[List[ChatMessage], bool, Optional[str]]:
+        """
+        관련도순 검색 (점수가 같으면 최신 메시지 우선, query_terms(q)가 비어 있지 않을 때만 사용)
+        반환값: (메시지 목록, 다음 페이지 존재 여부, 다음 페이지 커서)
+        cursor가 있으면 해당 위치 이후부터, 없으면 page 기준 OFFSET으로 조회합니다.
+        rare_term은 find_rare_term 결과 (최신순 검색과 같이 후보를 좁히는 데 사용)
+        """
+        query, scores = cls.relevance_query(room_id, q, rare_term)
+
+        if cursor:
+            last_score, last_message_id = cls.decode_cursor(cursor)
+            query = query.where(or_(
+                scores.c.score < last_score,
+                and_(scores.c.score == last_score, ChatMessage.message_id < last_message_id)
+            ))
+        elif page > 1:
+            query = query.offset((page - 1) * limit)
+
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = None
+        if has_more and rows:
+            last_message, last_score = rows[-1]
+            next_cursor = cls.encode_cursor(last_score, last_message.message_id)
+        return [message for message, _ in rows], has_more, next_cursor
+
+    # -------------------------------------------------------------------------
+    # 전체 채팅방 검색
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def active_rooms(user_id: int):
+        """사용자가 현재 참여 중인 채팅방 ID (나간 채팅방 제외)"""
+        return select(ChatParticipant.room_id).where(
+            ChatParticipant.user_id == user_id,
+            ChatParticipant.is_active == True,
+            ChatParticipant.left_at.is_(None)
+        )
+
+    @classmethod
+    async def search_user_rooms(
+        cls,
+        db: AsyncSession,
+        user_id: int,
+        q: str,
+        per_room: int
+    ) -> List[Tuple[int, int, List[ChatMessage]]]:
+        """
+        사용자가 참여 중인 모든 채팅방에서 검색 (채팅방별 최신 메시지 per_room개)
+        반환값: [(채팅방 ID, 검색된 메시지 수, 메시지 목록)] - 가장 최근 검색 결과가 있는 채팅방 순
+        """
+        rooms = cls.active_rooms(user_id)
+        filters = [
+            ChatMessage.room_id.in_(rooms),
+            ChatMessage.is_deleted == False,
+            *cls.like_filters(q)
+        ]
+        terms = cls.query_terms(q)
+        if terms:
+            filters.append(ChatMessage.message_id.in_(
+                select(MessageSearchTerm.message_id).where(
+                    MessageSearchTerm.room_id.in_(rooms),
+                    MessageSearchTerm.term.in_(terms)
+                ).group_by(MessageSearchTerm.message_id).having(func.count() == len(terms))
+            ))
+
+        by_room = {"partition_by": ChatMessage.room_id}
+        ranked = select(
+            ChatMessage.message_id,
+            func.row_number().over(order_by=ChatMessage.message_id.desc(), **by_room).label("rank"),
+            func.count().over(**by_room).label("hit_count"),
+            func.max(ChatMessage.message_id).over(**by_room).label("latest_message_id")
+        ).where(*filters).subquery()
+        rows = await db.execute(
+            select(ChatMessage, ranked.c.hit_count).join(
+                ranked, ranked.c.message_id == ChatMessage.message_id
+            ).where(ranked.c.rank <= per_room).order_by(ranked.c.latest_message_id.desc(), ranked.c.rank)
+        )
+
+        results: Dict[int, Tuple[int, List[ChatMessage]]] = {}
+        for message, hit_count in rows:
+            results.setdefault(message.room_id, (hit_count, []))[1].append(message)
+        return [(room_id, hit_count, messages) for room_id, (hit_count, messages) in results.items()]
+
+    @classmethod
+    def make_snippet(cls, content: Optional[str], q: str) -> str:
+        """검색어가 처음 나오는 위치 주변의 메시지 내용 (잘린 부분은 …로 표시)"""
+        content = content or ""
+        lowered = content.lower()
+        position, length = 0, 0
+        for word in cls.split_words(q) or [q.lower()]:
+            found = lowered.find(word)
+            if found >= 0:
+                position, length = found, len(word)
+                break
+        start = max(0, position - cls.SNIPPET_CONTEXT)
+        end = min(len(content), position + length + cls.SNIPPET_CONTEXT)
+        return ("…" if start > 0 else "") + content[start:end] + ("…" if end < len(content) else "")
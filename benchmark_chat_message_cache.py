@@ -0,0 +1,282 @@
+"""
+채팅방 최근 메시지 캐시 점검
+
+답장/반응이 섞인 채팅방에서 메시지 목록 첫 페이지(GET /chat/rooms/{room_id}/messages/)를
+- 캐시 없이 DB에서 조회할 때와 캐시에서 응답할 때의 처리 시간과 쿼리 수를 비교하고
+- REST/WebSocket 메시지 저장, 수정, 삭제, 반응 추가/제거 후에도 캐시 응답이 DB 조회 결과와 같은지
+- 조회 중 채팅방이 변경되면 오래된 조회 결과를 캐시에 넣지 않는지
+- 전체 크기 제한(MESSAGE_CACHE_MAX_BYTES)을 넘으면 가장 오래 조회하지 않은 채팅방부터 제거되는지
+- 채운 지 MESSAGE_CACHE_TTL_SECONDS가 지난 채팅방은 DB에서 다시 채우는지
+- pub/sub 허브 재연결 시 캐시를 모두 버리고 다른 워커에 전체 무효화를 알리는지
+를 확인합니다. 하나라도 어긋나면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_chat_message_cache.py
+   python benchmark_chat_message_cache.py --messages 1000 --runs 50
+   python benchmark_chat_message_cache.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+(반응 API는 동기 세션을 사용하므로 같은 DB에 pymysql/sqlite 동기 드라이버로도 연결합니다.)
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import (
+    add_message_reaction, create_chat_message, delete_chat_message, get_chat_messages, handle_chat_event,
+    remove_message_reaction, update_chat_message
+)
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, MessageReaction, User
+from app.models.schemas import ChatMessageCreate, MessageReactionCreate
+from app.monitoring import query_stats
+from app.services.message_cache import ALL_ROOMS, MESSAGE_CACHE_CHANNEL, message_cache
+
+MEMBER_COUNT = 5
+EMOJIS = ["👍", "❤️", "😂"]
+PAGE_SIZE = 50
+
+
+async def seed(session_factory, message_count: int, room_count: int):
+    """답장/반응이 있는 채팅방 room_count개 생성 후 (사용자 목록, 채팅방 ID 목록) 반환"""
+    async with session_factory() as db:
+        users = [
+            User(email=f"bench-cache{i}@example.com", password_hash="x", salt="", name=f"member {i}",
+                 birth_date=date(2000, 1, 1), gender="M", nationality="KR", terms_agreed=True)
+            for i in range(MEMBER_COUNT)
+        ]
+        db.add_all(users)
+        await db.flush()
+        room_ids = []
+        for r in range(room_count):
+            room = ChatRoom(room_name=f"cache {r}", room_type="group", created_by=users[0].user_id)
+            db.add(room)
+            await db.flush()
+            db.add_all([ChatParticipant(room_id=room.room_id, user_id=user.user_id) for user in users])
+            previous_id = None
+            for i in range(message_count):
+                message = ChatMessage(room_id=room.room_id, sender_id=users[i % MEMBER_COUNT].user_id,
+                                      message_content=f"message {i}", seq=i + 1,
+                                      reply_to_message_id=previous_id if i % 3 == 0 else None)
+                db.add(message)
+                await db.flush()
+                db.add_all([
+                    MessageReaction(message_id=message.message_id, user_id=users[(i + j) % MEMBER_COUNT].user_id,
+                                    emoji=EMOJIS[j])
+                    for j in range(i % len(EMOJIS))
+                ])
+                previous_id = message.message_id
+            room.last_seq = message_count
+            room_ids.append(room.room_id)
+        await db.commit()
+        return users, room_ids
+
+
+async def fetch_page(session_factory, user_id: int, room_id: int, size: int, include_total=None):
+    """첫 페이지 조회 결과를 JSON 값으로 반환 (캐시 응답과 DB 응답을 같은 형태로 비교)"""
+    async with session_factory() as db:
+        user = await db.get(User, user_id)
+        response = await get_chat_messages(room_id=room_id, page=1, size=size, include_total=include_total,
+                                           current_user=user, db=db, read_db=db)
+    if hasattr(response, "body"):
+        return json.loads(response.body)
+    return response.model_dump(mode="json")
+
+
+async def db_page(session_factory, user_id: int, room_id: int, size: int, include_total=None):
+    """캐시를 거치지 않은 조회 결과"""
+    cache_size, message_cache.size = message_cache.size, 0
+    try:
+        return await fetch_page(session_factory, user_id, room_id, size, include_total)
+    finally:
+        message_cache.size = cache_size
+
+
+async def measure(session_factory, user_id: int, room_id: int, runs: int):
+    timings = []
+    queries = 0
+    for _ in range(runs):
+        with query_stats.count_queries() as stats:
+            started = time.perf_counter()
+            await fetch_page(session_factory, user_id, room_id, PAGE_SIZE)
+            timings.append((time.perf_counter() - started) * 1000)
+        queries = stats.count
+    return statistics.median(timings), queries
+
+
+async def main(database_url: str, message_count: int, runs: int) -> bool:
+    logging.getLogger("app").setLevel(logging.WARNING)
+    # 한 프로세스에서 점검하므로 pub/sub 백엔드(MESSAGE_CACHE=auto)와 관계없이 캐시 사용
+    message_cache.mode = "on"
+    engine = create_async_engine(database_url)
+    query_stats.attach(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    users, room_ids = await seed(session_factory, message_count, room_count=12)
+    user = users[0]
+    room_id = room_ids[0]
+    ok = True
+
+    # 처리 시간과 쿼리 수
+    cache_size, message_cache.size = message_cache.size, 0
+    db_ms, db_queries = await measure(session_factory, user.user_id, room_id, runs)
+    message_cache.size = cache_size
+    await fetch_page(session_factory, user.user_id, room_id, PAGE_SIZE)
+    cache_ms, cache_queries = await measure(session_factory, user.user_id, room_id, runs)
+    print(f"첫 페이지 {PAGE_SIZE}개: DB 조회 {db_ms:.2f}ms {db_queries}쿼리 | 캐시 {cache_ms:.2f}ms {cache_queries}쿼리")
+    if cache_queries >= db_queries:
+        print("❌ 캐시 응답의 쿼리 수가 줄지 않았습니다.")
+        ok = False
+
+    async def compare(label: str):
+        nonlocal ok
+        for size, include_total in ((10, None), (PAGE_SIZE, None), (PAGE_SIZE, False), (message_cache.size, None)):
+            cached = await fetch_page(session_factory, user.user_id, room_id, size, include_total)
+            expected = await db_page(session_factory, user.user_id, room_id, size, include_total)
+            if cached != expected:
+                diff = [
+                    (c.get("message_id"), e.get("message_id"))
+                    for c, e in zip(cached["messages"], expected["messages"]) if c != e
+                ][:3]
+                print(f"❌ {label} 후 캐시 응답이 DB 조회와 다릅니다 (size={size}): "
+                      f"total {cached['total_count']}/{expected['total_count']}, "
+                      f"has_more {cached['has_more']}/{expected['has_more']}, 다른 메시지 {diff}")
+                ok = False
+                return
+
+    async def rest_session(endpoint, *args, **kwargs):
+        async with session_factory() as db:
+            current_user = await db.get(User, user.user_id)
+            return await endpoint(*args, current_user=current_user, db=db, **kwargs)
+
+    async def reaction_session(endpoint, *args, **kwargs):
+        try:
+            return await rest_session(endpoint, *args, **kwargs)
+        except HTTPException as e:
+            # 같은 반응을 다시 추가하면 제거 후 200 응답
+            if e.status_code != 200:
+                raise
+
+    await compare("캐시 채움")
+    hits_before = message_cache.hits
+
+    # 변경 반영
+    async def reply(payload: dict):
+        pass
+
+    newest = await rest_session(create_chat_message, room_id, ChatMessageCreate(message_content="rest message"),
+                                reply_to_message_id=None)
+    await compare("REST 메시지 저장")
+    await rest_session(create_chat_message, room_id, ChatMessageCreate(message_content="rest reply"),
+                       reply_to_message_id=newest.message_id)
+    await compare("REST 답장 저장")
+    await handle_chat_event(session_factory, user, room_id,
+                            {"type": "message", "content": "ws reply", "reply_to_message_id": newest.message_id}, reply)
+    await compare("WebSocket 메시지 저장")
+    await rest_session(update_chat_message, newest.message_id, ChatMessageCreate(message_content="edited"))
+    await compare("메시지 수정 (답장 미리보기 포함)")
+    await reaction_session(add_message_reaction, newest.message_id, MessageReactionCreate(emoji="🔥"))
+    await compare("반응 추가")
+    await reaction_session(add_message_reaction, newest.message_id, MessageReactionCreate(emoji="🔥"))
+    await compare("같은 반응 다시 추가 (제거)")
+    await reaction_session(add_message_reaction, newest.message_id, MessageReactionCreate(emoji="👍"))
+    await reaction_session(remove_message_reaction, newest.message_id, "👍")
+    await compare("반응 제거")
+    await rest_session(delete_chat_message, newest.message_id)
+    await compare("메시지 삭제 (답장 미리보기 포함)")
+    async with session_factory() as db:
+        oldest_id = await db.scalar(
+            ChatMessage.__table__.select().with_only_columns(ChatMessage.message_id)
+            .where(ChatMessage.room_id == room_id).order_by(ChatMessage.message_id).limit(1)
+        )
+    await rest_session(delete_chat_message, oldest_id)
+    await compare("캐시 밖 메시지 삭제")
+    # 캐시된 메시지를 size보다 적게 남을 때까지 삭제하면 다시 DB에서 채움
+    page = await fetch_page(session_factory, user.user_id, room_id, PAGE_SIZE)
+    own_messages = [message for message in page["messages"] if message["sender_id"] == user.user_id]
+    for message in own_messages[-5:]:
+        await rest_session(delete_chat_message, message["message_id"])
+    await compare("최신 메시지 여러 개 삭제")
+    if message_cache.hits == hits_before:
+        print("❌ 변경 후 캐시 응답이 한 번도 사용되지 않았습니다.")
+        ok = False
+
+    # 조회 중 변경된 채팅방은 캐시에 넣지 않음
+    other_room = room_ids[1]
+    version = message_cache.begin_fill(other_room)
+    message_cache.remove(other_room, 0)
+    message_cache.fill(other_room, version, [], 0)
+    message_cache.end_fill(other_room)
+    if message_cache.get_page(other_room, 1, True) is not None:
+        print("❌ 조회 중 변경된 채팅방의 조회 결과가 캐시에 들어갔습니다.")
+        ok = False
+
+    # 전체 크기 제한: 채팅방 3개 분량만 허용하고 11개 채팅방을 차례로 조회
+    message_cache.max_bytes = message_cache.snapshot()["bytes"] * 3
+    evictions = message_cache.evictions
+    for other in room_ids[1:]:
+        await fetch_page(session_factory, user.user_id, other, PAGE_SIZE)
+    stats = message_cache.snapshot()
+    print(f"크기 제한 {stats['max_bytes']:,}B: 사용 {stats['bytes']:,}B, 채팅방 {stats['rooms']}개, "
+          f"제거 {stats['evictions'] - evictions}회")
+    hits = message_cache.hits
+    await fetch_page(session_factory, user.user_id, room_ids[-1], PAGE_SIZE)
+    recent_hit = message_cache.hits == hits + 1
+    await fetch_page(session_factory, user.user_id, room_ids[1], PAGE_SIZE)
+    oldest_missed = message_cache.hits == hits + 1
+    if stats["bytes"] > stats["max_bytes"] or stats["evictions"] - evictions < 7 or not recent_hit or not oldest_missed:
+        print("❌ 가장 오래 조회하지 않은 채팅방부터 제거되지 않았습니다.")
+        ok = False
+
+    # 만료: 채운 지 TTL이 지나면 캐시 응답 대신 DB에서 다시 채움
+    ttl_room = room_ids[-1]
+    ttl_seconds, message_cache.ttl_seconds = message_cache.ttl_seconds, 0.05
+    message_cache.invalidate(ttl_room)
+    await fetch_page(session_factory, user.user_id, ttl_room, PAGE_SIZE)
+    hits, expired = message_cache.hits, message_cache.expired
+    await fetch_page(session_factory, user.user_id, ttl_room, PAGE_SIZE)
+    await asyncio.sleep(0.06)
+    await fetch_page(session_factory, user.user_id, ttl_room, PAGE_SIZE)
+    message_cache.ttl_seconds = ttl_seconds
+    if message_cache.hits != hits + 1 or message_cache.expired != expired + 1:
+        print("❌ TTL이 지난 채팅방 캐시가 만료되지 않았습니다.")
+        ok = False
+
+    # 허브 재연결: 끊긴 동안 놓친 무효화가 있을 수 있으므로 전체 제거 후 다른 워커에 알림
+    published = []
+    message_cache.publish = lambda channel, message: published.append((channel, message))
+    message_cache.on_reconnect()
+    message_cache.publish = None
+    if message_cache.snapshot()["rooms"] or published != [(MESSAGE_CACHE_CHANNEL, ALL_ROOMS)]:
+        print(f"❌ 재연결 후 캐시가 모두 제거되지 않았습니다: 채팅방 {message_cache.snapshot()['rooms']}개, 알림 {published}")
+        ok = False
+
+    stats = message_cache.snapshot()
+    print(f"적중률 {stats['hit_rate']:.1%} (적중 {stats['hits']}, 실패 {stats['misses']}), "
+          f"갱신 {stats['updates']}회, 버린 조회 결과 {stats['stale_fills']}회")
+
+    await engine.dispose()
+    if ok:
+        print("✅ 캐시 응답이 변경 후에도 DB 조회 결과와 같고, 크기 제한 안에서 LRU로 제거되고, TTL 만료와 재연결 시 제거가 정상입니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채팅방 최근 메시지 캐시 점검")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'message_cache.db')}"
+    sys.exit(0 if asyncio.run(main(database_url, args.messages, args.runs)) else 1)
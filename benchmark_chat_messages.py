@@ -0,0 +1,129 @@
+"""
+채팅 메시지 목록 조회 쿼리 수 점검
+
+답장/반응이 섞인 채팅방에서 GET /chat/rooms/{room_id}/messages/ 와 검색 API를 페이지 크기
+10~200으로 호출하면서 처리 시간과 실행된 쿼리 수를 측정합니다. 메시지 응답 변환
+(ChatService.serialize_messages)은 페이지 크기와 관계없이 같은 수의 쿼리만 실행해야 하므로,
+페이지 크기에 따라 쿼리 수가 달라지면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_chat_messages.py
+   python benchmark_chat_messages.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import get_chat_messages, search_messages
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, MessageReaction, User
+from app.monitoring import query_stats
+from app.services.message_cache import message_cache
+from app.services.search_service import MessageSearchService
+
+MEMBER_COUNT = 5
+EMOJIS = ["👍", "❤️", "😂"]
+
+
+async def seed(session_factory, message_count: int):
+    """벤치마크용 채팅방 생성 (메시지마다 답장/반응 포함) 후 (사용자 ID, 채팅방 ID) 반환"""
+    async with session_factory() as db:
+        users = [
+            User(email=f"bench-msg{i}@example.com", password_hash="x", salt="", name=f"member {i}",
+                 birth_date=date(2000, 1, 1), gender="M", nationality="KR", terms_agreed=True)
+            for i in range(MEMBER_COUNT)
+        ]
+        db.add_all(users)
+        await db.flush()
+
+        room = ChatRoom(room_name="bench", room_type="group", created_by=users[0].user_id)
+        db.add(room)
+        await db.flush()
+        db.add_all([ChatParticipant(room_id=room.room_id, user_id=user.user_id) for user in users])
+
+        started = datetime.now() - timedelta(days=1)
+        previous_id = None
+        for i in range(message_count):
+            message = ChatMessage(room_id=room.room_id, sender_id=users[i % MEMBER_COUNT].user_id,
+                                  message_content=f"message {i}", reply_to_message_id=previous_id if i % 3 == 0 else None,
+                                  created_at=started + timedelta(seconds=i))
+            db.add(message)
+            await db.flush()
+            await MessageSearchService.index_message(db, message)
+            db.add_all([
+                MessageReaction(message_id=message.message_id, user_id=users[(i + j) % MEMBER_COUNT].user_id,
+                                emoji=EMOJIS[j])
+                for j in range(i % len(EMOJIS) + 1)
+            ])
+            previous_id = message.message_id
+        await db.commit()
+        return users[0].user_id, room.room_id
+
+
+async def measure(session_factory, func, runs: int):
+    timings = []
+    queries = 0
+    for _ in range(runs):
+        async with session_factory() as db:
+            with query_stats.count_queries() as stats:
+                started = time.perf_counter()
+                await func(db)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = stats.count
+    return statistics.median(timings), queries
+
+
+async def main(database_url: str, page_sizes, runs: int) -> bool:
+    engine = create_async_engine(database_url)
+    query_stats.attach(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    user_id, room_id = await seed(session_factory, max(page_sizes))
+    # DB 조회 경로의 쿼리 수를 측정하므로 최근 메시지 캐시는 사용하지 않음 (캐시는 benchmark_chat_message_cache.py)
+    message_cache.size = 0
+
+    async def list_messages(db, size):
+        user = await db.get(User, user_id)
+        response = await get_chat_messages(room_id=room_id, size=size, current_user=user, db=db, read_db=db)
+        assert len(response.messages) == size
+
+    async def search(db, size):
+        user = await db.get(User, user_id)
+        response = await search_messages(room_id=room_id, q="message", size=size, current_user=user, db=db)
+        assert len(response.messages) == size
+
+    print(f"{'페이지 크기':>8} | {'메시지 조회':>20} | {'메시지 검색':>20}")
+    query_counts = {"list": set(), "search": set()}
+    for size in page_sizes:
+        list_ms, list_queries = await measure(session_factory, lambda db: list_messages(db, size), runs)
+        search_ms, search_queries = await measure(session_factory, lambda db: search(db, size), runs)
+        query_counts["list"].add(list_queries)
+        query_counts["search"].add(search_queries)
+        print(f"{size:>8} | {list_ms:>9.1f}ms {list_queries:>5}쿼리 | {search_ms:>9.1f}ms {search_queries:>5}쿼리")
+
+    await engine.dispose()
+
+    constant = all(len(counts) == 1 for counts in query_counts.values())
+    if constant:
+        print("✅ 페이지 크기와 관계없이 쿼리 수가 일정합니다.")
+    else:
+        print(f"❌ 페이지 크기에 따라 쿼리 수가 달라집니다: {query_counts}")
+    return constant
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채팅 메시지 목록 조회 쿼리 수 점검")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--sizes", default="10,50,200", help="쉼표로 구분한 페이지 크기")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    ok = asyncio.run(main(args.database_url, [int(n) for n in args.sizes.split(",")], args.runs))
+    sys.exit(0 if ok else 1)
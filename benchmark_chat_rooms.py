@@ -0,0 +1,121 @@
+"""
+채팅방 목록 조회 벤치마크
+
+사용자 한 명이 10/100/1000개 채팅방에 참여한 상태에서 GET /chat/rooms/ 처리 시간과
+실행된 쿼리 수를 측정합니다. 방마다 쿼리를 보내던 기존 방식과 비교합니다.
+
+실행 방법:
+   python benchmark_chat_rooms.py
+   python benchmark_chat_rooms.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import get_chat_rooms
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, User
+from app.monitoring import query_stats
+
+MESSAGES_PER_ROOM = 20
+
+
+async def seed(session_factory, room_count: int) -> int:
+    """벤치마크용 사용자/채팅방/메시지 생성 후 사용자 ID 반환"""
+    async with session_factory() as db:
+        user = User(email=f"bench{room_count}@example.com", password_hash="x", salt="", name="bench",
+                    birth_date=date(2000, 1, 1), gender="M", nationality="KR", terms_agreed=True)
+        friend = User(email=f"bench{room_count}-friend@example.com", password_hash="x", salt="", name="friend",
+                      birth_date=date(2000, 1, 1), gender="F", nationality="KR", terms_agreed=True)
+        db.add_all([user, friend])
+        await db.flush()
+
+        started = datetime.now() - timedelta(days=1)
+        for i in range(room_count):
+            room = ChatRoom(room_name=f"room {i}", room_type="direct", created_by=user.user_id)
+            db.add(room)
+            await db.flush()
+            db.add_all([
+                ChatParticipant(room_id=room.room_id, user_id=user.user_id, last_read_at=started + timedelta(minutes=10)),
+                ChatParticipant(room_id=room.room_id, user_id=friend.user_id),
+            ])
+            db.add_all([
+                ChatMessage(room_id=room.room_id, sender_id=friend.user_id, message_content=f"message {j}",
+                            created_at=started + timedelta(minutes=j))
+                for j in range(MESSAGES_PER_ROOM)
+            ])
+        await db.commit()
+        return user.user_id
+
+
+async def legacy_room_list(db, user_id: int) -> int:
+    """기존 방식: 방마다 참여자 수/마지막 메시지/참여 정보/읽지 않은 수를 따로 조회"""
+    rooms = (await db.scalars(
+        select(ChatRoom).join(ChatParticipant).where(
+            ChatParticipant.user_id == user_id, ChatParticipant.is_active == True, ChatRoom.is_active == True
+        )
+    )).all()
+    for room in rooms:
+        await db.scalar(select(func.count()).select_from(ChatParticipant).where(
+            ChatParticipant.room_id == room.room_id, ChatParticipant.is_active == True))
+        await db.scalar(select(ChatMessage).where(
+            ChatMessage.room_id == room.room_id, ChatMessage.is_deleted == False
+        ).order_by(ChatMessage.created_at.desc()).limit(1))
+        participant = await db.scalar(select(ChatParticipant).where(
+            ChatParticipant.room_id == room.room_id, ChatParticipant.user_id == user_id))
+        await db.scalar(select(func.count()).select_from(ChatMessage).where(
+            ChatMessage.room_id == room.room_id,
+            ChatMessage.created_at > participant.last_read_at,
+            ChatMessage.is_deleted == False))
+    return len(rooms)
+
+
+async def measure(session_factory, func, runs: int):
+    timings = []
+    queries = 0
+    for _ in range(runs):
+        async with session_factory() as db:
+            with query_stats.count_queries() as stats:
+                started = time.perf_counter()
+                await func(db)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = stats.count
+    return statistics.median(timings), queries
+
+
+async def main(database_url: str, room_counts, runs: int):
+    engine = create_async_engine(database_url)
+    query_stats.attach(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    print(f"{'채팅방 수':>8} | {'기존 방식':>22} | {'집계 쿼리':>22}")
+    for room_count in room_counts:
+        user_id = await seed(session_factory, room_count)
+
+        async def new_list(db):
+            user = await db.get(User, user_id)
+            await get_chat_rooms(current_user=user, db=db)
+
+        legacy_ms, legacy_queries = await measure(session_factory, lambda db: legacy_room_list(db, user_id), runs)
+        new_ms, new_queries = await measure(session_factory, new_list, runs)
+        print(f"{room_count:>8} | {legacy_ms:>10.1f}ms {legacy_queries:>6}쿼리 | {new_ms:>10.1f}ms {new_queries:>6}쿼리")
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채팅방 목록 조회 벤치마크")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--rooms", default="10,100,1000", help="쉼표로 구분한 사용자당 채팅방 수")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, [int(n) for n in args.rooms.split(",")], args.runs))
@@ -0,0 +1,184 @@
+"""
+채팅방 메시지 검색 벤치마크
+
+메시지가 많은 채팅방(기본 100만 개)을 만들고 같은 검색어를 여러 방식으로 조회해 처리 시간을 비교합니다.
+- LIKE: 기존 방식 (message_content LIKE '%검색어%', 채팅방 전체 스캔)
+- 색인 최신순: 드문 bigram이 있으면 n-gram 색인으로 후보를 좁힌 뒤 LIKE로 확인 (MessageSearchService.find_rare_term)
+- 색인 관련도순: MessageSearchService.search_by_relevance
+- API: 검색 엔드포인트(search_messages)를 권한 확인/응답 변환까지 그대로 호출
+  (최신순, 관련도순, include_total=true로 결과 수까지 세는 경우)
+첫 페이지 결과가 서로 다르거나, 결과 수가 LIKE로 센 개수와 다르거나(상한 이하일 때),
+엔드포인트가 쿼리 예산을 넘으면 실패(exit code 1)합니다. (관련도순은 결과 집합만 비교)
+
+실행 방법:
+   python benchmark_message_search.py
+   python benchmark_message_search.py --messages 100000
+   python benchmark_message_search.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import search_messages
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, MessageSearchTerm, User
+from app.monitoring import query_stats
+from app.services.chat_service import ChatService
+from app.services.search_service import MessageSearchService
+
+BATCH_SIZE = 5000
+PAGE_SIZE = 20
+WORDS = [
+    "안녕하세요", "오늘", "수업", "과제", "시험", "언제", "도서관에서", "같이", "공부해요", "점심",
+    "저녁은", "뭐", "먹을까요", "내일", "발표", "자료", "보내드릴게요", "감사합니다", "ㅋㅋㅋ", "좋아요",
+    "meeting", "notes", "학교", "카페에서", "만나요",
+]
+# 드물게 등장하는 검색어 (1,000개 중 1개 정도의 메시지에 포함)
+RARE_WORD = "기말고사"
+QUERIES = ["도서관", "과제 보내", RARE_WORD, f"오늘 {RARE_WORD}"]
+
+
+async def seed(session_factory, message_count: int) -> tuple:
+    """벤치마크용 채팅방 생성 후 (사용자, 채팅방 ID) 반환 (메시지와 검색 색인을 배치로 삽입)"""
+    rng = random.Random(0)
+    async with session_factory() as db:
+        user = User(email="bench-search@example.com", password_hash="x", salt="", name="searcher",
+                    birth_date=date(2000, 1, 1), gender="M", nationality="KR", terms_agreed=True)
+        db.add(user)
+        await db.flush()
+        room = ChatRoom(room_name="bench", room_type="group", created_by=user.user_id)
+        db.add(room)
+        await db.flush()
+        db.add(ChatParticipant(room_id=room.room_id, user_id=user.user_id, is_active=True))
+        await db.commit()
+        user_id, room_id = user.user_id, room.room_id
+
+    started = datetime.now() - timedelta(days=30)
+    message_id = 0
+    for offset in range(0, message_count, BATCH_SIZE):
+        messages, terms = [], []
+        for i in range(offset, min(offset + BATCH_SIZE, message_count)):
+            message_id += 1
+            words = rng.choices(WORDS, k=rng.randint(2, 8))
+            if rng.random() < 0.001:
+                words.insert(rng.randrange(len(words) + 1), RARE_WORD)
+            content = " ".join(words)
+            messages.append({"message_id": message_id, "room_id": room_id, "sender_id": user_id,
+                             "message_content": content, "created_at": started + timedelta(seconds=i)})
+            terms.extend(
+                {"room_id": room_id, "term": term, "message_id": message_id, "term_count": count}
+                for term, count in MessageSearchService.tokenize(content).items()
+            )
+        async with session_factory() as db:
+            await db.execute(insert(ChatMessage), messages)
+            await db.execute(insert(MessageSearchTerm), terms)
+            await db.commit()
+        print(f"\r   메시지 {message_id:,}개 생성", end="", flush=True)
+    print()
+    return user, room_id
+
+
+async def measure(session_factory, func, runs: int):
+    timings = []
+    result = None
+    for _ in range(runs):
+        async with session_factory() as db:
+            started = time.perf_counter()
+            result = await func(db)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+async def main(database_url: str, message_count: int, runs: int) -> bool:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    user, room_id = await seed(session_factory, message_count)
+    query_stats.attach(engine.sync_engine)
+
+    async def like_scan(db, q):
+        filters = (ChatMessage.room_id == room_id, ChatMessage.is_deleted == False,
+                   *[ChatMessage.message_content.like(f"%{word}%") for word in q.split()])
+        messages, _ = await ChatService.fetch_message_page(db, filters, PAGE_SIZE)
+        return [message.message_id for message in messages]
+
+    async def indexed(db, q):
+        rare_term = await MessageSearchService.find_rare_term(db, room_id, q)
+        messages, _ = await ChatService.fetch_message_page(
+            db, MessageSearchService.build_filters(room_id, q, rare_term), PAGE_SIZE
+        )
+        return [message.message_id for message in messages]
+
+    async def relevance(db, q):
+        rare_term = await MessageSearchService.find_rare_term(db, room_id, q)
+        messages, _, _ = await MessageSearchService.search_by_relevance(db, room_id, q, PAGE_SIZE, rare_term=rare_term)
+        return [message.message_id for message in messages]
+
+    async def endpoint(db, q, sort="recent", include_total=False):
+        with query_stats.count_queries(search_messages.query_budget):
+            return await search_messages(
+                room_id=room_id, q=q, page=1, size=PAGE_SIZE, before_message_id=None, after_message_id=None,
+                include_total=include_total, sort=sort, cursor=None, current_user=user, db=db
+            )
+
+    async def like_count(db, q):
+        return await db.scalar(select(func.count()).select_from(ChatMessage).where(
+            ChatMessage.room_id == room_id, ChatMessage.is_deleted == False,
+            *[ChatMessage.message_content.like(f"%{word}%") for word in q.split()]
+        ))
+
+    ok = True
+    print(f"{'검색어':>10} | {'LIKE':>10} | {'색인 최신순':>10} | {'색인 관련도순':>10} | "
+          f"{'API 최신순':>10} | {'API 관련도순':>10} | {'API 결과 수':>10}")
+    for q in QUERIES:
+        like_ms, like_ids = await measure(session_factory, lambda db: like_scan(db, q), runs)
+        indexed_ms, indexed_ids = await measure(session_factory, lambda db: indexed(db, q), runs)
+        relevance_ms, relevance_ids = await measure(session_factory, lambda db: relevance(db, q), runs)
+        api_ms, api_response = await measure(session_factory, lambda db: endpoint(db, q), runs)
+        api_relevance_ms, _ = await measure(session_factory, lambda db: endpoint(db, q, sort="relevance"), runs)
+        api_total_ms, total_response = await measure(
+            session_factory, lambda db: endpoint(db, q, include_total=True), runs
+        )
+        print(f"{q:>10} | {like_ms:>8.1f}ms | {indexed_ms:>8.1f}ms | {relevance_ms:>8.1f}ms | "
+              f"{api_ms:>8.1f}ms | {api_relevance_ms:>8.1f}ms | {api_total_ms:>8.1f}ms")
+
+        # 관련도순은 정렬이 다르므로 LIKE 결과가 한 페이지 이하일 때만 결과 집합 비교
+        api_ids = [message.message_id for message in api_response.messages]
+        if like_ids != indexed_ids or like_ids != api_ids or (
+            len(like_ids) < PAGE_SIZE and set(like_ids) != set(relevance_ids)
+        ):
+            print(f"❌ '{q}' 검색 결과가 일치하지 않습니다.")
+            ok = False
+
+        async with session_factory() as db:
+            expected = await like_count(db, q)
+        limit = MessageSearchService.TOTAL_COUNT_LIMIT
+        if (total_response.total_count, total_response.total_count_capped) != (min(expected, limit), expected > limit):
+            print(f"❌ '{q}' 결과 수가 다릅니다: {total_response.total_count} (LIKE {expected}개)")
+            ok = False
+
+    await engine.dispose()
+
+    if ok:
+        print("✅ 색인 검색 결과와 결과 수가 LIKE 검색과 일치하고, 엔드포인트가 쿼리 예산 안에서 실행되었습니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채팅방 메시지 검색 벤치마크")
+    parser.add_argument("--database-url", default="sqlite+aiosqlite:///:memory:")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    ok = asyncio.run(main(args.database_url, args.messages, args.runs))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,113 @@
+"""
+채팅방 브로드캐스트 전달 지연 벤치마크
+
+한 채팅방에 빠른 클라이언트 여러 개와 느린 클라이언트 하나를 연결하고 메시지를 연속으로 브로드캐스트하면서
+빠른 클라이언트가 메시지를 받기까지 걸린 시간을 비교합니다.
+- 순차 전송: 기존 방식 (연결마다 send_text를 차례로 await)
+- 전송 큐: ConnectionManager (연결별 전송 큐 + 전송 태스크)
+전송 큐 방식에서 느린 클라이언트가 큐 초과로 연결 종료(SLOW_CONSUMER_CLOSE_CODE)되지 않으면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_websocket_fanout.py
+   python benchmark_websocket_fanout.py --clients 500 --slow-delay-ms 500
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from app.services.connection_manager import SLOW_CONSUMER_CLOSE_CODE, ConnectionManager
+
+ROOM_ID = 1
+
+
+class FakeWebSocket:
+    """send_text마다 delay만큼 걸리는 가짜 WebSocket (받은 시각 기록)"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.latencies = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.latencies.append((time.perf_counter() - float(message)) * 1000)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.close_code = code
+
+
+def make_clients(count: int, slow_delay: float):
+    # 0번 사용자가 느린 클라이언트
+    return {user_id: FakeWebSocket(slow_delay if user_id == 0 else 0) for user_id in range(count)}
+
+
+async def sequential(clients, messages: int, interval: float):
+    """기존 broadcast_to_room 방식"""
+    for _ in range(messages):
+        message = str(time.perf_counter())
+        for websocket in clients.values():
+            await websocket.send_text(message)
+        await asyncio.sleep(interval)
+
+
+async def queued(clients, messages: int, interval: float, queue_size: int):
+    manager = ConnectionManager(queue_size=queue_size)
+    for user_id, websocket in clients.items():
+        await manager.connect(websocket, ROOM_ID, user_id)
+    for _ in range(messages):
+        await manager.broadcast_to_room(str(time.perf_counter()), ROOM_ID)
+        await asyncio.sleep(interval)
+    # 빠른 클라이언트의 큐가 비워질 때까지 대기
+    await asyncio.sleep(0.1)
+    stats = manager.snapshot()
+    for user_id in list(clients):
+        manager.disconnect(ROOM_ID, user_id)
+    return stats
+
+
+def fast_latencies(clients):
+    return [latency for user_id, websocket in clients.items() if user_id != 0 for latency in websocket.latencies]
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1] if ordered else 0.0
+    return f"중앙값 {statistics.median(ordered):>8.2f}ms, p99 {p99:>8.2f}ms, 최대 {ordered[-1]:>8.2f}ms"
+
+
+async def main(client_count: int, messages: int, slow_delay_ms: float, interval_ms: float, queue_size: int) -> bool:
+    slow_delay, interval = slow_delay_ms / 1000, interval_ms / 1000
+
+    clients = make_clients(client_count, slow_delay)
+    await sequential(clients, messages, interval)
+    print(f"순차 전송 (빠른 클라이언트 {client_count - 1}개): {describe(fast_latencies(clients))}")
+
+    clients = make_clients(client_count, slow_delay)
+    stats = await queued(clients, messages, interval, queue_size)
+    print(f"전송 큐   (빠른 클라이언트 {client_count - 1}개): {describe(fast_latencies(clients))}")
+    print(f"   최대 큐 깊이 {stats['max_queue_depth']}, 느린 소비자 연결 종료 {stats['slow_consumer_disconnects']}회")
+
+    slow_closed = clients[0].close_code == SLOW_CONSUMER_CLOSE_CODE
+    if slow_closed:
+        print(f"✅ 느린 클라이언트가 close code {SLOW_CONSUMER_CLOSE_CODE}로 연결 종료되었습니다.")
+    else:
+        print("❌ 느린 클라이언트의 연결이 종료되지 않았습니다.")
+    return slow_closed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="채팅방 브로드캐스트 전달 지연 벤치마크")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--slow-delay-ms", type=float, default=200)
+    parser.add_argument("--interval-ms", type=float, default=5)
+    parser.add_argument("--queue-size", type=int, default=16)
+    args = parser.parse_args()
+    ok = asyncio.run(main(args.clients, args.messages, args.slow_delay_ms, args.interval_ms, args.queue_size))
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,183 @@
+"""
+일시적인 WebSocket 이벤트(typing, 입장/퇴장) 병합 점검
+
+참여자 ROOM_SIZE명이 연결된 채팅방에서
+- 여러 명이 typing 프레임을 계속 보낼 때 전송 프레임 수를 병합 전/후로 비교하고
+  사용자마다 WS_TYPING_INTERVAL_MS에 한 번만, 첫 프레임은 바로 전달되는지
+- 메시지를 보낸 직후의 typing은 간격과 관계없이 바로 전달되는지
+- 재연결(퇴장 후 재입장)이 몰릴 때 입장/퇴장 알림이 presence_digest 하나로 합쳐지고,
+  상태가 원래대로 돌아온 사용자는 빠지는지
+를 확인합니다. 하나라도 어긋나면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_ws_ephemeral.py
+   python benchmark_ws_ephemeral.py --room-size 500 --typers 50
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from types import SimpleNamespace
+
+from app.main import broadcast_presence, handle_chat_event
+from app.services.connection_manager import manager
+from app.services.event_coalescer import event_coalescer
+
+ROOM_ID = 1
+TYPING_RATE = 10          # 초당 typing 프레임 수 (키 입력마다 보내는 클라이언트)
+TYPING_SECONDS = 1.5
+
+
+class CountingWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        self.messages.append(json.loads(message))
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def reply(payload: dict):
+    pass
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+async def typing_storm(users, typers: int) -> int:
+    """typers명이 TYPING_SECONDS 동안 초당 TYPING_RATE개씩 typing을 보내고 브로드캐스트 수 반환"""
+    before = event_coalescer.typing_received - event_coalescer.typing_suppressed
+    for _ in range(int(TYPING_RATE * TYPING_SECONDS)):
+        for user in users[:typers]:
+            await handle_chat_event(None, user, ROOM_ID, {"type": "typing"}, reply)
+        await asyncio.sleep(1 / TYPING_RATE)
+    return event_coalescer.typing_received - event_coalescer.typing_suppressed - before
+
+
+def delivered(sockets, event_type: str) -> int:
+    return sum(1 for ws in sockets for message in ws.messages if message["type"] == event_type)
+
+
+def clear(sockets):
+    for ws in sockets:
+        ws.messages.clear()
+
+
+async def main(room_size: int, typers: int, interval_ms: float, digest_ms: float) -> bool:
+    logging.getLogger("app").setLevel(logging.WARNING)
+    users = [SimpleNamespace(user_id=i + 1, name=f"member {i}") for i in range(room_size)]
+    sockets = [CountingWebSocket() for _ in users]
+    manager.queue_size = 100000
+    await manager.start()
+    for ws, user in zip(sockets, users):
+        await manager.connect(ws, ROOM_ID, user.user_id)
+    ok = True
+
+    # typing: 병합 전
+    event_coalescer.typing_interval = 0
+    await typing_storm(users, typers)
+    await wait_until(lambda: delivered(sockets, "typing") == typers * int(TYPING_RATE * TYPING_SECONDS) * (room_size - 1))
+    baseline = delivered(sockets, "typing")
+    clear(sockets)
+
+    # typing: 병합 후
+    event_coalescer.typing_interval = interval_ms / 1000
+    event_coalescer.typing_sent_at.clear()
+    broadcasts = await typing_storm(users, typers)
+    await asyncio.sleep(0.1)
+    coalesced = delivered(sockets, "typing")
+    per_user_limit = int(TYPING_SECONDS * 1000 // interval_ms) + 1
+    print(f"typing {typers}명 x {TYPING_RATE}회/초 x {TYPING_SECONDS}초 (참여자 {room_size}명): "
+          f"전송 프레임 {baseline:,}개 → {coalesced:,}개 ({1 - coalesced / baseline:.1%} 감소)")
+    if broadcasts > typers * per_user_limit or coalesced != broadcasts * (room_size - 1):
+        print(f"❌ typing 브로드캐스트가 사용자당 {per_user_limit}회를 넘었습니다: {broadcasts}회")
+        ok = False
+
+    # 첫 typing은 바로 전달되고, 메시지를 보낸 뒤에는 간격과 관계없이 다시 전달
+    clear(sockets)
+    event_coalescer.typing_sent_at.clear()
+    typer = users[0]
+    await handle_chat_event(None, typer, ROOM_ID, {"type": "typing"}, reply)
+    first_delivered = await wait_until(lambda: delivered(sockets[1:2], "typing") == 1, 0.05)
+    await handle_chat_event(None, typer, ROOM_ID, {"type": "typing"}, reply)
+    event_coalescer.message_sent(ROOM_ID, typer.user_id)
+    await handle_chat_event(None, typer, ROOM_ID, {"type": "typing"}, reply)
+    await asyncio.sleep(0.05)
+    if not first_delivered or delivered(sockets[1:2], "typing") != 2:
+        print(f"❌ 첫 typing 즉시 전달/메시지 후 재전달이 다릅니다: {delivered(sockets[1:2], 'typing')}회 (예상 2회)")
+        ok = False
+
+    # 입장/퇴장: 절반이 재연결(퇴장 후 재입장), 새 참여자 5명 입장, 3명 퇴장
+    flappers = users[:room_size // 2]
+    joiners = [SimpleNamespace(user_id=room_size + i + 1, name=f"new {i}") for i in range(5)]
+    leavers = users[-3:]
+
+    async def presence_storm():
+        for user in flappers:
+            await broadcast_presence(user, [ROOM_ID], "offline")
+            await broadcast_presence(user, [ROOM_ID], "online")
+        for user in joiners:
+            await broadcast_presence(user, [ROOM_ID], "online")
+        for user in leavers:
+            await broadcast_presence(user, [ROOM_ID], "offline")
+
+    clear(sockets)
+    event_coalescer.presence_interval = 0
+    await presence_storm()
+    # 연결된 참여자는 자기 자신의 알림은 받지 않음
+    expected = (len(flappers) * 2 + len(leavers)) * (room_size - 1) + len(joiners) * room_size
+    await wait_until(lambda: delivered(sockets, "presence") == expected)
+    baseline = delivered(sockets, "presence")
+
+    clear(sockets)
+    event_coalescer.presence_interval = digest_ms / 1000
+    await event_coalescer.start()
+    await presence_storm()
+    if not await wait_until(lambda: delivered(sockets, "presence_digest") >= room_size, digest_ms / 1000 + 2):
+        print("❌ presence_digest가 요약 주기 안에 전송되지 않았습니다.")
+        ok = False
+    await asyncio.sleep(0.1)
+    coalesced = delivered(sockets, "presence_digest")
+    print(f"입장/퇴장 {len(flappers) * 2 + len(joiners) + len(leavers)}건 (재연결 {len(flappers)}명): "
+          f"전송 프레임 {baseline:,}개 → {coalesced:,}개")
+    digest = next(message for message in sockets[0].messages if message["type"] == "presence_digest")
+    online = sorted(entry["user_id"] for entry in digest["online"])
+    offline = sorted(entry["user_id"] for entry in digest["offline"])
+    if (online, offline) != (sorted(user.user_id for user in joiners), sorted(user.user_id for user in leavers)) \
+            or coalesced != room_size:
+        print(f"❌ presence_digest 내용이 다릅니다: online {online}, offline {offline}, 프레임 {coalesced}개")
+        ok = False
+
+    stats = event_coalescer.snapshot()
+    print(f"통계: typing {stats['typing_received']}건 중 {stats['typing_suppressed']}건 생략, "
+          f"presence {stats['presence_received']}건 중 {stats['presence_suppressed']}건 생략, "
+          f"요약 {stats['presence_digests']}회")
+
+    await event_coalescer.close()
+    for user in users:
+        manager.disconnect(ROOM_ID, user.user_id)
+    await manager.close()
+    if ok:
+        print("✅ typing은 사용자별 간격으로, 입장/퇴장은 채팅방별 요약으로 합쳐서 전송되었습니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일시적인 WebSocket 이벤트 병합 점검")
+    parser.add_argument("--room-size", type=int, default=200)
+    parser.add_argument("--typers", type=int, default=10)
+    parser.add_argument("--typing-interval-ms", type=float, default=1000)
+    parser.add_argument("--digest-ms", type=float, default=500)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.room_size, args.typers, args.typing_interval_ms, args.digest_ms)) else 1)
@@ -0,0 +1,198 @@
+"""
+WebSocket 연결과 DB 커넥션 풀 점유 점검
+
+커넥션 풀 크기 20(max_overflow 0)인 엔진으로 채팅 WebSocket 5,000개를 동시에 연결한 뒤
+- 모든 연결이 인증/권한 확인을 통과해 연결되는지 (풀 크기보다 연결이 훨씬 많아도 대기 시간 초과 없이)
+- 연결만 유지하고 있는 동안 대여 중인 DB 커넥션이 0개인지
+- 일부 연결이 동시에 메시지를 보내도 풀 크기 안에서 저장되고 끝나면 모두 반환되는지
+를 확인합니다. WebSocket 처리는 작업 단위(인증, 메시지 저장, 답장 조회)마다 세션을 열고 바로 반환해야 하므로,
+연결 수명 동안 세션을 유지하면 풀이 고갈되어 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_ws_idle_sessions.py
+   python benchmark_ws_idle_sessions.py --sockets 10000 --pool-size 20
+   python benchmark_ws_idle_sessions.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from fastapi import WebSocketDisconnect
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.auth.jwt_handler import create_access_token
+from app.main import websocket_endpoint
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, User
+from app.services.connection_manager import manager
+
+ROOM_SIZE = 10
+
+
+class IdleWebSocket:
+    """클라이언트가 보낼 메시지를 큐로 넣어 주는 가짜 WebSocket (None을 넣으면 연결 종료)"""
+
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+        self.received = 0
+        self.closed_code = None
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self) -> str:
+        message = await self.incoming.get()
+        if message is None:
+            raise WebSocketDisconnect()
+        return message
+
+    async def send_text(self, message: str):
+        self.received += 1
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        self.closed_code = code
+
+
+class PoolUsage:
+    """대여 중인 커넥션 수와 최댓값"""
+
+    def __init__(self, engine):
+        self.checked_out = 0
+        self.peak = 0
+        event.listen(engine.sync_engine, "checkout", self._checkout)
+        event.listen(engine.sync_engine, "checkin", self._checkin)
+
+    def _checkout(self, *args):
+        self.checked_out += 1
+        self.peak = max(self.peak, self.checked_out)
+
+    def _checkin(self, *args):
+        self.checked_out -= 1
+
+
+async def seed(session_factory, socket_count: int):
+    """사용자 socket_count명을 ROOM_SIZE명씩 채팅방에 배정하고 [(이메일, 채팅방 ID)] 반환"""
+    async with session_factory() as db:
+        await db.execute(insert(User), [
+            {"email": f"bench-idle{i}@example.com", "password_hash": "x", "salt": "", "name": f"member {i}",
+             "birth_date": date(2000, 1, 1), "gender": "M", "nationality": "KR", "terms_agreed": True}
+            for i in range(socket_count)
+        ])
+        users = (await db.execute(
+            select(User.user_id, User.email).where(User.email.like("bench-idle%")).order_by(User.user_id)
+        )).all()
+        room_count = (socket_count + ROOM_SIZE - 1) // ROOM_SIZE
+        await db.execute(insert(ChatRoom), [
+            {"room_name": f"idle {i}", "room_type": "group", "created_by": users[0].user_id} for i in range(room_count)
+        ])
+        room_ids = (await db.scalars(
+            select(ChatRoom.room_id).where(ChatRoom.room_name.like("idle %")).order_by(ChatRoom.room_id)
+        )).all()
+        assignments = [(user.email, user.user_id, room_ids[i // ROOM_SIZE]) for i, user in enumerate(users)]
+        await db.execute(insert(ChatParticipant), [
+            {"room_id": room_id, "user_id": user_id, "is_active": True} for _, user_id, room_id in assignments
+        ])
+        await db.commit()
+        return [(email, room_id) for email, _, room_id in assignments]
+
+
+async def wait_until(condition, timeout: float):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+async def main(database_url: str, socket_count: int, pool_size: int) -> bool:
+    logging.getLogger("app").setLevel(logging.WARNING)
+    # SQLite는 DB 전체에 쓰기 잠금을 걸므로 동시 저장이 몰려도 잠금 대기 시간(기본 5초)을 넘지 않도록 늘림
+    connect_args = {"timeout": 60} if database_url.startswith("sqlite") else {}
+    engine = create_async_engine(database_url, pool_size=pool_size, max_overflow=0, pool_timeout=30,
+                                 connect_args=connect_args)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    assignments = await seed(session_factory, socket_count)
+    usage = PoolUsage(engine)
+    await manager.start()
+
+    # 모든 클라이언트가 동시에 연결 (재연결 폭주와 같은 상황)
+    sockets = [IdleWebSocket() for _ in assignments]
+    started = time.perf_counter()
+    tasks = [
+        asyncio.create_task(websocket_endpoint(ws, room_id, create_access_token({"sub": email}), session_factory))
+        for ws, (email, room_id) in zip(sockets, assignments)
+    ]
+    connected = await wait_until(
+        lambda: sum(len(room) for room in manager.active_connections.values()) == socket_count, 120
+    )
+    connect_seconds = time.perf_counter() - started
+    rejected = sum(1 for ws in sockets if ws.closed_code)
+    print(f"WebSocket {socket_count}개 연결: {connect_seconds:.1f}초, 커넥션 풀 {pool_size}개 중 최대 {usage.peak}개 사용"
+          f"{f', 거부 {rejected}개' if rejected else ''}")
+
+    # 연결만 유지하는 동안 대여 중인 커넥션
+    await asyncio.sleep(0.5)
+    idle_checked_out = usage.checked_out
+    print(f"유휴 상태: 연결 {socket_count}개, 대여 중인 DB 커넥션 {idle_checked_out}개")
+
+    # 채팅방마다 한 명씩 동시에 메시지 전송
+    senders = sockets[::ROOM_SIZE]
+    usage.peak = 0
+    started = time.perf_counter()
+    for i, ws in enumerate(senders):
+        ws.incoming.put_nowait(json.dumps({"type": "message", "content": f"hello {i}"}))
+    async with session_factory() as db:
+        async def saved_count():
+            return await db.scalar(select(func.count()).select_from(ChatMessage))
+        deadline = time.perf_counter() + 120
+        saved = 0
+        while time.perf_counter() < deadline:
+            saved = await saved_count()
+            await db.rollback()
+            if saved >= len(senders):
+                break
+            await asyncio.sleep(0.05)
+    await wait_until(lambda: usage.checked_out == 0, 10)
+    print(f"메시지 {len(senders)}개 동시 전송: {time.perf_counter() - started:.1f}초, 저장 {saved}개, "
+          f"최대 {usage.peak}개 사용, 완료 후 대여 중 {usage.checked_out}개")
+
+    ok = True
+    if not connected or rejected:
+        print(f"❌ {socket_count}개 중 일부가 연결되지 않았습니다. (거부 {rejected}개)")
+        ok = False
+    if idle_checked_out:
+        print(f"❌ 유휴 WebSocket 연결이 DB 커넥션 {idle_checked_out}개를 점유하고 있습니다.")
+        ok = False
+    if saved != len(senders) or usage.checked_out:
+        print(f"❌ 메시지 저장 후 커넥션이 반환되지 않았거나 저장이 누락되었습니다. (저장 {saved}개)")
+        ok = False
+
+    for ws in sockets:
+        ws.incoming.put_nowait(None)
+    await asyncio.gather(*tasks)
+    await manager.close()
+    await engine.dispose()
+
+    if ok:
+        print(f"✅ WebSocket {socket_count}개가 DB 커넥션 {pool_size}개 풀에서 커넥션을 점유하지 않고 유지되었습니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket 연결과 DB 커넥션 풀 점유 점검")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--sockets", type=int, default=5000)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'idle_sessions.db')}"
+    sys.exit(0 if asyncio.run(main(database_url, args.sockets, args.pool_size)) else 1)
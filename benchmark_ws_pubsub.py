@@ -0,0 +1,176 @@
+"""
+여러 워커 사이 채팅방 브로드캐스트 점검 (Unix 소켓 pub/sub 허브)
+
+허브 하나와 워커 두 개(각자 ConnectionManager + UnixSocketBackend)를 한 프로세스에서 실행하고
+- 워커 A에서 브로드캐스트한 메시지가 워커 B에 연결된 같은 채팅방 참여자에게 전달되는지
+- exclude_user로 제외한 사용자에게는 전달되지 않는지
+- 허브가 각 워커를 연결이 있는 채팅방에만 구독시키는지
+- 사용자별 연결(/ws/user)이 여러 채팅방 이벤트와 다른 워커에서 보낸 알람을 연결 하나로 받는지
+- 워커 공통 채널(캐시 무효화)이 보낸 워커를 제외한 워커에 전달되는지
+- 읽지 않는 워커 연결은 전송 대기량이 한도를 넘으면 허브가 끊고, 다른 워커 전달은 계속되는지
+- 허브 연결이 끊어진 워커가 재연결 후 구독을 복구하고 재연결 handler를 호출하는지
+를 확인하고 워커 간 전달 지연을 측정합니다. 하나라도 어긋나면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_ws_pubsub.py
+   python benchmark_ws_pubsub.py --messages 5000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app.services.connection_manager import ConnectionManager
+from app.services.pubsub import FRAME_LIMIT, PubSubHub, UnixSocketBackend
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+        self.received_at = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        self.messages.append(message)
+        self.received_at.append(time.perf_counter())
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def wait_until(condition, timeout: float = 5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.005)
+    return condition()
+
+
+async def main(message_count: int) -> bool:
+    path = os.path.join(tempfile.mkdtemp(), "ws_hub.sock")
+    hub = PubSubHub()
+    server = await asyncio.start_unix_server(hub.handle, path=path, limit=FRAME_LIMIT)
+
+    # 측정 중 메시지를 연속으로 보내므로 전송 큐는 메시지 수보다 크게
+    worker_a = ConnectionManager(queue_size=message_count + 10, pubsub=UnixSocketBackend(path))
+    worker_b = ConnectionManager(queue_size=message_count + 10, pubsub=UnixSocketBackend(path))
+    await worker_a.start()
+    await worker_b.start()
+
+    # 채팅방 1: 사용자 1(A), 2(B), 3(B) / 채팅방 2: 사용자 4(A)만
+    sockets = {user_id: FakeWebSocket() for user_id in (1, 2, 3, 4)}
+    await worker_a.connect(sockets[1], 1, 1)
+    await worker_b.connect(sockets[2], 1, 2)
+    await worker_b.connect(sockets[3], 1, 3)
+    await worker_a.connect(sockets[4], 2, 4)
+    # 사용자 5: 워커 B의 사용자별 연결로 채팅방 2, 3 구독 (채팅방 3은 다른 연결 없음)
+    sockets[5] = FakeWebSocket()
+    await worker_b.connect_user(sockets[5], 5, [2, 3])
+    await wait_until(lambda: len(hub.channels) == 4 and len(hub.channels.get(2, ())) == 2)
+
+    ok = True
+    subscribers = {channel: len(writers) for channel, writers in hub.channels.items()}
+    if subscribers != {1: 2, 2: 2, 3: 1, "user:5": 1}:
+        print(f"❌ 허브 구독 상태가 예상과 다릅니다: {subscribers}")
+        ok = False
+
+    await worker_a.broadcast_to_room("hello", 1, exclude_user=3)
+    await worker_a.broadcast_to_room("room 2 only", 2)
+    await worker_a.send_to_user("notification", 5)
+    delivered = await wait_until(lambda: sockets[2].messages == ["hello"] and len(sockets[5].messages) == 2)
+    await asyncio.sleep(0.05)
+    if not delivered or sockets[1].messages != ["hello"] or sockets[3].messages:
+        print(f"❌ 워커 간 전달 결과가 다릅니다: {[s.messages for s in sockets.values()]}")
+        ok = False
+    if sockets[5].messages != ["room 2 only", "notification"]:
+        print(f"❌ 사용자별 연결 전달 결과가 다릅니다: {sockets[5].messages}")
+        ok = False
+    if worker_b.pubsub.received != 3:
+        print(f"❌ 워커 B가 받은 메시지 수가 다릅니다: {worker_b.pubsub.received}개 (예상 3개)")
+        ok = False
+
+    # 워커 공통 채널 (최근 메시지 캐시 무효화 등): 보낸 워커를 제외한 모든 워커의 handler로 전달
+    changes = {"a": [], "b": []}
+    worker_a.add_channel_handler("message_cache", changes["a"].append)
+    worker_b.add_channel_handler("message_cache", changes["b"].append)
+    await wait_until(lambda: len(hub.channels.get("message_cache", ())) == 2)
+    worker_a.publish("message_cache", "1")
+    if not await wait_until(lambda: changes["b"] == ["1"]) or changes["a"]:
+        print(f"❌ 워커 공통 채널 전달 결과가 다릅니다: {changes}")
+        ok = False
+
+    # 워커 간 전달 지연
+    sockets[2].messages.clear()
+    sockets[2].received_at.clear()
+    sent_at = []
+    for i in range(message_count):
+        sent_at.append(time.perf_counter())
+        await worker_a.broadcast_to_room(str(i), 1)
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    await wait_until(lambda: len(sockets[2].received_at) == message_count)
+    latencies = [(received - sent) * 1000 for sent, received in zip(sent_at, sockets[2].received_at)]
+    if len(latencies) == message_count and sockets[2].messages == [str(i) for i in range(message_count)]:
+        print(f"워커 간 전달 {message_count}개: 중앙값 {statistics.median(latencies):.2f}ms, 최대 {max(latencies):.2f}ms")
+    else:
+        print(f"❌ {message_count}개 중 {len(sockets[2].messages)}개만 순서대로 전달되었습니다.")
+        ok = False
+
+    # 읽지 않는 워커: 허브 전송 대기량이 한도를 넘으면 연결 종료, 나머지 워커 전달은 유지
+    hub.max_buffer_bytes = 256 * 1024
+    stalled_reader, stalled_writer = await asyncio.open_unix_connection(path, limit=FRAME_LIMIT)
+    stalled_writer.write(b'{"op": "sub", "channel": 1}\n')
+    await wait_until(lambda: len(hub.channels.get(1, ())) == 3)
+    sockets[2].messages.clear()
+    payload = "x" * 16 * 1024
+    for i in range(200):
+        await worker_a.broadcast_to_room(payload, 1)
+        await asyncio.sleep(0)
+    stalled = await wait_until(lambda: hub.slow_disconnects == 1 and len(hub.channels.get(1, ())) == 2)
+    delivered = await wait_until(lambda: len(sockets[2].messages) == 200)
+    if not stalled or not delivered:
+        print(f"❌ 느린 워커 처리 결과가 다릅니다: 종료 {hub.slow_disconnects}건, "
+              f"다른 워커 전달 {len(sockets[2].messages)}/200개")
+        ok = False
+    else:
+        print("느린 워커 연결 종료: 1건, 다른 워커 전달 200/200개")
+    stalled_writer.close()
+
+    # 허브 재연결: 구독 복구 후 재연결 handler 호출 (끊긴 동안 놓친 캐시 무효화 보정용)
+    reconnected = []
+    worker_b.add_reconnect_handler(lambda: reconnected.append(len(worker_b.pubsub.subscriptions)))
+    worker_b.pubsub.writer.transport.abort()
+    if not await wait_until(lambda: reconnected and len(hub.channels.get(1, ())) == 2, timeout=5):
+        print(f"❌ 재연결 후 구독이 복구되지 않았습니다: handler {reconnected}, 채팅방 1 구독 워커 {len(hub.channels.get(1, ()))}개")
+        ok = False
+
+    # 마지막 연결이 끊어지면 구독 해제
+    worker_a.disconnect(2, 4)
+    worker_b.disconnect_user(5)
+    if not await wait_until(lambda: not {2, 3, "user:5"} & hub.channels.keys()):
+        print(f"❌ 채팅방 2, 3과 사용자 5의 구독이 해제되지 않았습니다: {list(hub.channels)}")
+        ok = False
+
+    for user_id, room_id, worker in ((1, 1, worker_a), (2, 1, worker_b), (3, 1, worker_b)):
+        worker.disconnect(room_id, user_id)
+    await worker_a.close()
+    await worker_b.close()
+    # 허브가 워커 연결 종료를 처리할 때까지 대기
+    await wait_until(lambda: not hub.channels)
+    server.close()
+    await server.wait_closed()
+
+    if ok:
+        print("✅ 워커 간 브로드캐스트, 채팅방별 구독, 사용자별 연결 전달, 느린 워커 차단, 재연결 후 구독 복구가 정상입니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="여러 워커 사이 채팅방 브로드캐스트 점검")
+    parser.add_argument("--messages", type=int, default=1000)
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.messages)) else 1)
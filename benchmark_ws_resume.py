@@ -0,0 +1,179 @@
+"""
+WebSocket 재연결 시 놓친 메시지 재전송 점검
+
+채팅방에 연결 하나를 유지한 채(재전송 버퍼 유지) 메시지를 보내고, 중간에 끊어진 클라이언트가 last_seq로
+재연결했을 때
+- 버퍼 안의 구간은 DB 조회 없이 버퍼에서 빠짐없이 순서대로 재전송되는지
+- 버퍼보다 오래된 구간은 DB에서 조회하고, WS_REPLAY_DB_LIMIT를 넘으면 has_more로 알리는지
+- 버퍼와 DB에서 재전송한 이벤트가 실시간으로 받은 이벤트와 같은지
+- 놓친 메시지가 없으면 빈 replay 이벤트를 받는지
+를 확인하고 버퍼/DB 재전송 시간을 비교합니다. 하나라도 어긋나면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_ws_resume.py
+   python benchmark_ws_resume.py --messages 2000 --buffer-size 512
+   python benchmark_ws_resume.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import handle_chat_event, replay_missed_messages
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatParticipant, ChatRoom, User
+from app.services.connection_manager import WS_REPLAY_DB_LIMIT, ReplayBuffer, manager
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        self.messages.append(message)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        pass
+
+
+async def seed(session_factory):
+    """사용자 두 명(보내는 사람, 계속 연결된 사람)과 채팅방 하나 생성"""
+    async with session_factory() as db:
+        users = [
+            User(email=f"bench-resume{i}@example.com", password_hash="x", salt="", name=f"member {i}",
+                 birth_date=date(2000, 1, 1), gender="M", nationality="KR", terms_agreed=True)
+            for i in range(2)
+        ]
+        db.add_all(users)
+        await db.flush()
+        room = ChatRoom(room_name="resume", room_type="group", created_by=users[0].user_id)
+        db.add(room)
+        await db.flush()
+        db.add_all([ChatParticipant(room_id=room.room_id, user_id=user.user_id) for user in users])
+        await db.commit()
+        return users, room.room_id
+
+
+async def resume(session_factory, room_id: int, last_seq: int):
+    """replay 이벤트 하나를 받아 (이벤트, 걸린 시간 ms) 반환"""
+    frames = []
+
+    async def send(message: str):
+        frames.append(message)
+
+    started = time.perf_counter()
+    await replay_missed_messages(session_factory, room_id, last_seq, send)
+    elapsed = (time.perf_counter() - started) * 1000
+    if len(frames) != 1:
+        raise AssertionError(f"replay 이벤트가 {len(frames)}개입니다.")
+    return json.loads(frames[0]), elapsed
+
+
+async def wait_until(condition, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        await asyncio.sleep(0.01)
+    return condition()
+
+
+async def main(database_url: str, message_count: int, buffer_size: int) -> bool:
+    logging.getLogger("app").setLevel(logging.WARNING)
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    (sender, listener), room_id = await seed(session_factory)
+
+    queries = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    # 계속 연결된 참여자가 있어야 채팅방을 구독하고 재전송 버퍼를 유지함
+    manager.replay_size = buffer_size
+    manager.queue_size = message_count + 10
+    await manager.start()
+    listener_ws = FakeWebSocket()
+    await manager.connect(listener_ws, room_id, listener.user_id)
+
+    async def reply(payload: dict):
+        pass
+
+    for i in range(message_count):
+        await handle_chat_event(session_factory, sender, room_id, {"type": "message", "content": f"resume {i}"}, reply)
+    await wait_until(lambda: len(listener_ws.messages) == message_count)
+    live = [json.loads(message) for message in listener_ws.messages]
+
+    ok = True
+    if [event["seq"] for event in live] != list(range(1, message_count + 1)):
+        print(f"❌ 실시간 메시지 순번이 1부터 연속되지 않습니다: {[event['seq'] for event in live][:10]}...")
+        ok = False
+
+    def check(label: str, frame: dict, last_seq: int, source: str, expected_count: int, has_more: bool):
+        expected = live[last_seq:last_seq + expected_count]
+        if (frame["source"], frame["has_more"]) != (source, has_more) or frame["messages"] != expected:
+            print(f"❌ {label}: source={frame['source']}, has_more={frame['has_more']}, "
+                  f"메시지 {len(frame['messages'])}개 (예상 {source}, {has_more}, {expected_count}개)")
+            return False
+        return True
+
+    # 버퍼 안의 구간
+    last_seq = message_count - buffer_size // 2
+    queries.clear()
+    frame, buffer_ms = await resume(session_factory, room_id, last_seq)
+    ok &= check("버퍼 재전송", frame, last_seq, "buffer", message_count - last_seq, False)
+    if queries:
+        print(f"❌ 버퍼 재전송 중 DB 쿼리 {len(queries)}개가 실행되었습니다.")
+        ok = False
+    print(f"버퍼 재전송 {len(frame['messages'])}개: {buffer_ms:.2f}ms, DB 쿼리 {len(queries)}개")
+
+    # 같은 구간을 DB에서 조회 (버퍼를 비워서 강제)
+    manager.replay_buffers[room_id] = ReplayBuffer(buffer_size)
+    frame, db_ms = await resume(session_factory, room_id, last_seq)
+    ok &= check("DB 재전송", frame, last_seq, "db", message_count - last_seq, False)
+    print(f"DB 재전송 {len(frame['messages'])}개:   {db_ms:.2f}ms")
+
+    # 버퍼보다 오래된 구간 (다시 메시지를 보내 버퍼를 채운 뒤 처음부터 재연결)
+    for i in range(buffer_size):
+        await handle_chat_event(session_factory, sender, room_id, {"type": "message", "content": f"more {i}"}, reply)
+    await wait_until(lambda: len(listener_ws.messages) == message_count + buffer_size)
+    live = [json.loads(message) for message in listener_ws.messages]
+    total = len(live)
+    frame, _ = await resume(session_factory, room_id, 0)
+    ok &= check("버퍼보다 오래된 구간", frame, 0, "db", min(total, WS_REPLAY_DB_LIMIT), total > WS_REPLAY_DB_LIMIT)
+
+    # 놓친 메시지 없음
+    frame, _ = await resume(session_factory, room_id, total)
+    ok &= check("놓친 메시지 없음", frame, total, "buffer", 0, False)
+
+    manager.disconnect(room_id, listener.user_id)
+    if room_id in manager.replay_buffers:
+        print("❌ 마지막 연결이 끊어진 뒤에도 재전송 버퍼가 남아 있습니다.")
+        ok = False
+    await manager.close()
+    await engine.dispose()
+
+    if ok:
+        print("✅ 재연결 시 놓친 메시지가 버퍼/DB에서 빠짐없이 순서대로 재전송되었습니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket 재연결 시 놓친 메시지 재전송 점검")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--buffer-size", type=int, default=256)
+    args = parser.parse_args()
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'resume.db')}"
+    sys.exit(0 if asyncio.run(main(database_url, args.messages, args.buffer_size)) else 1)
@@ -0,0 +1,170 @@
+"""
+WebSocket 메시지 지연 저장(write-behind) 처리량 점검
+
+같은 채팅방에 메시지를 연속으로 저장하면서
+- 메시지마다 INSERT + 커밋하는 기존 방식 (websocket_endpoint 기본 동작)
+- MessageWriter로 ID만 발급받고 일괄 저장하는 지연 저장 방식
+의 초당 처리 메시지 수와 메시지 하나를 받아들이는 데 걸린 시간(브로드캐스트 전까지의 지연)을 비교합니다.
+
+지연 저장 후에는 모든 메시지가 저장되었는지, 읽지 않은 메시지 수/마지막 메시지/검색 색인이 기존 방식과
+같게 갱신되었는지, 저장할 수 없는 메시지만 실패로 보고되는지, 여러 워커 설정(WS_PUBSUB_BACKEND=unix)에서는
+시작을 거부하는지 확인합니다. 하나라도 어긋나면 실패(exit code 1)합니다.
+
+실행 방법:
+   python benchmark_ws_write_behind.py
+   python benchmark_ws_write_behind.py --messages 20000 --batch-size 500
+   python benchmark_ws_write_behind.py --database-url "mysql+asyncmy://user:pw@host/bench_db"
+
+주의: --database-url로 지정한 데이터베이스에 테이블을 만들고 데이터를 넣으므로 벤치마크 전용 DB를 사용하세요.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models.migrations import create_missing_tables
+from app.models.models import ChatMessage, ChatParticipant, ChatRoom, MessageSearchTerm, User
+from app.services.chat_service import ChatService
+from app.services.message_writer import MessageWriter
+
+MEMBER_COUNT = 5
+
+
+async def seed(session_factory):
+    """채팅방 두 개 (직접 저장용 / 지연 저장용) 생성 후 (사용자 ID 목록, 채팅방 ID 목록) 반환"""
+    async with session_factory() as db:
+        users = [
+            User(email=f"bench-wb{i}@example.com", password_hash="x", salt="", name=f"member {i}",
+                 birth_date=date(2000, 1, 1), gender="M", nationality="KR", terms_agreed=True)
+            for i in range(MEMBER_COUNT)
+        ]
+        db.add_all(users)
+        await db.flush()
+        rooms = [ChatRoom(room_name=f"bench {i}", room_type="group", created_by=users[0].user_id) for i in range(2)]
+        db.add_all(rooms)
+        await db.flush()
+        db.add_all([
+            ChatParticipant(room_id=room.room_id, user_id=user.user_id)
+            for room in rooms for user in users
+        ])
+        await db.commit()
+        return [user.user_id for user in users], [room.room_id for room in rooms]
+
+
+def make_message(room_id: int, user_ids, i: int) -> ChatMessage:
+    return ChatMessage(room_id=room_id, sender_id=user_ids[i % MEMBER_COUNT],
+                       message_content=f"bench message {i}", message_type="text")
+
+
+async def room_state(session_factory, room_id: int):
+    """(저장된 메시지 수, 참여자별 unread_count, 마지막 메시지 미리보기, 검색 색인 행 수)"""
+    async with session_factory() as db:
+        count = await db.scalar(select(func.count()).where(ChatMessage.room_id == room_id))
+        unread = (await db.scalars(
+            select(ChatParticipant.unread_count).where(ChatParticipant.room_id == room_id)
+            .order_by(ChatParticipant.user_id)
+        )).all()
+        preview = await db.scalar(select(ChatRoom.last_message_preview).where(ChatRoom.room_id == room_id))
+        terms = await db.scalar(select(func.count()).where(MessageSearchTerm.room_id == room_id))
+        return count, list(unread), preview, terms
+
+
+def report(label: str, count: int, elapsed: float, accept_ms):
+    print(f"{label}: {count / elapsed:>9.0f}개/초 | 메시지 수신 지연 중앙값 {statistics.median(accept_ms):.3f}ms, "
+          f"최대 {max(accept_ms):.3f}ms")
+
+
+async def main(database_url: str, message_count: int, batch_size: int, interval_ms: float) -> bool:
+    engine = create_async_engine(database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(create_missing_tables)
+    session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    user_ids, (direct_room, behind_room) = await seed(session_factory)
+
+    # 기존 방식: 메시지마다 INSERT + 커밋
+    accept_ms = []
+    started = time.perf_counter()
+    async with session_factory() as db:
+        for i in range(message_count):
+            began = time.perf_counter()
+            message = make_message(direct_room, user_ids, i)
+            db.add(message)
+            await ChatService.on_message_created(db, message)
+            await db.commit()
+            accept_ms.append((time.perf_counter() - began) * 1000)
+    report("메시지별 커밋", message_count, time.perf_counter() - started, accept_ms)
+
+    # 지연 저장: ID만 발급받고 일괄 저장
+    failed = []
+
+    async def on_failed(messages):
+        failed.extend(message.message_id for message in messages)
+
+    writer = MessageWriter(session_factory, enabled=True, interval_ms=interval_ms, batch_size=batch_size)
+    await writer.start(on_failed=on_failed)
+    accept_ms = []
+    started = time.perf_counter()
+    for i in range(message_count):
+        began = time.perf_counter()
+        await writer.submit(make_message(behind_room, user_ids, i))
+        accept_ms.append((time.perf_counter() - began) * 1000)
+        if i % batch_size == 0:
+            # 실제 서버처럼 수신 사이에 저장 태스크가 실행될 기회를 줌
+            await asyncio.sleep(0)
+    await writer.close()
+    report("지연 저장    ", message_count, time.perf_counter() - started, accept_ms)
+    stats = writer.snapshot()
+    print(f"   배치 {stats['batches']}회 (최대 {stats['max_batch']}개, 평균 {stats['avg_flush_ms']:.1f}ms), "
+          f"ID 블록 예약 {stats['id_blocks_reserved']}회")
+
+    ok = True
+    direct_state = await room_state(session_factory, direct_room)
+    behind_state = await room_state(session_factory, behind_room)
+    if behind_state != direct_state or failed:
+        print(f"❌ 지연 저장 결과가 기존 방식과 다릅니다: {behind_state} / {direct_state}, 실패 {len(failed)}개")
+        ok = False
+
+    # 저장할 수 없는 메시지(내용 없음)는 같은 배치의 다른 메시지와 관계없이 실패로 보고
+    writer = MessageWriter(session_factory, enabled=True, interval_ms=interval_ms, batch_size=batch_size)
+    await writer.start(on_failed=on_failed)
+    good = [await writer.submit(make_message(behind_room, user_ids, i)) for i in range(3)]
+    bad = await writer.submit(ChatMessage(room_id=behind_room, sender_id=user_ids[0], message_content=None))
+    await writer.close()
+    async with session_factory() as db:
+        saved = (await db.scalars(select(ChatMessage.message_id).where(
+            ChatMessage.message_id.in_([message.message_id for message in good + [bad]])
+        ))).all()
+    if failed != [bad.message_id] or sorted(saved) != sorted(message.message_id for message in good):
+        print(f"❌ 실패 보고가 다릅니다: 실패 {failed}, 저장 {sorted(saved)}")
+        ok = False
+
+    # 여러 워커 설정에서는 채팅방 순번이 겹치므로 시작 거부
+    try:
+        await MessageWriter(session_factory, enabled=True, pubsub_backend="unix").start()
+        print("❌ WS_PUBSUB_BACKEND=unix에서 지연 저장이 시작되었습니다.")
+        ok = False
+    except RuntimeError:
+        pass
+
+    await engine.dispose()
+    if ok:
+        print("✅ 지연 저장한 메시지와 카운터/색인이 기존 방식과 같고, 실패한 메시지만 보고되었고, 여러 워커 설정에서는 시작을 거부했습니다.")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WebSocket 메시지 지연 저장 처리량 점검")
+    parser.add_argument("--database-url", default=None, help="기본값: 임시 SQLite 파일")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=50)
+    args = parser.parse_args()
+    database_url = args.database_url or f"sqlite+aiosqlite:///{os.path.join(tempfile.mkdtemp(), 'write_behind.db')}"
+    sys.exit(0 if asyncio.run(main(database_url, args.messages, args.batch_size, args.interval_ms)) else 1)